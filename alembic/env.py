@@ -15,8 +15,9 @@ from app.core.config import settings
 # Import all models so they're registered with SQLModel
 # This ensures Alembic can see all tables for autogenerate
 from app.identity.models import User  # noqa: F401
-from app.wallet.models import Account, LedgerEntry, DailyTreasuryStat, NCRMarketState  # noqa: F401
-from app.xp_loyalty.models import UserLoyalty, XpEvent  # noqa: F401
+from app.wallet.models import Account, LedgerEntry, DailyTreasuryStat, NCRMarketState, TreasuryShard, TreasuryTotal  # noqa: F401
+from app.treasury.models import TreasuryFlowDaily  # noqa: F401
+from app.xp_loyalty.models import UserLoyalty, XpDelta, XpEvent  # noqa: F401
 from app.nova_credit.models import CitizenScore, ScoreChange, RiskFlag  # noqa: F401
 from app.agency.models import Agency, AgencyOperator, Performer  # noqa: F401
 from app.consent.models import (  # noqa: F401
@@ -29,6 +30,7 @@ from app.consent.models import (  # noqa: F401
 from app.justice.models import ViolationLog, UserCpState, TaskAppeal  # noqa: F401
 from app.justice.nasipcourt_models import RiskEvent, JusticeCase, JusticePenalty  # noqa: F401
 from app.telegram_gateway.models import TelegramAccount  # noqa: F401
+from app.telegram_gateway.leaderboard_models import LeaderboardSnapshot  # noqa: F401
 from app.telegram_gateway.task_models import (  # noqa: F401
     Task,
     TaskAssignment,
@@ -42,8 +44,9 @@ from app.telegram_gateway.event_models import (  # noqa: F401
     EventParticipation,
     EventReward,
 )
-from app.abuse.models import UserRiskProfile, AbuseEvent  # noqa: F401
+from app.abuse.models import UserRiskProfile, AbuseEvent, ProofFingerprint, ProofSignature  # noqa: F401
 from app.quests.models import UserQuest  # noqa: F401
+from app.events.models import ProcessedEvent, EventQueueItem, EventDeadLetter  # noqa: F401
 from app.agency.models import CreatorAsset, AgencyClient  # noqa: F401
 
 # Alembic Config object
@@ -0,0 +1,68 @@
+"""add_account_user_token_unique
+
+Revision ID: c1a7e4f2d9b3
+Revises: b50f4f545527
+Create Date: 2025-12-03 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1a7e4f2d9b3'
+down_revision: Union[str, None] = 'b50f4f545527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Merge duplicate (user_id, token) accounts into the lowest id first: the
+    # survivor takes the summed balance and any system_accounts reference.
+    # The merge is not undone by downgrade().
+    op.execute(
+        """
+        WITH dupes AS (
+            SELECT id, min(id) OVER (PARTITION BY user_id, token) AS keep_id
+            FROM accounts
+        ),
+        moved AS (
+            SELECT d.keep_id, sum(a.balance) AS balance, max(a.updated_at) AS updated_at
+            FROM accounts a JOIN dupes d ON d.id = a.id
+            WHERE d.id <> d.keep_id
+            GROUP BY d.keep_id
+        )
+        UPDATE accounts a
+        SET balance = a.balance + moved.balance,
+            updated_at = greatest(a.updated_at, moved.updated_at)
+        FROM moved
+        WHERE a.id = moved.keep_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE system_accounts s
+        SET wallet_account_id = d.keep_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY user_id, token) AS keep_id
+            FROM accounts
+        ) d
+        WHERE s.wallet_account_id = d.id AND d.id <> d.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM accounts a
+        USING accounts keep
+        WHERE keep.user_id = a.user_id AND keep.token = a.token AND keep.id < a.id
+        """
+    )
+
+    # WalletService mutates balances with a guarded UPDATE keyed on (user_id, token);
+    # the key must identify exactly one account row.
+    op.create_unique_constraint('uq_account_user_token', 'accounts', ['user_id', 'token'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_account_user_token', 'accounts', type_='unique')
@@ -0,0 +1,34 @@
+"""add_treasury_shards_table
+
+Revision ID: d4b8f1e6a2c7
+Revises: c1a7e4f2d9b3
+Create Date: 2025-12-03 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8f1e6a2c7'
+down_revision: Union[str, None] = 'c1a7e4f2d9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'treasury_shards',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(length=10), nullable=False),
+        sa.Column('shard_no', sa.Integer(), nullable=False),
+        sa.Column('balance', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token', 'shard_no', name='uq_treasury_shard'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('treasury_shards')
@@ -0,0 +1,37 @@
+"""add_treasury_totals_table
+
+Revision ID: e7c2a9d5f3b1
+Revises: d4b8f1e6a2c7
+Create Date: 2025-12-03 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a9d5f3b1'
+down_revision: Union[str, None] = 'd4b8f1e6a2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'treasury_totals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(length=10), nullable=False),
+        sa.Column('metric', sa.String(length=20), nullable=False),
+        sa.Column('slot', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=24, scale=8), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token', 'metric', 'slot', name='uq_treasury_total_slot'),
+    )
+    # Sayaçlar boş başlar; mevcut veriyi yüklemek için:
+    #   python scripts/reconcile_treasury_totals.py --fix
+
+
+def downgrade() -> None:
+    op.drop_table('treasury_totals')
@@ -0,0 +1,44 @@
+"""add_history_keyset_indexes
+
+Revision ID: f2d6b8a4c1e9
+Revises: e7c2a9d5f3b1
+Create Date: 2025-12-03 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d6b8a4c1e9'
+down_revision: Union[str, None] = 'e7c2a9d5f3b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination (created_at, id) < cursor; btree backward scan serves DESC
+    op.create_index(
+        'ix_ledger_entries_user_created_id',
+        'ledger_entries',
+        ['user_id', 'created_at', 'id'],
+    )
+    op.create_index(
+        'ix_score_changes_user_created_id',
+        'score_changes',
+        ['user_id', 'created_at', 'id'],
+    )
+    # treasury_flows may be missing on migration-only databases (dropped by
+    # a11cb366f975 and created by init_db / create_all instead)
+    if sa.inspect(op.get_bind()).has_table('treasury_flows'):
+        op.create_index('ix_treasury_flows_ts_id', 'treasury_flows', ['ts', 'id'])
+        op.create_index('ix_treasury_flows_app_ts_id', 'treasury_flows', ['app', 'ts', 'id'])
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('treasury_flows'):
+        op.drop_index('ix_treasury_flows_app_ts_id', table_name='treasury_flows', if_exists=True)
+        op.drop_index('ix_treasury_flows_ts_id', table_name='treasury_flows', if_exists=True)
+    op.drop_index('ix_score_changes_user_created_id', table_name='score_changes')
+    op.drop_index('ix_ledger_entries_user_created_id', table_name='ledger_entries')
@@ -0,0 +1,53 @@
+"""add_treasury_flow_daily_table
+
+Revision ID: a9e3c5d7b2f4
+Revises: f2d6b8a4c1e9
+Create Date: 2025-12-03 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e3c5d7b2f4'
+down_revision: Union[str, None] = 'f2d6b8a4c1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AMOUNT_COLUMNS = (
+    'gross_amount',
+    'tax_amount',
+    'net_to_performer',
+    'growth_amount',
+    'performer_pool_amount',
+    'dev_amount',
+    'burn_amount',
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'treasury_flow_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('app', sa.String(length=50), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        *(
+            sa.Column(name, sa.Numeric(precision=24, scale=8), nullable=False)
+            for name in AMOUNT_COLUMNS
+        ),
+        sa.Column('flow_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'app', 'kind', name='uq_treasury_flow_daily'),
+    )
+    op.create_index(op.f('ix_treasury_flow_daily_day'), 'treasury_flow_daily', ['day'], unique=False)
+    # Geçmiş günleri yüklemek için (deploy gününü de kapsaması için ertesi gün):
+    #   python scripts/backfill_treasury_flow_daily.py
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_treasury_flow_daily_day'), table_name='treasury_flow_daily')
+    op.drop_table('treasury_flow_daily')
@@ -0,0 +1,56 @@
+"""add_leaderboard_snapshot_table
+
+Revision ID: c7f1a3e5d9b2
+Revises: a9e3c5d7b2f4
+Create Date: 2025-12-03 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f1a3e5d9b2'
+down_revision: Union[str, None] = 'a9e3c5d7b2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'leaderboard_snapshot',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=True),
+        sa.Column('telegram_user_id', sa.Integer(), nullable=True),
+        sa.Column('username', sa.String(length=255), nullable=True),
+        sa.Column('display_name', sa.String(length=255), nullable=True),
+        sa.Column('xp_total', sa.Integer(), nullable=False),
+        sa.Column('level', sa.Integer(), nullable=False),
+        sa.Column('tier', sa.String(length=20), nullable=False),
+        sa.Column('tasks_completed', sa.Integer(), nullable=False),
+        sa.Column('referrals_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('period', 'period_start', 'user_id', name='uq_leaderboard_snapshot_user'),
+    )
+    op.create_index(op.f('ix_leaderboard_snapshot_user_id'), 'leaderboard_snapshot', ['user_id'], unique=False)
+    op.create_index(
+        'ix_leaderboard_snapshot_score',
+        'leaderboard_snapshot',
+        ['period', 'period_start', 'score'],
+        unique=False,
+    )
+    # Güncel bucket'ları doldurmak için:
+    #   python scripts/rebuild_leaderboard_snapshot.py
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leaderboard_snapshot_score', table_name='leaderboard_snapshot')
+    op.drop_index(op.f('ix_leaderboard_snapshot_user_id'), table_name='leaderboard_snapshot')
+    op.drop_table('leaderboard_snapshot')
@@ -0,0 +1,30 @@
+"""add_task_submission_gate_index
+
+Revision ID: d3b8e6f2a4c7
+Revises: c7f1a3e5d9b2
+Create Date: 2025-12-03 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b8e6f2a4c7'
+down_revision: Union[str, None] = 'c7f1a3e5d9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Submission gate: user_id = ? AND submitted_at >= now - 1h
+    op.create_index(
+        'ix_task_submissions_user_submitted',
+        'telegram_task_submissions',
+        ['user_id', 'submitted_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_submissions_user_submitted', table_name='telegram_task_submissions')
@@ -0,0 +1,52 @@
+"""add_proof_fingerprints_table
+
+Revision ID: e5a9c1d7f3b6
+Revises: d3b8e6f2a4c7
+Create Date: 2025-12-03 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c1d7f3b6'
+down_revision: Union[str, None] = 'd3b8e6f2a4c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'proof_fingerprints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('proof_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['submission_id'], ['telegram_task_submissions.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('proof_hash', 'user_id', name='uq_proof_fingerprints_hash_user'),
+    )
+    op.create_index('ix_proof_fingerprints_created', 'proof_fingerprints', ['created_at'], unique=False)
+
+    # Son 30 günün submission'larından backfill (kullanıcı başına hash'in ilk kullanımı)
+    op.execute(
+        """
+        INSERT INTO proof_fingerprints (proof_hash, user_id, submission_id, created_at)
+        SELECT DISTINCT ON (proof_metadata->>'proof_hash', user_id)
+               proof_metadata->>'proof_hash', user_id, id, submitted_at
+        FROM telegram_task_submissions
+        WHERE proof_metadata ? 'proof_hash'
+          AND submitted_at >= now() - interval '30 days'
+        ORDER BY proof_metadata->>'proof_hash', user_id, submitted_at
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proof_fingerprints_created', table_name='proof_fingerprints')
+    op.drop_table('proof_fingerprints')
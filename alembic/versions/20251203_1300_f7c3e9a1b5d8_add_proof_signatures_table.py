@@ -0,0 +1,39 @@
+"""add_proof_signatures_table
+
+Revision ID: f7c3e9a1b5d8
+Revises: e5a9c1d7f3b6
+Create Date: 2025-12-03 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3e9a1b5d8'
+down_revision: Union[str, None] = 'e5a9c1d7f3b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'proof_signatures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=32), nullable=False),
+        sa.Column('ref_id', sa.Integer(), nullable=True),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_proof_signatures_user_id'), 'proof_signatures', ['user_id'], unique=False)
+    op.create_index('ix_proof_signatures_created', 'proof_signatures', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proof_signatures_created', table_name='proof_signatures')
+    op.drop_index(op.f('ix_proof_signatures_user_id'), table_name='proof_signatures')
+    op.drop_table('proof_signatures')
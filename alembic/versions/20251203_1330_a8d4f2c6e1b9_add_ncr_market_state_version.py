@@ -0,0 +1,28 @@
+"""add_ncr_market_state_version
+
+Revision ID: a8d4f2c6e1b9
+Revises: f7c3e9a1b5d8
+Create Date: 2025-12-03 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4f2c6e1b9'
+down_revision: Union[str, None] = 'f7c3e9a1b5d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'ncr_market_state',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('ncr_market_state', 'version')
@@ -0,0 +1,40 @@
+"""add_processed_events_table
+
+Revision ID: b6f1d9e3c2a7
+Revises: a8d4f2c6e1b9
+Create Date: 2025-12-03 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f1d9e3c2a7'
+down_revision: Union[str, None] = 'a8d4f2c6e1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'processed_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_app', sa.String(length=20), nullable=False),
+        sa.Column('event_id', sa.String(length=100), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_app', 'event_id', name='uq_processed_events_source_event'),
+    )
+    op.create_index('ix_processed_events_created', 'processed_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_processed_events_created', table_name='processed_events')
+    op.drop_table('processed_events')
@@ -0,0 +1,64 @@
+"""add_event_queue_tables
+
+Revision ID: c9a4e2f7b1d3
+Revises: b6f1d9e3c2a7
+Create Date: 2025-12-03 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9a4e2f7b1d3'
+down_revision: Union[str, None] = 'b6f1d9e3c2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'event_queue',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_app', sa.String(length=20), nullable=False),
+        sa.Column('event_id', sa.String(length=100), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_event_queue_status_available', 'event_queue', ['status', 'available_at', 'id'], unique=False)
+    op.create_index('ix_event_queue_user_id', 'event_queue', ['user_id', 'id'], unique=False)
+
+    op.create_table(
+        'event_dead_letters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('queue_id', sa.Integer(), nullable=False),
+        sa.Column('source_app', sa.String(length=20), nullable=False),
+        sa.Column('event_id', sa.String(length=100), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=False),
+        sa.Column('failed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_event_dead_letters_user_id'), 'event_dead_letters', ['user_id'], unique=False)
+    op.create_index(op.f('ix_event_dead_letters_failed_at'), 'event_dead_letters', ['failed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_event_dead_letters_failed_at'), table_name='event_dead_letters')
+    op.drop_index(op.f('ix_event_dead_letters_user_id'), table_name='event_dead_letters')
+    op.drop_table('event_dead_letters')
+    op.drop_index('ix_event_queue_user_id', table_name='event_queue')
+    op.drop_index('ix_event_queue_status_available', table_name='event_queue')
+    op.drop_table('event_queue')
@@ -0,0 +1,35 @@
+"""add_xp_deltas_table
+
+Revision ID: d2b7e5a9c4f1
+Revises: c9a4e2f7b1d3
+Create Date: 2025-12-03 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e5a9c4f1'
+down_revision: Union[str, None] = 'c9a4e2f7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'xp_deltas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_xp_deltas_user_id'), 'xp_deltas', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_xp_deltas_user_id'), table_name='xp_deltas')
+    op.drop_table('xp_deltas')
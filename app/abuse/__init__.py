@@ -2,7 +2,7 @@
 AbuseGuard Module
 RiskScore & Abuse Event System for NasipQuest Economy Protection
 """
-from .models import UserRiskProfile, AbuseEvent, AbuseEventType
+from .models import UserRiskProfile, AbuseEvent, AbuseEventType, ProofFingerprint, ProofSignature
 from .service import AbuseGuard
 from .repository import AbuseRepository
 from .config import (
@@ -17,6 +17,8 @@ __all__ = [
     "UserRiskProfile",
     "AbuseEvent",
     "AbuseEventType",
+    "ProofFingerprint",
+    "ProofSignature",
     "AbuseGuard",
     "AbuseRepository",
     "ABUSE_EVENT_WEIGHTS",
@@ -29,5 +29,12 @@ RISK_THRESHOLD_COOLDOWN = 9.0              # 9+: Cooldown
 
 # Heuristics thresholds
 LOW_QUALITY_BURST_COUNT = 5               # 24 saatte 5+ reject → burst
+LOW_QUALITY_BURST_WINDOW_SECONDS = 24 * 3600
 TOO_FAST_COMPLETION_SECONDS = 10          # < 10 saniye → too fast
+DUPLICATE_PROOF_WINDOW_DAYS = 30          # Proof hash'leri 30 gün tutulur / karşılaştırılır
 
+
+# Near-duplicate (metin) proof tespiti
+NEAR_DUPLICATE_SIMILARITY_THRESHOLD = 0.75  # Tahmini Jaccard ≥ 0.75 → DUPLICATE_PROOF
+NEAR_DUPLICATE_MIN_TEXT_LENGTH = 40         # Normalize metin bundan kısaysa bakılmaz
+NEAR_DUPLICATE_PROOF_TYPES = ("text", "mixed")
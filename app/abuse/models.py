@@ -6,7 +6,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Column, Index
+from sqlalchemy import Column, Index, LargeBinary, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
@@ -82,3 +82,53 @@ class AbuseEvent(SQLModel, table=True):
         Index('ix_abuse_events_created', 'created_at'),
     )
 
+
+
+class ProofFingerprint(SQLModel, table=True):
+    """
+    Submit edilen proof'ların hash kaydı (duplicate-proof tespiti).
+
+    (proof_hash, user_id) başına tek satır: kullanıcının o hash'i ilk
+    kullandığı submission. Hash üzerinden tek index lookup'ı hem aynı
+    kullanıcının hem de başka hesapların (multi-account farming) tekrarını
+    bulur. Pencere dışına çıkan satırlar retention sweeper ile silinir.
+    """
+    __tablename__ = "proof_fingerprints"
+
+    id: int | None = Field(default=None, primary_key=True)
+    proof_hash: str = Field(max_length=64)
+    user_id: int = Field(foreign_key="users.id")
+    submission_id: Optional[int] = Field(default=None, foreign_key="telegram_task_submissions.id")
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        # Hash lookup'ı (proof_hash prefix'i) + kullanıcı başına tek kayıt
+        UniqueConstraint('proof_hash', 'user_id', name='uq_proof_fingerprints_hash_user'),
+        Index('ix_proof_fingerprints_created', 'created_at'),
+    )
+
+
+class ProofSignature(SQLModel, table=True):
+    """
+    Metin proof'larının MinHash imzası (near-duplicate tespiti).
+
+    Kalıcı kayıt; lookup'lar process içi LSH index'inden yapılır
+    (app.abuse.similarity). source + ref_id imzanın geldiği kaydı gösterir:
+    telegram_task → telegram_task_submissions.id, quest → user_quests.id.
+    """
+    __tablename__ = "proof_signatures"
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+    source: str = Field(max_length=32)
+    ref_id: Optional[int] = Field(default=None)
+    signature: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_proof_signatures_created', 'created_at'),
+    )
@@ -5,16 +5,74 @@ Database I/O operations for RiskScore system
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, delete, event, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select
 
-from .models import UserRiskProfile, AbuseEvent, AbuseEventType
+from app.core.session_buffers import is_savepoint_commit, register_session_buffer
+
+from .config import MAX_RISK_SCORE, MIN_RISK_SCORE
+from .models import UserRiskProfile, AbuseEvent, AbuseEventType, ProofFingerprint, ProofSignature
 from app.telegram_gateway.task_models import TaskSubmission, SubmissionStatus
 
+# session.info anahtarı: user_id → (profil, bekleyen delta'lar, son event zamanı)
+_PENDING_KEY = "abuse_risk_pending"
+
+
+def _clamped_risk_score(deltas: list[float]):
+    """Delta'ları sırayla uygulayan LEAST(GREATEST(...)) ifadesi."""
+    risk_score = UserRiskProfile.__table__.c.risk_score
+    for delta in deltas:
+        risk_score = func.least(func.greatest(risk_score + delta, MIN_RISK_SCORE), MAX_RISK_SCORE)
+    return risk_score
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_pending_risk_deltas(session: Session) -> None:
+    if is_savepoint_commit(session):
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    # Yeni profiller / event'ler UPDATE'ten önce yazılsın (autoflush kapalı)
+    session.flush()
+    profiles = UserRiskProfile.__table__
+    now = datetime.utcnow()
+    for user_id, (profile, deltas, at) in pending.items():
+        result = session.execute(
+            update(profiles)
+            .where(profiles.c.user_id == user_id)
+            .values(
+                risk_score=_clamped_risk_score(deltas),
+                last_event_at=at,
+                updated_at=now,
+            )
+            .returning(profiles.c.risk_score)
+        )
+        row = result.first()
+        if row is not None:
+            set_committed_value(profile, "risk_score", row.risk_score)
+            set_committed_value(profile, "updated_at", now)
+
+
+# Rollback olan transaction'ın / SAVEPOINT'in delta'ları atılır
+register_session_buffer(
+    _PENDING_KEY,
+    lambda pending: {user_id: (profile, list(deltas), at) for user_id, (profile, deltas, at) in pending.items()},
+)
+
 
 class AbuseRepository:
-    """AbuseGuard için repository katmanı."""
+    """
+    AbuseGuard için repository katmanı.
+    
+    Yazma metodları commit etmez; değişiklikler çağıranın transaction'ı ile
+    birlikte commit edilir.
+    """
     
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -26,20 +84,51 @@ class AbuseRepository:
         )
         return result.scalar_one_or_none()
     
-    async def save_profile(self, profile: UserRiskProfile) -> UserRiskProfile:
-        """Risk profilini kaydet/güncelle."""
-        profile.updated_at = datetime.utcnow()
-        self.session.add(profile)
-        await self.session.commit()
-        await self.session.refresh(profile)
-        return profile
+    async def create_profile(self, user_id: int) -> UserRiskProfile:
+        """
+        Profil yoksa oluştur (commit etmez).
+        
+        INSERT ... ON CONFLICT DO NOTHING: eşzamanlı ilk event'ler aynı
+        kullanıcı için ikinci profil denemesinde hata almaz.
+        """
+        await self.session.execute(
+            pg_insert(UserRiskProfile.__table__)
+            .values(
+                user_id=user_id,
+                risk_score=0.0,
+                risk_metadata={},
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        return await self.get_profile(user_id)
     
-    async def log_event(self, event: AbuseEvent) -> AbuseEvent:
-        """Abuse event'ini logla."""
+    def add_risk_delta(self, profile: UserRiskProfile, delta: float, at: datetime) -> None:
+        """
+        RiskScore delta'sını transaction'a ekle (commit etmez).
+        
+        Delta'lar session'da birikir ve commit'ten hemen önce kullanıcı
+        başına tek bir atomik UPDATE ile yazılır:
+            risk_score = LEAST(GREATEST(risk_score + d, min), max)
+        (aynı transaction'daki her delta sırayla clamp'lenir). Profil
+        nesnesi bu arada dirty yapılmadan tahmini skora çekilir; commit'te
+        DB'nin döndürdüğü değerle güncellenir.
+        """
+        pending: dict[int, tuple[UserRiskProfile, list[float], datetime]] = (
+            self.session.info.setdefault(_PENDING_KEY, {})
+        )
+        _, deltas, _ = pending.get(profile.user_id, (profile, [], at))
+        deltas.append(delta)
+        pending[profile.user_id] = (profile, deltas, at)
+        
+        projected = max(MIN_RISK_SCORE, min(MAX_RISK_SCORE, profile.risk_score + delta))
+        set_committed_value(profile, "risk_score", projected)
+        set_committed_value(profile, "last_event_at", at)
+    
+    def add_event(self, event: AbuseEvent) -> None:
+        """Abuse event'ini transaction'a ekle (commit etmez)."""
         self.session.add(event)
-        await self.session.commit()
-        await self.session.refresh(event)
-        return event
     
     async def count_rejected_tasks(
         self,
@@ -77,4 +166,74 @@ class AbuseRepository:
         
         result = await self.session.execute(query)
         return list(result.scalars().all())
-
+    
+    async def find_proof_fingerprint(
+        self,
+        proof_hash: str,
+        user_id: int,
+        since: datetime,
+    ) -> Optional[ProofFingerprint]:
+        """
+        Hash'in pencere içindeki önceki kullanımı.
+        
+        Aynı kullanıcının kaydı varsa o, yoksa en eski başka kullanıcı
+        kaydı döner (uq_proof_fingerprints_hash_user üzerinden tek lookup).
+        """
+        result = await self.session.execute(
+            select(ProofFingerprint)
+            .where(
+                and_(
+                    ProofFingerprint.proof_hash == proof_hash,
+                    ProofFingerprint.created_at >= since,
+                )
+            )
+            .order_by(ProofFingerprint.user_id != user_id, ProofFingerprint.created_at)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+    
+    async def add_proof_fingerprint(
+        self,
+        proof_hash: str,
+        user_id: int,
+        submission_id: Optional[int],
+    ) -> None:
+        """
+        Proof hash'ini kaydet (commit etmez; submission ile aynı transaction).
+        
+        Kullanıcının bu hash için zaten kaydı varsa ilk kayıt korunur.
+        """
+        await self.session.execute(
+            pg_insert(ProofFingerprint.__table__)
+            .values(
+                proof_hash=proof_hash,
+                user_id=user_id,
+                submission_id=submission_id,
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["proof_hash", "user_id"])
+        )
+    
+    async def prune_proof_fingerprints(self, before: datetime, limit: int) -> int:
+        """before'dan eski en fazla `limit` fingerprint'i sil (commit etmez)."""
+        expired = (
+            select(ProofFingerprint.id)
+            .where(ProofFingerprint.created_at < before)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(ProofFingerprint).where(ProofFingerprint.id.in_(expired))
+        )
+        return result.rowcount or 0
+    
+    async def prune_proof_signatures(self, before: datetime, limit: int) -> int:
+        """before'dan eski en fazla `limit` proof imzasını sil (commit etmez)."""
+        expired = (
+            select(ProofSignature.id)
+            .where(ProofSignature.created_at < before)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(ProofSignature).where(ProofSignature.id.in_(expired))
+        )
+        return result.rowcount or 0
@@ -0,0 +1,108 @@
+"""
+AbuseGuard - Proof fingerprint retention sweeper
+
+proof_fingerprints (exact hash) ve proof_signatures (near-duplicate imza)
+sadece DUPLICATE_PROOF_WINDOW_DAYS penceresi içinde karşılaştırılır;
+pencere dışına çıkan satırlar burada silinir, böylece tablolar ve
+index'leri aktif submission hacmiyle sınırlı kalır.
+
+- sweep_proof_fingerprints(): her iki tabloda created_at < now - pencere
+  olan satırları chunk'lar halinde siler; her chunk kendi
+  transaction'ında commit edilir
+- start/stop_proof_fingerprint_sweeper(): lifespan'den başlatılan döngü
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .config import DUPLICATE_PROOF_WINDOW_DAYS
+from .repository import AbuseRepository
+
+logger = get_logger("abuse_retention")
+
+_sweeper_task: asyncio.Task | None = None
+
+
+async def sweep_proof_fingerprints(
+    session: AsyncSession,
+    chunk_size: int | None = None,
+    now: datetime | None = None,
+) -> dict:
+    """
+    Pencere dışına çıkmış proof fingerprint'lerini ve imzalarını sil.
+
+    Returns:
+        {"fingerprints", "signatures", "chunks", "seconds"}
+    """
+    chunk_size = chunk_size or settings.PROOF_FINGERPRINT_SWEEP_CHUNK
+    cutoff = (now or datetime.utcnow()) - timedelta(days=DUPLICATE_PROOF_WINDOW_DAYS)
+    repo = AbuseRepository(session)
+
+    started = time.perf_counter()
+    deleted = {"fingerprints": 0, "signatures": 0}
+    chunks = 0
+    for key, prune in (
+        ("fingerprints", repo.prune_proof_fingerprints),
+        ("signatures", repo.prune_proof_signatures),
+    ):
+        while True:
+            count = await prune(cutoff, chunk_size)
+            await session.commit()
+            deleted[key] += count
+            chunks += 1
+            if count < chunk_size:
+                break
+
+    seconds = time.perf_counter() - started
+    logger.info(
+        "proof_fingerprints_swept",
+        cutoff=cutoff.isoformat(),
+        chunks=chunks,
+        seconds=round(seconds, 3),
+        **deleted,
+    )
+    return {**deleted, "chunks": chunks, "seconds": seconds}
+
+
+async def run_proof_fingerprint_sweeper_loop() -> None:
+    """Sweep'i PROOF_FINGERPRINT_SWEEP_INTERVAL_SECONDS aralıkla çalıştır."""
+    from app.core.db import async_session_factory
+
+    while True:
+        try:
+            async with async_session_factory() as session:
+                await sweep_proof_fingerprints(session)
+        except Exception as e:
+            logger.warning("proof_fingerprint_sweep_failed", error=str(e))
+        await asyncio.sleep(settings.PROOF_FINGERPRINT_SWEEP_INTERVAL_SECONDS)
+
+
+def start_proof_fingerprint_sweeper() -> None:
+    """Retention sweeper'ı background task olarak başlat."""
+    global _sweeper_task
+    if settings.PROOF_FINGERPRINT_SWEEP_INTERVAL_SECONDS > 0 and _sweeper_task is None:
+        _sweeper_task = asyncio.create_task(run_proof_fingerprint_sweeper_loop())
+        logger.info(
+            "proof_fingerprint_sweeper_started",
+            interval=settings.PROOF_FINGERPRINT_SWEEP_INTERVAL_SECONDS,
+            window_days=DUPLICATE_PROOF_WINDOW_DAYS,
+        )
+
+
+async def stop_proof_fingerprint_sweeper() -> None:
+    """Retention sweeper'ı durdur."""
+    global _sweeper_task
+    if _sweeper_task is None:
+        return
+
+    _sweeper_task.cancel()
+    try:
+        await _sweeper_task
+    except asyncio.CancelledError:
+        pass
+    _sweeper_task = None
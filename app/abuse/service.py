@@ -2,28 +2,41 @@
 AbuseGuard Service
 NasipQuest ekonomisini koruyan risk motoru
 """
+from array import array
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
 
-from .models import UserRiskProfile, AbuseEvent, AbuseEventType
+from .models import UserRiskProfile, AbuseEvent, AbuseEventType, ProofSignature
 from .config import (
     ABUSE_EVENT_WEIGHTS,
-    MAX_RISK_SCORE,
-    MIN_RISK_SCORE,
     RISK_THRESHOLD_REWARD_MULTIPLIER_1,
     RISK_THRESHOLD_REWARD_MULTIPLIER_2,
     RISK_THRESHOLD_REWARD_MULTIPLIER_3,
     RISK_THRESHOLD_FORCED_HITL,
     RISK_THRESHOLD_COOLDOWN,
     LOW_QUALITY_BURST_COUNT,
+    LOW_QUALITY_BURST_WINDOW_SECONDS,
     TOO_FAST_COMPLETION_SECONDS,
+    DUPLICATE_PROOF_WINDOW_DAYS,
+    NEAR_DUPLICATE_SIMILARITY_THRESHOLD,
 )
 from .repository import AbuseRepository
-from app.telegram_gateway.task_models import TaskSubmission, SubmissionStatus
+from .similarity import (
+    NearDuplicateMatch,
+    find_near_duplicate,
+    signature_to_bytes,
+    track_proof_signature,
+)
+from app.core.rate_limit import RateLimit, get_rate_limiter
+
+# 24 saatlik auto-reject penceresi (LOW_QUALITY_BURST_COUNT'ta burst)
+LOW_QUALITY_BURST_LIMIT = RateLimit(
+    "abuse_auto_rejects",
+    limit=LOW_QUALITY_BURST_COUNT,
+    window_seconds=LOW_QUALITY_BURST_WINDOW_SECONDS,
+)
 
 
 class AbuseGuard:
@@ -31,21 +44,28 @@ class AbuseGuard:
     NasipQuest ekonomisini koruyan risk motoru.
     
     RiskScore hesaplar, ödül çarpanlarını uygular, HITL zorunluluğunu belirler.
+    
+    unit_of_work=True ile profil oluşturma, RiskScore delta'ları ve event
+    kayıtları commit edilmez; çağıranın bir sonraki commit'i ile tek
+    transaction'da yazılır. Varsayılan mod her register_event'i tek commit
+    ile yazar.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, unit_of_work: bool = False):
         self.repo = AbuseRepository(session)
         self.session = session
+        self.unit_of_work = unit_of_work
+    
+    async def _commit(self) -> None:
+        if not self.unit_of_work:
+            await self.session.commit()
     
     async def get_or_create_profile(self, user_id: int) -> UserRiskProfile:
         """Kullanıcı risk profilini getir veya oluştur."""
         profile = await self.repo.get_profile(user_id)
         if profile is None:
-            profile = UserRiskProfile(
-                user_id=user_id,
-                risk_score=0.0,
-            )
-            profile = await self.repo.save_profile(profile)
+            profile = await self.repo.create_profile(user_id)
+            await self._commit()
         return profile
     
     async def register_event(
@@ -58,6 +78,10 @@ class AbuseGuard:
         """
         Abuse event'ini kaydet ve RiskScore'u güncelle.
         
+        RiskScore DB'de atomik olarak güncellenir (eşzamanlı event'ler
+        birbirinin delta'sını ezmez); dönen profil bekleyen delta'lar
+        uygulanmış skoru gösterir.
+        
         Args:
             user_id: Kullanıcı ID
             event_type: Event tipi
@@ -73,24 +97,20 @@ class AbuseGuard:
         base_delta = ABUSE_EVENT_WEIGHTS.get(event_type, 0.0)
         delta = override_delta if override_delta is not None else base_delta
         
-        # RiskScore'u güncelle
-        new_score = profile.risk_score + delta
-        new_score = max(MIN_RISK_SCORE, min(MAX_RISK_SCORE, new_score))
-        
-        profile.risk_score = new_score
-        profile.last_event_at = datetime.utcnow()
+        # RiskScore'u güncelle (commit'te atomik UPDATE)
+        self.repo.add_risk_delta(profile, delta, datetime.utcnow())
         
         # Event logla
-        event = AbuseEvent(
-            user_id=user_id,
-            event_type=event_type,
-            delta=delta,
-            meta=meta or {},
+        self.repo.add_event(
+            AbuseEvent(
+                user_id=user_id,
+                event_type=event_type,
+                delta=delta,
+                meta=meta or {},
+            )
         )
         
-        await self.repo.save_profile(profile)
-        await self.repo.log_event(event)
-        
+        await self._commit()
         return profile
     
     # ------ DECISION LOGIC ------
@@ -133,11 +153,13 @@ class AbuseGuard:
         """
         Son 24 saatte 5+ auto-reject varsa → LOW_QUALITY_BURST event.
         
+        Her auto-reject'ten sonra çağrılır; reject'ler DB'de sayılmak yerine
+        rate limiter'ın sliding window'una kaydedilir.
+        
         Returns:
             True if burst detected
         """
-        since = datetime.utcnow() - timedelta(hours=24)
-        rejects = await self.repo.count_rejected_tasks(user_id=user_id, since=since)
+        rejects = await get_rate_limiter().record(str(user_id), LOW_QUALITY_BURST_LIMIT)
         
         if rejects >= LOW_QUALITY_BURST_COUNT:
             await self.register_event(
@@ -191,6 +213,10 @@ class AbuseGuard:
         """
         Aynı proof daha önce kullanıldı mı kontrol et.
         
+        proof_fingerprints üzerinde tek index lookup'ı: son 30 günde aynı
+        hash'i aynı kullanıcı ya da başka bir hesap kullandıysa duplicate.
+        Submission oluşturulduktan sonra record_proof_fingerprint() çağrılır.
+        
         Args:
             user_id: Kullanıcı ID
             task_id: Görev ID
@@ -202,34 +228,117 @@ class AbuseGuard:
         if not proof_hash:
             return False
         
-        # Son 30 günde aynı hash ile submission var mı?
-        since = datetime.utcnow() - timedelta(days=30)
+        since = datetime.utcnow() - timedelta(days=DUPLICATE_PROOF_WINDOW_DAYS)
+        previous = await self.repo.find_proof_fingerprint(proof_hash, user_id, since)
+        if previous is None:
+            return False
         
-        from sqlalchemy import func
+        cross_user = previous.user_id != user_id
+        meta = {
+            "task_id": task_id,
+            "previous_submission_id": previous.submission_id,
+            "proof_hash": proof_hash,
+            "scope": "cross_user" if cross_user else "same_user",
+        }
+        if cross_user:
+            meta["previous_user_id"] = previous.user_id
         
-        # JSONB field'ı kontrol et
-        result = await self.session.execute(
-            select(TaskSubmission).where(
-                and_(
-                    TaskSubmission.user_id == user_id,
-                    TaskSubmission.submitted_at >= since,
-                )
-            )
+        await self.register_event(
+            user_id=user_id,
+            event_type=AbuseEventType.DUPLICATE_PROOF,
+            meta=meta,
         )
-        submissions = result.scalars().all()
-        
-        # Check if any submission has the same proof_hash in metadata
-        for sub in submissions:
-            if sub.proof_metadata and sub.proof_metadata.get("proof_hash") == proof_hash:
-                await self.register_event(
-                    user_id=user_id,
-                    event_type=AbuseEventType.DUPLICATE_PROOF,
-                    meta={
-                        "task_id": task_id,
-                        "previous_submission_id": sub.id,
-                        "proof_hash": proof_hash,
-                    },
-                )
-                return True
-        return False
-
+        return True
+    
+    async def record_proof_fingerprint(
+        self,
+        user_id: int,
+        submission_id: Optional[int],
+        proof_hash: Optional[str],
+    ) -> None:
+        """
+        Submission'ın proof hash'ini kaydet.
+        
+        Commit etmez; submission ile aynı transaction'da yazılır.
+        """
+        if not proof_hash:
+            return
+        await self.repo.add_proof_fingerprint(proof_hash, user_id, submission_id)
+    
+    async def check_near_duplicate_proof(
+        self,
+        user_id: int,
+        signature: Optional[array],
+        source: str,
+        ref_id: Optional[int] = None,
+        meta: Optional[dict] = None,
+    ) -> Optional[NearDuplicateMatch]:
+        """
+        Hafifçe düzenlenmiş metin proof'u daha önce kullanıldı mı kontrol et.
+        
+        Process içi MinHash LSH index'inde son 30 günün en benzer proof'u
+        aranır (aynı kullanıcı ya da başka hesaplar). Benzerlik eşiği
+        aşılırsa DUPLICATE_PROOF event'i benzerlikle ölçeklenmiş delta ile
+        kaydedilir.
+        
+        Args:
+            user_id: Kullanıcı ID
+            signature: similarity.proof_signature() çıktısı (None = metin yok / kısa)
+            source: "telegram_task" | "quest"
+            ref_id: Kaydın ID'si; aynı kullanıcının aynı kayda tekrar
+                gönderdiği proof eşleşme sayılmaz
+            meta: Event'e eklenecek bağlam (task_id, quest_uuid, ...)
+        
+        Returns:
+            Eşleşme (yoksa None)
+        """
+        if signature is None:
+            return None
+        
+        exclude = (user_id, source, ref_id) if ref_id is not None else None
+        match = find_near_duplicate(signature, NEAR_DUPLICATE_SIMILARITY_THRESHOLD, exclude=exclude)
+        if match is None:
+            return None
+        
+        cross_user = match.user_id != user_id
+        event_meta = {
+            **(meta or {}),
+            "match": "near",
+            "similarity": round(match.similarity, 3),
+            "scope": "cross_user" if cross_user else "same_user",
+            "previous_source": match.source,
+            "previous_ref_id": match.ref_id,
+        }
+        if cross_user:
+            event_meta["previous_user_id"] = match.user_id
+        
+        await self.register_event(
+            user_id=user_id,
+            event_type=AbuseEventType.DUPLICATE_PROOF,
+            override_delta=ABUSE_EVENT_WEIGHTS[AbuseEventType.DUPLICATE_PROOF] * match.similarity,
+            meta=event_meta,
+        )
+        return match
+    
+    async def record_proof_signature(
+        self,
+        user_id: int,
+        signature: Optional[array],
+        source: str,
+        ref_id: Optional[int],
+    ) -> None:
+        """
+        Proof imzasını kaydet.
+        
+        Commit etmez; commit'ten sonra bu worker'ın index'ine eklenir,
+        diğer worker'lar tablodan sync eder.
+        """
+        if signature is None:
+            return
+        row = ProofSignature(
+            user_id=user_id,
+            source=source,
+            ref_id=ref_id,
+            signature=signature_to_bytes(signature),
+        )
+        track_proof_signature(self.session, row, signature)
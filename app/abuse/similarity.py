@@ -0,0 +1,477 @@
+"""
+AbuseGuard - Near-duplicate proof index
+Hafifçe düzenlenmiş metin proof'larını (farklı quest / hesaplar arası)
+yakalayan MinHash + LSH benzerlik index'i.
+
+- proof_signature(): normalize edilmiş metnin 5-byte shingle'ları tek bir
+  hash ile SIGNATURE_SIZE bin'e dağıtılır (one-permutation MinHash), boş
+  bin'ler rotation ile doldurulur; her bin'in minimum'unun düşük 16 biti
+  saklanır. İki imzadaki eşit bin oranı Jaccard benzerliğinin tahminidir.
+- ProofSimilarityIndex: process içi, kapasitesi sabit ring buffer.
+  İmza LSH_BANDS band'a (LSH_ROWS bin) bölünür; her band için
+  bucket → en yeni kayıt zinciri tutulur, lookup sadece aynı bucket'a
+  düşen adayları doğrular (alt-lineer). Tüm yapı kapasiteye göre önceden
+  ayrılmış array'lerdir; dolunca en eski kayıtlar üzerine yazılır.
+- proof_signatures tablosu kalıcı kayıttır: commit edilen imzalar bu
+  worker'ın index'ine hemen eklenir, diğer worker'ların yazdıkları
+  sync döngüsüyle (id > son görülen id) çekilir; startup'ta pencere
+  içindeki en yeni kayıtlarla warm-up yapılır.
+
+Band eşiği (LSH_BANDS=8, LSH_ROWS=4) Jaccard ≈ 0.6 civarındadır; 0.75+
+benzerliklerin aday olma olasılığı ≈ %96+'dır.
+"""
+import asyncio
+import re
+import sys
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from operator import eq
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.session_buffers import is_savepoint_commit, register_session_buffer
+
+from .config import DUPLICATE_PROOF_WINDOW_DAYS, NEAR_DUPLICATE_MIN_TEXT_LENGTH
+from .models import ProofSignature
+
+logger = get_logger("abuse_similarity")
+
+# İmza formatı (proof_signatures.signature ile uyumlu kalmalı)
+SIGNATURE_SIZE = 32
+SHINGLE_BYTES = 5
+LSH_BANDS = 8
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+
+# Tek bucket zincirinde doğrulanacak en fazla aday (aynı şablon metinle
+# dolmuş bucket'larda lookup süresini sınırlar; en yeniler önce gelir)
+MAX_CHAIN_CANDIDATES = 64
+
+# Sync döngüsünde tek sorguda çekilen satır
+SYNC_BATCH_SIZE = 10_000
+
+_NON_WORD = re.compile(r"[\W_]+")
+_EMPTY_BIN = 0xFFFFFFFF
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+# session.info anahtarı: commit bekleyen (ProofSignature, imza) çiftleri
+_PENDING_KEY = "proof_signatures_pending"
+
+_sync_task: asyncio.Task | None = None
+
+
+def normalize_proof_text(text: str) -> str:
+    """Küçük harf, noktalama yok, tek boşluk."""
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+def proof_signature(text: Optional[str]) -> Optional[array]:
+    """
+    Metnin MinHash imzası (SIGNATURE_SIZE adet uint16).
+
+    Normalize edilmiş metin NEAR_DUPLICATE_MIN_TEXT_LENGTH byte'tan kısaysa
+    None (kısa cevaplarda benzerlik anlamlı değil).
+    """
+    if not text:
+        return None
+    data = normalize_proof_text(text).encode()
+    if len(data) < NEAR_DUPLICATE_MIN_TEXT_LENGTH:
+        return None
+
+    mins = [_EMPTY_BIN] * SIGNATURE_SIZE
+    for h in {zlib.crc32(data[i:i + SHINGLE_BYTES]) for i in range(len(data) - SHINGLE_BYTES + 1)}:
+        b = h % SIGNATURE_SIZE
+        v = h // SIGNATURE_SIZE
+        if v < mins[b]:
+            mins[b] = v
+
+    # Boş bin'ler: sağdaki ilk dolu bin'in değeri + mesafeye bağlı offset
+    for b in range(SIGNATURE_SIZE):
+        if mins[b] == _EMPTY_BIN:
+            for distance in range(1, SIGNATURE_SIZE):
+                source = mins[(b + distance) % SIGNATURE_SIZE]
+                if source != _EMPTY_BIN:
+                    mins[b] = source + distance * 0x9E37
+                    break
+
+    return array("H", [v & 0xFFFF for v in mins])
+
+
+def signature_similarity(a: array, b: array) -> float:
+    """İki imzanın tahmini Jaccard benzerliği (0.0 - 1.0)."""
+    return sum(map(eq, a, b)) / SIGNATURE_SIZE
+
+
+def signature_to_bytes(signature: array) -> bytes:
+    """DB'de saklanan sabit (little-endian) byte dizisi."""
+    if sys.byteorder == "big":
+        signature = array("H", signature)
+        signature.byteswap()
+    return signature.tobytes()
+
+
+def signature_from_bytes(data: bytes) -> array:
+    """signature_to_bytes'ın tersi."""
+    signature = array("H")
+    signature.frombytes(data)
+    if sys.byteorder == "big":
+        signature.byteswap()
+    return signature
+
+
+@dataclass(frozen=True)
+class NearDuplicateMatch:
+    """Index'teki en benzer önceki proof."""
+    user_id: int
+    source: str
+    ref_id: int
+    similarity: float
+    created_at: datetime
+
+
+class ProofSimilarityIndex:
+    """
+    Sabit kapasiteli MinHash LSH index'i.
+
+    Kayıtlar artan sıra numarası (seq) alır, slot = seq % capacity. Her band
+    için heads[bucket] en yeni seq'i, next[slot] aynı bucket'taki bir önceki
+    seq'i tutar. Üzerine yazılmış slot'lar seq karşılaştırmasıyla anlaşılır;
+    zincir orada biter (ring buffer daha eskileri de silmiştir).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._head_bits = max(10, (capacity - 1).bit_length())
+        head_size = 1 << self._head_bits
+
+        self._heads = [array("q", [-1]) * head_size for _ in range(LSH_BANDS)]
+        self._next = [array("q", [-1]) * capacity for _ in range(LSH_BANDS)]
+        self._seq_at = array("q", [-1]) * capacity
+        self._signatures = array("H", [0]) * (capacity * SIGNATURE_SIZE)
+        self._user_ids = array("q", [0]) * capacity
+        self._ref_ids = array("q", [0]) * capacity
+        self._created = array("d", [0.0]) * capacity
+        self._sources: list[Optional[str]] = [None] * capacity
+        self._next_seq = 0
+
+        # Sync durumu: DB'den görülen son id, bu worker'ın eklediği id'ler
+        self.last_row_id = 0
+        self.own_row_ids: set[int] = set()
+
+        self.lookups = 0
+        self.candidates = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    def _bucket(self, signature: array, band: int) -> int:
+        key = band
+        for value in signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]:
+            key = (key << 16) | value
+        return ((key * _GOLDEN64) & _MASK64) >> (64 - self._head_bits)
+
+    def add(
+        self,
+        signature: array,
+        user_id: int,
+        source: str,
+        ref_id: int,
+        created_at: datetime,
+    ) -> None:
+        """İmzayı ekle (doluysa en eski kaydın üzerine yazar)."""
+        seq = self._next_seq
+        slot = seq % self.capacity
+        self._next_seq += 1
+
+        self._seq_at[slot] = seq
+        offset = slot * SIGNATURE_SIZE
+        self._signatures[offset:offset + SIGNATURE_SIZE] = signature
+        self._user_ids[slot] = user_id
+        self._ref_ids[slot] = ref_id or 0
+        self._sources[slot] = source
+        self._created[slot] = created_at.timestamp()
+
+        for band in range(LSH_BANDS):
+            bucket = self._bucket(signature, band)
+            heads = self._heads[band]
+            self._next[band][slot] = heads[bucket]
+            heads[bucket] = seq
+
+    def query(
+        self,
+        signature: array,
+        threshold: float,
+        since: Optional[datetime] = None,
+        exclude: Optional[tuple[int, str, int]] = None,
+    ) -> Optional[NearDuplicateMatch]:
+        """
+        threshold üzerindeki en benzer kayıt (eşitlikte en yenisi).
+
+        Args:
+            since: Bundan eski kayıtlar yok sayılır
+            exclude: (user_id, source, ref_id) - aynı kaydın yeniden
+                gönderimi (ör. aynı quest'e tekrar proof) eşleşme sayılmaz
+        """
+        self.lookups += 1
+        cutoff = since.timestamp() if since else float("-inf")
+        seen: set[int] = set()
+        best: Optional[tuple[float, int]] = None
+
+        for band in range(LSH_BANDS):
+            seq = self._heads[band][self._bucket(signature, band)]
+            next_seqs = self._next[band]
+            steps = 0
+            while seq >= 0 and steps < MAX_CHAIN_CANDIDATES:
+                slot = seq % self.capacity
+                if self._seq_at[slot] != seq or self._created[slot] < cutoff:
+                    break
+                steps += 1
+                if seq not in seen:
+                    seen.add(seq)
+                    offset = slot * SIGNATURE_SIZE
+                    similarity = signature_similarity(
+                        signature, self._signatures[offset:offset + SIGNATURE_SIZE]
+                    )
+                    if (
+                        similarity >= threshold
+                        and (best is None or (similarity, seq) > best)
+                        and not (
+                            exclude is not None
+                            and exclude == (self._user_ids[slot], self._sources[slot], self._ref_ids[slot])
+                        )
+                    ):
+                        best = (similarity, seq)
+                seq = next_seqs[slot]
+
+        self.candidates += len(seen)
+        if best is None:
+            return None
+
+        self.hits += 1
+        similarity, seq = best
+        slot = seq % self.capacity
+        return NearDuplicateMatch(
+            user_id=self._user_ids[slot],
+            source=self._sources[slot],
+            ref_id=self._ref_ids[slot],
+            similarity=similarity,
+            created_at=datetime.fromtimestamp(self._created[slot]),
+        )
+
+    def memory_bytes(self) -> int:
+        """Önceden ayrılmış yapıların yaklaşık boyutu."""
+        arrays = [
+            *self._heads,
+            *self._next,
+            self._seq_at,
+            self._signatures,
+            self._user_ids,
+            self._ref_ids,
+            self._created,
+        ]
+        return sum(a.buffer_info()[1] * a.itemsize for a in arrays) + 8 * self.capacity
+
+    def stats(self) -> dict:
+        """Sayaçlar ve doluluk."""
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "memory_bytes": self.memory_bytes(),
+            "last_row_id": self.last_row_id,
+            "lookups": self.lookups,
+            "candidates": self.candidates,
+            "hits": self.hits,
+        }
+
+
+_index: ProofSimilarityIndex | None = None
+
+
+def get_proof_similarity_index() -> Optional[ProofSimilarityIndex]:
+    """Process-wide index (PROOF_SIMILARITY_INDEX_CAPACITY = 0 ise None)."""
+    global _index
+    if _index is None and settings.PROOF_SIMILARITY_INDEX_CAPACITY > 0:
+        _index = ProofSimilarityIndex(settings.PROOF_SIMILARITY_INDEX_CAPACITY)
+    return _index
+
+
+def reset_proof_similarity_index() -> None:
+    """Index'i bırak; sonraki kullanımda boş olarak yeniden kurulur."""
+    global _index
+    _index = None
+
+
+def get_proof_similarity_stats() -> dict:
+    """Index sayaçları (kapalıysa boş)."""
+    index = get_proof_similarity_index()
+    return index.stats() if index else {}
+
+
+def find_near_duplicate(
+    signature: array,
+    threshold: float,
+    exclude: Optional[tuple[int, str, int]] = None,
+    now: Optional[datetime] = None,
+) -> Optional[NearDuplicateMatch]:
+    """DUPLICATE_PROOF_WINDOW_DAYS içindeki en benzer proof."""
+    index = get_proof_similarity_index()
+    if index is None:
+        return None
+    since = (now or datetime.utcnow()) - timedelta(days=DUPLICATE_PROOF_WINDOW_DAYS)
+    return index.query(signature, threshold, since=since, exclude=exclude)
+
+
+# ------ Session hooks: commit edilen imzalar index'e ------
+
+def track_proof_signature(session: AsyncSession, row: ProofSignature, signature: array) -> None:
+    """Satırı session'a ekle; commit'ten sonra bu worker'ın index'ine girer."""
+    session.add(row)
+    session.info.setdefault(_PENDING_KEY, []).append((row, signature))
+
+
+@event.listens_for(Session, "after_commit")
+def _index_committed_signatures(session: Session) -> None:
+    # SAVEPOINT release'i commit değil; dış transaction rollback olabilir
+    if is_savepoint_commit(session):
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    index = get_proof_similarity_index()
+    if index is None:
+        return
+    for row, signature in pending:
+        index.add(signature, row.user_id, row.source, row.ref_id, row.created_at)
+        if row.id is not None and settings.PROOF_SIMILARITY_SYNC_INTERVAL_SECONDS > 0:
+            index.own_row_ids.add(row.id)
+
+
+# Rollback olan transaction'ın / SAVEPOINT'in imzaları index'e girmez
+register_session_buffer(_PENDING_KEY, list)
+
+
+# ------ DB sync ------
+
+def _load_rows(index: ProofSimilarityIndex, rows) -> int:
+    added = 0
+    for row_id, user_id, source, ref_id, signature, created_at in rows:
+        index.last_row_id = max(index.last_row_id, row_id)
+        if row_id in index.own_row_ids:
+            index.own_row_ids.discard(row_id)
+            continue
+        index.add(signature_from_bytes(signature), user_id, source, ref_id, created_at)
+        added += 1
+    return added
+
+
+async def sync_proof_similarity_index(session: AsyncSession, now: Optional[datetime] = None) -> int:
+    """
+    proof_signatures'tan index'e yeni satırları yükle.
+
+    İlk çağrı (warm-up) pencere içindeki en yeni `capacity` satırı, sonraki
+    çağrılar last_row_id'den sonraki satırları çeker. Bu worker'ın kendi
+    eklediği satırlar atlanır.
+
+    Returns:
+        Index'e eklenen satır sayısı
+    """
+    index = get_proof_similarity_index()
+    if index is None:
+        return 0
+
+    columns = (
+        ProofSignature.id,
+        ProofSignature.user_id,
+        ProofSignature.source,
+        ProofSignature.ref_id,
+        ProofSignature.signature,
+        ProofSignature.created_at,
+    )
+
+    if index.last_row_id == 0:
+        since = (now or datetime.utcnow()) - timedelta(days=DUPLICATE_PROOF_WINDOW_DAYS)
+        result = await session.execute(
+            select(*columns)
+            .where(ProofSignature.created_at >= since)
+            .order_by(ProofSignature.id.desc())
+            .limit(index.capacity)
+        )
+        added = _load_rows(index, reversed(result.all()))
+    else:
+        added = 0
+        while True:
+            result = await session.execute(
+                select(*columns)
+                .where(ProofSignature.id > index.last_row_id)
+                .order_by(ProofSignature.id)
+                .limit(SYNC_BATCH_SIZE)
+            )
+            rows = result.all()
+            added += _load_rows(index, rows)
+            if len(rows) < SYNC_BATCH_SIZE:
+                break
+
+    # Sync'in geride bıraktığı kendi id'lerimiz (sıra dışı commit'ler)
+    index.own_row_ids = {row_id for row_id in index.own_row_ids if row_id > index.last_row_id}
+    return added
+
+
+async def run_proof_similarity_sync_loop() -> None:
+    """Warm-up + PROOF_SIMILARITY_SYNC_INTERVAL_SECONDS aralıkla sync."""
+    from app.core.db import async_session_factory
+
+    while True:
+        started = time.perf_counter()
+        try:
+            async with async_session_factory() as session:
+                added = await sync_proof_similarity_index(session)
+            if added:
+                logger.info(
+                    "proof_similarity_synced",
+                    added=added,
+                    seconds=round(time.perf_counter() - started, 3),
+                )
+        except Exception as e:
+            logger.warning("proof_similarity_sync_failed", error=str(e))
+
+        if settings.PROOF_SIMILARITY_SYNC_INTERVAL_SECONDS <= 0:
+            return
+        await asyncio.sleep(settings.PROOF_SIMILARITY_SYNC_INTERVAL_SECONDS)
+
+
+def start_proof_similarity_sync() -> None:
+    """Index warm-up / sync döngüsünü background task olarak başlat."""
+    global _sync_task
+    if settings.PROOF_SIMILARITY_INDEX_CAPACITY > 0 and _sync_task is None:
+        _sync_task = asyncio.create_task(run_proof_similarity_sync_loop())
+        logger.info(
+            "proof_similarity_sync_started",
+            capacity=settings.PROOF_SIMILARITY_INDEX_CAPACITY,
+            interval=settings.PROOF_SIMILARITY_SYNC_INTERVAL_SECONDS,
+        )
+
+
+async def stop_proof_similarity_sync() -> None:
+    """Sync döngüsünü durdur."""
+    global _sync_task
+    if _sync_task is None:
+        return
+
+    _sync_task.cancel()
+    try:
+        await _sync_task
+    except asyncio.CancelledError:
+        pass
+    _sync_task = None
@@ -26,6 +26,8 @@ from app.telegram_gateway.event_schemas import (
     EventLeaderboardResponse,
     EventLeaderboardEntry,
 )
+from app.telegram_gateway.event_service import EventService
+from app.telegram_gateway.user_hydration import hydrate_users
 
 router = APIRouter(prefix="/api/v1/admin/events", tags=["admin-events"])
 
@@ -226,76 +228,28 @@ async def get_event_participants_admin(
             detail="Event not found",
         )
     
-    # Get participations
-    participation_query = (
-        select(EventParticipation)
-        .where(EventParticipation.event_id == event_id)
-        .order_by(
-            EventParticipation.total_xp_earned.desc(),
-            EventParticipation.tasks_completed.desc(),
-        )
-        .limit(limit)
+    # Get participations (ranks are persisted by the service)
+    participations = await EventService(session).get_event_leaderboard(
+        event_id=event_id,
+        limit=limit,
     )
     
-    participation_result = await session.execute(participation_query)
-    participations = participation_result.scalars().all()
-    
-    # Update ranks
-    for rank, participation in enumerate(participations, 1):
-        if participation.rank != rank:
-            participation.rank = rank
-            session.add(participation)
-    
-    await session.commit()
-    
-    # Get user info
-    from app.telegram_gateway.models import TelegramAccount
+    # Display info for all participants in one query
+    displays = await hydrate_users(session, (p.user_id for p in participations))
     
     entries = []
     for participation in participations:
-        # Get telegram account
-        account_query = (
-            select(TelegramAccount)
-            .where(TelegramAccount.user_id == participation.user_id)
-        )
-        account_result = await session.execute(account_query)
-        account = account_result.scalar_one_or_none()
-        
-        if not account:
-            # Fallback to user
-            user_query = select(User).where(User.id == participation.user_id)
-            user_result = await session.execute(user_query)
-            user = user_result.scalar_one_or_none()
-            
-            if not user:
-                continue
-            
-            entries.append(
-                EventLeaderboardEntry(
-                    rank=participation.rank or 0,
-                    user_id=participation.user_id,
-                    telegram_user_id=0,
-                    username=user.username,
-                    display_name=user.display_name,
-                    total_xp_earned=participation.total_xp_earned,
-                    total_ncr_earned=str(participation.total_ncr_earned),
-                    tasks_completed=participation.tasks_completed,
-                )
-            )
+        display = displays.get(participation.user_id)
+        if not display:
             continue
         
-        # Get user
-        user_query = select(User).where(User.id == participation.user_id)
-        user_result = await session.execute(user_query)
-        user = user_result.scalar_one()
-        
         entries.append(
             EventLeaderboardEntry(
                 rank=participation.rank or 0,
                 user_id=participation.user_id,
-                telegram_user_id=account.telegram_user_id,
-                username=account.username or user.username,
-                display_name=user.display_name or account.first_name,
+                telegram_user_id=display.telegram_user_id or 0,
+                username=display.username,
+                display_name=display.display_name,
                 total_xp_earned=participation.total_xp_earned,
                 total_ncr_earned=str(participation.total_ncr_earned),
                 tasks_completed=participation.tasks_completed,
@@ -15,6 +15,7 @@ from app.core.db import get_session
 from app.core.security import get_admin_user
 from app.identity.models import User
 from app.wallet.models import Account, LedgerEntry
+from app.wallet.treasury_shards import get_treasury_shard_total
 from app.xp_loyalty.models import UserLoyalty
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
@@ -136,6 +137,7 @@ async def get_summary(
         )
     )
     treasury_balance = treasury_result.scalar() or Decimal("0")
+    treasury_balance += await get_treasury_shard_total(session)
 
     # Total transactions
     tx_result = await session.execute(select(func.count(LedgerEntry.id)))
@@ -272,6 +274,7 @@ async def get_quick_stats(
         )
     )
     treasury_ncr = treasury.scalar() or Decimal("0")
+    treasury_ncr += await get_treasury_shard_total(session)
 
     performers = await session.execute(
         select(func.count(Performer.id)).where(Performer.is_active == True)
@@ -334,10 +337,58 @@ async def get_credit_top(
     session: AsyncSession = Depends(get_session),
 ):
     """Get top citizens by NovaCredit score."""
-    from app.nova_credit.service import NovaCreditService
+    return await get_top_citizens(_admin, session, tier=None, limit=50)
 
-    service = NovaCreditService(session)
-    return await service.get_top_citizens(limit=50)
+
+# ============ Process Metrics ============
+class MetricsResponse(BaseModel):
+    """Process-local metrics (this worker only)."""
+
+    timestamp: datetime
+    timings: dict
+    caches: dict
+    queues: dict
+
+
+@router.get(
+    "/metrics",
+    response_model=MetricsResponse,
+    summary="Process Metrics",
+    description="Per-stage latency timings, in-process cache stats, queue worker counters and keyed-lane depths for this worker (admin only).",
+)
+async def get_metrics(
+    prefix: str | None = None,
+    _admin: User = Depends(get_admin_user),
+) -> MetricsResponse:
+    """Get per-stage timings and cache counters of this worker."""
+    from app.abuse.similarity import get_proof_similarity_stats
+    from app.core.lanes import get_lane_stats
+    from app.core.metrics import get_timing_stats
+    from app.core.rate_limit import get_rate_limiter
+    from app.events.worker import get_event_queue_stats
+    from app.justice.policy_cache import get_policy_cache_stats
+    from app.telegram_gateway.task_cache import get_task_cache_stats
+    from app.telegram_gateway.user_hydration import get_user_display_cache_stats
+    from app.wallet.price_cache import get_ncr_price_cache_stats
+    from app.xp_loyalty.write_behind import get_xp_fold_stats
+
+    return MetricsResponse(
+        timestamp=datetime.utcnow(),
+        timings=get_timing_stats(prefix),
+        caches={
+            "task_cache": get_task_cache_stats(),
+            "user_display_cache": get_user_display_cache_stats(),
+            "justice_policy_cache": get_policy_cache_stats(),
+            "proof_similarity_index": get_proof_similarity_stats(),
+            "rate_limiter": get_rate_limiter().stats(),
+            "ncr_price_cache": get_ncr_price_cache_stats(),
+        },
+        queues={
+            "event_queue": get_event_queue_stats(),
+            "lanes": get_lane_stats(),
+            "xp_write_behind": get_xp_fold_stats(),
+        },
+    )
 
 
 # ============ Aurora Justice Stats ============
@@ -497,18 +548,29 @@ async def get_top_citizens(
 
     entries = await service.get_leaderboard(limit, tier_filter)
 
-    return {
-        "entries": [
+    # Telegram display info for all entries in one query
+    from app.telegram_gateway.user_hydration import hydrate_users
+
+    displays = await hydrate_users(session, (e.user_id for e in entries))
+
+    items = []
+    for e in entries:
+        display = displays.get(e.user_id)
+        items.append(
             {
                 "rank": e.rank,
                 "user_id": e.user_id,
-                "username": e.username,
+                "username": display.username if display else e.username,
+                "display_name": display.display_name if display else None,
+                "telegram_user_id": display.telegram_user_id if display else None,
                 "nova_credit": e.nova_credit,
                 "tier": e.tier.value,
                 "reputation_score": e.reputation_score,
             }
-            for e in entries
-        ],
+        )
+
+    return {
+        "entries": items,
         "total": len(entries),
     }
 
@@ -25,7 +25,7 @@ CREATOR_SHARE_RATE = Decimal("0.20")  # %20 pay Creator'a
 TREASURY_SHARE_RATE = Decimal("0.40")  # %40 Treasury'ye (Rezerv)
 AGENCY_OPERATIONS_RATE = Decimal("0.40")  # %40 Ajansın Operasyon/Kâr Payı
 
-# NCR fiyatı (TRY cinsinden) - NCRMarketState'den alınabilir, şimdilik sabit
+# NCRMarketState yoksa veya fiyatı geçersizse kullanılan NCR fiyatı (TRY cinsinden)
 DEFAULT_NCR_PRICE_TRY = Decimal("1.0")  # 1 NCR = 1 TRY (örnek)
 
 
@@ -45,14 +45,11 @@ class RevenueShareService:
 
     async def get_ncr_price_try(self) -> Decimal:
         """Mevcut NCR fiyatını getir (TRY cinsinden)."""
-        from app.wallet.models import NCRMarketState
-        result = await self.session.execute(
-            select(NCRMarketState).order_by(NCRMarketState.id.desc()).limit(1)
-        )
-        market_state = result.scalar_one_or_none()
+        from app.wallet.price_cache import get_cached_market_price
+        price = await get_cached_market_price(self.session)
         
-        if market_state and market_state.current_price_try > 0:
-            return Decimal(str(market_state.current_price_try))
+        if price is not None and price > 0:
+            return Decimal(str(price))
         
         return DEFAULT_NCR_PRICE_TRY
 
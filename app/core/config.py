@@ -41,6 +41,16 @@ class Settings(BaseSettings):
 
     # Treasury
     NCR_TREASURY_USER_ID: int = 1
+
+    # Treasury hot-account sharding
+    # 1 = kapalı (tüm treasury credit'leri tek Account satırına yazılır)
+    # N > 1 = credit'ler N shard satırına dağılır, roll-up canonical bakiyeye taşır
+    TREASURY_SHARD_COUNT: int = 1
+    TREASURY_SHARD_STRATEGY: Literal["hash", "round_robin"] = "hash"
+    TREASURY_ROLLUP_INTERVAL_SECONDS: float = 30.0
+
+    # Treasury özet sayaçları (treasury_totals) kaç slot'a bölünsün
+    TREASURY_TOTALS_SLOTS: int = 8
     
     # Treasury Cap System
     TREASURY_DAILY_NCR_LIMIT: float = 200_000.0
@@ -55,6 +65,9 @@ class Settings(BaseSettings):
         1.00: 0.30,  # %95–100 arası %70 kesinti
         1.10: 0.10,  # %100–110 arası neredeyse yok
     }
+    # issued_ncr'ın asla geçemeyeceği tavan (limit × oran); tablo sonrası
+    # %5'lik can simidi bu tavana kadar ödenir
+    TREASURY_HARD_CAP_RATIO: float = 1.10
     
     # NCR Pricing System
     # Teorik baz fiyat (örn: 1 NCR ≈ 1 TL başlangıç)
@@ -76,9 +89,68 @@ class Settings(BaseSettings):
     # Fiyat smoothing (0–1 arası, 1 = hiç smoothing yok)
     NCR_SMOOTHING_ALPHA: float = 0.3
 
+    # NCR fiyat cache'i: bu süre içinde fiyat DB'ye sorulmaz, sonra
+    # ncr_market_state.version ile ucuz bir version-check yapılır
+    NCR_PRICE_CACHE_TTL_SECONDS: float = 30.0
+
+    # Justice policy cache: bu süre içinde aktif policy DB'ye sorulmaz,
+    # sonra ucuz bir version-check yapılır
+    JUSTICE_POLICY_CACHE_TTL_SECONDS: float = 5.0
+
+    # Justice CP decay sweeper (0 = kapalı)
+    JUSTICE_DECAY_SWEEP_INTERVAL_SECONDS: float = 3600.0
+    JUSTICE_DECAY_SWEEP_CHUNK: int = 10_000
+
+    # Telegram leaderboard rank yenileme aralığı (0 = kapalı)
+    LEADERBOARD_RERANK_INTERVAL_SECONDS: float = 60.0
+
+    # Kullanıcı listeleri için görüntüleme bilgisi cache'i (0 = kapalı)
+    USER_HYDRATION_CACHE_TTL_SECONDS: float = 30.0
+    USER_HYDRATION_CACHE_SIZE: int = 10_000
+
+    # Telegram task tanımları cache'i (0 = kapalı)
+    TELEGRAM_TASK_CACHE_TTL_SECONDS: float = 60.0
+
+    # Proof fingerprint retention sweeper (0 = kapalı)
+    PROOF_FINGERPRINT_SWEEP_INTERVAL_SECONDS: float = 3600.0
+    PROOF_FINGERPRINT_SWEEP_CHUNK: int = 10_000
+
+    # Near-duplicate proof index: worker başına kayıt kapasitesi (0 = kapalı),
+    # diğer worker'ların imzalarını çekme aralığı (0 = sadece startup warm-up)
+    PROOF_SIMILARITY_INDEX_CAPACITY: int = 200_000
+    PROOF_SIMILARITY_SYNC_INTERVAL_SECONDS: float = 5.0
+
+    # NovaCredit toplu event ingestion: tek istekte kabul edilen en fazla event
+    NOVA_CREDIT_BATCH_MAX_EVENTS: int = 5_000
+
+    # Async event queue (POST /events/async/*): worker sayısı (0 = bu
+    # process kuyruğu boşaltmaz), micro-batch boyutu, boş kuyrukta bekleme,
+    # claim lease'i, deneme sayısı ve retry backoff tabanı
+    EVENT_QUEUE_WORKERS: int = 2
+    EVENT_QUEUE_BATCH_SIZE: int = 100
+    EVENT_QUEUE_POLL_INTERVAL_SECONDS: float = 0.5
+    EVENT_QUEUE_LEASE_SECONDS: float = 60.0
+    EVENT_QUEUE_MAX_ATTEMPTS: int = 5
+    EVENT_QUEUE_RETRY_BASE_SECONDS: float = 2.0
+
+    # Keyed lanes: aynı user_id / performer_id'ye gelen işler process içinde
+    # sıraya girer ve birikenler tek transaction'da işlenir (False = kapalı)
+    KEYED_LANES_ENABLED: bool = True
+    EVENT_LANE_MAX_BATCH: int = 50
+
+    # XP write-behind: XP event'leri xp_deltas'a yazılır, UserLoyalty bu
+    # aralıkla (veya process'te XP_FOLD_BATCH_SIZE delta birikince) toplu
+    # güncellenir. 0 = kapalı (her XP event'i UserLoyalty'yi hemen günceller)
+    XP_FOLD_INTERVAL_SECONDS: float = 0.0
+    XP_FOLD_BATCH_SIZE: int = 1_000
+
     # Redis (opsiyonel)
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Rate limiter backend: "memory" = worker başına, "redis" = REDIS_URL üzerinden paylaşımlı.
+    # None = dev'de memory, staging / prod'da redis (limitler tüm worker'larda global)
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] | None = None
+
     # CORS
     # Default: localhost (dev)
     # Production: Cloudflare subdomain'leri (https://portal.siyahkare.com, https://app.siyahkare.com)
@@ -110,6 +182,13 @@ class Settings(BaseSettings):
     def is_prod(self) -> bool:
         return self.ENV == "prod"
 
+    @property
+    def rate_limit_backend(self) -> str:
+        """Etkin rate limiter backend'i."""
+        if self.RATE_LIMIT_BACKEND:
+            return self.RATE_LIMIT_BACKEND
+        return "memory" if self.is_dev else "redis"
+
 
 def get_settings() -> Settings:
     """Get settings instance."""
@@ -0,0 +1,178 @@
+"""
+NovaCore Keyed Lanes
+Key başına (user_id / performer_id) sıralı işleme + coalescing
+
+Aynı kullanıcıya eşzamanlı gelen işler (bahşiş fırtınası, poker
+masasının toplu kapanışı) aynı Account / UserLoyalty / CitizenScore
+satırları için Postgres'te birbirini bekler. Lane'ler bu işi DB'ye
+gitmeden process içinde sıraya koyar; farklı key'ler paralel çalışır.
+
+- hold(key): async context manager; key başına FIFO, tek seferde tek iş
+- submit(key, item, runner): key'in kuyruğunda biriken item'lar lane'i
+  alan ilk çağıran tarafından runner(key, items) ile tek seferde (tek
+  transaction) işlenir; her çağıran kendi item'ının sonucunu/hatasını
+  alır. Sıra korunur, batch en fazla max_batch item
+- Lane'ler sadece üzerinde iş varken yaşar: son çağıran çıkınca silinir
+  (bellek aktif key sayısıyla sınırlı)
+- stats(): aktif lane'ler, en derin kuyruklar (o an) ve en yüksek kuyruk
+  derinliği görülen hot key'ler (sınırlı tablo)
+
+Lane'ler worker (process) başınadır; birden fazla uvicorn worker'da
+aynı key için çekişme azalır ama DB kilitleri doğruluğun garantisi
+olmaya devam eder. settings.KEYED_LANES_ENABLED=False ile tümü kapanır
+(hold no-op, submit item'ı tek başına runner'a verir).
+"""
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from app.core.config import settings
+
+# Peak derinliği tutulan en fazla hot key sayısı
+HOT_KEY_SLOTS = 32
+
+LaneRunner = Callable[[Hashable, list], Awaitable[list]]
+
+
+class _Lane:
+    """Tek key'in kilidi, bekleyen item'ları ve derinliği."""
+
+    __slots__ = ("lock", "pending", "depth")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()  # Bekleyenler FIFO uyanır
+        self.pending: list[tuple[Any, asyncio.Future]] = []
+        self.depth = 0  # Lane'i tutan + bekleyen çağıran sayısı
+
+
+class KeyedLanes:
+    """Key başına asyncio lane'leri + sayaçlar."""
+
+    def __init__(self, name: str, max_batch: int = 50, enabled: bool | None = None):
+        self.name = name
+        self.max_batch = max_batch
+        self._enabled = enabled
+        self._lanes: dict[Hashable, _Lane] = {}
+        self._peaks: dict[Hashable, int] = {}
+        self.submitted = 0
+        self.batches = 0
+        self.coalesced = 0  # Başka bir çağıranın batch'inde işlenen item'lar
+        self.contended = 0  # Lane'i dolu bulan çağıranlar
+        _registry.append(self)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.KEYED_LANES_ENABLED if self._enabled is None else self._enabled
+
+    def _enter(self, key: Hashable) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane()
+        lane.depth += 1
+        if lane.depth > 1:
+            self.contended += 1
+            self._record_peak(key, lane.depth)
+        return lane
+
+    def _exit(self, key: Hashable, lane: _Lane) -> None:
+        lane.depth -= 1
+        if lane.depth == 0:
+            del self._lanes[key]
+
+    def _record_peak(self, key: Hashable, depth: int) -> None:
+        if key in self._peaks:
+            self._peaks[key] = max(self._peaks[key], depth)
+        elif len(self._peaks) < HOT_KEY_SLOTS:
+            self._peaks[key] = depth
+        else:
+            coldest = min(self._peaks, key=self._peaks.__getitem__)
+            if depth > self._peaks[coldest]:
+                del self._peaks[coldest]
+                self._peaks[key] = depth
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """Bu key için sıradaki tek iş ol."""
+        if not self.enabled:
+            yield
+            return
+
+        lane = self._enter(key)
+        try:
+            async with lane.lock:
+                yield
+        finally:
+            self._exit(key, lane)
+
+    async def submit(self, key: Hashable, item: Any, runner: LaneRunner) -> Any:
+        """
+        Item'ı key'in lane'inde işlet, kendi sonucunu döndür.
+
+        runner(key, items) item sırasıyla sonuç listesi döner; listedeki
+        bir exception o item'ın çağıranına raise edilir.
+        """
+        self.submitted += 1
+        if not self.enabled:
+            self.batches += 1
+            return _unwrap((await runner(key, [item]))[0])
+
+        future = asyncio.get_running_loop().create_future()
+        lane = self._enter(key)
+        lane.pending.append((item, future))
+        try:
+            async with lane.lock:
+                if not future.done():
+                    # Öncekiler kendi batch'lerini aldı; bizim item'ımız başta
+                    batch = lane.pending[: self.max_batch]
+                    del lane.pending[: len(batch)]
+                    await self._run_batch(key, batch, runner)
+                else:
+                    self.coalesced += 1
+        finally:
+            self._exit(key, lane)
+        return _unwrap(future.result())
+
+    async def _run_batch(self, key: Hashable, batch: list, runner: LaneRunner) -> None:
+        self.batches += 1
+        try:
+            results = await runner(key, [item for item, _ in batch])
+        except BaseException as e:
+            # Lider iptal edildiyse diğer çağıranlar iptal görmesin
+            error = e if isinstance(e, Exception) else RuntimeError(f"{self.name} lane batch interrupted")
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(error)
+            raise
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self, top: int = 10) -> dict:
+        """Sayaçlar + o anki en derin lane'ler + peak derinlikli hot key'ler."""
+        deepest = sorted(self._lanes.items(), key=lambda kv: kv[1].depth, reverse=True)[:top]
+        hot = sorted(self._peaks.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        return {
+            "enabled": self.enabled,
+            "active_lanes": len(self._lanes),
+            "submitted": self.submitted,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "contended": self.contended,
+            "deepest_lanes": [{"key": str(k), "depth": lane.depth} for k, lane in deepest],
+            "hot_keys": [{"key": str(k), "peak_depth": depth} for k, depth in hot],
+        }
+
+
+def _unwrap(result: Any) -> Any:
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+_registry: list[KeyedLanes] = []
+
+
+def get_lane_stats() -> dict:
+    """Bu process'teki tüm lane gruplarının sayaçları."""
+    return {lanes.name: lanes.stats() for lanes in _registry}
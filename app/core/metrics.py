@@ -0,0 +1,101 @@
+"""
+NovaCore Metrics
+Process içi latency sayaçları (stage / operasyon süreleri)
+
+Prometheus gibi harici bir toplayıcı yok; her worker kendi sayaçlarını
+tutar ve /api/v1/admin/metrics üzerinden JSON olarak verir.
+
+- TimingStat: isim başına toplam sayaç + son N örnekten p50/p95/p99
+- timed("telegram_submit.wallet_credit"): süreyi ölçen context manager
+- observe(): hazır ölçülmüş süreyi kaydet
+- get_timing_stats(): tüm sayaçların snapshot'ı (ms)
+
+İsimler "<akış>.<stage>" biçimindedir; prefix ile filtrelenebilir.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+# Percentile hesabı için isim başına tutulan son örnek sayısı
+TIMING_RESERVOIR_SIZE = 1024
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class TimingStat:
+    """Tek bir ölçüm adı için sayaçlar (saniye cinsinden tutulur)."""
+
+    def __init__(self, reservoir_size: int = TIMING_RESERVOIR_SIZE):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque = deque(maxlen=reservoir_size)
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+        self._recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        """Sayaçlar + son örneklerden percentile'lar (ms)."""
+        recent = list(self._recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(percentile(recent, 50) * 1000, 3),
+            "p95_ms": round(percentile(recent, 95) * 1000, 3),
+            "p99_ms": round(percentile(recent, 99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+_timings: dict[str, TimingStat] = {}
+
+
+def observe(name: str, seconds: float, error: bool = False) -> None:
+    """Ölçülmüş bir süreyi `name` altında kaydet."""
+    stat = _timings.get(name)
+    if stat is None:
+        stat = _timings[name] = TimingStat()
+    stat.observe(seconds, error)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Blok süresini ölç; exception'da süre yine kaydedilir (errors += 1)."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        observe(name, time.perf_counter() - started, error=True)
+        raise
+    observe(name, time.perf_counter() - started)
+
+
+def get_timing_stats(prefix: str | None = None) -> dict:
+    """Tüm (ya da prefix ile başlayan) ölçümlerin snapshot'ı."""
+    return {
+        name: stat.snapshot()
+        for name, stat in sorted(_timings.items())
+        if prefix is None or name.startswith(prefix)
+    }
+
+
+def reset_timing_stats() -> None:
+    """Sayaçları sıfırla (test / benchmark)."""
+    _timings.clear()
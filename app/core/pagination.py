@@ -0,0 +1,76 @@
+"""
+NovaCore Keyset Pagination
+Cursor-based (created_at, id) pagination for append-only history tables.
+
+OFFSET pagination reads and discards every skipped row, so deep pages get
+linearly slower. A keyset cursor resumes with
+    WHERE (created_at, id) < (:cursor_ts, :cursor_id)
+    ORDER BY created_at DESC, id DESC
+which is a single index range scan on (owner, created_at, id) at any depth.
+"""
+import base64
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(ts: datetime, row_id: Any) -> str:
+    """Opaque cursor for the row at (ts, id)."""
+    raw = f"{ts.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Parse a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts_raw), row_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def apply_keyset(
+    query,
+    ts_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    after: str | None,
+    page: int,
+    per_page: int,
+):
+    """
+    Order newest-first and page the query.
+
+    With `after`, resumes strictly below the cursor row (keyset); otherwise
+    falls back to OFFSET for classic page numbers.
+    """
+    query = query.order_by(ts_column.desc(), id_column.desc())
+
+    if after:
+        cursor_ts, cursor_id = decode_cursor(after)
+        if isinstance(id_column.type, Integer):
+            if not cursor_id.isdigit():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor",
+                )
+            cursor_id = int(cursor_id)
+        query = query.where(tuple_(ts_column, id_column) < tuple_(cursor_ts, cursor_id))
+    else:
+        query = query.offset((page - 1) * per_page)
+
+    return query.limit(per_page)
+
+
+def next_cursor(items: list, per_page: int, ts_attr: str = "created_at") -> str | None:
+    """Cursor for the page after `items`, or None if this was the last page."""
+    if len(items) < per_page:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, ts_attr), last.id)
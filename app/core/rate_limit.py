@@ -0,0 +1,335 @@
+"""
+NovaCore Rate Limiting
+Sliding-window rate limiter (in-memory / Redis backend)
+
+Rate limit'ler eskiden büyüyen tablolar üzerinde COUNT sorgularıyla
+yapılıyordu. Bu modül sayımı Postgres'ten alır:
+
+- MemoryRateLimiter: worker başına, key başına en fazla `limit` zaman
+  damgası tutan sliding-window log; boşta kalan key'ler periyodik silinir
+- RedisRateLimiter: sorted set tabanlı sliding-window log; tüm
+  worker'lar aynı sayacı paylaşır (settings.REDIS_URL). Redis erişilemezse
+  istek engellenmez (fail-open), uyarı loglanır.
+
+Backend settings.rate_limit_backend ile seçilir: RATE_LIMIT_BACKEND
+verilmezse dev'de "memory", staging / prod'da "redis". Eski COUNT tabanlı
+limitler global olduğundan çok worker'lı kurulumlarda paylaşımlı backend
+gerekir; memory backend'de limit worker başınadır (N worker → N × limit)
+ve restart'ta sıfırlanır.
+
+acquire() olayı istek işlenmeden önce kaydeder; istek başarısız olursa
+refund() ile geri alınır, böylece sadece başarılı istekler sayılır.
+Endpoint'ler limitleri rate_limit_user() dependency'si ile tanımlar
+(hata durumunda refund otomatik); servis kodu enforce_rate_limit() /
+refund_rate_limit() / get_rate_limiter() kullanır.
+"""
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis_asyncio = None
+
+from fastapi import Depends, HTTPException, status
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import get_current_user
+from app.identity.models import User
+
+logger = get_logger("rate_limit")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`window_seconds` içinde en fazla `limit` olay."""
+    name: str
+    limit: int
+    window_seconds: float
+
+    def describe(self) -> str:
+        if self.window_seconds % 86400 == 0:
+            unit = "day" if self.window_seconds == 86400 else f"{int(self.window_seconds // 86400)} days"
+        elif self.window_seconds % 3600 == 0:
+            unit = "hour" if self.window_seconds == 3600 else f"{int(self.window_seconds // 3600)} hours"
+        else:
+            unit = f"{self.window_seconds:g} seconds"
+        return f"max {self.limit} per {unit}"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """acquire() sonucu."""
+    allowed: bool
+    count: int  # Pencere içindeki olay sayısı (bu istek dahil, izin verildiyse)
+    remaining: int
+    retry_after: float  # Saniye (allowed ise 0)
+    token: Any = None  # refund() için kaydedilen olayın kimliği (allowed ise)
+
+
+class RateLimiter(ABC):
+    """Rate limiter backend arayüzü."""
+
+    @abstractmethod
+    async def acquire(self, key: str, limit: RateLimit) -> RateLimitResult:
+        """Limit dolmadıysa olayı kaydet ve izin ver; dolduysa reddet."""
+
+    @abstractmethod
+    async def record(self, key: str, limit: RateLimit) -> int:
+        """
+        Olayı koşulsuz kaydet, pencere içindeki sayıyı döndür.
+
+        Sayı `limit`'te doyar (eşik kontrolü için yeterli, bellek sınırlı).
+        """
+
+    @abstractmethod
+    async def refund(self, key: str, limit: RateLimit, result: RateLimitResult) -> None:
+        """acquire() ile kaydedilen olayı geri al (istek başarısız oldu)."""
+
+    @abstractmethod
+    async def reset(self, key: str, limit: RateLimit) -> None:
+        """Key'in sayacını sıfırla."""
+
+    async def close(self) -> None:
+        """Backend kaynaklarını bırak."""
+
+    def stats(self) -> dict:
+        """Process içi sayaçlar (paylaşımlı backend'lerde boş)."""
+        return {}
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Process içi sliding-window log (worker başına sayaç)."""
+
+    # Boşta kalan key'lerin taranma aralığı (saniye)
+    SWEEP_INTERVAL_SECONDS = 60.0
+
+    def __init__(self):
+        self._windows: dict[str, tuple[float, deque]] = {}
+        self._last_sweep = time.monotonic()
+
+    def _events(self, key: str, limit: RateLimit, now: float) -> deque:
+        if now - self._last_sweep >= self.SWEEP_INTERVAL_SECONDS:
+            self._sweep(now)
+
+        full_key = f"{limit.name}:{key}"
+        entry = self._windows.get(full_key)
+        if entry is None:
+            events: deque = deque(maxlen=limit.limit)
+            self._windows[full_key] = (limit.window_seconds, events)
+        else:
+            events = entry[1]
+
+        cutoff = now - limit.window_seconds
+        while events and events[0] <= cutoff:
+            events.popleft()
+        return events
+
+    def _sweep(self, now: float) -> None:
+        """Tüm olayları pencere dışında kalmış key'leri sil."""
+        expired = [
+            full_key
+            for full_key, (window, events) in self._windows.items()
+            if not events or events[-1] <= now - window
+        ]
+        for full_key in expired:
+            del self._windows[full_key]
+        self._last_sweep = now
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateLimitResult:
+        now = time.monotonic()
+        events = self._events(key, limit, now)
+
+        if len(events) >= limit.limit:
+            retry_after = events[0] + limit.window_seconds - now
+            return RateLimitResult(False, len(events), 0, max(0.0, retry_after))
+
+        events.append(now)
+        return RateLimitResult(True, len(events), limit.limit - len(events), 0.0, token=now)
+
+    async def record(self, key: str, limit: RateLimit) -> int:
+        now = time.monotonic()
+        events = self._events(key, limit, now)
+        events.append(now)
+        return len(events)
+
+    async def refund(self, key: str, limit: RateLimit, result: RateLimitResult) -> None:
+        entry = self._windows.get(f"{limit.name}:{key}")
+        if entry is None or result.token is None:
+            return
+        try:
+            entry[1].remove(result.token)
+        except ValueError:
+            pass  # Pencereden çoktan çıkmış
+
+    async def reset(self, key: str, limit: RateLimit) -> None:
+        self._windows.pop(f"{limit.name}:{key}", None)
+
+    def stats(self) -> dict:
+        return {"keys": len(self._windows)}
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Redis sorted set sliding-window log.
+
+    acquire(): tek MULTI/EXEC içinde pencere dışını sil, olayı ekle, say;
+    limit aşıldıysa eklenen olay geri alınır. Eşzamanlı istekler limiti
+    asla aşamaz (sınırda ikisi birden reddedilebilir).
+    """
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "rl"):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package is not installed (pip install redis)")
+            client = redis_asyncio.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str, limit: RateLimit) -> str:
+        return f"{self.prefix}:{limit.name}:{key}"
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateLimitResult:
+        redis_key = self._key(key, limit)
+        now = time.time()
+        member = f"{now:.6f}:{uuid.uuid4().hex[:8]}"
+        window_ms = int(limit.window_seconds * 1000)
+
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(redis_key, "-inf", now - limit.window_seconds)
+                pipe.zadd(redis_key, {member: now})
+                pipe.zcard(redis_key)
+                pipe.pexpire(redis_key, window_ms)
+                _, _, count, _ = await pipe.execute()
+
+            if count <= limit.limit:
+                return RateLimitResult(True, count, limit.limit - count, 0.0, token=member)
+
+            await self.client.zrem(redis_key, member)
+            oldest = await self.client.zrange(redis_key, 0, 0, withscores=True)
+            retry_after = oldest[0][1] + limit.window_seconds - now if oldest else limit.window_seconds
+            return RateLimitResult(False, count - 1, 0, max(0.0, retry_after))
+        except Exception as e:
+            logger.warning("rate_limit_backend_error", limit=limit.name, error=str(e))
+            return RateLimitResult(True, 0, limit.limit, 0.0)
+
+    async def record(self, key: str, limit: RateLimit) -> int:
+        redis_key = self._key(key, limit)
+        now = time.time()
+        member = f"{now:.6f}:{uuid.uuid4().hex[:8]}"
+
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(redis_key, "-inf", now - limit.window_seconds)
+                pipe.zadd(redis_key, {member: now})
+                # En yeni `limit` olay yeterli
+                pipe.zremrangebyrank(redis_key, 0, -(limit.limit + 1))
+                pipe.zcard(redis_key)
+                pipe.pexpire(redis_key, int(limit.window_seconds * 1000))
+                _, _, _, count, _ = await pipe.execute()
+            return count
+        except Exception as e:
+            logger.warning("rate_limit_backend_error", limit=limit.name, error=str(e))
+            return 0
+
+    async def refund(self, key: str, limit: RateLimit, result: RateLimitResult) -> None:
+        if result.token is None:
+            return
+        try:
+            await self.client.zrem(self._key(key, limit), result.token)
+        except Exception as e:
+            logger.warning("rate_limit_backend_error", limit=limit.name, error=str(e))
+
+    async def reset(self, key: str, limit: RateLimit) -> None:
+        await self.client.delete(self._key(key, limit))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """settings.rate_limit_backend'e göre process-wide limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        backend = settings.rate_limit_backend
+        if backend == "redis":
+            _rate_limiter = RedisRateLimiter()
+        else:
+            _rate_limiter = MemoryRateLimiter()
+            if not settings.is_dev:
+                logger.warning(
+                    "rate_limiter_per_process",
+                    detail="memory backend: limits are per worker and reset on restart",
+                )
+        logger.info("rate_limiter_initialized", backend=backend)
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None) -> None:
+    """Limiter'ı değiştir (testler / özel kurulum). None = settings'ten yeniden oluştur."""
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+async def close_rate_limiter() -> None:
+    """Shutdown'da backend bağlantısını kapat."""
+    global _rate_limiter
+    if _rate_limiter is not None:
+        await _rate_limiter.close()
+        _rate_limiter = None
+
+
+async def enforce_rate_limit(
+    limit: RateLimit,
+    key: str,
+    detail: Optional[str] = None,
+) -> RateLimitResult:
+    """Limit aşıldıysa 429 (Retry-After header ile) fırlat."""
+    result = await get_rate_limiter().acquire(key, limit)
+    if not result.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail or f"Rate limit exceeded: {limit.describe()}",
+            headers={"Retry-After": str(math.ceil(result.retry_after))},
+        )
+    return result
+
+
+async def refund_rate_limit(limit: RateLimit, key: str, result: RateLimitResult) -> None:
+    """enforce_rate_limit()'in kaydettiği olayı geri al (istek başarısız oldu)."""
+    await get_rate_limiter().refund(key, limit, result)
+
+
+def rate_limit_user(limit: RateLimit, detail: Optional[str] = None):
+    """
+    Kullanıcı başına rate limit dependency'si.
+
+        @router.post("/events", dependencies=[Depends(rate_limit_user(LIMIT))])
+
+    Endpoint hata fırlatırsa (HTTPException dahil) kaydedilen olay geri
+    alınır; limit sadece başarılı istekleri sayar.
+    """
+
+    async def dependency(current_user: User = Depends(get_current_user)) -> AsyncIterator[None]:
+        key = str(current_user.id)
+        result = await enforce_rate_limit(limit, key, detail)
+        try:
+            yield
+        except Exception:
+            await refund_rate_limit(limit, key, result)
+            raise
+
+    return dependency
@@ -0,0 +1,69 @@
+"""
+NovaCore Session Buffers
+session.info'da commit'e kadar biriken yan yazımlar için SAVEPOINT desteği
+
+treasury_totals, treasury_flow_daily, leaderboard_snapshot ve risk_score
+delta'ları session.info'da birikir ve dış transaction'ın commit'inde tek
+upsert ile yazılır. SQLAlchemy before_commit / after_commit /
+after_rollback event'lerini SAVEPOINT release ve rollback'inde de
+tetikler; bu modül buffer'ları savepoint'lerle hizalar:
+
+- register_session_buffer(key, copy): buffer'ı kaydet; begin_nested()
+  açılırken copy(buffer) ile anlık kopyası alınır
+- SAVEPOINT rollback olursa buffer o ana geri döner (sadece savepoint
+  içindeki delta'lar düşer, öncekiler commit'e kalır)
+- Dış transaction rollback olursa kayıtlı buffer'lar tamamen atılır
+- is_savepoint_commit(session): before_commit / after_commit hook'ları
+  SAVEPOINT release'inde buffer'ı yazmaz, dış commit'i bekler
+
+Kopyalar konteyner seviyesindedir; buffer'daki ORM nesneleri paylaşılır.
+"""
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+# session.info anahtarı → buffer kopyalama fonksiyonu
+_buffers: dict[str, Callable[[Any], Any]] = {}
+
+# SAVEPOINT → açıldığı andaki buffer kopyaları (savepoint bitince GC ile düşer)
+_snapshots: "weakref.WeakKeyDictionary[SessionTransaction, dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def register_session_buffer(key: str, copy: Callable[[Any], Any]) -> None:
+    """session.info[key] buffer'ını savepoint'lerle birlikte geri alınır yap."""
+    _buffers[key] = copy
+
+
+def is_savepoint_commit(session: Session) -> bool:
+    """Çalışan before_commit / after_commit bir SAVEPOINT release'i mi?"""
+    return session.in_nested_transaction()
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _snapshot_buffers(session: Session, transaction: SessionTransaction) -> None:
+    if not transaction.nested:
+        return
+    _snapshots[transaction] = {
+        key: copy(session.info[key]) for key, copy in _buffers.items() if key in session.info
+    }
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _restore_buffers(session: Session, previous_transaction: SessionTransaction) -> None:
+    if previous_transaction.nested:
+        snapshot = _snapshots.pop(previous_transaction, None)
+        if snapshot is None:
+            return
+        for key in _buffers:
+            if key in snapshot:
+                session.info[key] = snapshot[key]
+            else:
+                session.info.pop(key, None)
+    elif previous_transaction.parent is None:
+        for key in _buffers:
+            session.info.pop(key, None)
@@ -0,0 +1,59 @@
+# app/economy/batch.py
+"""
+Batch (columnar) Scoring Helpers
+
+RewardEngine / DynamicRewardManager'ın *_batch metodları tek tek context
+yerine kolon array'leri alır ve skaler path ile bit-identical sonuç
+döndürür. Bunun için skaler koddaki her round(x, n) adımı
+round_like_python ile aynen tekrarlanır.
+
+numpy opsiyoneldir (pip install -e ".[sim]"); yoksa NUMPY_AVAILABLE=False
+ve batch metodları RuntimeError verir.
+"""
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for batch scoring: pip install numpy")
+
+
+def round_like_python(values: "np.ndarray", digits: int) -> "np.ndarray":
+    """
+    Python round(x, digits) ile birebir aynı sonuç veren array yuvarlama.
+
+    np.round ölçekleyip rint uyguladığı için x.xx5 sınırında Python'dan
+    ayrılır: Python ikili değerin tam ondalık karşılığını yuvarlar
+    (round(2.675, 2) == 2.67). Burada x × 10^digits çarpımının yuvarlama
+    hatası Dekker split ile tam olarak bulunur; kesin yarım durumda
+    çifte yuvarlanır.
+    """
+    values = np.asarray(values, dtype=float)
+    scale = 10.0 ** digits
+    scaled = values * scale
+
+    # err: values × scale'in yuvarlama hatası (Dekker split, 2^27 + 1)
+    err = values * 134217729.0
+    err -= err - values
+    lo = values - err
+    err *= scale
+    err -= scaled
+    lo *= scale
+    err += lo
+
+    # Tam çarpımın kesirli kısmı - 0.5 (işareti kesin)
+    out = np.floor(scaled)
+    scaled -= out
+    scaled -= 0.5
+    scaled += err
+    out += scaled > 0
+    tie = scaled == 0
+    if tie.any():
+        out[tie] += np.fmod(out[tie], 2) != 0
+    out /= scale
+    return out
@@ -5,10 +5,14 @@ Dynamic Reward Multiplier (DRM)
 Makro ekonomi katmanı - Mikro (kullanıcı kalitesi) + Makro (mode & emission) birleşimi.
 
 NCR_final = BaseNCR × UserMultiplier × MacroMultiplier
+
+compute_macro_multiplier_batch aynı formülü kolon array'leri üzerinde
+hesaplar (bit-identical); bkz. app/economy/batch.py.
 """
 from dataclasses import dataclass
 from typing import Optional
 
+from .batch import np, require_numpy, round_like_python
 from .constitution import EconomyMode
 
 
@@ -42,6 +46,14 @@ class DynamicRewardManager:
     MIN_MACRO = 0.5
     MAX_MACRO = 1.5
     
+    # Mode bazlı base multiplier
+    BASE_BY_MODE = {
+        EconomyMode.NORMAL: 1.0,
+        EconomyMode.GROWTH: 1.15,          # +%15 (onboarding/hype dönemi)
+        EconomyMode.STABILIZATION: 0.9,    # -%10 (enflasyon kontrolü)
+        EconomyMode.RECOVERY: 0.75,        # -%25 (kriz modu)
+    }
+    
     @classmethod
     def compute_macro_multiplier(cls, ctx: MacroContext) -> float:
         """
@@ -67,12 +79,7 @@ class DynamicRewardManager:
         pressure = max(daily_ratio, weekly_ratio)
         
         # 2) Mode bazlı base multiplier
-        base_by_mode = {
-            EconomyMode.NORMAL: 1.0,
-            EconomyMode.GROWTH: 1.15,          # +%15 (onboarding/hype dönemi)
-            EconomyMode.STABILIZATION: 0.9,    # -%10 (enflasyon kontrolü)
-            EconomyMode.RECOVERY: 0.75,        # -%25 (kriz modu)
-        }.get(ctx.mode, 1.0)
+        base_by_mode = cls.BASE_BY_MODE.get(ctx.mode, 1.0)
         
         # 3) Emission pressure'a göre ayar
         if pressure > 1.0:
@@ -101,17 +108,69 @@ class DynamicRewardManager:
         macro = max(cls.MIN_MACRO, min(cls.MAX_MACRO, macro))
         return round(macro, 3)
     
+    @classmethod
+    def compute_macro_multiplier_batch(
+        cls,
+        mode: EconomyMode,
+        daily_emission_used: "np.ndarray",
+        daily_emission_cap: "np.ndarray",
+        weekly_emission_used: "np.ndarray",
+        weekly_emission_cap: "np.ndarray",
+        burn_rate_7d: "np.ndarray",
+        treasury_health: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        compute_macro_multiplier'ın kolon array'leri üzerindeki karşılığı.
+        
+        Array'ler birbirine broadcast edilir (örn. tek cap + günlük
+        emisyon serisi). Her eleman için skaler path ile bit-identical.
+        
+        Returns:
+            float64 macro multiplier array
+        """
+        require_numpy()
+        daily_used, daily_cap, weekly_used, weekly_cap, burn_rate, health = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (
+                daily_emission_used,
+                daily_emission_cap,
+                weekly_emission_used,
+                weekly_emission_cap,
+                burn_rate_7d,
+                treasury_health,
+            ))
+        )
+        
+        # 1) Emission baskısı (cap <= 0 → 0.0)
+        daily_ratio = np.divide(daily_used, daily_cap, out=np.zeros(daily_used.shape), where=daily_cap > 0)
+        weekly_ratio = np.divide(weekly_used, weekly_cap, out=np.zeros(weekly_used.shape), where=weekly_cap > 0)
+        pressure = np.maximum(daily_ratio, weekly_ratio)
+        
+        # 2) Mode bazlı base multiplier
+        base_by_mode = cls.BASE_BY_MODE.get(mode, 1.0)
+        
+        # 3) Emission pressure'a göre ayar
+        macro = np.where(
+            pressure > 1.0,
+            base_by_mode * (1.0 - np.minimum(0.5, (pressure - 1.0))),
+            base_by_mode * (1.0 + ((1.0 - pressure) * 0.2)),
+        )
+        
+        # 4) Treasury health ile ince ayar
+        macro = np.where(health < 0.3, macro * 0.9, np.where(health > 0.8, macro * 1.05, macro))
+        
+        # 5) Burn rate ile denge
+        macro = np.where(burn_rate > 0.3, macro * 1.02, macro)
+        
+        # Clamp
+        macro = np.maximum(cls.MIN_MACRO, np.minimum(cls.MAX_MACRO, macro))
+        return round_like_python(macro, 3)
+    
     @classmethod
     def get_mode_adjustment(cls, mode: EconomyMode) -> float:
         """
         Ekonomi moduna göre base çarpan (hızlı referans için).
         """
-        return {
-            EconomyMode.NORMAL: 1.0,
-            EconomyMode.GROWTH: 1.15,
-            EconomyMode.STABILIZATION: 0.9,
-            EconomyMode.RECOVERY: 0.75,
-        }.get(mode, 1.0)
+        return cls.BASE_BY_MODE.get(mode, 1.0)
 
 
 # =============================================================================
@@ -7,10 +7,14 @@ Madde 3 - NCR Kazanma Mekanizması implementasyonu.
 NCR_final = BaseNCR × RewardMultiplier(user)
 
 RewardMultiplier = StreakFactor × SiyahScoreFactor × RiskFactor × NovaFactor
+
+compute_reward_multiplier_batch aynı formülü kolon array'leri üzerinde
+hesaplar (bit-identical); bkz. app/economy/batch.py.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
+from .batch import np, require_numpy, round_like_python
 from .constitution import (
     ECONOMY_CONSTANTS,
     UserEconomyContext,
@@ -18,7 +22,31 @@ from .constitution import (
     EconomyMode,
 )
 from .drm import DynamicRewardManager, MacroContext, compute_final_reward
-from ..core.citizenship import get_citizen_level_multiplier
+from ..core.citizenship import CitizenLevel, get_citizen_level_multiplier
+
+# Ekonomi moduna göre ek çarpan
+MODE_ADJUSTMENTS = {
+    EconomyMode.NORMAL: 1.0,
+    EconomyMode.GROWTH: 1.2,          # +%20 emission
+    EconomyMode.STABILIZATION: 0.8,   # -%20 emission
+    EconomyMode.RECOVERY: 0.5,        # -%50 emission
+}
+
+# Batch API'de citizen level kodu: CITIZEN_LEVEL_CODES listesindeki index.
+# Listede olmayan seviye UNKNOWN_CITIZEN_LEVEL_CODE alır (çarpan 1.0, skaler
+# path'teki gibi).
+CITIZEN_LEVEL_CODES = [level.value for level in CitizenLevel]
+UNKNOWN_CITIZEN_LEVEL_CODE = len(CITIZEN_LEVEL_CODES)
+
+
+def encode_citizen_levels(levels: Iterable[str]) -> "np.ndarray":
+    """citizen_level string'leri → batch API kodları."""
+    require_numpy()
+    index = {value: code for code, value in enumerate(CITIZEN_LEVEL_CODES)}
+    return np.fromiter(
+        (index.get(getattr(level, "value", level), UNKNOWN_CITIZEN_LEVEL_CODE) for level in levels),
+        dtype=np.int64,
+    )
 
 
 class RewardEngine:
@@ -88,13 +116,7 @@ class RewardEngine:
         """
         Ekonomi moduna göre ek çarpan.
         """
-        adjustments = {
-            EconomyMode.NORMAL: 1.0,
-            EconomyMode.GROWTH: 1.2,          # +%20 emission
-            EconomyMode.STABILIZATION: 0.8,   # -%20 emission
-            EconomyMode.RECOVERY: 0.5,        # -%50 emission
-        }
-        return adjustments.get(self.economy_mode, 1.0)
+        return MODE_ADJUSTMENTS.get(self.economy_mode, 1.0)
     
     # =========================================================================
     # MAIN CALCULATION
@@ -122,6 +144,54 @@ class RewardEngine:
         
         return round(multiplier, 4)
     
+    def compute_reward_multiplier_batch(
+        self,
+        streak_days: "np.ndarray",
+        siyah_score_avg: "np.ndarray",
+        risk_score: "np.ndarray",
+        citizen_level_codes: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        compute_reward_multiplier'ın kolon array'leri üzerindeki karşılığı.
+        
+        Her eleman için skaler path ile bit-identical sonuç verir (aynı
+        işlem sırası, aynı round adımları).
+        
+        Args:
+            streak_days: int array
+            siyah_score_avg: float array
+            risk_score: float array
+            citizen_level_codes: encode_citizen_levels() kodları
+        
+        Returns:
+            float64 multiplier array
+        """
+        require_numpy()
+        c = self.constants
+        
+        capped_days = np.minimum(np.asarray(streak_days), c.MAX_STREAK_DAYS)
+        streak_f = round_like_python(1.0 + (capped_days * c.STREAK_BONUS_PER_DAY), 3)
+        
+        normalized = np.maximum(0.0, np.minimum(100.0, np.asarray(siyah_score_avg, dtype=float))) / 100.0
+        siyah_f = round_like_python(c.SIYAH_SCORE_BASE + (normalized * c.SIYAH_SCORE_MAX_BONUS), 3)
+        
+        risk_f = round_like_python(
+            np.maximum(0.0, 1.0 - (np.asarray(risk_score, dtype=float) / 10.0)), 3
+        )
+        
+        nova_table = np.array(
+            [get_citizen_level_multiplier(level) for level in CITIZEN_LEVEL_CODES] + [1.0]
+        )
+        nova_f = nova_table[np.asarray(citizen_level_codes)]
+        
+        multiplier = streak_f * siyah_f * risk_f * nova_f * self.get_mode_adjustment()
+        multiplier = np.maximum(
+            c.MIN_REWARD_MULTIPLIER,
+            np.minimum(c.MAX_REWARD_MULTIPLIER, multiplier),
+        )
+        
+        return round_like_python(multiplier, 4)
+    
     def calculate_reward(
         self,
         ctx: UserEconomyContext,
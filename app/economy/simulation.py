@@ -0,0 +1,601 @@
+# app/economy/simulation.py
+"""
+Vectorized Economy Simulation (NumPy)
+
+scripts/simulate_nasip_economy.py ve scripts/simulate_aurora_policies.py
+eskiden kullanıcı başına Python döngüsüyle ve formüllerin kendi
+kopyalarıyla çalışıyordu; kopyalar gerçek motorlardan sapmıştı (farklı
+streak / risk / siyah çarpanları, sabit damping tablosu, lokal regime
+fonksiyonu). Bu modül her tick'te (gün) tüm kullanıcılar için gerçek
+formülleri array işlemi olarak uygular:
+
+- User multiplier: RewardEngine.compute_reward_multiplier_batch
+- Macro multiplier: DynamicRewardManager.compute_macro_multiplier, tick
+  başına bir kez (önceki günlerin emisyonuyla)
+- Task ödülü: calculate_ncr_reward_v2 ile aynı (base × user × macro, 2 hane)
+- Treasury cap: _get_damping_multiplier + TREASURY_HARD_CAP_RATIO; gün
+  içi rezervasyonların sıralı semantiği korunur (apply_daily_treasury_cap)
+- Fiyat: pricing.compute_price_step (update_ncr_price'ın çekirdeği)
+- CP / regime: cp_weight_for_violation ve regime_for_cp lookup tablosu
+
+Knob'lar çağrı anında settings / policy'den okunur; run_sweep DAO
+knob'larını (settings.NCR_K_*, TREASURY_DAMPING_TABLE, policy eşikleri,
+senaryo alanları) grid olarak tarar. Sonuç satırları write_results ile
+Parquet (pyarrow varsa) ya da CSV olarak yazılır.
+
+numpy opsiyoneldir (pip install -e ".[sim]"); yoksa NUMPY_AVAILABLE=False
+ve simülasyon fonksiyonları RuntimeError verir.
+"""
+import csv
+import itertools
+import json
+import math
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from app.core.citizenship import nova_score_to_level
+from app.core.config import settings
+from app.justice.policy import cp_weight_for_violation, regime_for_cp
+from app.justice.policy_models import JusticePolicyParams
+from app.wallet.pricing import (
+    EMA_COVERAGE_DIGITS,
+    EMA_FLOW_DIGITS,
+    compute_coverage_ratio,
+    compute_price_step,
+)
+from app.wallet.treasury_cap import OVERFLOW_MULTIPLIER, _get_damping_multiplier
+
+from .batch import NUMPY_AVAILABLE, np, round_like_python
+from .constitution import EconomyMode
+from .drm import DynamicRewardManager, MacroContext
+from .reward_engine import CITIZEN_LEVEL_CODES, RewardEngine
+
+REGIMES = ["NORMAL", "SOFT_FLAG", "PROBATION", "RESTRICTED", "LOCKDOWN"]
+
+VIOLATION_CODES = {
+    "EKO": ["EKO_NO_SHOW", "EKO_FRAUD", "EKO_CHARGEBACK"],
+    "COM": ["COM_TOXIC", "COM_HARASSMENT", "COM_SPAM"],
+    "SYS": ["SYS_EXPLOIT", "SYS_ABUSE", "SYS_BOT"],
+    "TRUST": ["TRUST_MULTIPLE_ACCOUNTS", "TRUST_FAKE_ID", "TRUST_SCAM"],
+}
+VIOLATION_CATEGORIES = list(VIOLATION_CODES)
+
+# Görev tipi dağılımı: (olasılık, base NCR seçenekleri)
+BASE_NCR_TIERS = (
+    (0.50, (2.0, 3.0, 4.0)),     # basit görevler
+    (0.35, (5.0, 6.0, 8.0)),     # orta görevler
+    (0.12, (10.0, 12.0, 15.0)),  # zor görevler
+    (0.03, (20.0, 25.0)),        # elite
+)
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for the economy simulation: pip install numpy")
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+
+@dataclass
+class EconomyScenario:
+    """Ekonomi simülasyonu senaryosu (DAO knob'ları settings'ten okunur)."""
+
+    n_users: int = 10_000
+    n_days: int = 30
+    seed: int = 42
+    economy_mode: EconomyMode = EconomyMode.NORMAL
+
+    initial_reserves_fiat: float = 500_000.0
+    initial_price_try: Optional[float] = None  # None → NCR_BASE_PRICE_TRY
+    daily_limit_ncr: Optional[float] = None    # None → TREASURY_DAILY_NCR_LIMIT
+
+    # Günlük oranlar
+    redemption_rate: float = 0.10  # basılan + mevcut NCR'ın fiata çevrilen kısmı
+    burn_rate: float = 0.02        # mevcut supply'dan sink'lere giden kısım
+
+    # Davranış
+    task_count_weights: tuple = (0.4, 0.3, 0.2, 0.1)  # günde 0-3 görev
+    abuse_rate: float = 0.01  # görev başına AbuseGuard risk artışı olasılığı
+    nova_score_mean: float = 55.0
+    nova_score_std: float = 15.0
+
+
+@dataclass
+class JusticeScenario:
+    """CP / regime simülasyonu senaryosu (eşikler policy'den okunur)."""
+
+    n_users: int = 1_000
+    n_days: int = 90
+    seed: int = 42
+    violation_probability: float = 0.05  # kullanıcı başı günlük
+    severity_weights: tuple = (0.3, 0.3, 0.2, 0.15, 0.05)  # severity 1-5
+
+
+@dataclass
+class SimulationResult:
+    """Tick satırları + son kullanıcı state'i + özet."""
+
+    rows: list[dict] = field(default_factory=list)
+    users: dict[str, Any] = field(default_factory=dict)
+    summary: dict[str, Any] = field(default_factory=dict)
+
+
+def default_policy(**overrides) -> JusticePolicyParams:
+    """DB'siz, v1.0 varsayılanlarıyla policy (simülasyon için)."""
+    values = dict(
+        version="simulation",
+        decay_per_day=1,
+        base_eko=10,
+        base_com=15,
+        base_sys=20,
+        base_trust=25,
+        threshold_soft_flag=20,
+        threshold_probation=40,
+        threshold_restricted=60,
+        threshold_lockdown=80,
+    )
+    values.update(overrides)
+    return JusticePolicyParams(**values)
+
+
+# =============================================================================
+# VECTORIZED FORMULAS
+# =============================================================================
+
+def _damping_bands() -> tuple[list[float], list[float]]:
+    """Damping tablosu (üst eşik, çarpan) listeleri + overflow bandı."""
+    thresholds = sorted(settings.TREASURY_DAMPING_TABLE.items(), key=lambda x: x[0])
+    uppers = [threshold for threshold, _ in thresholds] + [math.inf]
+    mults = [mult for _, mult in thresholds] + [OVERFLOW_MULTIPLIER]
+    return uppers, mults
+
+
+def _reserve_one(amount: float, issued: float, limit_ncr: float, hard_cap: float) -> float:
+    """Tek rezervasyon (reserve_treasury_budget'ın Python karşılığı)."""
+    damped = round(amount * _get_damping_multiplier((issued + amount) / limit_ncr), 2)
+    headroom = max(math.floor((hard_cap - issued) * 100) / 100, 0.0)
+    granted = min(damped, headroom)
+    return granted if granted >= 0.01 else 0.0
+
+
+def apply_daily_treasury_cap(
+    requested: "np.ndarray",
+    limit_ncr: float,
+    issued_ncr: float = 0.0,
+) -> tuple["np.ndarray", float]:
+    """
+    Günün rezervasyonlarını sırayla uygula; (granted, issued_after).
+
+    Her rezervasyonun çarpanı kendinden öncekilerin issued_ncr'ına
+    bağlıdır. Band içinde "güvenli" olan (issued + en büyük talep hâlâ
+    aynı band ve hard cap altında) ardışık önek tek cumsum ile kabul
+    edilir; band / hard cap sınırına yakın birkaç rezervasyon tek tek
+    _reserve_one ile işlenir. Sonuç seri uygulamayla aynıdır.
+    """
+    n = len(requested)
+    granted = np.zeros(n)
+    if n == 0 or limit_ncr <= 0:
+        return granted, issued_ncr
+
+    uppers, mults = _damping_bands()
+    hard_cap = limit_ncr * settings.TREASURY_HARD_CAP_RATIO
+    max_request = float(requested.max())
+    issued = issued_ncr
+    pos = 0
+
+    while pos < n:
+        if hard_cap - issued < 0.01:
+            break  # Hard cap dolu: kalan herkes 0
+
+        band = next(i for i, upper in enumerate(uppers) if issued / limit_ncr <= upper)
+        bound = min(uppers[band] * limit_ncr, hard_cap - 0.01) - max_request
+
+        if issued > bound:
+            granted[pos] = _reserve_one(float(requested[pos]), issued, limit_ncr, hard_cap)
+            issued += granted[pos]
+            pos += 1
+            continue
+
+        chunk = round_like_python(requested[pos:] * mults[band], 2)
+        chunk[chunk < 0.01] = 0.0
+        issued_before = np.cumsum(chunk) - chunk
+        safe = int(np.searchsorted(issued_before, bound - issued, side="right"))
+
+        granted[pos:pos + safe] = chunk[:safe]
+        issued += float(chunk[:safe].sum())
+        pos += safe
+
+    return granted, issued
+
+
+def sample_base_ncr(rng: "np.random.Generator", size: int) -> "np.ndarray":
+    """BASE_NCR_TIERS dağılımından görev base NCR'ı."""
+    tier = rng.choice(len(BASE_NCR_TIERS), size=size, p=[p for p, _ in BASE_NCR_TIERS])
+    out = np.empty(size)
+    for i, (_, choices) in enumerate(BASE_NCR_TIERS):
+        mask = tier == i
+        out[mask] = rng.choice(choices, size=int(mask.sum()))
+    return out
+
+
+def regime_lookup(policy: JusticePolicyParams, max_cp: int) -> "np.ndarray":
+    """0..max_cp için regime_for_cp → REGIMES index tablosu."""
+    return np.array(
+        [REGIMES.index(regime_for_cp(cp, policy)) for cp in range(max_cp + 1)],
+        dtype=np.int8,
+    )
+
+
+def cp_weight_table(policy: JusticePolicyParams) -> "np.ndarray":
+    """[kategori, severity-1, kod] → cp_weight_for_violation tablosu."""
+    table = np.zeros((len(VIOLATION_CATEGORIES), 5, 3), dtype=np.int64)
+    for c, category in enumerate(VIOLATION_CATEGORIES):
+        for s in range(5):
+            for k, code in enumerate(VIOLATION_CODES[category]):
+                table[c, s, k] = cp_weight_for_violation(policy, category, s + 1, code)
+    return table
+
+
+# =============================================================================
+# ECONOMY
+# =============================================================================
+
+def _init_economy_users(scenario: EconomyScenario, rng: "np.random.Generator") -> dict:
+    n = scenario.n_users
+    nova_scores = np.clip(
+        rng.normal(scenario.nova_score_mean, scenario.nova_score_std, n), 0, 100
+    ).astype(np.int64)
+    level_by_score = np.array(
+        [CITIZEN_LEVEL_CODES.index(nova_score_to_level(s).value) for s in range(101)], dtype=np.int8
+    )
+    return {
+        "citizen_level_code": level_by_score[nova_scores],
+        "streak_days": np.zeros(n, dtype=np.int64),
+        # kalite: çoğu 65–85; risk: çoğu 0–3
+        "siyah_score": np.clip(rng.normal(75, 10, n), 40.0, 100.0),
+        "risk_score": np.clip(rng.normal(1.5, 1.5, n), 0.0, 10.0),
+        "balance_ncr": np.zeros(n),
+    }
+
+
+def simulate_economy(scenario: EconomyScenario) -> SimulationResult:
+    """NCR mint → treasury cap → burn / redemption → fiyat, tick = gün."""
+    _require_numpy()
+    rng = np.random.default_rng(scenario.seed)
+    users = _init_economy_users(scenario, rng)
+    engine = RewardEngine(scenario.economy_mode)
+
+    limit_ncr = (
+        scenario.daily_limit_ncr
+        if scenario.daily_limit_ncr is not None
+        else settings.TREASURY_DAILY_NCR_LIMIT
+    )
+    price = scenario.initial_price_try or settings.NCR_BASE_PRICE_TRY
+    ema_coverage, ema_flow = 1.0, 0.0
+    reserves = scenario.initial_reserves_fiat
+    outstanding = 0.0
+    history: list[dict] = []  # son 7 günün emisyon / burn'ü (macro context)
+    rows: list[dict] = []
+
+    for day in range(1, scenario.n_days + 1):
+        week = history[-7:]
+        minted_7d = sum(h["minted"] for h in week)
+        burned_7d = sum(h["burned"] for h in week)
+        macro = DynamicRewardManager.compute_macro_multiplier(
+            MacroContext(
+                mode=scenario.economy_mode,
+                daily_emission_used=history[-1]["minted"] if history else 0.0,
+                daily_emission_cap=limit_ncr,
+                weekly_emission_used=minted_7d,
+                weekly_emission_cap=limit_ncr * 7,
+                burn_rate_7d=burned_7d / (minted_7d + burned_7d) if minted_7d + burned_7d else 0.0,
+                treasury_health=min(
+                    1.0,
+                    compute_coverage_ratio(
+                        treasury_reserves_fiat=reserves,
+                        ncr_outstanding=outstanding,
+                        reference_price=price,
+                    ) / settings.NCR_TARGET_COVERAGE,
+                ),
+            )
+        )
+
+        user_mult = engine.compute_reward_multiplier_batch(
+            users["streak_days"],
+            users["siyah_score"],
+            users["risk_score"],
+            users["citizen_level_code"],
+        )
+
+        # Görevler: kullanıcı başı 0-3, gün içinde karışık sırada
+        counts = rng.choice(
+            len(scenario.task_count_weights), size=scenario.n_users, p=scenario.task_count_weights
+        )
+        task_user = np.repeat(np.arange(scenario.n_users), counts)
+        rng.shuffle(task_user)
+        base_ncr = sample_base_ncr(rng, len(task_user))
+
+        # calculate_ncr_reward_v2: max(0, round(base × user × macro, 2))
+        requested = np.maximum(0.0, round_like_python(base_ncr * user_mult[task_user] * macro, 2))
+        positive = requested > 0
+        granted = np.zeros(len(task_user))
+        granted[positive], issued = apply_daily_treasury_cap(requested[positive], limit_ncr)
+
+        earned = np.bincount(task_user, weights=granted, minlength=scenario.n_users)
+        users["balance_ncr"] += earned
+        minted = float(granted.sum())
+
+        # AbuseGuard: bazı görevler risk_score'u zıplatır
+        flagged = task_user[rng.random(len(task_user)) < scenario.abuse_rate]
+        np.add.at(users["risk_score"], flagged, rng.uniform(0.5, 1.5, len(flagged)))
+
+        # Gün sonu davranış: streak, kalite, risk mean-revert
+        active = counts > 0
+        users["streak_days"] = np.where(active, users["streak_days"] + 1, 0)
+        improving = active & (users["siyah_score"] > 75)
+        users["siyah_score"][improving] += rng.uniform(0.0, 0.5, int(improving.sum()))
+        np.clip(users["siyah_score"], 0.0, 100.0, out=users["siyah_score"])
+        users["risk_score"] = np.clip(
+            users["risk_score"] - rng.uniform(0.0, 0.2, scenario.n_users), 0.0, 10.0
+        )
+
+        # Burn & redemption
+        burned = min(outstanding * scenario.burn_rate, outstanding + minted)
+        redeemed = min(
+            (outstanding + minted - burned) * scenario.redemption_rate,
+            outstanding + minted - burned,
+        )
+        outstanding = max(0.0, outstanding + minted - burned - redeemed)
+        reserves = max(0.0, reserves - redeemed * price)
+
+        price, ema_cov, ema_fl, _ = compute_price_step(
+            current_price=price,
+            ema_coverage=ema_coverage,
+            ema_flow_index=ema_flow,
+            treasury_reserves_fiat=reserves,
+            ncr_outstanding=outstanding,
+            net_mint_24h=minted,
+            net_burn_24h=burned,
+            net_redemption_24h=redeemed,
+        )
+        # update_ncr_price'ın state'e yazdığı hassasiyet
+        ema_coverage = round(ema_cov, EMA_COVERAGE_DIGITS)
+        ema_flow = round(ema_fl, EMA_FLOW_DIGITS)
+
+        coverage = compute_coverage_ratio(
+            treasury_reserves_fiat=reserves,
+            ncr_outstanding=outstanding,
+            reference_price=price,
+        )
+        history.append({"minted": minted, "burned": burned})
+        rows.append({
+            "day": day,
+            "active_users": int(active.sum()),
+            "tasks": len(task_user),
+            "macro_multiplier": macro,
+            "avg_user_multiplier": round(float(user_mult.mean()), 4),
+            "requested_ncr": round(float(requested.sum()), 2),
+            "minted_ncr": round(minted, 2),
+            "capped_ncr": round(float(requested.sum()) - minted, 2),
+            "burned_ncr": round(burned, 2),
+            "redeemed_ncr": round(redeemed, 2),
+            "treasury_reserves_fiat": round(reserves, 2),
+            "ncr_outstanding": round(outstanding, 2),
+            "ncr_price_try": price,
+            "coverage_ratio": round(coverage, 3),
+            "treasury_load_ratio": round(float(issued) / limit_ncr, 3) if limit_ncr > 0 else 0.0,
+        })
+
+    balances = users["balance_ncr"]
+    summary = {
+        "total_users": scenario.n_users,
+        "days": scenario.n_days,
+        "total_minted_ncr": round(sum(r["minted_ncr"] for r in rows), 2),
+        "total_redeemed_ncr": round(sum(r["redeemed_ncr"] for r in rows), 2),
+        "total_capped_ncr": round(sum(r["capped_ncr"] for r in rows), 2),
+        "average_balance_ncr": round(float(balances.mean()), 2) if len(balances) else 0.0,
+        "top_balances_ncr": [round(float(v), 2) for v in np.sort(balances)[::-1][:10]],
+    }
+    return SimulationResult(rows=rows, users=users, summary=summary)
+
+
+# =============================================================================
+# JUSTICE (CP / REGIME)
+# =============================================================================
+
+def simulate_justice(
+    scenario: JusticeScenario,
+    policy: Optional[JusticePolicyParams] = None,
+) -> SimulationResult:
+    """Günlük decay → ihlal → regime, tick = gün."""
+    _require_numpy()
+    policy = policy or default_policy()
+    rng = np.random.default_rng(scenario.seed)
+    n = scenario.n_users
+
+    weights = cp_weight_table(policy)
+    regimes = regime_lookup(policy, int(weights.max()) * 2)
+    severity_p = np.asarray(scenario.severity_weights, dtype=float)
+    severity_p /= severity_p.sum()
+
+    cp = np.zeros(n, dtype=np.int64)
+    violations = np.zeros(n, dtype=np.int64)
+    category_counts = np.zeros(len(VIOLATION_CATEGORIES), dtype=np.int64)
+    days_in_regime = np.zeros((len(REGIMES), n), dtype=np.int32)
+    rows: list[dict] = []
+    # project_decay: günde int(1 × decay_per_day)
+    daily_decay = int(policy.decay_per_day)
+
+    for day in range(scenario.n_days):
+        if daily_decay >= 1:
+            np.maximum(cp - daily_decay, 0, out=cp)
+
+        hit = np.flatnonzero(rng.random(n) < scenario.violation_probability)
+        category = rng.integers(0, len(VIOLATION_CATEGORIES), len(hit))
+        severity = rng.choice(5, size=len(hit), p=severity_p)
+        code = rng.integers(0, 3, len(hit))
+        cp[hit] += weights[category, severity, code]
+        violations[hit] += 1
+        category_counts += np.bincount(category, minlength=len(VIOLATION_CATEGORIES))
+
+        max_cp = int(cp.max()) if n else 0
+        if max_cp >= len(regimes):
+            regimes = regime_lookup(policy, max_cp * 2)
+        regime_idx = regimes[cp]
+        days_in_regime[regime_idx, np.arange(n)] += 1
+        distribution = np.bincount(regime_idx, minlength=len(REGIMES))
+
+        rows.append({
+            "day": day,
+            "violations": len(hit),
+            "average_cp": round(float(cp.mean()), 2) if n else 0.0,
+            "max_cp": max_cp,
+            **{regime.lower(): int(distribution[i]) for i, regime in enumerate(REGIMES)},
+        })
+
+    final_regime = regimes[cp]
+    distribution = np.bincount(final_regime, minlength=len(REGIMES))
+    summary = {
+        "total_users": n,
+        "average_cp": round(float(cp.mean()), 2) if n else 0.0,
+        "median_cp": float(np.median(cp)) if n else 0.0,
+        "max_cp": int(cp.max()) if n else 0,
+        "total_violations": int(violations.sum()),
+        "average_violations_per_user": round(float(violations.sum()) / n, 2) if n else 0.0,
+        "regime_distribution": {
+            regime: int(distribution[i]) for i, regime in enumerate(REGIMES) if distribution[i]
+        },
+        "category_distribution": {
+            category: int(category_counts[i]) for i, category in enumerate(VIOLATION_CATEGORIES)
+        },
+    }
+    for regime in ("LOCKDOWN", "RESTRICTED", "PROBATION"):
+        count = int(distribution[REGIMES.index(regime)])
+        summary[f"{regime.lower()}_users"] = count
+        summary[f"{regime.lower()}_percentage"] = round(count / n * 100, 2) if n else 0.0
+        summary[f"avg_days_in_{regime.lower()}"] = (
+            round(float(days_in_regime[REGIMES.index(regime)].mean()), 2) if n else 0.0
+        )
+
+    users = {"cp_value": cp, "violations": violations, "regime_idx": final_regime}
+    return SimulationResult(rows=rows, users=users, summary=summary)
+
+
+# =============================================================================
+# SWEEPS & OUTPUT
+# =============================================================================
+
+@contextmanager
+def settings_overrides(**overrides) -> Iterator[None]:
+    """settings alanlarını geçici olarak değiştir (sweep için)."""
+    original = {name: getattr(settings, name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+def parse_sweep_spec(specs: list[str]) -> dict[str, list]:
+    """
+    "NAME=[v1, v2, ...]" (JSON liste) ya da "NAME=v1,v2" → grid.
+
+    TREASURY_DAMPING_TABLE değerleri JSON objesidir; anahtarlar float'a
+    çevrilir.
+    """
+    grid: dict[str, list] = {}
+    for spec in specs:
+        name, _, raw = spec.partition("=")
+        name = name.strip()
+        if not name or not raw:
+            raise ValueError(f"invalid sweep spec: {spec!r} (expected NAME=VALUES)")
+        try:
+            values = json.loads(raw)
+        except json.JSONDecodeError:
+            values = [json.loads(v) for v in raw.split(",")]
+        if not isinstance(values, list):
+            values = [values]
+        if name == "TREASURY_DAMPING_TABLE":
+            values = [{float(k): float(v) for k, v in table.items()} for table in values]
+        grid[name] = values
+    return grid
+
+
+def run_sweep(
+    simulate: Callable[..., SimulationResult],
+    scenario: Any,
+    grid: dict[str, list],
+    policy: Optional[JusticePolicyParams] = None,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Grid'in kartezyen çarpımı üzerinde simülasyon koş.
+
+    Anahtar çözümü: BÜYÜK_HARF → settings, senaryo alanı → senaryo,
+    diğerleri → JusticePolicyParams alanı.
+
+    Returns:
+        (rows, summaries) - her satır sweep_id + parametre kolonları taşır
+    """
+    scenario_fields = {f.name for f in fields(scenario)}
+    names = list(grid)
+    rows: list[dict] = []
+    summaries: list[dict] = []
+
+    for sweep_id, values in enumerate(itertools.product(*(grid[n] for n in names))):
+        params = dict(zip(names, values))
+        setting_values = {k: v for k, v in params.items() if k.isupper()}
+        scenario_values = {k: v for k, v in params.items() if k in scenario_fields}
+        policy_values = {
+            k: v for k, v in params.items()
+            if k not in setting_values and k not in scenario_values
+        }
+        unknown = set(policy_values) - set(JusticePolicyParams.model_fields)
+        if unknown:
+            raise ValueError(f"unknown sweep parameter(s): {', '.join(sorted(unknown))}")
+
+        kwargs = {}
+        if policy is not None or policy_values:
+            base = policy.model_dump() if policy is not None else {}
+            base.pop("id", None)
+            kwargs["policy"] = default_policy(**{**base, **policy_values})
+
+        with settings_overrides(**setting_values):
+            result = simulate(replace(scenario, **scenario_values), **kwargs)
+
+        labels = {k: json.dumps(v) if isinstance(v, dict) else v for k, v in params.items()}
+        rows.extend({"sweep_id": sweep_id, **labels, **row} for row in result.rows)
+        summaries.append({"sweep_id": sweep_id, **labels, **result.summary})
+
+    return rows, summaries
+
+
+def write_results(rows: list[dict], path: str | Path) -> Path:
+    """Satırları .parquet (pyarrow) ya da .csv olarak yaz."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for Parquet output: pip install pyarrow")
+        pq.write_table(pa.Table.from_pylist(rows), path)
+        return path
+
+    columns: list[str] = []
+    for row in rows:
+        columns.extend(k for k in row if k not in columns)
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
@@ -0,0 +1,65 @@
+"""
+NovaCore Events - Keyed Processing Lanes
+
+Senkron /events/* istekleri app.core.lanes üzerinden işlenir:
+
+- Lane key'i event'in en sıcak satırıdır: performer_id varsa performer
+  (bahşiş fırtınasında binlerce kullanıcı aynı performer'a yazar), yoksa
+  user_id (poker masası kapanışında aynı kullanıcıya art arda event)
+- Aynı key'e birikmiş event'ler tek session / tek commit'te işlenir; her
+  event kendi SAVEPOINT'inde çalışır, hata sadece o event'in çağıranına
+  döner. Başarısız event'in buffer'lanmış yan yazımları (treasury_totals,
+  rollup, leaderboard, risk_score, proof imzaları) SAVEPOINT'le birlikte
+  geri alınır; kalanlar lane commit'inde bir kez yazılır
+  (app.core.session_buffers)
+- Farklı key'ler paralel çalışır
+"""
+from collections.abc import Hashable
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.lanes import KeyedLanes
+
+event_lanes = KeyedLanes("events", max_batch=settings.EVENT_LANE_MAX_BATCH)
+
+
+def event_lane_key(event: BaseModel) -> tuple[str, int]:
+    """Event'in serileştirileceği key."""
+    performer_id = getattr(event, "performer_id", None)
+    if performer_id:
+        return ("performer", performer_id)
+    return ("user", event.user_id)
+
+
+async def run_event_batch(
+    key: Hashable,
+    items: list[tuple[str, BaseModel]],
+    session_factory=None,
+) -> list:
+    """Aynı key'in event'lerini tek transaction'da işle; item başına sonuç veya hata."""
+    from app.events.service import EventService
+
+    if session_factory is None:
+        from app.core.db import async_session_factory as session_factory
+
+    results: list = []
+    async with session_factory() as session:
+        service = EventService(session)
+        for source_app, event in items:
+            try:
+                async with session.begin_nested():
+                    results.append(await getattr(service, f"handle_{source_app}_event")(event))
+            except Exception as e:
+                results.append(e)
+        try:
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            return [e] * len(items)
+    return results
+
+
+async def process_in_lane(source_app: str, event: BaseModel):
+    """Event'i key'inin lane'inde işle, EventResult döndür."""
+    return await event_lanes.submit(event_lane_key(event), (source_app, event), run_event_batch)
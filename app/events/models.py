@@ -0,0 +1,112 @@
+"""
+NovaCore Events Models - Idempotent Ingest + Async Queue
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Column, DateTime, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class ProcessedEvent(SQLModel, table=True):
+    """
+    İşlenmiş partner event'leri (idempotency kaydı).
+
+    (source_app, event_id) başına tek satır. Satır, event'in wallet / XP /
+    NovaCredit etkileriyle aynı transaction'da açılır; retry'lar unique
+    index'e çarpıp saklanan EventResult'ı döner, etkiler ikinci kez
+    uygulanmaz. Transaction rollback olursa satır da gider ve retry
+    event'i yeniden işler.
+    """
+    __tablename__ = "processed_events"
+
+    id: int | None = Field(default=None, primary_key=True)
+    source_app: str = Field(max_length=20)  # flirt, onlyvips, poker, aurora
+    event_id: str = Field(max_length=100)  # Partner'ın idempotency key'i
+
+    # Aynı key'in farklı bir event için tekrar kullanımını yakalamak için
+    event_type: str = Field(max_length=50)
+    user_id: int = Field(foreign_key="users.id")
+
+    # İşlenmiş EventResult (JSON); satır açıldığı transaction'da doldurulur
+    result: Optional[dict] = Field(default=None, sa_column=Column(JSONB, nullable=True))
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('source_app', 'event_id', name='uq_processed_events_source_event'),
+        Index('ix_processed_events_created', 'created_at'),
+    )
+
+
+# Queue tabloları Postgres'te JSONB, offline testlerde (SQLite) JSON kullanır;
+# zaman kolonları her iki tarafta da naive UTC DateTime (migration ile aynı)
+QueuePayload = JSON().with_variant(JSONB(), "postgresql")
+
+
+class EventQueueStatus:
+    """event_queue.status değerleri (tamamlanan satırlar silinir)."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+
+
+class EventQueueItem(SQLModel, table=True):
+    """
+    Async işlenecek partner event'i (durable queue).
+
+    POST /events/async/* event'i buraya yazıp hemen döner; worker pool
+    (app.events.worker) FOR UPDATE SKIP LOCKED ile micro-batch'ler halinde
+    çeker. Başarılı event'in satırı silinir, kalıcı hata alan event
+    event_dead_letters'a taşınır.
+
+    Sıra garantisi: kullanıcının tablodaki en eski satırı (head) bitmeden
+    sonraki event'leri claim edilmez; retry bekleyen head de bloklar.
+    """
+    __tablename__ = "event_queue"
+
+    id: int | None = Field(default=None, primary_key=True)
+    source_app: str = Field(max_length=20)  # flirt, onlyvips, poker, aurora
+    event_id: str = Field(max_length=100)
+    user_id: int
+    payload: dict = Field(sa_column=Column(QueuePayload, nullable=False))
+
+    status: str = Field(default=EventQueueStatus.PENDING, max_length=20)
+    attempts: int = Field(default=0)
+    available_at: datetime = Field(default_factory=datetime.utcnow, sa_type=DateTime)  # Retry backoff
+    locked_until: Optional[datetime] = Field(default=None, sa_type=DateTime)  # Worker lease
+    last_error: Optional[str] = Field(default=None, max_length=500)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=DateTime)
+
+    __table_args__ = (
+        # Claim taraması: claim edilebilir satırlar id sırasıyla
+        Index('ix_event_queue_status_available', 'status', 'available_at', 'id'),
+        # Kullanıcının daha eski satırı var mı (sıra garantisi)
+        Index('ix_event_queue_user_id', 'user_id', 'id'),
+    )
+
+
+class EventDeadLetter(SQLModel, table=True):
+    """
+    İşlenemeyen queue event'leri.
+
+    Kalıcı hata (4xx) veya EVENT_QUEUE_MAX_ATTEMPTS deneme sonrası queue'dan
+    buraya taşınır; payload aynen saklanır, elle incelenip yeniden
+    kuyruğa alınabilir.
+    """
+    __tablename__ = "event_dead_letters"
+
+    id: int | None = Field(default=None, primary_key=True)
+    queue_id: int
+    source_app: str = Field(max_length=20)
+    event_id: str = Field(max_length=100)
+    user_id: int = Field(index=True)
+    payload: dict = Field(sa_column=Column(QueuePayload, nullable=False))
+
+    attempts: int
+    last_error: Optional[str] = Field(default=None, max_length=500)
+
+    enqueued_at: datetime = Field(sa_type=DateTime)
+    failed_at: datetime = Field(default_factory=datetime.utcnow, sa_type=DateTime, index=True)
@@ -0,0 +1,193 @@
+"""
+NovaCore Events - Durable Event Queue
+
+POST /events/async/* event'i event_queue tablosuna yazar ve hemen 202
+döner; wallet / XP / agency / credit etkileri worker pool'da
+(app.events.worker) uygulanır.
+
+- enqueue_event(): satırı ekle (commit çağıranda)
+- claim_events(): claim edilebilir satırları tek UPDATE ... WHERE id IN
+  (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING ile processing'e çek;
+  lease (locked_until) dolan processing satırları yeniden claim edilir
+- ack / retry / dead-letter: claim'deki attempts değeri fencing token'dır;
+  lease'i kaçırmış (başka worker'ın yeniden claim ettiği) bir worker'ın
+  yazması hiçbir satıra dokunmaz
+- get_queue_depth(): bekleyen / işlenen sayısı + en eski bekleyenin yaşı
+
+Sıra garantisi: bir kullanıcının yalnızca tablodaki en eski satırı
+claim edilebilir. Tamamlanan satırlar silindiği için "daha küçük id'li
+satırı var mı" kontrolü yeterlidir; retry bekleyen head de sonraki
+event'leri bekletir. Bu yüzden bir micro-batch kullanıcı başına en fazla
+bir event içerir.
+
+Sorgular dialect'e bağlı değildir: Postgres'te SKIP LOCKED ile çalışır,
+offline testlerde aynı kod SQLite üzerinde koşar (SQLite FOR UPDATE'i
+yok sayar; tek yazıcı olduğu için claim yine atomiktir).
+"""
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel
+from sqlalchemy import and_, delete, exists, func, insert, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.events.models import EventDeadLetter, EventQueueItem, EventQueueStatus
+from app.events.schemas import AuroraEvent, FlirtEvent, OnlyVipsEvent, PokerEvent
+
+# source_app → payload modeli
+QUEUE_EVENT_MODELS: dict[str, type[BaseModel]] = {
+    "flirt": FlirtEvent,
+    "onlyvips": OnlyVipsEvent,
+    "poker": PokerEvent,
+    "aurora": AuroraEvent,
+}
+
+_queue = EventQueueItem.__table__
+_dead_letters = EventDeadLetter.__table__
+
+
+async def enqueue_event(session: AsyncSession, source_app: str, event: BaseModel) -> int:
+    """Event'i kuyruğa ekle, queue id'sini döndür (commit etmez)."""
+    now = datetime.utcnow()
+    result = await session.execute(
+        insert(_queue)
+        .values(
+            source_app=source_app,
+            event_id=event.event_id,
+            user_id=event.user_id,
+            payload=event.model_dump(mode="json"),
+            status=EventQueueStatus.PENDING,
+            attempts=0,
+            available_at=now,
+            created_at=now,
+        )
+        .returning(_queue.c.id)
+    )
+    return result.scalar_one()
+
+
+def parse_queued_event(item) -> BaseModel:
+    """Queue satırının payload'ını kaynak app'in event modeline çevir."""
+    return QUEUE_EVENT_MODELS[item.source_app].model_validate(item.payload)
+
+
+async def claim_events(
+    session: AsyncSession,
+    limit: int,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> list:
+    """
+    En fazla `limit` event'i bu worker için claim et ve commit et.
+
+    Dönen satırlar id sırasındadır; her birinin attempts değeri bu
+    claim'in fencing token'ıdır.
+    """
+    now = now or datetime.utcnow()
+    earlier = _queue.alias("earlier")
+
+    claimable = (
+        select(_queue.c.id)
+        .where(
+            or_(
+                and_(_queue.c.status == EventQueueStatus.PENDING, _queue.c.available_at <= now),
+                and_(_queue.c.status == EventQueueStatus.PROCESSING, _queue.c.locked_until < now),
+            ),
+            ~exists().where(earlier.c.user_id == _queue.c.user_id, earlier.c.id < _queue.c.id),
+        )
+        .order_by(_queue.c.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        update(_queue)
+        .where(_queue.c.id.in_(claimable))
+        .values(
+            status=EventQueueStatus.PROCESSING,
+            locked_until=now + timedelta(seconds=lease_seconds),
+            attempts=_queue.c.attempts + 1,
+        )
+        .returning(*_queue.c)
+    )
+    items = sorted(result.all(), key=lambda row: row.id)
+    await session.commit()
+    return items
+
+
+def _fenced(item):
+    return and_(_queue.c.id == item.id, _queue.c.attempts == item.attempts)
+
+
+async def ack_event(session: AsyncSession, item) -> bool:
+    """İşlenen event'i kuyruktan sil. False: lease kaybedilmiş."""
+    result = await session.execute(delete(_queue).where(_fenced(item)))
+    return result.rowcount == 1
+
+
+async def retry_event(
+    session: AsyncSession,
+    item,
+    error: str,
+    delay_seconds: float,
+    now: datetime | None = None,
+) -> bool:
+    """Event'i `delay_seconds` sonra tekrar denenecek şekilde pending'e al."""
+    now = now or datetime.utcnow()
+    result = await session.execute(
+        update(_queue)
+        .where(_fenced(item))
+        .values(
+            status=EventQueueStatus.PENDING,
+            available_at=now + timedelta(seconds=delay_seconds),
+            locked_until=None,
+            last_error=error[:500],
+        )
+    )
+    return result.rowcount == 1
+
+
+async def dead_letter_event(
+    session: AsyncSession,
+    item,
+    error: str,
+    now: datetime | None = None,
+) -> bool:
+    """Event'i kuyruktan event_dead_letters'a taşı."""
+    if not await ack_event(session, item):
+        return False
+
+    await session.execute(
+        insert(_dead_letters).values(
+            queue_id=item.id,
+            source_app=item.source_app,
+            event_id=item.event_id,
+            user_id=item.user_id,
+            payload=item.payload,
+            attempts=item.attempts,
+            last_error=error[:500],
+            enqueued_at=item.created_at,
+            failed_at=now or datetime.utcnow(),
+        )
+    )
+    return True
+
+
+async def get_queue_depth(session: AsyncSession, now: datetime | None = None) -> dict:
+    """Bekleyen / işlenen satır sayısı ve en eski bekleyen event'in yaşı (lag)."""
+    now = now or datetime.utcnow()
+    rows = (
+        await session.execute(
+            select(_queue.c.status, func.count(), func.min(_queue.c.created_at))
+            .group_by(_queue.c.status)
+        )
+    ).all()
+    counts = {status: (count, oldest) for status, count, oldest in rows}
+    oldest = min((o for _, o in counts.values() if o is not None), default=None)
+    dead_letters = (await session.execute(select(func.count()).select_from(_dead_letters))).scalar()
+
+    return {
+        "pending": counts.get(EventQueueStatus.PENDING, (0, None))[0],
+        "processing": counts.get(EventQueueStatus.PROCESSING, (0, None))[0],
+        "dead_letters": dead_letters or 0,
+        "oldest_age_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+    }
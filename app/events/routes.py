@@ -1,18 +1,31 @@
 """
 NovaCore Events Routes - App Event Ingest Endpoints
+
+Her event partner'ın verdiği event_id ile idempotent'tir: aynı event_id
+ile gelen retry etkileri tekrar uygulamaz, ilk sonucu duplicate=true ile
+döner. Aynı event_id farklı bir event için kullanılırsa 409.
+
+Senkron endpoint'ler performer_id / user_id lane'inde (app.events.lanes)
+işlenir: aynı key'e eşzamanlı gelen event'ler sırayla ve tek transaction'da
+uygulanır, farklı key'ler paralel çalışır.
+
+/events/async/* aynı payload'ı kuyruğa yazıp 202 döner; etkiler worker
+pool'da (app.events.worker) kullanıcı başına sırayla uygulanır.
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_session
 from app.events.schemas import (
     AuroraEvent,
+    EventAccepted,
     EventResult,
     FlirtEvent,
     OnlyVipsEvent,
     PokerEvent,
 )
-from app.events.service import EventService
+from app.events.lanes import process_in_lane
+from app.events.queue import enqueue_event
 
 router = APIRouter(prefix="/api/v1/events", tags=["events"])
 
@@ -23,10 +36,7 @@ router = APIRouter(prefix="/api/v1/events", tags=["events"])
     summary="FlirtMarket Event",
     description="Process FlirtMarket event (coin spent, show purchase, tip, gift).",
 )
-async def handle_flirt_event(
-    event: FlirtEvent,
-    session: AsyncSession = Depends(get_session),
-) -> EventResult:
+async def handle_flirt_event(event: FlirtEvent) -> EventResult:
     """
     Process FlirtMarket event.
     
@@ -43,8 +53,7 @@ async def handle_flirt_event(
     - Calculates revenue split (performer/agency/treasury)
     - Records performer earnings
     """
-    service = EventService(session)
-    return await service.handle_flirt_event(event)
+    return await process_in_lane("flirt", event)
 
 
 @router.post(
@@ -53,10 +62,7 @@ async def handle_flirt_event(
     summary="OnlyVips Event",
     description="Process OnlyVips event (premium, content, quest, streak).",
 )
-async def handle_onlyvips_event(
-    event: OnlyVipsEvent,
-    session: AsyncSession = Depends(get_session),
-) -> EventResult:
+async def handle_onlyvips_event(event: OnlyVipsEvent) -> EventResult:
     """
     Process OnlyVips event.
     
@@ -72,8 +78,7 @@ async def handle_onlyvips_event(
     - Awards XP for activity
     - Calculates revenue split for performer content
     """
-    service = EventService(session)
-    return await service.handle_onlyvips_event(event)
+    return await process_in_lane("onlyvips", event)
 
 
 @router.post(
@@ -82,10 +87,7 @@ async def handle_onlyvips_event(
     summary="PokerVerse Event",
     description="Process PokerVerse event (buy-in, cash-out, rake, tournament).",
 )
-async def handle_poker_event(
-    event: PokerEvent,
-    session: AsyncSession = Depends(get_session),
-) -> EventResult:
+async def handle_poker_event(event: PokerEvent) -> EventResult:
     """
     Process PokerVerse event.
     
@@ -101,8 +103,7 @@ async def handle_poker_event(
     - Rake goes to treasury
     - Awards XP for profitable sessions
     """
-    service = EventService(session)
-    return await service.handle_poker_event(event)
+    return await process_in_lane("poker", event)
 
 
 @router.post(
@@ -111,10 +112,7 @@ async def handle_poker_event(
     summary="Aurora AI Event",
     description="Process Aurora AI event (chat, image, voice, token burn).",
 )
-async def handle_aurora_event(
-    event: AuroraEvent,
-    session: AsyncSession = Depends(get_session),
-) -> EventResult:
+async def handle_aurora_event(event: AuroraEvent) -> EventResult:
     """
     Process Aurora AI event.
     
@@ -129,6 +127,72 @@ async def handle_aurora_event(
     - Awards XP based on tokens used
     - Calculates revenue split for AI performers
     """
-    service = EventService(session)
-    return await service.handle_aurora_event(event)
+    return await process_in_lane("aurora", event)
+
+
+# ============ Async Ingest (Queue) ============
+async def _accept(session: AsyncSession, source_app: str, event) -> EventAccepted:
+    queue_id = await enqueue_event(session, source_app, event)
+    # 202 yalnızca event kalıcı olarak yazıldıktan sonra dönsün
+    await session.commit()
+    return EventAccepted(queue_id=queue_id, source_app=source_app, event_id=event.event_id)
+
+
+@router.post(
+    "/async/flirt",
+    response_model=EventAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="FlirtMarket Event (Async)",
+    description="Queue a FlirtMarket event; effects are applied by the event queue workers.",
+)
+async def enqueue_flirt_event(
+    event: FlirtEvent,
+    session: AsyncSession = Depends(get_session),
+) -> EventAccepted:
+    """Queue FlirtMarket event."""
+    return await _accept(session, "flirt", event)
+
+
+@router.post(
+    "/async/onlyvips",
+    response_model=EventAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="OnlyVips Event (Async)",
+    description="Queue an OnlyVips event; effects are applied by the event queue workers.",
+)
+async def enqueue_onlyvips_event(
+    event: OnlyVipsEvent,
+    session: AsyncSession = Depends(get_session),
+) -> EventAccepted:
+    """Queue OnlyVips event."""
+    return await _accept(session, "onlyvips", event)
+
+
+@router.post(
+    "/async/poker",
+    response_model=EventAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="PokerVerse Event (Async)",
+    description="Queue a PokerVerse event; effects are applied by the event queue workers.",
+)
+async def enqueue_poker_event(
+    event: PokerEvent,
+    session: AsyncSession = Depends(get_session),
+) -> EventAccepted:
+    """Queue PokerVerse event."""
+    return await _accept(session, "poker", event)
+
 
+@router.post(
+    "/async/aurora",
+    response_model=EventAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Aurora AI Event (Async)",
+    description="Queue an Aurora AI event; effects are applied by the event queue workers.",
+)
+async def enqueue_aurora_event(
+    event: AuroraEvent,
+    session: AsyncSession = Depends(get_session),
+) -> EventAccepted:
+    """Queue Aurora AI event."""
+    return await _accept(session, "aurora", event)
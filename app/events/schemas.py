@@ -20,6 +20,7 @@ class FlirtEventType(str, Enum):
 class FlirtEvent(BaseModel):
     """FlirtMarket event payload."""
 
+    event_id: str = Field(..., min_length=1, max_length=100)  # Idempotency key
     event_type: FlirtEventType
     user_id: int
     performer_id: int | None = None
@@ -42,6 +43,7 @@ class OnlyVipsEventType(str, Enum):
 class OnlyVipsEvent(BaseModel):
     """OnlyVips event payload."""
 
+    event_id: str = Field(..., min_length=1, max_length=100)  # Idempotency key
     event_type: OnlyVipsEventType
     user_id: int
     performer_id: int | None = None
@@ -64,6 +66,7 @@ class PokerEventType(str, Enum):
 class PokerEvent(BaseModel):
     """PokerVerse event payload."""
 
+    event_id: str = Field(..., min_length=1, max_length=100)  # Idempotency key
     event_type: PokerEventType
     user_id: int
     amount: Decimal = Field(..., gt=0)
@@ -83,6 +86,7 @@ class AuroraEventType(str, Enum):
 class AuroraEvent(BaseModel):
     """Aurora AI event payload."""
 
+    event_id: str = Field(..., min_length=1, max_length=100)  # Idempotency key
     event_type: AuroraEventType
     user_id: int
     performer_id: int | None = None  # AI performer
@@ -106,3 +110,15 @@ class EventResult(BaseModel):
     revenue_split: dict | None = None  # performer/agency/treasury split
     message: str | None = None
 
+    # Idempotency: aynı event_id ile gelen retry saklanan sonucu alır
+    event_id: str | None = None
+    duplicate: bool = False
+
+
+class EventAccepted(BaseModel):
+    """Async ingest yanıtı: event kuyruğa yazıldı, sonra işlenecek."""
+
+    queue_id: int
+    source_app: str
+    event_id: str
+    status: Literal["queued"] = "queued"
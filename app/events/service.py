@@ -7,16 +7,25 @@ Flow:
    - wallet.tx işler
    - xp_loyalty.event işler
    - nova_credit.process_event çağırır
+   - (source_app, event_id) processed_events'e yazılır; retry'lar
+     etkileri tekrar uygulamadan saklanan sonucu alır
 3. nova_credit:
    - ΔNovaCredit hesaplar
    - CitizenScore günceller
 """
+from collections.abc import Awaitable, Callable
+from datetime import datetime
 from decimal import Decimal
 
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
 
 from app.agency.service import AgencyService
 from app.core.logging import get_logger
+from app.events.models import ProcessedEvent
 from app.events.schemas import (
     AuroraEvent,
     AuroraEventType,
@@ -37,6 +46,8 @@ from app.xp_loyalty.service import XpLoyaltyService
 
 logger = get_logger("events")
 
+AppEvent = FlirtEvent | OnlyVipsEvent | PokerEvent | AuroraEvent
+
 
 class EventService:
     """Event processing service."""
@@ -48,8 +59,92 @@ class EventService:
         self.agency = AgencyService(session)
         self.credit = NovaCreditService(session)  # NovaCredit engine
 
-    # ============ FlirtMarket Events ============
+    # ============ Idempotent Ingest ============
     async def handle_flirt_event(self, event: FlirtEvent) -> EventResult:
+        """Process FlirtMarket event once per event_id."""
+        return await self._ingest("flirt", event, self._process_flirt_event)
+
+    async def handle_onlyvips_event(self, event: OnlyVipsEvent) -> EventResult:
+        """Process OnlyVips event once per event_id."""
+        return await self._ingest("onlyvips", event, self._process_onlyvips_event)
+
+    async def handle_poker_event(self, event: PokerEvent) -> EventResult:
+        """Process PokerVerse event once per event_id."""
+        return await self._ingest("poker", event, self._process_poker_event)
+
+    async def handle_aurora_event(self, event: AuroraEvent) -> EventResult:
+        """Process Aurora AI event once per event_id."""
+        return await self._ingest("aurora", event, self._process_aurora_event)
+
+    async def _ingest(
+        self,
+        source_app: str,
+        event: AppEvent,
+        process: Callable[[AppEvent], Awaitable[EventResult]],
+    ) -> EventResult:
+        """
+        Claim (source_app, event_id), process, store the result.
+
+        INSERT ... ON CONFLICT DO NOTHING RETURNING: the first delivery gets
+        the row and applies the effects in the same transaction; a retry
+        racing an uncommitted first delivery waits on the unique index, and
+        any later retry gets the stored EventResult with duplicate=True.
+        """
+        claimed = await self.session.execute(
+            pg_insert(ProcessedEvent.__table__)
+            .values(
+                source_app=source_app,
+                event_id=event.event_id,
+                event_type=event.event_type.value,
+                user_id=event.user_id,
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["source_app", "event_id"])
+            .returning(ProcessedEvent.__table__.c.id)
+        )
+        claim_id = claimed.scalar()
+        if claim_id is None:
+            return await self._replay(source_app, event)
+
+        result = await process(event)
+        result.event_id = event.event_id
+
+        await self.session.execute(
+            update(ProcessedEvent.__table__)
+            .where(ProcessedEvent.__table__.c.id == claim_id)
+            .values(result=result.model_dump(mode="json"))
+        )
+        return result
+
+    async def _replay(self, source_app: str, event: AppEvent) -> EventResult:
+        """Return the stored result of an already processed event_id."""
+        row = (
+            await self.session.execute(
+                select(ProcessedEvent.event_type, ProcessedEvent.user_id, ProcessedEvent.result)
+                .where(
+                    ProcessedEvent.source_app == source_app,
+                    ProcessedEvent.event_id == event.event_id,
+                )
+            )
+        ).one()
+
+        if row.event_type != event.event_type.value or row.user_id != event.user_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="event_id already used for a different event",
+            )
+
+        logger.info(
+            "event_duplicate",
+            source_app=source_app,
+            event_id=event.event_id,
+            event_type=row.event_type,
+            user_id=row.user_id,
+        )
+        return EventResult.model_validate({**row.result, "duplicate": True})
+
+    # ============ FlirtMarket Events ============
+    async def _process_flirt_event(self, event: FlirtEvent) -> EventResult:
         """Process FlirtMarket event."""
         ncr_change = Decimal("0")
         xp_change = 0
@@ -126,6 +221,7 @@ class EventService:
             user_id=event.user_id,
             event_type=event.event_type.value,
             source_app="flirt",
+            event_id=event.event_id,
             context={"performer_id": event.performer_id, **event.metadata},
         )
 
@@ -168,7 +264,7 @@ class EventService:
         return base_xp + bonuses.get(event.event_type, 0)
 
     # ============ OnlyVips Events ============
-    async def handle_onlyvips_event(self, event: OnlyVipsEvent) -> EventResult:
+    async def _process_onlyvips_event(self, event: OnlyVipsEvent) -> EventResult:
         """Process OnlyVips event."""
         ncr_change = Decimal("0")
         xp_change = 0
@@ -233,6 +329,7 @@ class EventService:
             user_id=event.user_id,
             event_type=event.event_type.value,
             source_app="onlyvips",
+            event_id=event.event_id,
             context={"performer_id": event.performer_id, **event.metadata},
         )
 
@@ -269,7 +366,7 @@ class EventService:
         return xp_map.get(event.event_type, 0)
 
     # ============ PokerVerse Events ============
-    async def handle_poker_event(self, event: PokerEvent) -> EventResult:
+    async def _process_poker_event(self, event: PokerEvent) -> EventResult:
         """Process PokerVerse event."""
         ncr_change = Decimal("0")
         xp_change = 0
@@ -390,6 +487,7 @@ class EventService:
             user_id=event.user_id,
             event_type=event.event_type.value,
             source_app="poker",
+            event_id=event.event_id,
             context={"table_id": event.table_id, "hand_id": event.hand_id, **event.metadata},
         )
 
@@ -415,7 +513,7 @@ class EventService:
         )
 
     # ============ Aurora Events ============
-    async def handle_aurora_event(self, event: AuroraEvent) -> EventResult:
+    async def _process_aurora_event(self, event: AuroraEvent) -> EventResult:
         """Process Aurora AI event."""
         ncr_change = Decimal("0")
         xp_change = 0
@@ -476,6 +574,7 @@ class EventService:
             user_id=event.user_id,
             event_type=event.event_type.value,
             source_app="aurora",
+            event_id=event.event_id,
             context={
                 "performer_id": event.performer_id,
                 "ai_profile_id": event.ai_profile_id,
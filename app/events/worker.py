@@ -0,0 +1,256 @@
+"""
+NovaCore Events - Queue Worker Pool
+
+event_queue'yu EVENT_QUEUE_WORKERS asyncio task'ı ile boşaltır.
+
+Her worker döngüsü:
+1. claim_events(): EVENT_QUEUE_BATCH_SIZE kadar event (kullanıcı başına
+   en fazla bir) kendi kısa transaction'ında claim edilir
+2. Event'ler tek session'da sırayla işlenir; her biri SAVEPOINT içinde
+   EventService'ten geçer, başarılıysa satırı silinir. Başarısız
+   event'in commit'e buffer'lanmış sayaç delta'ları (treasury_totals,
+   rollup, leaderboard, risk_score) savepoint'le birlikte geri alınır
+   (app.core.session_buffers)
+3. Hata:
+   - HTTPException 4xx (yetersiz bakiye, 409 ...) kalıcıdır → dead-letter
+   - diğerleri → backoff ile retry; EVENT_QUEUE_MAX_ATTEMPTS sonra
+     dead-letter
+4. Batch tek commit'le kapanır; commit olmazsa lease dolunca event'ler
+   yeniden claim edilir (etkiler processed_events ile idempotent)
+
+Metrikler (/api/v1/admin/metrics):
+- timings: event_queue.lag (enqueue → işleme başlangıcı),
+  event_queue.process (event başına), event_queue.batch
+- queues.event_queue: sayaçlar + periyodik depth / en eski bekleyen yaşı
+"""
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import observe, timed
+from app.events.queue import (
+    ack_event,
+    claim_events,
+    dead_letter_event,
+    get_queue_depth,
+    parse_queued_event,
+    retry_event,
+)
+
+logger = get_logger("event_queue")
+
+# Depth sorgusu en fazla bu aralıkla çalışır (worker'lar arasında paylaşılır)
+DEPTH_REFRESH_SECONDS = 5.0
+
+# Retry backoff tavanı
+MAX_RETRY_DELAY_SECONDS = 300.0
+
+QueueProcessor = Callable[[AsyncSession, object], Awaitable[object]]
+
+
+async def process_queued_event(session: AsyncSession, item) -> object:
+    """Queue satırını ilgili EventService handler'ından geçir."""
+    from app.events.service import EventService
+
+    event = parse_queued_event(item)
+    handler = getattr(EventService(session), f"handle_{item.source_app}_event")
+    return await handler(event)
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Tekrar denemekle düzelmeyecek hatalar (4xx)."""
+    return isinstance(error, HTTPException) and 400 <= error.status_code < 500
+
+
+class EventQueueWorkerPool:
+    """event_queue'yu boşaltan asyncio worker'ları + sayaçlar."""
+
+    def __init__(
+        self,
+        session_factory,
+        workers: int | None = None,
+        batch_size: int | None = None,
+        processor: QueueProcessor = process_queued_event,
+        poll_interval: float | None = None,
+        lease_seconds: float | None = None,
+        max_attempts: int | None = None,
+        retry_base_seconds: float | None = None,
+    ):
+        self.session_factory = session_factory
+        self.workers = settings.EVENT_QUEUE_WORKERS if workers is None else workers
+        self.batch_size = batch_size or settings.EVENT_QUEUE_BATCH_SIZE
+        self.processor = processor
+        self.poll_interval = (
+            settings.EVENT_QUEUE_POLL_INTERVAL_SECONDS if poll_interval is None else poll_interval
+        )
+        self.lease_seconds = lease_seconds or settings.EVENT_QUEUE_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.EVENT_QUEUE_MAX_ATTEMPTS
+        self.retry_base_seconds = (
+            settings.EVENT_QUEUE_RETRY_BASE_SECONDS if retry_base_seconds is None else retry_base_seconds
+        )
+
+        self._tasks: list[asyncio.Task] = []
+        self._depth: dict = {}
+        self._depth_checked_at = 0.0
+        self.batches = 0
+        self.claimed = 0
+        self.processed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.lost_leases = 0
+        self.failed_batches = 0
+
+    def retry_delay(self, attempts: int) -> float:
+        """Üstel backoff: base × 2^(attempts-1), tavanlı."""
+        return min(self.retry_base_seconds * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+    async def run_once(self) -> int:
+        """Bir batch claim edip işle; claim edilen event sayısını döndür."""
+        async with self.session_factory() as session:
+            items = await claim_events(session, self.batch_size, self.lease_seconds)
+        if not items:
+            return 0
+
+        self.batches += 1
+        self.claimed += len(items)
+        outcome = {"processed": 0, "retried": 0, "dead_lettered": 0, "lost_leases": 0}
+
+        with timed("event_queue.batch"):
+            async with self.session_factory() as session:
+                try:
+                    for item in items:
+                        await self._process_item(session, item, outcome)
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    self.failed_batches += 1
+                    logger.warning("event_queue_batch_failed", size=len(items), error=str(e))
+                    return len(items)
+
+        self.processed += outcome["processed"]
+        self.retried += outcome["retried"]
+        self.dead_lettered += outcome["dead_lettered"]
+        self.lost_leases += outcome["lost_leases"]
+        return len(items)
+
+    async def _process_item(self, session: AsyncSession, item, outcome: dict) -> None:
+        observe("event_queue.lag", (datetime.utcnow() - item.created_at).total_seconds())
+
+        started = time.perf_counter()
+        try:
+            async with session.begin_nested():
+                await self.processor(session, item)
+                acked = await ack_event(session, item)
+        except Exception as e:
+            observe("event_queue.process", time.perf_counter() - started, error=True)
+            error = f"{type(e).__name__}: {getattr(e, 'detail', None) or e}"
+
+            if is_permanent_error(e) or item.attempts >= self.max_attempts:
+                moved = await dead_letter_event(session, item, error)
+                outcome["dead_lettered" if moved else "lost_leases"] += 1
+                logger.warning(
+                    "event_dead_lettered",
+                    queue_id=item.id,
+                    source_app=item.source_app,
+                    event_id=item.event_id,
+                    attempts=item.attempts,
+                    error=error,
+                )
+            else:
+                moved = await retry_event(session, item, error, self.retry_delay(item.attempts))
+                outcome["retried" if moved else "lost_leases"] += 1
+            return
+
+        observe("event_queue.process", time.perf_counter() - started)
+        outcome["processed" if acked else "lost_leases"] += 1
+
+    async def refresh_depth(self, force: bool = False) -> dict:
+        """Queue depth'i en fazla DEPTH_REFRESH_SECONDS'ta bir ölç."""
+        now = time.monotonic()
+        if force or now - self._depth_checked_at >= DEPTH_REFRESH_SECONDS:
+            self._depth_checked_at = now
+            async with self.session_factory() as session:
+                self._depth = await get_queue_depth(session)
+        return self._depth
+
+    async def _worker_loop(self, worker_no: int) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+                if worker_no == 0:
+                    await self.refresh_depth()
+            except Exception as e:
+                claimed = 0
+                logger.warning("event_queue_worker_failed", worker=worker_no, error=str(e))
+            if not claimed:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Worker task'larını başlat."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker_loop(n)) for n in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Worker task'larını durdur (yarım kalan batch lease dolunca tekrar claim edilir)."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def stats(self) -> dict:
+        """Sayaçlar + son ölçülen depth."""
+        return {
+            "workers": len(self._tasks),
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "claimed": self.claimed,
+            "processed": self.processed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "lost_leases": self.lost_leases,
+            "failed_batches": self.failed_batches,
+            "depth": self._depth,
+        }
+
+
+_pool: EventQueueWorkerPool | None = None
+
+
+def start_event_queue_workers() -> None:
+    """Worker pool'u background task'lar olarak başlat (EVENT_QUEUE_WORKERS > 0)."""
+    global _pool
+    if settings.EVENT_QUEUE_WORKERS > 0 and _pool is None:
+        from app.core.db import async_session_factory
+
+        _pool = EventQueueWorkerPool(async_session_factory)
+        _pool.start()
+        logger.info(
+            "event_queue_workers_started",
+            workers=_pool.workers,
+            batch_size=_pool.batch_size,
+        )
+
+
+async def stop_event_queue_workers() -> None:
+    """Worker pool'u durdur."""
+    global _pool
+    if _pool is None:
+        return
+    await _pool.stop()
+    _pool = None
+
+
+def get_event_queue_stats() -> dict:
+    """Bu process'teki worker pool'un sayaçları."""
+    return _pool.stats() if _pool is not None else {"workers": 0}
@@ -18,6 +18,7 @@ from app.identity.schemas import (
     TelegramAuthPayload,
 )
 from app.telegram_gateway.models import TelegramAccount
+from app.telegram_gateway.user_hydration import invalidate_user_display
 
 router = APIRouter(prefix="/api/v1/identity", tags=["identity"])
 
@@ -147,6 +148,7 @@ async def link_telegram_account(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    invalidate_user_display(current_user.id)
     
     return UserResponse.model_validate(current_user)
 
@@ -0,0 +1,185 @@
+"""
+Aurora Justice CP Decay - scheduled bulk decay sweeper
+
+CP decay eskiden sadece kullanıcının CP'si okunduğunda (lazy) yazılıyordu:
+okumalar yazıya dönüşüyor, hiç bakılmayan kullanıcıların regime geçişleri
+hiç olmuyordu. Bu modül:
+
+- sweep_cp_decay(): user_id aralıklarıyla (chunk) tek bir set-based UPDATE;
+  decay geçen süreye göre SQL'de hesaplanır, regime policy eşikleriyle
+  SQL CASE üzerinden yeniden hesaplanır. Policy eşikleri değiştiyse
+  decay'i olmayan satırların regime'i de düzeltilir.
+- project_decay(): okuma yolunun yazmadan gösterdiği "etkin" CP / regime
+  (sweep'ler arasındaki birikmiş decay dahil).
+
+Decay formülü eski _apply_decay ile aynıdır:
+    decay = floor(elapsed_days * decay_per_day); decay >= 1 ise
+    cp = max(0, cp - decay), last_updated_at = now
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, and_, case, cast, func, literal, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.justice.models import UserCpState
+from app.justice.policy import regime_for_cp
+from app.justice.policy_models import JusticePolicyParams
+from app.justice.policy_service import PolicyService
+
+logger = get_logger("justice_decay")
+
+_sweeper_task: asyncio.Task | None = None
+
+
+def project_decay(
+    state: UserCpState,
+    policy: JusticePolicyParams,
+    now: datetime | None = None,
+) -> tuple[int, str]:
+    """State'e bekleyen decay uygulanmış (cp_value, regime) - yazmaz."""
+    now = now or datetime.utcnow()
+    elapsed_days = (now - state.last_updated_at).total_seconds() / 86400.0
+    decay_amount = int(elapsed_days * policy.decay_per_day)
+
+    if decay_amount <= 0:
+        return state.cp_value, regime_for_cp(state.cp_value, policy)
+
+    cp_value = max(0, state.cp_value - decay_amount)
+    return cp_value, regime_for_cp(cp_value, policy)
+
+
+def _regime_case(cp, policy: JusticePolicyParams):
+    """regime_for_cp'nin SQL CASE karşılığı."""
+    return case(
+        (cp >= policy.threshold_lockdown, "LOCKDOWN"),
+        (cp >= policy.threshold_restricted, "RESTRICTED"),
+        (cp >= policy.threshold_probation, "PROBATION"),
+        (cp >= policy.threshold_soft_flag, "SOFT_FLAG"),
+        else_="NORMAL",
+    )
+
+
+def _decay_update(policy: JusticePolicyParams, now: datetime, lower: str | None, upper: str):
+    """(lower, upper] user_id aralığı için decay + regime UPDATE'i."""
+    cp_state = UserCpState.__table__
+    now_param = literal(now, DateTime)
+
+    elapsed_days = func.extract("epoch", now_param - cp_state.c.last_updated_at) / 86400.0
+    decay_amount = cast(func.floor(elapsed_days * policy.decay_per_day), Integer)
+    decay_due = and_(cp_state.c.cp_value > 0, decay_amount >= 1)
+    new_cp = func.greatest(cp_state.c.cp_value - func.greatest(decay_amount, 0), 0)
+
+    where = [cp_state.c.user_id <= upper]
+    if lower is not None:
+        where.append(cp_state.c.user_id > lower)
+
+    return (
+        update(cp_state)
+        .where(
+            *where,
+            or_(decay_due, cp_state.c.regime != _regime_case(cp_state.c.cp_value, policy)),
+        )
+        .values(
+            cp_value=new_cp,
+            regime=_regime_case(new_cp, policy),
+            last_updated_at=case((decay_due, now_param), else_=cp_state.c.last_updated_at),
+        )
+    )
+
+
+async def sweep_cp_decay(
+    session: AsyncSession,
+    chunk_size: int | None = None,
+    now: datetime | None = None,
+) -> dict:
+    """
+    Tüm UserCpState satırlarına decay uygula.
+
+    user_id sırasıyla chunk_size'lık aralıklar halinde ilerler; her chunk
+    kendi transaction'ında commit edilir, böylece kilitler kısa tutulur.
+
+    Returns:
+        {"scanned", "updated", "chunks", "seconds"}
+    """
+    chunk_size = chunk_size or settings.JUSTICE_DECAY_SWEEP_CHUNK
+    now = now or datetime.utcnow()
+    policy = await PolicyService(session).get_active_policy()
+    await session.commit()
+
+    started = time.perf_counter()
+    scanned = updated = chunks = 0
+    lower: str | None = None
+
+    while True:
+        # Sonraki chunk'ın üst sınırı (PK index-only scan)
+        bounds = select(UserCpState.user_id).order_by(UserCpState.user_id).limit(chunk_size)
+        if lower is not None:
+            bounds = bounds.where(UserCpState.user_id > lower)
+        bounds = bounds.subquery()
+        result = await session.execute(select(func.max(bounds.c.user_id), func.count()))
+        upper, count = result.one()
+        if upper is None:
+            break
+
+        result = await session.execute(_decay_update(policy, now, lower, upper))
+        await session.commit()
+
+        scanned += count
+        updated += result.rowcount
+        chunks += 1
+        lower = upper
+
+    seconds = time.perf_counter() - started
+    logger.info(
+        "cp_decay_swept",
+        policy_version=policy.version,
+        scanned=scanned,
+        updated=updated,
+        chunks=chunks,
+        seconds=round(seconds, 3),
+    )
+    return {"scanned": scanned, "updated": updated, "chunks": chunks, "seconds": seconds}
+
+
+async def run_cp_decay_sweeper_loop() -> None:
+    """Sweep'i JUSTICE_DECAY_SWEEP_INTERVAL_SECONDS aralıkla çalıştır."""
+    from app.core.db import async_session_factory
+
+    while True:
+        try:
+            async with async_session_factory() as session:
+                await sweep_cp_decay(session)
+        except Exception as e:
+            logger.warning("cp_decay_sweep_failed", error=str(e))
+        await asyncio.sleep(settings.JUSTICE_DECAY_SWEEP_INTERVAL_SECONDS)
+
+
+def start_cp_decay_sweeper() -> None:
+    """Decay sweeper'ı background task olarak başlat."""
+    global _sweeper_task
+    if settings.JUSTICE_DECAY_SWEEP_INTERVAL_SECONDS > 0 and _sweeper_task is None:
+        _sweeper_task = asyncio.create_task(run_cp_decay_sweeper_loop())
+        logger.info(
+            "cp_decay_sweeper_started",
+            interval=settings.JUSTICE_DECAY_SWEEP_INTERVAL_SECONDS,
+            chunk=settings.JUSTICE_DECAY_SWEEP_CHUNK,
+        )
+
+
+async def stop_cp_decay_sweeper() -> None:
+    """Decay sweeper'ı durdur."""
+    global _sweeper_task
+    if _sweeper_task is None:
+        return
+
+    _sweeper_task.cancel()
+    try:
+        await _sweeper_task
+    except asyncio.CancelledError:
+        pass
+    _sweeper_task = None
@@ -147,6 +147,52 @@ def regime_for_cp(
 
 
 
+# Policy'de özel ayar yokken kullanılan severity çarpanları
+DEFAULT_SEVERITY_MULTIPLIER = {1: 0.5, 2: 1.0, 3: 1.5, 4: 2.0, 5: 3.0}
+
+# Kategori ağırlığından bağımsız minimum CP (ağır ihlaller)
+CP_CODE_FLOORS = {
+    "SYS_EXPLOIT": 60,
+    "TRUST_MULTIPLE_ACCOUNTS": 80,
+}
+
+
+def cp_weight_for_violation(
+    policy: "JusticePolicyParams",
+    category: str,
+    severity: int,
+    code: str,
+) -> int:
+    """
+    CP weight for a violation using DAO-controlled parameters.
+
+    Pure function; JusticeService and the policy simulator share it.
+    """
+    base_map = {
+        "EKO": policy.base_eko,
+        "COM": policy.base_com,
+        "SYS": policy.base_sys,
+        "TRUST": policy.base_trust,
+    }
+    base = base_map.get(category, policy.base_eko)
+
+    if severity in DEFAULT_SEVERITY_MULTIPLIER:
+        multiplier = policy.severity_multiplier.get(
+            str(severity), DEFAULT_SEVERITY_MULTIPLIER[severity]
+        )
+    else:
+        multiplier = 1.0
+
+    cp = int(base * multiplier)
+
+    floor = CP_CODE_FLOORS.get(code)
+    if floor is not None:
+        cp = max(cp, floor)
+
+    return cp
+
+
+
 def is_action_allowed(regime: Regime, action: str) -> bool:
 
     """Check if an action is allowed for a given regime."""
@@ -0,0 +1,111 @@
+"""
+Aurora Justice Policy Cache - process-wide active policy cache
+
+Aktif JusticePolicyParams her CP okuması, violation ve decay'de okunur;
+politika ise sadece DAO sync / admin güncellemesinde değişir.
+
+- TTL içinde: DB'ye hiç gidilmez
+- TTL dolunca: sadece aktif policy id'sini okuyan ucuz version-check;
+  id aynıysa cache uzatılır, değiştiyse tam satır yeniden yüklenir
+- create_policy_version bu process'te cache'i anında düşürür; diğer
+  worker'lar (ve sync_dao_policy.py gibi ayrı process'ler) değişikliği
+  en geç bir TTL sonra version-check ile görür
+"""
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.justice.policy_models import JusticePolicyParams
+
+logger = get_logger("justice_policy_cache")
+
+# Aktif policy yokken kullanılan version anahtarı
+DEFAULT_POLICY_KEY = 0
+
+
+class PolicyCache:
+    """Aktif policy'nin process-wide snapshot'ı + hit/miss sayaçları."""
+
+    def __init__(self):
+        self._policy: Optional[JusticePolicyParams] = None
+        self._policy_key: Optional[int] = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.invalidations = 0
+
+    def invalidate(self) -> None:
+        """Cache'i düşür; sonraki okuma tam yükleme yapar."""
+        self._policy = None
+        self._policy_key = None
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Sayaçlar ve cache'teki version."""
+        return {
+            "version": self._policy.version if self._policy else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "version_checks": self.version_checks,
+            "invalidations": self.invalidations,
+        }
+
+    async def get(self, session: AsyncSession) -> Optional[JusticePolicyParams]:
+        """
+        Cache'teki aktif policy'yi döndür (None = aktif policy yok, default kullanılmalı).
+
+        Cache boşsa veya version değiştiyse aktif satırı yükler.
+        """
+        now = time.monotonic()
+
+        if self._policy_key is not None:
+            if now - self._checked_at < settings.JUSTICE_POLICY_CACHE_TTL_SECONDS:
+                self.hits += 1
+                return self._policy
+
+            self.version_checks += 1
+            result = await session.execute(
+                select(JusticePolicyParams.id)
+                .where(JusticePolicyParams.active == True)
+                .order_by(JusticePolicyParams.synced_at.desc())
+                .limit(1)
+            )
+            if (result.scalar() or DEFAULT_POLICY_KEY) == self._policy_key:
+                self._checked_at = now
+                self.hits += 1
+                return self._policy
+
+        self.misses += 1
+        result = await session.execute(
+            select(JusticePolicyParams)
+            .where(JusticePolicyParams.active == True)
+            .order_by(JusticePolicyParams.synced_at.desc())
+            .limit(1)
+        )
+        policy = result.scalars().first()
+
+        # Session'dan bağımsız kopya: request'ler arasında paylaşılır
+        self._policy = JusticePolicyParams(**policy.model_dump()) if policy else None
+        self._policy_key = policy.id if policy else DEFAULT_POLICY_KEY
+        self._checked_at = now
+
+        logger.info("justice_policy_loaded", **self.stats())
+        return self._policy
+
+
+policy_cache = PolicyCache()
+
+
+def invalidate_policy_cache() -> None:
+    """Bu process'teki policy cache'ini düşür."""
+    policy_cache.invalidate()
+
+
+def get_policy_cache_stats() -> dict:
+    """Policy cache hit/miss sayaçları."""
+    return policy_cache.stats()
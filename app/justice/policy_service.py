@@ -5,6 +5,7 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.justice.policy_cache import invalidate_policy_cache, policy_cache
 from app.justice.policy_models import JusticePolicyParams
 
 
@@ -19,13 +20,9 @@ class PolicyService:
         Get the currently active policy parameters.
         
         Falls back to default values if no active policy exists.
+        Served from the process-wide policy cache (see policy_cache).
         """
-        result = await self.session.execute(
-            select(JusticePolicyParams).where(
-                JusticePolicyParams.active == True
-            ).order_by(JusticePolicyParams.synced_at.desc())
-        )
-        policy = result.scalars().first()
+        policy = await policy_cache.get(self.session)
         
         if policy is None:
             # Fallback to default policy (v1.0)
@@ -105,6 +102,9 @@ class PolicyService:
         self.session.add(new_policy)
         await self.session.commit()
         await self.session.refresh(new_policy)
+
+        # Other workers pick the new version up via the cache version check
+        invalidate_policy_cache()
         
         return new_policy
 
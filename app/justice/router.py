@@ -23,10 +23,12 @@ from .schemas import (
 
 from .models import ViolationLog, UserCpState, TaskAppeal
 
-from .policy import regime_for_cp
+from .policy import cp_weight_for_violation, regime_for_cp
 
 from .policy_service import PolicyService
 
+from .decay import project_decay
+
 from app.core.db import get_session
 
 from app.consent.router import get_current_user_id, get_consent_service, ConsentService  # Auth helper
@@ -51,7 +53,10 @@ class JusticeService:
 
     async def _get_policy(self, force_refresh: bool = False):
         """
-        Load current Justice policy (DAO parameters) with simple caching.
+        Load current Justice policy (DAO parameters).
+
+        Pinned per service instance so one request sees one version; the
+        process-wide cache behind get_active_policy avoids the DB read.
         """
         if force_refresh or self._cached_policy is None:
             self._cached_policy = await self._policy_service.get_active_policy()
@@ -88,38 +93,19 @@ class JusticeService:
 
 
     async def _apply_decay(self, state: UserCpState) -> UserCpState:
+        """
+        Apply pending decay in memory before a CP write.
 
-        now = datetime.utcnow()
-
-        elapsed_sec = (now - state.last_updated_at).total_seconds()
-
-        if elapsed_sec <= 0:
-
-            return state
-
-
-
-        elapsed_days = elapsed_sec / 86400.0
+        Persisted by the caller's commit; bulk decay for everyone else is
+        done by the scheduled sweeper (app.justice.decay).
+        """
         policy = await self._get_policy()
-        decay_amount = int(elapsed_days * policy.decay_per_day)
-
-
-
-        if decay_amount <= 0:
+        cp_value, regime = project_decay(state, policy)
 
-            return state
-
-
-
-        state.cp_value = max(0, state.cp_value - decay_amount)
-        state.last_updated_at = now
-        
-        # Update regime based on new CP
-        state.regime = regime_for_cp(state.cp_value, policy)
-        
-        self.session.add(state)
-        await self.session.commit()
-        await self.session.refresh(state)
+        if cp_value != state.cp_value:
+            state.cp_value = cp_value
+            state.last_updated_at = datetime.utcnow()
+        state.regime = regime
 
         return state
 
@@ -128,43 +114,7 @@ class JusticeService:
     async def _cp_weight_for_violation(self, category: str, severity: int, code: str) -> int:
         """Calculate CP weight for violation using DAO-controlled parameters."""
         policy = await self._get_policy()
-        
-        # Get base weight from policy
-        base_map = {
-            "EKO": policy.base_eko,
-            "COM": policy.base_com,
-            "SYS": policy.base_sys,
-            "TRUST": policy.base_trust,
-        }
-        base = base_map.get(category, policy.base_eko)
-        
-        # Get severity multiplier from policy
-        mul_map = {
-            1: policy.severity_multiplier.get("1", 0.5),
-            2: policy.severity_multiplier.get("2", 1.0),
-            3: policy.severity_multiplier.get("3", 1.5),
-            4: policy.severity_multiplier.get("4", 2.0),
-            5: policy.severity_multiplier.get("5", 3.0),
-        }
-        multiplier = mul_map.get(severity, 1.0)
-        
-        cp = int(base * multiplier)
-
-
-
-        # İstersen bazı özel kodları burada override edebilirsin
-
-        if code == "SYS_EXPLOIT":
-
-            cp = max(cp, 60)
-
-        if code == "TRUST_MULTIPLE_ACCOUNTS":
-
-            cp = max(cp, 80)
-
-
-
-        return cp
+        return cp_weight_for_violation(policy, category, severity, code)
 
 
 
@@ -261,34 +211,35 @@ class JusticeService:
 
 
     async def get_cp(self, user_id: str) -> CpStateResponse:
+        """
+        Read-only CP view.
 
-        state = await self._get_cp_state(user_id)
-
-        state = await self._apply_decay(state)
-
-        # Decay sonrası regime'i de güncelle (policy zaten _apply_decay içinde güncellendi)
+        Shows decay accrued since the last sweep without writing it; a user
+        without a CP row reads as CP 0.
+        """
+        result = await self.session.execute(
+            select(UserCpState).where(UserCpState.user_id == user_id)
+        )
+        state = result.scalar_one_or_none()
         policy = await self._get_policy()
-        new_regime = regime_for_cp(state.cp_value, policy)
-
-        if new_regime != state.regime:  # Eğer değiştiyse kaydet
-
-            state.regime = new_regime
-
-            self.session.add(state)
-
-            await self.session.commit()
-
-            await self.session.refresh(state)
 
+        if state is None:
+            return CpStateResponse(
+                user_id=user_id,
+                cp_value=0,
+                regime=regime_for_cp(0, policy),  # type: ignore
+                last_updated_at=datetime.utcnow(),
+            )
 
+        cp_value, regime = project_decay(state, policy)
 
         return CpStateResponse(
 
             user_id=state.user_id,
 
-            cp_value=state.cp_value,
+            cp_value=cp_value,
 
-            regime=state.regime,  # type: ignore
+            regime=regime,  # type: ignore
 
             last_updated_at=state.last_updated_at,
 
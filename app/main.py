@@ -69,10 +69,78 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"telethon_client_start_failed: {e}")
 
+    # NCR fiyat cache'i warm-up
+    try:
+        from app.wallet.price_cache import warm_up_ncr_price_cache
+        await warm_up_ncr_price_cache()
+    except Exception as e:
+        logger.warning("ncr_price_cache_warm_up_failed", error=str(e))
+
+    # Treasury shard roll-up (TREASURY_SHARD_COUNT > 1 ise)
+    from app.wallet.treasury_shards import start_treasury_rollup, stop_treasury_rollup
+    start_treasury_rollup()
+
+    # XP write-behind fold (XP_FOLD_INTERVAL_SECONDS > 0 ise)
+    from app.xp_loyalty.write_behind import start_xp_fold, stop_xp_fold
+    start_xp_fold()
+
+    # Justice CP decay sweeper
+    from app.justice.decay import start_cp_decay_sweeper, stop_cp_decay_sweeper
+    start_cp_decay_sweeper()
+
+    # Telegram leaderboard rerank
+    from app.telegram_gateway.leaderboard import start_leaderboard_rerank, stop_leaderboard_rerank
+    start_leaderboard_rerank()
+
+    # AbuseGuard proof fingerprint retention
+    from app.abuse.retention import start_proof_fingerprint_sweeper, stop_proof_fingerprint_sweeper
+    start_proof_fingerprint_sweeper()
+
+    # AbuseGuard near-duplicate proof index (warm-up + worker'lar arası sync)
+    from app.abuse.similarity import start_proof_similarity_sync, stop_proof_similarity_sync
+    start_proof_similarity_sync()
+
+    # Async event queue worker pool
+    from app.events.worker import start_event_queue_workers, stop_event_queue_workers
+    start_event_queue_workers()
+
     yield
 
     # Shutdown
     logger.info("novacore_shutting_down")
+    try:
+        await stop_event_queue_workers()
+    except Exception as e:
+        logger.warning("event_queue_workers_stop_failed", error=str(e))
+    try:
+        await stop_treasury_rollup()
+    except Exception as e:
+        logger.warning("treasury_rollup_stop_failed", error=str(e))
+    try:
+        await stop_xp_fold()
+    except Exception as e:
+        logger.warning("xp_fold_stop_failed", error=str(e))
+    try:
+        await stop_cp_decay_sweeper()
+    except Exception as e:
+        logger.warning("cp_decay_sweeper_stop_failed", error=str(e))
+    try:
+        await stop_leaderboard_rerank()
+    except Exception as e:
+        logger.warning("leaderboard_rerank_stop_failed", error=str(e))
+    try:
+        await stop_proof_fingerprint_sweeper()
+    except Exception as e:
+        logger.warning("proof_fingerprint_sweeper_stop_failed", error=str(e))
+    try:
+        await stop_proof_similarity_sync()
+    except Exception as e:
+        logger.warning("proof_similarity_sync_stop_failed", error=str(e))
+    try:
+        from app.core.rate_limit import close_rate_limiter
+        await close_rate_limiter()
+    except Exception as e:
+        logger.warning("rate_limiter_close_failed", error=str(e))
     try:
         from app.voice_engine.telethon_client import stop_telethon_client
         await stop_telethon_client()
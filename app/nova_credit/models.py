@@ -5,7 +5,7 @@ Davranış Skoru & Vatandaşlık Ekonomisi
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
@@ -118,6 +118,10 @@ class ScoreChange(SQLModel, table=True):
     Audit trail + analytics için kullanılır.
     """
     __tablename__ = "score_changes"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) < cursor
+        Index('ix_score_changes_user_created_id', 'user_id', 'created_at', 'id'),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
 
@@ -2,20 +2,24 @@
 NovaCore - NovaCredit Routes
 API Endpoints for Credit System
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.db import get_session
+from app.core.pagination import next_cursor
 from app.core.security import get_admin_user, get_current_user
 from app.identity.models import User
 from app.nova_credit.models import CreditTier
 from app.nova_credit.schemas import (
     BehaviorEvent,
+    BehaviorEventBatch,
     CreditLeaderboard,
     CreditProfile,
     CreditProfileBrief,
     CreditStats,
     LeaderboardEntry,
+    ProcessEventBatchResult,
     ProcessEventResult,
     RiskFlagCreate,
     RiskFlagOut,
@@ -85,11 +89,13 @@ async def get_my_history(
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None, description="Cursor from next_cursor (replaces page)"),
+    include_total: bool = Query(True, description="Compute total count"),
 ) -> ScoreChangeHistory:
     """Get current user's score change history."""
     service = NovaCreditService(session)
     changes, total = await service.get_score_history(
-        current_user.id, page, per_page
+        current_user.id, page, per_page, after=after, include_total=include_total
     )
 
     return ScoreChangeHistory(
@@ -97,6 +103,7 @@ async def get_my_history(
         total=total,
         page=page,
         per_page=per_page,
+        next_cursor=next_cursor(changes, per_page),
     )
 
 
@@ -111,16 +118,21 @@ async def get_history(
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None, description="Cursor from next_cursor (replaces page)"),
+    include_total: bool = Query(True, description="Compute total count"),
 ) -> ScoreChangeHistory:
     """Get user's score change history."""
     service = NovaCreditService(session)
-    changes, total = await service.get_score_history(user_id, page, per_page)
+    changes, total = await service.get_score_history(
+        user_id, page, per_page, after=after, include_total=include_total
+    )
 
     return ScoreChangeHistory(
         changes=[ScoreChangeOut.model_validate(c) for c in changes],
         total=total,
         page=page,
         per_page=per_page,
+        next_cursor=next_cursor(changes, per_page),
     )
 
 
@@ -145,6 +157,38 @@ async def process_event(
     return await service.process_event(event)
 
 
+@router.post(
+    "/events:batch",
+    response_model=ProcessEventBatchResult,
+    summary="Process Behavior Events (Batch)",
+    description="Process many behavior events in one request (internal use).",
+)
+async def process_events_batch(
+    batch: BehaviorEventBatch,
+    session: AsyncSession = Depends(get_session),
+) -> ProcessEventBatchResult:
+    """
+    Process a batch of behavior events.
+    
+    Same rules as /process applied in request order; partner apps with
+    high event volume use this instead of one request per event.
+    """
+    if len(batch.events) > settings.NOVA_CREDIT_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {settings.NOVA_CREDIT_BATCH_MAX_EVENTS} events)",
+        )
+
+    service = NovaCreditService(session)
+    results = await service.process_events_bulk(batch.events)
+
+    return ProcessEventBatchResult(
+        processed=len(results),
+        citizens=len({r.user_id for r in results}),
+        results=results,
+    )
+
+
 # ============ Risk Flags ============
 @router.get(
     "/me/risks",
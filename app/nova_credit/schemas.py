@@ -29,6 +29,11 @@ class BehaviorEvent(BaseModel):
     context: dict = Field(default_factory=dict)
 
 
+class BehaviorEventBatch(BaseModel):
+    """Toplu event ingestion isteği (partner app'ler)."""
+    events: list[BehaviorEvent] = Field(..., min_length=1)
+
+
 # ============ Credit Profile ============
 class CreditProfile(BaseModel):
     """User's full credit profile."""
@@ -107,9 +112,10 @@ class ScoreChangeOut(BaseModel):
 class ScoreChangeHistory(BaseModel):
     """Score change history response."""
     changes: list[ScoreChangeOut]
-    total: int
+    total: int | None = None
     page: int
     per_page: int
+    next_cursor: str | None = None
 
 
 # ============ Process Result ============
@@ -136,6 +142,13 @@ class ProcessEventResult(BaseModel):
     message: str | None = None
 
 
+class ProcessEventBatchResult(BaseModel):
+    """Result of a bulk ingestion; results follow request order."""
+    processed: int
+    citizens: int
+    results: list[ProcessEventResult]
+
+
 # ============ Risk Flag ============
 class RiskFlagCreate(BaseModel):
     """Create risk flag."""
@@ -4,12 +4,14 @@ Event → Delta → Score Update Engine
 """
 from datetime import datetime, timedelta
 
-from sqlalchemy import func
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.pagination import apply_keyset
 from app.nova_credit.models import (
     CitizenScore,
     CreditTier,
@@ -44,6 +46,200 @@ from app.nova_credit.schemas import (
 
 logger = get_logger("nova_credit")
 
+# Event fold'unun değiştirdiği CitizenScore kolonları (bulk upsert bunları yazar)
+_FOLDED_COLUMNS = (
+    "nova_credit",
+    "tier",
+    "risk_score",
+    "reputation_score",
+    "total_positive_events",
+    "total_negative_events",
+    "total_events",
+    "positive_streak",
+    "negative_streak",
+    "last_event_at",
+    "last_positive_at",
+    "last_negative_at",
+    "updated_at",
+)
+
+
+def _default_score_row(user_id: int, now: datetime) -> dict:
+    """Yeni vatandaşın citizen_scores satırı (get_or_create ile aynı başlangıç)."""
+    return {
+        "user_id": user_id,
+        "nova_credit": CREDIT_DEFAULT,
+        "tier": calculate_tier(CREDIT_DEFAULT),
+        "risk_score": 0.0,
+        "reputation_score": 0.5,
+        "total_positive_events": 0,
+        "total_negative_events": 0,
+        "total_events": 0,
+        "positive_streak": 0,
+        "negative_streak": 0,
+        "volatility": 0.0,
+        "metadata": {},
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def apply_behavior_event(
+    score: CitizenScore,
+    event: BehaviorEvent,
+    now: datetime,
+) -> tuple[ScoreChange, ProcessEventResult]:
+    """
+    Tek bir event'i skora uygula (DB'ye dokunmaz).
+
+    Delta → clamp → tier → risk/reputation → streak sırası; `score`
+    yerinde güncellenir. process_event ve process_events_bulk aynı
+    kuralları buradan kullanır.
+    """
+    old_score = score.nova_credit
+    old_tier = score.tier
+
+    # Get category weight
+    category_weight = CATEGORY_WEIGHTS.get(event.category)
+    if not category_weight:
+        logger.warning(
+            "unknown_category",
+            category=event.category,
+            event_type=event.event_type,
+        )
+        category_weight = CATEGORY_WEIGHTS[EventCategory.ECONOMIC]
+
+    # Apply streak bonus
+    streak_multiplier = get_streak_multiplier(score.positive_streak)
+
+    # Calculate final delta
+    weight = category_weight.weight
+    if weight > 0:
+        # Pozitif eventlerde streak bonus uygula
+        delta = int(event.base_delta * weight * streak_multiplier)
+    else:
+        # Negatif eventlerde streak bonus yok
+        delta = int(event.base_delta * weight)
+
+    # Update score
+    new_score = max(CREDIT_MIN, min(CREDIT_MAX, score.nova_credit + delta))
+    score.nova_credit = new_score
+
+    # Update tier
+    new_tier = calculate_tier(new_score)
+    score.tier = new_tier
+    tier_changed = old_tier != new_tier
+
+    # Update risk & reputation
+    risk_delta = category_weight.risk_impact
+    reputation_delta = category_weight.reputation_impact
+
+    score.risk_score = max(0.0, min(1.0, score.risk_score + risk_delta))
+    score.reputation_score = max(0.0, min(1.0, score.reputation_score + reputation_delta))
+
+    # Update streaks
+    if delta > 0:
+        score.positive_streak += 1
+        score.negative_streak = 0
+        score.total_positive_events += 1
+        score.last_positive_at = now
+    elif delta < 0:
+        score.negative_streak += 1
+        score.positive_streak = 0
+        score.total_negative_events += 1
+        score.last_negative_at = now
+
+    # Update activity
+    score.total_events += 1
+    score.last_event_at = now
+    score.updated_at = now
+
+    # Score change log
+    change = ScoreChange(
+        user_id=event.actor_id,
+        event_id=event.event_id,
+        event_type=event.event_type,
+        delta=delta,
+        old_score=old_score,
+        new_score=new_score,
+        category=event.category.value,
+        reason=event.reason or event.event_type,
+        source_app=event.source_app,
+        weight_applied=weight * streak_multiplier if delta > 0 else weight,
+        base_delta=event.base_delta,
+        context=event.context,
+        created_at=now,
+    )
+
+    message = None
+    if tier_changed:
+        if new_tier.value > old_tier.value:
+            message = f"Tebrikler! {new_tier.value} tier'ına yükseldiniz!"
+        else:
+            message = f"Dikkat: {new_tier.value} tier'ına düştünüz."
+
+    result = ProcessEventResult(
+        success=True,
+        user_id=event.actor_id,
+        event_type=event.event_type,
+        delta=delta,
+        old_score=old_score,
+        new_score=new_score,
+        old_tier=old_tier,
+        new_tier=new_tier,
+        tier_changed=tier_changed,
+        risk_delta=risk_delta,
+        reputation_delta=reputation_delta,
+        message=message,
+    )
+    return change, result
+
+
+def fold_behavior_events(
+    scores: dict[int, CitizenScore],
+    events: list[BehaviorEvent],
+    now: datetime,
+) -> tuple[list[ScoreChange], list[ProcessEventResult]]:
+    """
+    Event'leri geliş sırasıyla actor'larının skoruna uygula.
+
+    Aynı actor'ın event'leri birbirinin streak / clamp / tier sonucunu
+    görür; her event'in process_event'e tek tek gönderilmesiyle aynı
+    sonuç. `scores` her actor için bir CitizenScore içermelidir.
+    """
+    changes = []
+    results = []
+    for event in events:
+        change, result = apply_behavior_event(scores[event.actor_id], event, now)
+        changes.append(change)
+        results.append(result)
+    return changes, results
+
+
+def _log_tier_change(result: ProcessEventResult) -> None:
+    logger.info(
+        "tier_changed",
+        user_id=result.user_id,
+        old_tier=result.old_tier.value,
+        new_tier=result.new_tier.value,
+        nova_credit=result.new_score,
+    )
+
+
+def _log_credit_update(result: ProcessEventResult) -> None:
+    # Log significant changes
+    if result.tier_changed:
+        _log_tier_change(result)
+
+    logger.info(
+        "credit_updated",
+        user_id=result.user_id,
+        event_type=result.event_type,
+        delta=result.delta,
+        new_score=result.new_score,
+        tier=result.new_tier.value,
+    )
+
 
 class NovaCreditService:
     """
@@ -159,126 +355,78 @@ class NovaCreditService:
         This is the core engine method.
         """
         score = await self.get_or_create_citizen_score(event.actor_id)
-        old_score = score.nova_credit
-        old_tier = score.tier
 
-        # Get category weight
-        category_weight = CATEGORY_WEIGHTS.get(event.category)
-        if not category_weight:
-            logger.warning(
-                "unknown_category",
-                category=event.category,
-                event_type=event.event_type,
-            )
-            category_weight = CATEGORY_WEIGHTS[EventCategory.ECONOMIC]
-
-        # Apply streak bonus
-        streak_multiplier = get_streak_multiplier(score.positive_streak)
-
-        # Calculate final delta
-        weight = category_weight.weight
-        if weight > 0:
-            # Pozitif eventlerde streak bonus uygula
-            delta = int(event.base_delta * weight * streak_multiplier)
-        else:
-            # Negatif eventlerde streak bonus yok
-            delta = int(event.base_delta * weight)
-
-        # Update score
-        new_score = max(CREDIT_MIN, min(CREDIT_MAX, score.nova_credit + delta))
-        score.nova_credit = new_score
-
-        # Update tier
-        new_tier = calculate_tier(new_score)
-        score.tier = new_tier
-        tier_changed = old_tier != new_tier
-
-        # Update risk & reputation
-        risk_delta = category_weight.risk_impact
-        reputation_delta = category_weight.reputation_impact
-
-        score.risk_score = max(0.0, min(1.0, score.risk_score + risk_delta))
-        score.reputation_score = max(0.0, min(1.0, score.reputation_score + reputation_delta))
-
-        # Update streaks
-        if delta > 0:
-            score.positive_streak += 1
-            score.negative_streak = 0
-            score.total_positive_events += 1
-            score.last_positive_at = datetime.utcnow()
-        elif delta < 0:
-            score.negative_streak += 1
-            score.positive_streak = 0
-            score.total_negative_events += 1
-            score.last_negative_at = datetime.utcnow()
-
-        # Update activity
-        score.total_events += 1
-        score.last_event_at = datetime.utcnow()
-        score.updated_at = datetime.utcnow()
+        change, result = apply_behavior_event(score, event, datetime.utcnow())
 
         self.session.add(score)
-
-        # Create score change log
-        change = ScoreChange(
-            user_id=event.actor_id,
-            event_id=event.event_id,
-            event_type=event.event_type,
-            delta=delta,
-            old_score=old_score,
-            new_score=new_score,
-            category=event.category.value,
-            reason=event.reason or event.event_type,
-            source_app=event.source_app,
-            weight_applied=weight * streak_multiplier if delta > 0 else weight,
-            base_delta=event.base_delta,
-            context=event.context,
-        )
         self.session.add(change)
 
         await self.session.flush()
 
-        # Log significant changes
-        if tier_changed:
-            logger.info(
-                "tier_changed",
-                user_id=event.actor_id,
-                old_tier=old_tier.value,
-                new_tier=new_tier.value,
-                nova_credit=new_score,
-            )
+        _log_credit_update(result)
+        return result
 
-        logger.info(
-            "credit_updated",
-            user_id=event.actor_id,
-            event_type=event.event_type,
-            delta=delta,
-            new_score=new_score,
-            tier=new_tier.value,
+    async def process_events_bulk(self, events: list[BehaviorEvent]) -> list[ProcessEventResult]:
+        """
+        Process many behavior events in a handful of statements.
+
+        Events are folded per actor in arrival order with the same rules as
+        process_event, so the outcome equals calling it once per event.
+        Affected CitizenScore rows are created if missing, locked once,
+        written back with a single multi-row upsert and all ScoreChange rows
+        go in with one multi-row insert. Does not commit. Results are
+        returned in input order.
+        """
+        if not events:
+            return []
+
+        actor_ids = sorted({event.actor_id for event in events})
+        now = datetime.utcnow()
+
+        # Eksik skor satırlarını varsayılanlarla aç (eşzamanlı ilk event'ler
+        # birbirini ezmez), sonra hepsini user_id sırasıyla kilitle
+        await self.session.execute(
+            pg_insert(CitizenScore.__table__).on_conflict_do_nothing(index_elements=["user_id"]),
+            [_default_score_row(user_id, now) for user_id in actor_ids],
+        )
+        rows = await self.session.execute(
+            select(*(CitizenScore.__table__.c[name] for name in ("user_id", *_FOLDED_COLUMNS)))
+            .where(CitizenScore.user_id.in_(actor_ids))
+            .order_by(CitizenScore.user_id)
+            .with_for_update()
         )
+        # Fold session dışındaki geçici nesneler üzerinde yapılır; yazma
+        # aşağıdaki tek upsert'tür (ORM flush'ı ikinci kez yazmaz)
+        scores = {row.user_id: CitizenScore(**row._mapping) for row in rows}
 
-        # Build result
-        message = None
-        if tier_changed:
-            if new_tier.value > old_tier.value:
-                message = f"Tebrikler! {new_tier.value} tier'ına yükseldiniz!"
-            else:
-                message = f"Dikkat: {new_tier.value} tier'ına düştünüz."
-
-        return ProcessEventResult(
-            success=True,
-            user_id=event.actor_id,
-            event_type=event.event_type,
-            delta=delta,
-            old_score=old_score,
-            new_score=new_score,
-            old_tier=old_tier,
-            new_tier=new_tier,
-            tier_changed=tier_changed,
-            risk_delta=risk_delta,
-            reputation_delta=reputation_delta,
-            message=message,
+        changes, results = fold_behavior_events(scores, events, now)
+
+        stmt = pg_insert(CitizenScore.__table__)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={name: stmt.excluded[name] for name in _FOLDED_COLUMNS},
+            ),
+            [
+                # Satır her zaman var (yukarıda açıldı); INSERT kısmı yine de
+                # NOT NULL kolonları doldurmalı, set_ sadece fold kolonlarını yazar
+                {
+                    **_default_score_row(user_id, now),
+                    **{name: getattr(score, name) for name in _FOLDED_COLUMNS},
+                }
+                for user_id, score in scores.items()
+            ],
         )
+        await self.session.execute(
+            insert(ScoreChange.__table__), [change.model_dump(exclude={"id"}) for change in changes]
+        )
+
+        for result in results:
+            if result.tier_changed:
+                _log_tier_change(result)
+        logger.info("credit_bulk_updated", events=len(events), citizens=len(actor_ids))
+
+        return results
 
     async def normalize_and_process(
         self,
@@ -327,17 +475,27 @@ class NovaCreditService:
         user_id: int,
         page: int = 1,
         per_page: int = 20,
-    ) -> tuple[list[ScoreChange], int]:
-        """Get score change history."""
+        after: str | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[ScoreChange], int | None]:
+        """
+        Get score change history.
+
+        `after` is a keyset cursor (see app.core.pagination);
+        `include_total=False` skips the COUNT.
+        """
         query = select(ScoreChange).where(ScoreChange.user_id == user_id)
 
         # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self.session.execute(count_query)).scalar() or 0
+        total = None
+        if include_total:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self.session.execute(count_query)).scalar() or 0
 
         # Fetch
-        query = query.order_by(ScoreChange.created_at.desc())
-        query = query.offset((page - 1) * per_page).limit(per_page)
+        query = apply_keyset(
+            query, ScoreChange.created_at, ScoreChange.id, after, page, per_page
+        )
 
         result = await self.session.execute(query)
         changes = list(result.scalars().all())
@@ -13,6 +13,8 @@ from .proof_models import QuestProof
 from .enums import QuestStatus
 from app.abuse.service import AbuseGuard
 from app.abuse.models import AbuseEventType
+from app.abuse.config import NEAR_DUPLICATE_PROOF_TYPES
+from app.abuse.similarity import proof_signature
 from app.core.logging import get_logger
 
 logger = get_logger("quest_completion")
@@ -51,7 +53,7 @@ async def get_user_state(
     loyalty = await loyalty_service.get_loyalty_profile(user_id)
     
     # RiskScore
-    abuse_guard = AbuseGuard(session)
+    abuse_guard = AbuseGuard(session, unit_of_work=True)
     risk_profile = await abuse_guard.get_or_create_profile(user_id)
     
     # SiyahScore (Placeholder - NovaScore'dan gelecek)
@@ -181,8 +183,8 @@ async def submit_quest_proof(
     # Get user state
     user_state = await get_user_state(session, user_id)
     
-    # AbuseGuard: risk snapshot
-    abuse_guard = AbuseGuard(session)
+    # AbuseGuard: risk snapshot (unit of work: event'ler quest commit'iyle yazılır)
+    abuse_guard = AbuseGuard(session, unit_of_work=True)
     risk_profile = await abuse_guard.get_or_create_profile(user_id)
     risk_snapshot = risk_profile.risk_score
     
@@ -204,6 +206,22 @@ async def submit_quest_proof(
     )
     session.add(quest_proof)
     
+    # Near-duplicate metin proof kontrolü (quest'ler / hesaplar arası)
+    proof_sig = proof_signature(proof_content_str) if proof_type in NEAR_DUPLICATE_PROOF_TYPES else None
+    await abuse_guard.check_near_duplicate_proof(
+        user_id=user_id,
+        signature=proof_sig,
+        source="quest",
+        ref_id=uq.id,
+        meta={"quest_uuid": quest_uuid},
+    )
+    await abuse_guard.record_proof_signature(
+        user_id=user_id,
+        signature=proof_sig,
+        source="quest",
+        ref_id=uq.id,
+    )
+    
     # Proof meta kaydet (backward compatibility)
     uq.proof_type = proof_type
     uq.proof_payload_ref = proof_payload_ref
@@ -2,27 +2,34 @@
 Telegram Gateway - Abuse & Rate Limiting Guards
 Spam, abuse ve rate limiting koruması
 """
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, and_
+from sqlalchemy import and_, case, exists, false, func, literal, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.core.rate_limit import RateLimit, RateLimitResult, get_rate_limiter
+from app.telegram_gateway.task_cache import get_cached_task
 from app.telegram_gateway.task_models import (
     TaskSubmission,
+    SubmissionStatus,
     ReferralReward,
     TaskAssignment,
-    Task,
 )
 
+# Kullanıcı başına saatlik maksimum task submission
+SUBMISSION_RATE_LIMIT = RateLimit("telegram_task_submissions", limit=20, window_seconds=3600)
+
 
 class AbuseGuard:
     """Abuse ve rate limiting kontrolü."""
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        # check_task_submission_allowed'ın aldığı rate limit slot'u (refund için)
+        self._submission_rate: Optional[tuple[str, RateLimitResult]] = None
     
     async def check_task_submission_allowed(
         self,
@@ -33,87 +40,125 @@ class AbuseGuard:
         """
         Görev submit edilebilir mi kontrol et.
         
+        DB girdileri (idempotency, mevcut submission, rewarded sayısı) tek bir
+        gate sorgusuyla okunur; Task tanımı task cache'ten, saatlik limit
+        rate limiter'dan gelir.
+        
+        Saatlik limit artık submission tablosunda sayılmaz: global kalması
+        paylaşımlı backend'e bağlıdır (staging / prod varsayılanı redis).
+        Memory backend'de limit worker başınadır, Redis erişilemezse
+        fail-open'dır. İzin verilen submit yazılamazsa slot
+        refund_submission_rate_limit() ile geri verilir.
+        
         Returns:
             (allowed, reason)
         """
-        # 1. Idempotency check (external_id)
-        if external_id:
-            existing = await self.session.execute(
-                select(TaskSubmission).where(
-                    TaskSubmission.external_id == external_id
-                )
-            )
-            if existing.scalar_one_or_none():
-                return False, "Bu submission zaten işlendi (idempotency)"
-        
-        # 2. Duplicate check (user_id, task_id)
-        existing = await self.session.execute(
-            select(TaskSubmission).where(
-                and_(
-                    TaskSubmission.user_id == user_id,
-                    TaskSubmission.task_id == task_id,
-                )
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            self._submission_gate_query(
+                user_id=user_id,
+                task_id=task_id,
+                external_id=external_id,
             )
         )
-        submission = existing.scalar_one_or_none()
+        gate = result.one()
+        
+        # 1. Idempotency check (external_id)
+        if gate.idempotent_hit:
+            return False, "Bu submission zaten işlendi (idempotency)"
         
-        if submission:
+        task = await get_cached_task(self.session, task_id)
+        
+        # 2. Duplicate check (user_id, task_id)
+        if gate.existing_status == SubmissionStatus.REWARDED:
             # Eğer zaten rewarded ise, tekrar izin verme
-            if submission.status == "rewarded":
-                return False, "Bu görev zaten tamamlandı ve ödül verildi"
-            
+            return False, "Bu görev zaten tamamlandı ve ödül verildi"
+        
+        if gate.existing_status == SubmissionStatus.PENDING:
             # Eğer pending ise, cooldown kontrolü yap
-            if submission.status == "pending":
-                # Task'ın cooldown'u var mı kontrol et
-                task_result = await self.session.execute(
-                    select(Task).where(Task.id == task_id)
-                )
-                task = task_result.scalar_one_or_none()
-                
-                if task and task.cooldown_seconds > 0:
-                    elapsed = (datetime.utcnow() - submission.submitted_at).total_seconds()
-                    if elapsed < task.cooldown_seconds:
-                        remaining = int(task.cooldown_seconds - elapsed)
-                        return False, f"Cooldown aktif. {remaining} saniye sonra tekrar deneyebilirsin."
+            if task and task.cooldown_seconds > 0:
+                elapsed = (now - gate.existing_submitted_at).total_seconds()
+                if elapsed < task.cooldown_seconds:
+                    remaining = int(task.cooldown_seconds - elapsed)
+                    return False, f"Cooldown aktif. {remaining} saniye sonra tekrar deneyebilirsin."
         
         # 3. Task max_completions kontrolü
-        task_result = await self.session.execute(
-            select(Task).where(Task.id == task_id)
-        )
-        task = task_result.scalar_one_or_none()
-        
         if task and task.max_completions_per_user > 0:
-            completed_count = await self.session.execute(
-                select(func.count(TaskSubmission.id)).where(
-                    and_(
-                        TaskSubmission.user_id == user_id,
-                        TaskSubmission.task_id == task_id,
-                        TaskSubmission.status == "rewarded",
-                    )
-                )
-            )
-            count = completed_count.scalar_one()
-            
-            if count >= task.max_completions_per_user:
+            if gate.rewarded_count >= task.max_completions_per_user:
                 return False, f"Bu görev maksimum {task.max_completions_per_user} kez tamamlanabilir"
         
-        # 4. Rate limiting: Son 1 saatte kaç submission?
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        recent_count = await self.session.execute(
-            select(func.count(TaskSubmission.id)).where(
-                and_(
-                    TaskSubmission.user_id == user_id,
-                    TaskSubmission.submitted_at >= one_hour_ago,
-                )
+        # 4. Rate limiting: saatte en fazla SUBMISSION_RATE_LIMIT.limit submission
+        # (sadece diğer kontrollerden geçen submit'ler sayılır)
+        rate = await get_rate_limiter().acquire(str(user_id), SUBMISSION_RATE_LIMIT)
+        if not rate.allowed:
+            return False, f"Rate limit: Saatte maksimum {SUBMISSION_RATE_LIMIT.limit} görev tamamlayabilirsin"
+        self._submission_rate = (str(user_id), rate)
+        
+        return True, None
+    
+    async def refund_submission_rate_limit(self) -> None:
+        """
+        Submission yazılamadıysa check_task_submission_allowed'ın aldığı
+        rate limit slot'unu geri ver (yoksa no-op).
+        """
+        if self._submission_rate is None:
+            return
+        key, rate = self._submission_rate
+        self._submission_rate = None
+        await get_rate_limiter().refund(key, SUBMISSION_RATE_LIMIT, rate)
+    
+    @staticmethod
+    def _submission_gate_query(
+        user_id: int,
+        task_id: str,
+        external_id: Optional[str],
+    ):
+        """
+        check_task_submission_allowed'ın DB girdileri için tek SELECT.
+        
+        Kolonlar: idempotent_hit, existing_status, existing_submitted_at,
+        rewarded_count.
+        
+        existing_* aynı satırdan gelir: çiftin birden fazla submission'ı
+        varsa önce rewarded olan, sonra en yenisi (submitted_at, id DESC).
+        Submission yoksa ikisi de NULL.
+        """
+        pair = (
+            select(TaskSubmission.id, TaskSubmission.status, TaskSubmission.submitted_at)
+            .where(
+                TaskSubmission.user_id == user_id,
+                TaskSubmission.task_id == task_id,
             )
+            .cte("pair")
         )
-        count = recent_count.scalar_one()
         
-        # Max 20 submission per hour
-        if count >= 20:
-            return False, "Rate limit: Saatte maksimum 20 görev tamamlayabilirsin"
+        existing = (
+            select(pair.c.status, pair.c.submitted_at)
+            .order_by(
+                case((pair.c.status == SubmissionStatus.REWARDED, 0), else_=1),
+                pair.c.submitted_at.desc(),
+                pair.c.id.desc(),
+            )
+            .limit(1)
+            .lateral("existing")
+        )
+        gate = select(literal(1).label("one")).subquery("gate")
         
-        return True, None
+        if external_id:
+            idempotent_hit = exists().where(TaskSubmission.external_id == external_id)
+        else:
+            idempotent_hit = false()
+        
+        return select(
+            idempotent_hit.label("idempotent_hit"),
+            existing.c.status.label("existing_status"),
+            existing.c.submitted_at.label("existing_submitted_at"),
+            select(func.count())
+            .select_from(pair)
+            .where(pair.c.status == SubmissionStatus.REWARDED)
+            .scalar_subquery()
+            .label("rewarded_count"),
+        ).select_from(gate.outerjoin(existing, true()))
     
     async def check_referral_allowed(
         self,
@@ -170,10 +215,7 @@ class AbuseGuard:
             (allowed, reason)
         """
         # Task var mı ve aktif mi?
-        task_result = await self.session.execute(
-            select(Task).where(Task.id == task_id)
-        )
-        task = task_result.scalar_one_or_none()
+        task = await get_cached_task(self.session, task_id)
         
         if not task:
             return False, "Görev bulunamadı"
@@ -6,8 +6,10 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import and_, func
+from sqlalchemy import Integer, and_, column, func, update
+from sqlalchemy import values as sa_values
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select
 
 from app.telegram_gateway.event_models import (
@@ -332,13 +334,27 @@ class EventService:
         result = await self.session.execute(query)
         participations = list(result.scalars().all())
         
-        # Rank'leri set et
-        for rank, participation in enumerate(participations, 1):
-            if participation.rank != rank:
-                participation.rank = rank
-                self.session.add(participation)
-        
-        await self.session.commit()
+        # Değişen rank'leri tek UPDATE ile yaz (satır başına UPDATE yerine)
+        changed = [
+            (participation.id, rank)
+            for rank, participation in enumerate(participations, 1)
+            if participation.rank != rank
+        ]
+        if changed:
+            ranks = sa_values(
+                column("id", Integer),
+                column("rank", Integer),
+                name="ranks",
+            ).data(changed)
+            await self.session.execute(
+                update(EventParticipation)
+                .where(EventParticipation.id == ranks.c.id)
+                .values(rank=ranks.c.rank)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+            for rank, participation in enumerate(participations, 1):
+                set_committed_value(participation, "rank", rank)
         
         return participations
 
@@ -0,0 +1,429 @@
+"""
+Telegram Gateway - Leaderboard Engine
+leaderboard_snapshot tablosunu (period başına) güncel tutan engine.
+
+- track_xp / track_task_rewarded / track_referral: XP ve reward
+  event'lerini session'a not eder; bekleyen delta'lar commit'ten hemen
+  önce tek bir INSERT ... SELECT ... ON CONFLICT ile daily / weekly /
+  all_time satırlarına yazılır (aynı transaction, rollback'te birlikte
+  geri alınır). Görüntüleme alanları (telegram_user_id, username,
+  display_name, level, tier) aynı statement'ta tazelenir.
+- refresh_leaderboard_ranks(): güncel bucket'larda rank'i row_number()
+  ile yeniden yazar, süresi geçmiş daily / weekly bucket'ları siler.
+- get_leaderboard(): endpoint'in tek indexed okuması.
+- rebuild_leaderboard_snapshot(): güncel bucket'ları kaynak tablolardan
+  (user_loyalty, xp_events, task_rewards, referral_rewards) yeniden kurar.
+
+Period pencereleri takvim bazlıdır: daily = UTC gün, weekly = ISO hafta
+(Pazartesi 00:00 UTC), all_time = sabit ALL_TIME_START.
+"""
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    String,
+    case,
+    cast,
+    column,
+    delete,
+    event,
+    func,
+    literal,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.session_buffers import is_savepoint_commit, register_session_buffer
+from app.identity.models import User
+from app.telegram_gateway.leaderboard_models import LeaderboardSnapshot
+from app.telegram_gateway.models import TelegramAccount
+from app.telegram_gateway.task_models import ReferralReward, TaskReward
+from app.xp_loyalty.models import UserLoyalty, XpEvent
+
+logger = get_logger("telegram_leaderboard")
+
+DAILY = "daily"
+WEEKLY = "weekly"
+ALL_TIME = "all_time"
+PERIODS = (DAILY, WEEKLY, ALL_TIME)
+
+# all_time satırlarının period_start değeri
+ALL_TIME_START = date(1970, 1, 1)
+
+_PENDING_KEY = "leaderboard_pending"
+
+_SNAPSHOT_COLUMNS = (
+    "period",
+    "period_start",
+    "user_id",
+    "score",
+    "telegram_user_id",
+    "username",
+    "display_name",
+    "xp_total",
+    "level",
+    "tier",
+    "tasks_completed",
+    "referrals_count",
+    "updated_at",
+)
+
+_rerank_task: asyncio.Task | None = None
+
+
+def normalize_period(period: str) -> str:
+    """Bilinmeyen period değerleri all_time'a düşer."""
+    return period if period in PERIODS else ALL_TIME
+
+
+def current_period_start(period: str, now: datetime | None = None) -> date:
+    """Period'un içinde bulunulan bucket'ının başlangıç günü (UTC)."""
+    today = (now or datetime.utcnow()).date()
+    if period == DAILY:
+        return today
+    if period == WEEKLY:
+        return today - timedelta(days=today.weekday())
+    return ALL_TIME_START
+
+
+def _current_buckets(now: datetime) -> list[tuple[str, date]]:
+    return [(period, current_period_start(period, now)) for period in PERIODS]
+
+
+# --- Incremental updates (commit-time) ---
+
+def _track(session: AsyncSession, user_id: int, xp: int = 0, tasks: int = 0, referrals: int = 0) -> None:
+    pending: dict[int, list[int]] = session.info.setdefault(_PENDING_KEY, {})
+    deltas = pending.setdefault(user_id, [0, 0, 0])
+    deltas[0] += xp
+    deltas[1] += tasks
+    deltas[2] += referrals
+
+
+def track_xp(session: AsyncSession, user_id: int, amount: int) -> None:
+    """Commit'te leaderboard'a eklenecek bir XP event'ini not et."""
+    _track(session, user_id, xp=amount)
+
+
+def track_task_rewarded(session: AsyncSession, user_id: int) -> None:
+    """Ödüllendirilen bir task submission'ını not et."""
+    _track(session, user_id, tasks=1)
+
+
+def track_referral(session: AsyncSession, referrer_user_id: int) -> None:
+    """Referrer'a verilen bir referral ödülünü not et."""
+    _track(session, referrer_user_id, referrals=1)
+
+
+def _display_columns():
+    """users / telegram_accounts / user_loyalty join'lerinden görüntüleme alanları."""
+    return (
+        TelegramAccount.telegram_user_id,
+        func.coalesce(TelegramAccount.username, User.username),
+        func.coalesce(User.display_name, TelegramAccount.first_name),
+        func.coalesce(UserLoyalty.xp_total, 0),
+        func.coalesce(UserLoyalty.level, 1),
+        func.coalesce(cast(UserLoyalty.tier, String), "BRONZE"),
+    )
+
+
+def _upsert_snapshot(pending: dict[int, list[int]], now: datetime):
+    """Bekleyen delta'lar × güncel period bucket'ları için tek upsert."""
+    deltas = sa_values(
+        column("user_id", Integer),
+        column("xp", Integer),
+        column("tasks", Integer),
+        column("referrals", Integer),
+        name="deltas",
+    ).data([(user_id, *values) for user_id, values in sorted(pending.items())])
+    buckets = sa_values(
+        column("period", String),
+        column("period_start", Date),
+        name="buckets",
+    ).data(_current_buckets(now))
+
+    source = (
+        select(
+            buckets.c.period,
+            buckets.c.period_start,
+            deltas.c.user_id,
+            case(
+                (buckets.c.period == ALL_TIME, func.coalesce(UserLoyalty.xp_total, 0)),
+                else_=deltas.c.xp,
+            ),
+            *_display_columns(),
+            deltas.c.tasks,
+            deltas.c.referrals,
+            literal(now, DateTime),
+        )
+        .select_from(deltas)
+        .join(buckets, true())
+        .join(User, User.id == deltas.c.user_id)
+        .outerjoin(TelegramAccount, TelegramAccount.user_id == deltas.c.user_id)
+        .outerjoin(UserLoyalty, UserLoyalty.user_id == deltas.c.user_id)
+        # Sabit satır sırası: eşzamanlı commit'ler arasında deadlock olmaz
+        .order_by(buckets.c.period, deltas.c.user_id)
+    )
+
+    snapshot = LeaderboardSnapshot.__table__
+    stmt = pg_insert(snapshot).from_select(list(_SNAPSHOT_COLUMNS), source)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=["period", "period_start", "user_id"],
+        set_={
+            "score": case(
+                (excluded.period == ALL_TIME, excluded.score),
+                else_=snapshot.c.score + excluded.score,
+            ),
+            "tasks_completed": snapshot.c.tasks_completed + excluded.tasks_completed,
+            "referrals_count": snapshot.c.referrals_count + excluded.referrals_count,
+            "telegram_user_id": excluded.telegram_user_id,
+            "username": excluded.username,
+            "display_name": excluded.display_name,
+            "xp_total": excluded.xp_total,
+            "level": excluded.level,
+            "tier": excluded.tier,
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_pending_leaderboard(session: Session) -> None:
+    """Bekleyen leaderboard delta'larını commit'ten hemen önce yaz."""
+    if is_savepoint_commit(session):
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        # user_loyalty değişiklikleri SELECT'ten önce DB'de olmalı
+        session.flush()
+        session.execute(_upsert_snapshot(pending, datetime.utcnow()))
+
+
+# Rollback olan transaction'ın / SAVEPOINT'in delta'ları atılır
+register_session_buffer(
+    _PENDING_KEY, lambda pending: {user_id: list(deltas) for user_id, deltas in pending.items()}
+)
+
+
+# --- Reads ---
+
+async def get_leaderboard(
+    session: AsyncSession,
+    period: str = ALL_TIME,
+    limit: int = 10,
+) -> list[LeaderboardSnapshot]:
+    """
+    Güncel bucket'ın ilk `limit` satırı (score desc).
+
+    Sadece Telegram hesabı bağlı kullanıcılar döner; sıralama
+    ix_leaderboard_snapshot_score index'i üzerinden yapılır.
+    """
+    period = normalize_period(period)
+    result = await session.execute(
+        select(LeaderboardSnapshot)
+        .where(
+            LeaderboardSnapshot.period == period,
+            LeaderboardSnapshot.period_start == current_period_start(period),
+            LeaderboardSnapshot.telegram_user_id.is_not(None),
+        )
+        .order_by(LeaderboardSnapshot.score.desc(), LeaderboardSnapshot.user_id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_user_snapshot(
+    session: AsyncSession,
+    user_id: int,
+    period: str,
+) -> LeaderboardSnapshot | None:
+    """Kullanıcının güncel bucket'taki satırı (yoksa None)."""
+    result = await session.execute(
+        select(LeaderboardSnapshot).where(
+            LeaderboardSnapshot.period == period,
+            LeaderboardSnapshot.period_start == current_period_start(period),
+            LeaderboardSnapshot.user_id == user_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+# --- Rerank / maintenance ---
+
+async def refresh_leaderboard_ranks(session: AsyncSession, now: datetime | None = None) -> dict:
+    """
+    Güncel bucket'larda rank'i yeniden hesapla, eski bucket'ları sil.
+
+    Sadece rank'i değişen satırlar yazılır. Bir önceki daily / weekly
+    bucket (dün / geçen hafta) okunabilir kalsın diye tutulur.
+
+    Returns:
+        {"ranked", "pruned"}
+    """
+    now = now or datetime.utcnow()
+    snapshot = LeaderboardSnapshot.__table__
+
+    ranked = (
+        select(
+            snapshot.c.id,
+            func.row_number()
+            .over(
+                partition_by=(snapshot.c.period, snapshot.c.period_start),
+                order_by=(snapshot.c.score.desc(), snapshot.c.user_id),
+            )
+            .label("new_rank"),
+        )
+        .where(tuple_(snapshot.c.period, snapshot.c.period_start).in_(_current_buckets(now)))
+        .subquery()
+    )
+    result = await session.execute(
+        update(snapshot)
+        .where(
+            snapshot.c.id == ranked.c.id,
+            snapshot.c.rank.is_distinct_from(ranked.c.new_rank),
+        )
+        .values(rank=ranked.c.new_rank)
+    )
+    ranked_rows = result.rowcount
+
+    daily_keep = current_period_start(DAILY, now) - timedelta(days=1)
+    weekly_keep = current_period_start(WEEKLY, now) - timedelta(weeks=1)
+    result = await session.execute(
+        delete(snapshot).where(
+            (
+                (snapshot.c.period == DAILY) & (snapshot.c.period_start < daily_keep)
+            )
+            | (
+                (snapshot.c.period == WEEKLY) & (snapshot.c.period_start < weekly_keep)
+            )
+        )
+    )
+    pruned = result.rowcount
+    await session.commit()
+
+    logger.info("leaderboard_reranked", ranked=ranked_rows, pruned=pruned)
+    return {"ranked": ranked_rows, "pruned": pruned}
+
+
+async def rebuild_leaderboard_snapshot(session: AsyncSession, now: datetime | None = None) -> dict:
+    """
+    Güncel daily / weekly / all_time bucket'larını kaynak tablolardan yeniden kur.
+
+    İlk kurulumda (migration sonrası) ve şüpheli drift durumunda çalıştırılır;
+    sonunda rank'ler de yeniden hesaplanır.
+
+    Returns:
+        {period: satır sayısı}
+    """
+    now = now or datetime.utcnow()
+    snapshot = LeaderboardSnapshot.__table__
+    counts: dict[str, int] = {}
+
+    for period, period_start in _current_buckets(now):
+        await session.execute(
+            delete(snapshot).where(
+                snapshot.c.period == period,
+                snapshot.c.period_start == period_start,
+            )
+        )
+
+        window_start = None if period == ALL_TIME else datetime.combine(period_start, time.min)
+
+        tasks_query = select(TaskReward.user_id, func.count().label("n")).group_by(TaskReward.user_id)
+        referrals_query = select(
+            ReferralReward.referrer_user_id.label("user_id"), func.count().label("n")
+        ).group_by(ReferralReward.referrer_user_id)
+        if window_start is not None:
+            tasks_query = tasks_query.where(TaskReward.rewarded_at >= window_start)
+            referrals_query = referrals_query.where(ReferralReward.rewarded_at >= window_start)
+        tasks = tasks_query.subquery("tasks")
+        referrals = referrals_query.subquery("referrals")
+
+        if window_start is None:
+            base = select(UserLoyalty.user_id, UserLoyalty.xp_total.label("score")).subquery("base")
+        else:
+            base = (
+                select(XpEvent.user_id, cast(func.sum(XpEvent.amount), Integer).label("score"))
+                .where(XpEvent.created_at >= window_start)
+                .group_by(XpEvent.user_id)
+                .subquery("base")
+            )
+
+        source = (
+            select(
+                literal(period, String),
+                literal(period_start, Date),
+                base.c.user_id,
+                base.c.score,
+                *_display_columns(),
+                func.coalesce(tasks.c.n, 0),
+                func.coalesce(referrals.c.n, 0),
+                literal(now, DateTime),
+            )
+            .select_from(base)
+            .join(User, User.id == base.c.user_id)
+            .outerjoin(TelegramAccount, TelegramAccount.user_id == base.c.user_id)
+            .outerjoin(UserLoyalty, UserLoyalty.user_id == base.c.user_id)
+            .outerjoin(tasks, tasks.c.user_id == base.c.user_id)
+            .outerjoin(referrals, referrals.c.user_id == base.c.user_id)
+        )
+        result = await session.execute(
+            pg_insert(snapshot).from_select(list(_SNAPSHOT_COLUMNS), source)
+        )
+        counts[period] = result.rowcount
+
+    await session.commit()
+    await refresh_leaderboard_ranks(session, now)
+
+    logger.info("leaderboard_rebuilt", **counts)
+    return counts
+
+
+async def run_leaderboard_rerank_loop() -> None:
+    """Rank'leri LEADERBOARD_RERANK_INTERVAL_SECONDS aralıkla yenile."""
+    from app.core.db import async_session_factory
+
+    while True:
+        try:
+            async with async_session_factory() as session:
+                await refresh_leaderboard_ranks(session)
+        except Exception as e:
+            logger.warning("leaderboard_rerank_failed", error=str(e))
+        await asyncio.sleep(settings.LEADERBOARD_RERANK_INTERVAL_SECONDS)
+
+
+def start_leaderboard_rerank() -> None:
+    """Rerank job'ını background task olarak başlat."""
+    global _rerank_task
+    if settings.LEADERBOARD_RERANK_INTERVAL_SECONDS > 0 and _rerank_task is None:
+        _rerank_task = asyncio.create_task(run_leaderboard_rerank_loop())
+        logger.info(
+            "leaderboard_rerank_started",
+            interval=settings.LEADERBOARD_RERANK_INTERVAL_SECONDS,
+        )
+
+
+async def stop_leaderboard_rerank() -> None:
+    """Rerank job'ını durdur."""
+    global _rerank_task
+    if _rerank_task is None:
+        return
+
+    _rerank_task.cancel()
+    try:
+        await _rerank_task
+    except asyncio.CancelledError:
+        pass
+    _rerank_task = None
@@ -0,0 +1,50 @@
+"""
+Telegram Gateway - Leaderboard Snapshot Model
+Leaderboard okuması için period başına denormalize snapshot
+"""
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class LeaderboardSnapshot(SQLModel, table=True):
+    """
+    Period başına leaderboard satırı (daily / weekly / all_time).
+
+    - daily / weekly: score = period içinde kazanılan XP (UTC gün / ISO hafta)
+    - all_time: score = UserLoyalty.xp_total
+    - tasks_completed / referrals_count: period içindeki sayılar
+
+    XP ve reward event'lerinde commit anında incremental güncellenir;
+    rank periyodik rerank job'ı ile yazılır. Görüntüleme alanları
+    (telegram_user_id, username, display_name) her güncellemede tazelenir.
+    """
+    __tablename__ = "leaderboard_snapshot"
+
+    id: int | None = Field(default=None, primary_key=True)
+    period: str = Field(max_length=10)  # daily, weekly, all_time
+    period_start: date  # all_time için sabit ALL_TIME_START
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    score: int = Field(default=0)
+    rank: Optional[int] = Field(default=None)
+
+    # Denormalized display fields
+    telegram_user_id: Optional[int] = Field(default=None)
+    username: Optional[str] = Field(default=None, max_length=255)
+    display_name: Optional[str] = Field(default=None, max_length=255)
+    xp_total: int = Field(default=0)
+    level: int = Field(default=1)
+    tier: str = Field(default="BRONZE", max_length=20)
+
+    tasks_completed: int = Field(default=0)
+    referrals_count: int = Field(default=0)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('period', 'period_start', 'user_id', name='uq_leaderboard_snapshot_user'),
+        Index('ix_leaderboard_snapshot_score', 'period', 'period_start', 'score'),
+    )
@@ -0,0 +1,263 @@
+"""
+Telegram Task Reward Pipeline
+Onaylanan submission için ödül adımlarını tek transaction'da çalıştırır.
+
+submit_telegram_task eskiden adımları ayrı ayrı commit ediyor (treasury
+cap kendi commit'ini atıyordu) ve response için wallet + loyalty
+profilini yeniden okuyordu. Pipeline:
+
+- risk → bonuses → xp_event → prepare → treasury_cap → wallet_credit →
+  reward_record adımlarını sırayla çalıştırır; hiçbiri commit etmez
+- treasury_cap günün DailyTreasuryStat satırını commit'e kadar kilitler
+  (tüm kullanıcıların ödülleri bu satırda sıraya girer). Kilitten önce
+  prepare bekleyen ORM yazılarını (submission, abuse, XP) flush eder;
+  kilit altında sadece rezervasyon, tek statement'lık ledger yazısı,
+  TaskReward INSERT'ü ve commit kalır
+- commit adımı submission, abuse yazıları, treasury issued_ncr, XP,
+  ledger ve TaskReward'ı tek seferde yazar; hata olursa hepsi geri alınır
+- new_balance ledger INSERT ... RETURNING balance_after'dan,
+  new_xp_total XP event'in xp_total_after değerinden gelir
+- curate adımı commit sonrası çalışır, hatası ödülü etkilemez
+- Her adımın süresi "telegram_submit.<adım>" adıyla app.core.metrics'e
+  yazılır (/api/v1/admin/metrics)
+"""
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.abuse.service import AbuseGuard
+from app.core.logging import get_logger
+from app.core.metrics import observe, timed
+from app.wallet.models import LedgerEntryType
+from app.wallet.schemas import TransactionCreate
+from app.wallet.service import WalletService
+from app.wallet.treasury_cap import apply_treasury_cap
+from app.xp_loyalty.schemas import XpEventCreate
+from app.xp_loyalty.service import XpLoyaltyService
+
+from .event_service import EventService
+from .leaderboard import track_task_rewarded
+from .task_models import SubmissionStatus, Task, TaskReward, TaskSubmission
+
+logger = get_logger("telegram_reward_pipeline")
+
+METRIC_PREFIX = "telegram_submit"
+
+
+@dataclass
+class RewardContext:
+    """Adımlar arasında taşınan state."""
+
+    user_id: int
+    task: Task
+    submission: TaskSubmission
+    proof: Optional[str]
+
+    base_xp: int = 0
+    base_ncr: Decimal = Decimal("0")
+    risk_score: float = 0.0
+    risk_multiplier: float = 1.0
+    total_xp: int = 0
+    pre_treasury_ncr: Decimal = Decimal("0")
+    total_ncr: Decimal = Decimal("0")
+    treasury_meta: dict = field(default_factory=dict)
+    xp_event_id: Optional[int] = None
+    xp_total_after: int = 0
+    wallet_tx_id: Optional[int] = None
+    balance_after: Optional[Decimal] = None
+
+
+@dataclass(frozen=True)
+class RewardResult:
+    """Response için gereken değerler (yeniden okuma yok)."""
+
+    total_xp: int
+    total_ncr: Decimal
+    base_xp: int
+    base_ncr: Decimal
+    risk_score: float
+    risk_multiplier: float
+    treasury_meta: dict
+    new_balance: Decimal
+    new_xp_total: int
+
+
+class TaskRewardPipeline:
+    """
+    Onaylanmış TaskSubmission → XP + NCR ödülü.
+
+    AbuseGuard unit_of_work modunda olmalı; RiskScore yazıları da pipeline
+    commit'ine dahil edilir.
+    """
+
+    STAGES = (
+        "risk",
+        "bonuses",
+        "xp_event",
+        "prepare",
+        "treasury_cap",
+        "wallet_credit",
+        "reward_record",
+        "commit",
+    )
+
+    def __init__(self, session: AsyncSession, abuse_guard: AbuseGuard):
+        self.session = session
+        self.abuse_guard = abuse_guard
+        self.wallet_service = WalletService(session)
+        self.loyalty_service = XpLoyaltyService(session)
+
+    async def run(
+        self,
+        user_id: int,
+        task: Task,
+        submission: TaskSubmission,
+        proof: Optional[str] = None,
+    ) -> RewardResult:
+        """Tüm adımları çalıştır, commit et, commit sonrası curator'ı çağır."""
+        ctx = RewardContext(user_id=user_id, task=task, submission=submission, proof=proof)
+
+        started = time.perf_counter()
+        try:
+            for stage in self.STAGES:
+                with timed(f"{METRIC_PREFIX}.{stage}"):
+                    await getattr(self, f"_stage_{stage}")(ctx)
+        except BaseException:
+            await self.session.rollback()
+            observe(f"{METRIC_PREFIX}.reward_total", time.perf_counter() - started, error=True)
+            raise
+        observe(f"{METRIC_PREFIX}.reward_total", time.perf_counter() - started)
+
+        with timed(f"{METRIC_PREFIX}.curate"):
+            await self._curate(ctx)
+
+        return RewardResult(
+            total_xp=ctx.total_xp,
+            total_ncr=ctx.total_ncr,
+            base_xp=ctx.base_xp,
+            base_ncr=ctx.base_ncr,
+            risk_score=ctx.risk_score,
+            risk_multiplier=ctx.risk_multiplier,
+            treasury_meta=ctx.treasury_meta,
+            new_balance=ctx.balance_after if ctx.balance_after is not None else Decimal("0"),
+            new_xp_total=ctx.xp_total_after,
+        )
+
+    # ============ Stages ============
+
+    async def _stage_risk(self, ctx: RewardContext) -> None:
+        """Submission kontrollerinin RiskScore'a yansımış hali (identity map'ten)."""
+        profile = await self.abuse_guard.get_or_create_profile(ctx.user_id)
+        ctx.risk_score = profile.risk_score
+
+    async def _stage_bonuses(self, ctx: RewardContext) -> None:
+        """Event bonusları + RiskScore çarpanı (EventService.compute_final_rewards)."""
+        ctx.base_xp = ctx.task.reward_xp
+        ctx.base_ncr = Decimal(str(ctx.task.reward_ncr))
+        ctx.total_xp, ctx.pre_treasury_ncr, ctx.risk_multiplier = await EventService(
+            self.session
+        ).compute_final_rewards(
+            user_id=ctx.user_id,
+            task_id=ctx.task.id,
+            base_xp=ctx.base_xp,
+            base_ncr=ctx.base_ncr,
+            risk_score=ctx.risk_score,
+        )
+
+    async def _stage_xp_event(self, ctx: RewardContext) -> None:
+        """XP event (bonuslu toplam XP)."""
+        xp_event = await self.loyalty_service.create_xp_event(
+            XpEventCreate(
+                user_id=ctx.user_id,
+                amount=ctx.total_xp,
+                event_type="TASK_COMPLETED",
+                source_app="aurora",
+                metadata={
+                    "task_id": ctx.task.id,
+                    "proof": ctx.proof,
+                    "base_xp": ctx.base_xp,
+                    "bonus_xp": ctx.total_xp - ctx.base_xp,
+                },
+            )
+        )
+        ctx.xp_event_id = xp_event.id
+        ctx.xp_total_after = xp_event.xp_total_after or 0
+
+    async def _stage_prepare(self, ctx: RewardContext) -> None:
+        """Submission REWARDED + leaderboard; bekleyen yazılar treasury kilidinden önce flush edilir."""
+        ctx.submission.status = SubmissionStatus.REWARDED
+        self.session.add(ctx.submission)
+        track_task_rewarded(self.session, ctx.user_id)
+        await self.session.flush()
+
+    async def _stage_treasury_cap(self, ctx: RewardContext) -> None:
+        """Günlük Treasury bütçesinden atomik rezervasyon (commit pipeline'da)."""
+        adjusted_ncr, ctx.treasury_meta = await apply_treasury_cap(
+            session=self.session,
+            pre_treasury_ncr=float(ctx.pre_treasury_ncr),
+            commit=False,
+        )
+        ctx.total_ncr = Decimal(str(adjusted_ncr))
+
+    async def _stage_wallet_credit(self, ctx: RewardContext) -> None:
+        """Treasury sonrası NCR'ı ledger'a yaz; bakiye RETURNING'den gelir."""
+        if ctx.total_ncr <= 0:
+            # Ledger kaydı yok (tam damping); bakiye değişmedi
+            account = await self.wallet_service.get_account(ctx.user_id)
+            ctx.balance_after = account.balance if account else Decimal("0")
+            return
+
+        wallet_tx = await self.wallet_service.create_transaction(
+            TransactionCreate(
+                user_id=ctx.user_id,
+                amount=ctx.total_ncr,
+                type=LedgerEntryType.EARN,
+                source_app="aurora",
+                reference_id=str(ctx.submission.id),
+                reference_type="telegram_task_submission",
+                metadata={
+                    "task_id": ctx.task.id,
+                    "submission_id": ctx.submission.id,
+                    "base_ncr": str(ctx.base_ncr),
+                    "bonus_ncr": str(ctx.pre_treasury_ncr - ctx.base_ncr),
+                    "treasury": ctx.treasury_meta,
+                },
+            )
+        )
+        ctx.wallet_tx_id = wallet_tx.id
+        ctx.balance_after = wallet_tx.balance_after
+
+    async def _stage_reward_record(self, ctx: RewardContext) -> None:
+        """TaskReward audit kaydı (INSERT commit flush'ında)."""
+        self.session.add(
+            TaskReward(
+                submission_id=ctx.submission.id,
+                user_id=ctx.user_id,
+                task_id=ctx.task.id,
+                xp_amount=ctx.total_xp,
+                ncr_amount=str(ctx.total_ncr),
+                xp_event_id=ctx.xp_event_id,
+                wallet_tx_id=ctx.wallet_tx_id,
+            )
+        )
+
+    async def _stage_commit(self, ctx: RewardContext) -> None:
+        """Tek commit (AbuseGuard / leaderboard before_commit flush'ları dahil)."""
+        await self.session.commit()
+
+    async def _curate(self, ctx: RewardContext) -> None:
+        """Content Curator: yüksek kaliteli submission → CreatorAsset (best effort)."""
+        try:
+            from app.agency.services.content_curator import curate_from_submission
+
+            await curate_from_submission(self.session, ctx.submission.id)
+        except Exception as e:
+            # Curator hatası reward'ı etkilemesin
+            logger.error(
+                "content_curator_failed",
+                submission_id=ctx.submission.id,
+                error=str(e),
+            )
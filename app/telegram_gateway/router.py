@@ -2,6 +2,7 @@
 Telegram Gateway Router
 Telegram bot ↔ NovaCore bridge endpoints
 """
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -11,6 +12,8 @@ from sqlmodel import select, and_
 
 from app.core.config import settings
 from app.core.db import get_session
+from app.core.lanes import KeyedLanes
+from app.core.metrics import observe, timed
 from app.identity.models import User
 from app.identity.service import IdentityService
 from app.wallet.service import WalletService
@@ -33,12 +36,23 @@ from .schemas import (
     DAOQueueResponse,
     QuestResponse,
 )
+from .leaderboard import (
+    get_leaderboard,
+    get_user_snapshot,
+    normalize_period,
+    track_referral,
+    WEEKLY,
+)
 from .leaderboard_schemas import (
     LeaderboardResponse,
     LeaderboardEntry,
     ProfileCardResponse,
 )
 from .event_service import EventService
+from .abuse_guard import AbuseGuard as OldAbuseGuard
+from .reward_pipeline import TaskRewardPipeline
+from .task_cache import get_cached_task
+from .user_hydration import hydrate_users
 from .quest_service import QuestService
 from .event_schemas import (
     ActiveEventsResponse,
@@ -49,9 +63,14 @@ from .event_schemas import (
 )
 from app.abuse.service import AbuseGuard
 from app.abuse.models import AbuseEventType
+from app.abuse.config import NEAR_DUPLICATE_PROOF_TYPES
+from app.abuse.similarity import proof_signature
 
 router = APIRouter(prefix="/api/v1/telegram", tags=["telegram"])
 
+# Task submit'leri telegram_user_id başına serileştirilir
+submit_lanes = KeyedLanes("telegram_submit")
+
 
 # --- Security ---
 
@@ -390,6 +409,28 @@ async def submit_telegram_task(
     Bot'tan görev tamamlandığında çağrılır.
     XP ve NCR ödülü verilir.
     """
+    # Aynı kullanıcının eşzamanlı submit'leri (bot retry'ları, çift tık)
+    # sırayla işlenir: duplicate kontrolü ve wallet / loyalty satırları
+    # için DB'de birbirini beklemezler
+    old_abuse_guard = OldAbuseGuard(session)
+    async with submit_lanes.hold(telegram_user_id):
+        try:
+            return await _submit_telegram_task(
+                task_id, payload, telegram_user_id, session, old_abuse_guard
+            )
+        except Exception:
+            # Submission commit edilmedi: saatlik limit sadece başarılı submit'leri sayar
+            await old_abuse_guard.refund_submission_rate_limit()
+            raise
+
+
+async def _submit_telegram_task(
+    task_id: str,
+    payload: TelegramTaskSubmitRequest,
+    telegram_user_id: int,
+    session: AsyncSession,
+    old_abuse_guard: OldAbuseGuard,
+) -> TelegramTaskSubmitResponse:
     account = await get_telegram_account(telegram_user_id, session)
     
     if not account:
@@ -399,9 +440,11 @@ async def submit_telegram_task(
         )
     
     # Abuse guards (old + new)
-    from .abuse_guard import AbuseGuard as OldAbuseGuard
-    old_abuse_guard = OldAbuseGuard(session)
-    risk_abuse_guard = AbuseGuard(session)
+    # Unit of work: profil / RiskScore / abuse event yazıları submission
+    # commit'iyle birlikte yazılır (heuristic başına commit yok)
+    risk_abuse_guard = AbuseGuard(session, unit_of_work=True)
+    
+    checks_started = time.perf_counter()
     
     # Check cooldown (RiskScore 9+)
     risk_profile = await risk_abuse_guard.get_or_create_profile(account.user_id)
@@ -438,10 +481,7 @@ async def submit_telegram_task(
     from app.telegram_gateway.task_models import Task, TaskSubmission, SubmissionStatus, TaskAssignment
     import hashlib
     
-    task_result = await session.execute(
-        select(Task).where(Task.id == task_id)
-    )
-    task = task_result.scalar_one_or_none()
+    task = await get_cached_task(session, task_id)
     
     if not task:
         raise HTTPException(
@@ -463,13 +503,24 @@ async def submit_telegram_task(
     
     # Check duplicate proof (if proof provided)
     proof_hash = None
+    proof_sig = None
     if payload.proof:
         proof_hash = hashlib.sha256(payload.proof.encode()).hexdigest()
-        await risk_abuse_guard.check_duplicate_proof(
+        is_duplicate = await risk_abuse_guard.check_duplicate_proof(
             user_id=account.user_id,
             task_id=task_id,
             proof_hash=proof_hash,
         )
+        # Near-duplicate: metin proof'larında, exact eşleşme yoksa
+        if task.proof_type.value in NEAR_DUPLICATE_PROOF_TYPES:
+            proof_sig = proof_signature(payload.proof)
+            if not is_duplicate:
+                await risk_abuse_guard.check_near_duplicate_proof(
+                    user_id=account.user_id,
+                    signature=proof_sig,
+                    source="telegram_task",
+                    meta={"task_id": task_id},
+                )
     
     # Check too fast completion
     if assigned_at:
@@ -479,6 +530,9 @@ async def submit_telegram_task(
             assigned_at=assigned_at,
         )
     
+    insert_started = time.perf_counter()
+    observe("telegram_submit.abuse_checks", insert_started - checks_started)
+    
     # Create submission (idempotent)
     submission_metadata = payload.metadata or {}
     if proof_hash:
@@ -493,8 +547,19 @@ async def submit_telegram_task(
         external_id=payload.metadata.get("external_id") if payload.metadata else None,
     )
     session.add(submission)
-    await session.commit()
-    await session.refresh(submission)
+    await session.flush()
+    await risk_abuse_guard.record_proof_fingerprint(
+        user_id=account.user_id,
+        submission_id=submission.id,
+        proof_hash=proof_hash,
+    )
+    await risk_abuse_guard.record_proof_signature(
+        user_id=account.user_id,
+        signature=proof_sig,
+        source="telegram_task",
+        ref_id=submission.id,
+    )
+    observe("telegram_submit.submission_insert", time.perf_counter() - insert_started)
     
     # Auto-approve logic with RiskScore check
     auto_approve = False
@@ -514,7 +579,6 @@ async def submit_telegram_task(
     if auto_approve:
         submission.status = SubmissionStatus.APPROVED
         session.add(submission)
-        await session.commit()
     else:
         # For now, keep as PENDING (will be reviewed manually or by AI)
         # If we had AI scoring, we'd set status based on score here
@@ -534,114 +598,30 @@ async def submit_telegram_task(
         # Check for low quality burst
         await risk_abuse_guard.check_low_quality_burst(account.user_id)
     
-    # Reward (if approved)
+    # Reward (if approved): submission + ödül tek commit'te yazılır
     if submission.status == SubmissionStatus.APPROVED:
-        from app.telegram_gateway.task_models import TaskReward
-        from decimal import Decimal
-        
-        # Refresh risk profile (may have changed from events)
-        risk_profile = await risk_abuse_guard.get_or_create_profile(account.user_id)
-        
-        # Base rewards
-        base_xp = task.reward_xp
-        base_ncr = Decimal(str(task.reward_ncr))
-        
-        # Compute final rewards (Event bonuses + RiskScore multiplier)
-        # Single source of truth: EventService.compute_final_rewards
-        event_service = EventService(session)
-        total_xp, pre_treasury_ncr, risk_multiplier = await event_service.compute_final_rewards(
+        pipeline = TaskRewardPipeline(session, risk_abuse_guard)
+        reward = await pipeline.run(
             user_id=account.user_id,
-            task_id=task_id,
-            base_xp=base_xp,
-            base_ncr=base_ncr,
-            risk_score=risk_profile.risk_score,
+            task=task,
+            submission=submission,
+            proof=payload.proof,
         )
         
-        # Apply Treasury Cap (günlük limit kontrolü)
-        from app.wallet.treasury_cap import apply_treasury_cap
-        from decimal import Decimal
-        
-        treasury_adjusted_ncr, treasury_meta = await apply_treasury_cap(
-            session=session,
-            pre_treasury_ncr=float(pre_treasury_ncr),
-        )
-        total_ncr = Decimal(str(treasury_adjusted_ncr))
-        
-        # XP event (total XP with bonuses)
-        from app.xp_loyalty.schemas import XpEventCreate
-        
-        loyalty_service = XpLoyaltyService(session)
-        xp_event = await loyalty_service.create_xp_event(
-            XpEventCreate(
-                user_id=account.user_id,
-                amount=total_xp,
-                event_type="TASK_COMPLETED",
-                source_app="aurora",
-                metadata={"task_id": task_id, "proof": payload.proof, "base_xp": base_xp, "bonus_xp": total_xp - base_xp},
-            )
-        )
-        
-        # NCR reward (Treasury-adjusted NCR)
-        wallet_service = WalletService(session)
-        wallet_metadata = {
-            "task_id": task_id,
-            "submission_id": submission.id,
-            "base_ncr": str(base_ncr),
-            "bonus_ncr": str(pre_treasury_ncr - base_ncr),
-            "treasury": treasury_meta,  # Treasury cap metadata
-        }
-        wallet_tx = await wallet_service.credit(
-            user_id=account.user_id,
-            amount=float(total_ncr),
-            source="telegram_task",
-            metadata=wallet_metadata,
-        )
-        
-        # Create reward record
-        reward = TaskReward(
-            submission_id=submission.id,
-            user_id=account.user_id,
-            task_id=task_id,
-            xp_amount=total_xp,
-            ncr_amount=str(total_ncr),
-            xp_event_id=xp_event.id if xp_event else None,
-            wallet_tx_id=wallet_tx.id if wallet_tx else None,
-        )
-        session.add(reward)
-        
-        submission.status = SubmissionStatus.REWARDED
-        session.add(submission)
-        await session.commit()
-
-        # Content Curator Hook: Eğer submission yüksek kaliteli ise CreatorAsset'e dönüştür
-        try:
-            from app.agency.services.content_curator import curate_from_submission
-            asset = await curate_from_submission(session, submission.id)
-            if asset:
-                # Log success (optional)
-                pass
-        except Exception as e:
-            # Curator hatası reward'ı etkilemesin
-            import logging
-            logging.getLogger("content_curator").error(f"Failed to curate submission {submission.id}: {e}")
-
-        # Get updated balance
-        wallet = await wallet_service.get_account(account.user_id)
-        loyalty = await loyalty_service.get_loyalty_profile(account.user_id)
-        
         # Bonus mesajı
         bonus_msg = ""
-        if total_xp > base_xp:
-            bonus_msg = f" (Event bonus: +{total_xp - base_xp} XP)"
-        if total_ncr > base_ncr:
-            bonus_msg += f" (+{total_ncr - base_ncr} NCR)"
+        if reward.total_xp > reward.base_xp:
+            bonus_msg = f" (Event bonus: +{reward.total_xp - reward.base_xp} XP)"
+        if reward.total_ncr > reward.base_ncr:
+            bonus_msg += f" (+{reward.total_ncr - reward.base_ncr} NCR)"
         
         # RiskScore mesajı (eğer multiplier < 1.0 ise)
         risk_msg = ""
-        if risk_multiplier < 1.0:
-            risk_msg = f" (RiskScore: {risk_profile.risk_score:.1f}/10, çarpan: {risk_multiplier:.1f}x)"
+        if reward.risk_multiplier < 1.0:
+            risk_msg = f" (RiskScore: {reward.risk_score:.1f}/10, çarpan: {reward.risk_multiplier:.1f}x)"
         
         # Treasury mesajı (eğer damping uygulandıysa)
+        treasury_meta = reward.treasury_meta
         treasury_msg = ""
         if treasury_meta.get("treasury_applied") and treasury_meta.get("multiplier", 1.0) < 1.0:
             load_pct = treasury_meta.get("load_ratio", 0.0) * 100
@@ -650,17 +630,20 @@ async def submit_telegram_task(
         return TelegramTaskSubmitResponse(
             success=True,
             task_id=task_id,
-            reward_xp=total_xp,
-            reward_ncr=str(total_ncr),
-            message=f"Görev tamamlandı! +{total_xp} XP, +{total_ncr} NCR{bonus_msg}{risk_msg}{treasury_msg}",
-            new_balance=str(wallet.balance) if wallet else "0",
-            new_xp_total=loyalty.xp_total if loyalty else 0,
-            risk_score=risk_profile.risk_score,
-            hitl_required=risk_abuse_guard.requires_forced_hitl(risk_profile.risk_score),
-            reward_multiplier=risk_multiplier,
+            reward_xp=reward.total_xp,
+            reward_ncr=str(reward.total_ncr),
+            message=f"Görev tamamlandı! +{reward.total_xp} XP, +{reward.total_ncr} NCR{bonus_msg}{risk_msg}{treasury_msg}",
+            new_balance=str(reward.new_balance),
+            new_xp_total=reward.new_xp_total,
+            risk_score=reward.risk_score,
+            hitl_required=risk_abuse_guard.requires_forced_hitl(reward.risk_score),
+            reward_multiplier=reward.risk_multiplier,
         )
     else:
-        # Pending review - refresh risk profile for response
+        # Pending review: submission + abuse yazıları tek commit
+        with timed("telegram_submit.pending_commit"):
+            await session.commit()
+        # RiskScore commit sırasında RETURNING ile profile'a yansıtıldı
         risk_profile = await risk_abuse_guard.get_or_create_profile(account.user_id)
         return TelegramTaskSubmitResponse(
             success=True,
@@ -806,6 +789,7 @@ async def claim_referral(
         ncr_amount=reward_ncr,
     )
     session.add(reward)
+    track_referral(session, referrer_user_id)
     await session.commit()
     await session.refresh(reward)
     
@@ -858,96 +842,38 @@ async def get_telegram_leaderboard(
     _verified: bool = Depends(verify_bridge_token),
 ):
     """
-    Leaderboard - En yüksek XP'li kullanıcılar.
+    Leaderboard - Period içinde en yüksek skorlu kullanıcılar.
+
+    - daily: bugün (UTC) kazanılan XP
+    - weekly: bu ISO hafta kazanılan XP
+    - all_time: toplam XP
+
+    leaderboard_snapshot üzerinden tek indexed okuma.
     """
-    from app.telegram_gateway.task_models import TaskSubmission, SubmissionStatus, ReferralReward
-    from app.xp_loyalty.models import UserLoyalty
-    from sqlalchemy import func, case
-    
-    # Time filter
-    if period == "daily":
-        since = datetime.utcnow() - timedelta(days=1)
-    elif period == "weekly":
-        since = datetime.utcnow() - timedelta(days=7)
-    else:
-        since = None
-    
-    # Get top users by XP
-    query = (
-        select(
-            UserLoyalty.user_id,
-            UserLoyalty.xp_total,
-            UserLoyalty.level,
-            UserLoyalty.tier,
-        )
-        .order_by(UserLoyalty.xp_total.desc())
-        .limit(limit)
-    )
-    
-    if since:
-        # Filter by recent activity (simplified - check last submission)
-        pass  # TODO: Add time-based filtering
-    
-    result = await session.execute(query)
-    top_users = result.all()
-    
-    # Build entries with additional stats
-    entries = []
-    for rank, (user_id, xp_total, level, tier) in enumerate(top_users, 1):
-        # Get telegram account
-        account_result = await session.execute(
-            select(TelegramAccount).where(TelegramAccount.user_id == user_id)
-        )
-        account = account_result.scalar_one_or_none()
-        
-        if not account:
-            continue
-        
-        # Get user
-        user_result = await session.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = user_result.scalar_one()
-        
-        # Count tasks completed
-        tasks_count_result = await session.execute(
-            select(func.count(TaskSubmission.id)).where(
-                and_(
-                    TaskSubmission.user_id == user_id,
-                    TaskSubmission.status == SubmissionStatus.REWARDED,
-                )
-            )
-        )
-        tasks_completed = tasks_count_result.scalar_one() or 0
-        
-        # Count referrals
-        referrals_count_result = await session.execute(
-            select(func.count(ReferralReward.id)).where(
-                ReferralReward.referrer_user_id == user_id
-            )
-        )
-        referrals_count = referrals_count_result.scalar_one() or 0
-        
-        entries.append(
-            LeaderboardEntry(
-                rank=rank,
-                user_id=user_id,
-                telegram_user_id=account.telegram_user_id,
-                username=account.username or user.username,
-                display_name=user.display_name or account.first_name,
-                xp_total=xp_total,
-                level=level,
-                tier=tier,
-                tasks_completed=tasks_completed,
-                referrals_count=referrals_count,
-            )
+    period = normalize_period(period)
+    rows = await get_leaderboard(session, period=period, limit=limit)
+
+    entries = [
+        LeaderboardEntry(
+            rank=rank,
+            user_id=row.user_id,
+            telegram_user_id=row.telegram_user_id,
+            username=row.username,
+            display_name=row.display_name,
+            xp_total=row.xp_total,
+            level=row.level,
+            tier=row.tier,
+            tasks_completed=row.tasks_completed,
+            referrals_count=row.referrals_count,
         )
-    
+        for rank, row in enumerate(rows, 1)
+    ]
+
     return LeaderboardResponse(
         entries=entries,
         total_users=len(entries),
         period=period,
-        updated_at=datetime.utcnow(),
+        updated_at=max((row.updated_at for row in rows), default=datetime.utcnow()),
     )
 
 
@@ -972,11 +898,9 @@ async def get_telegram_profile_card(
             detail="Telegram account not found",
         )
     
-    # Get user
-    user_result = await session.execute(
-        select(User).where(User.id == account.user_id)
-    )
-    user = user_result.scalar_one()
+    # Display info
+    displays = await hydrate_users(session, [account.user_id])
+    display = displays[account.user_id]
     
     # Get loyalty
     loyalty_service = XpLoyaltyService(session)
@@ -1012,6 +936,10 @@ async def get_telegram_profile_card(
     )
     rank_result = await session.execute(rank_query)
     rank_all_time = (rank_result.scalar_one() or 0) + 1
+
+    # Weekly rank: rerank job'ının yazdığı snapshot rank'i
+    weekly_snapshot = await get_user_snapshot(session, account.user_id, WEEKLY)
+    rank_weekly = weekly_snapshot.rank if weekly_snapshot else None
     
     # Achievements (mock)
     achievements = []
@@ -1023,17 +951,17 @@ async def get_telegram_profile_card(
         achievements.append("10 Referral")
     
     return ProfileCardResponse(
-        user_id=user.id,
+        user_id=account.user_id,
         telegram_user_id=account.telegram_user_id,
-        username=account.username or user.username,
-        display_name=user.display_name or account.first_name,
+        username=display.username,
+        display_name=display.display_name,
         xp_total=loyalty.xp_total,
         level=loyalty.level,
         tier=loyalty.tier,
         tasks_completed=tasks_completed,
         referrals_count=referrals_count,
         rank_all_time=rank_all_time,
-        rank_weekly=None,  # TODO: Calculate weekly rank
+        rank_weekly=rank_weekly,
         achievements=achievements,
         first_seen_at=account.first_seen_at,
         last_seen_at=account.last_seen_at,
@@ -1267,34 +1195,22 @@ async def get_event_leaderboard(
         limit=limit,
     )
     
-    # Get user info for each participation
-    from app.telegram_gateway.models import TelegramAccount
+    # Display info for all participants in one query
+    displays = await hydrate_users(session, (p.user_id for p in participations))
     
     entries = []
     for participation in participations:
-        # Get telegram account
-        account_query = (
-            select(TelegramAccount)
-            .where(TelegramAccount.user_id == participation.user_id)
-        )
-        account_result = await session.execute(account_query)
-        account = account_result.scalar_one_or_none()
-        
-        if not account:
+        display = displays.get(participation.user_id)
+        if not display or not display.has_telegram:
             continue
         
-        # Get user
-        user_query = select(User).where(User.id == participation.user_id)
-        user_result = await session.execute(user_query)
-        user = user_result.scalar_one()
-        
         entries.append(
             EventLeaderboardEntry(
                 rank=participation.rank or 0,
                 user_id=participation.user_id,
-                telegram_user_id=account.telegram_user_id,
-                username=account.username or user.username,
-                display_name=user.display_name or account.first_name,
+                telegram_user_id=display.telegram_user_id,
+                username=display.username,
+                display_name=display.display_name,
                 total_xp_earned=participation.total_xp_earned,
                 total_ncr_earned=str(participation.total_ncr_earned),
                 tasks_completed=participation.tasks_completed,
@@ -1511,11 +1427,15 @@ async def get_dao_queue(
     
     # Get pending submissions
     query = (
-        select(TaskSubmission, Task, TelegramAccount, User)
+        select(TaskSubmission, Task)
         .join(Task, TaskSubmission.task_id == Task.id)
-        .join(TelegramAccount, TaskSubmission.user_id == TelegramAccount.user_id)
-        .join(User, TaskSubmission.user_id == User.id)
-        .where(TaskSubmission.status == SubmissionStatus.PENDING)
+        .where(
+            TaskSubmission.status == SubmissionStatus.PENDING,
+            # Telegram hesabı olmayanlar LIMIT'ten önce elenir (sayfa kısa kalmasın)
+            select(TelegramAccount.id)
+            .where(TelegramAccount.user_id == TaskSubmission.user_id)
+            .exists(),
+        )
         .order_by(TaskSubmission.submitted_at.asc())
         .limit(limit)
         .offset(offset)
@@ -1524,15 +1444,18 @@ async def get_dao_queue(
     result = await session.execute(query)
     rows = result.all()
     
+    displays = await hydrate_users(session, (submission.user_id for submission, _ in rows))
+    
     submissions = []
-    for submission, task, account, user in rows:
+    for submission, task in rows:
+        display = displays[submission.user_id]
         submissions.append(
             PendingTaskSubmission(
                 submission_id=submission.id,
                 user_id=submission.user_id,
-                telegram_user_id=account.telegram_user_id,
-                username=account.username or user.username,
-                display_name=user.display_name or account.first_name,
+                telegram_user_id=display.telegram_user_id,
+                username=display.username,
+                display_name=display.display_name,
                 task_id=task.id,
                 task_title=task.title,
                 proof=submission.proof,
@@ -0,0 +1,90 @@
+"""
+Telegram Gateway - Task Definition Cache
+Task tanımları için process-wide cache
+
+Task satırları submit yolunda (erişim kontrolü, submission gate, reward
+hesaplama) defalarca okunur; tanımlar ise nadiren değişir (seed / admin).
+
+- TTL içinde: DB'ye hiç gidilmez
+- TTL dolunca: satır yeniden yüklenir
+- Olmayan task_id'ler cache'lenmez (kullanıcı girdisiyle cache büyümesin)
+
+Cache'teki nesneler session'dan bağımsız kopyalardır; sadece okunmalı,
+session'a eklenmemelidir.
+"""
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.telegram_gateway.task_models import Task
+
+
+class TaskCache:
+    """task_id → Task snapshot'ı + hit/miss sayaçları."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, Task]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self, task_id: str | None = None) -> None:
+        """Tek task'ı ya da (task_id=None) tüm cache'i düşür."""
+        if task_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(task_id, None)
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Sayaçlar ve cache boyutu."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+    async def get(self, session: AsyncSession, task_id: str) -> Optional[Task]:
+        """Task tanımı (None = böyle bir task yok)."""
+        now = time.monotonic()
+        ttl = settings.TELEGRAM_TASK_CACHE_TTL_SECONDS
+
+        entry = self._entries.get(task_id)
+        if entry is not None and now - entry[0] < ttl:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        result = await session.execute(select(Task).where(Task.id == task_id))
+        task = result.scalar_one_or_none()
+        if task is None:
+            self._entries.pop(task_id, None)
+            return None
+
+        # Session'dan bağımsız kopya: request'ler arasında paylaşılır
+        snapshot = Task(**task.model_dump())
+        if ttl > 0:
+            self._entries[task_id] = (now, snapshot)
+        return snapshot
+
+
+task_cache = TaskCache()
+
+
+async def get_cached_task(session: AsyncSession, task_id: str) -> Optional[Task]:
+    """Task tanımını cache üzerinden getir."""
+    return await task_cache.get(session, task_id)
+
+
+def invalidate_task_cache(task_id: str | None = None) -> None:
+    """Bu process'teki task cache'ini düşür."""
+    task_cache.invalidate(task_id)
+
+
+def get_task_cache_stats() -> dict:
+    """Task cache hit/miss sayaçları."""
+    return task_cache.stats()
@@ -155,6 +155,8 @@ class TaskSubmission(SQLModel, table=True):
     __table_args__ = (
         UniqueConstraint('user_id', 'task_id', name='uq_user_task_submission'),
         Index('ix_task_submissions_status', 'status', 'submitted_at'),
+        # Submission gate: kullanıcının son 1 saatteki submission sayısı
+        Index('ix_task_submissions_user_submitted', 'user_id', 'submitted_at'),
     )
 
 
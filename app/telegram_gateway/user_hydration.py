@@ -0,0 +1,159 @@
+"""
+Telegram Gateway - User Hydration
+Kullanıcı listeleri için görüntüleme bilgisi (telegram_user_id, username,
+display_name) yükleyen ortak katman.
+
+- hydrate_users(): user_id listesi için tek bir users ⟕ telegram_accounts
+  sorgusu; satır başına TelegramAccount + User sorgusu (N+1) yerine
+- Sonuçlar process içi, kısa TTL'li bir LRU cache'te tutulur; leaderboard
+  gibi sık okunan listelerde tekrar eden kullanıcılar DB'ye gitmez
+- Görüntüleme kuralı tek yerde: username = telegram username ∨ user
+  username, display_name = user display_name ∨ telegram first_name
+
+Cache sadece görüntüleme alanlarını tutar; isim değişiklikleri en geç bir
+TTL sonra görünür. Hesap bağlama gibi yerlerde invalidate_user_display()
+çağrılır.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.identity.models import User
+from app.telegram_gateway.models import TelegramAccount
+
+
+@dataclass(frozen=True)
+class UserDisplay:
+    """Bir kullanıcının liste görüntüleme bilgisi."""
+    user_id: int
+    telegram_user_id: Optional[int]
+    username: Optional[str]
+    display_name: Optional[str]
+
+    @property
+    def has_telegram(self) -> bool:
+        return self.telegram_user_id is not None
+
+
+class UserDisplayCache:
+    """user_id → UserDisplay LRU cache'i (TTL + boyut sınırı) ve sayaçlar."""
+
+    def __init__(self):
+        self._entries: OrderedDict[int, tuple[float, UserDisplay]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, user_ids: Iterable[int]) -> tuple[dict[int, UserDisplay], list[int]]:
+        """Cache'teki (süresi dolmamış) kayıtlar ve eksik user_id'ler."""
+        now = time.monotonic()
+        ttl = settings.USER_HYDRATION_CACHE_TTL_SECONDS
+        found: dict[int, UserDisplay] = {}
+        missing: list[int] = []
+
+        for user_id in user_ids:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[0] < ttl:
+                self._entries.move_to_end(user_id)
+                found[user_id] = entry[1]
+                self.hits += 1
+            else:
+                missing.append(user_id)
+                self.misses += 1
+
+        return found, missing
+
+    def put_many(self, displays: Iterable[UserDisplay]) -> None:
+        """Kayıtları ekle; boyut sınırını aşan en eski kayıtları at."""
+        now = time.monotonic()
+        for display in displays:
+            self._entries[display.user_id] = (now, display)
+            self._entries.move_to_end(display.user_id)
+
+        max_size = settings.USER_HYDRATION_CACHE_SIZE
+        while len(self._entries) > max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Tek kullanıcıyı ya da (user_id=None) tüm cache'i düşür."""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """Sayaçlar ve cache boyutu."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+user_display_cache = UserDisplayCache()
+
+
+async def hydrate_users(
+    session: AsyncSession,
+    user_ids: Iterable[int],
+) -> dict[int, UserDisplay]:
+    """
+    user_id'ler için görüntüleme bilgisi.
+
+    Cache'te olmayanlar tek bir joined sorguyla yüklenir (liste ne kadar
+    uzun olursa olsun en fazla 1 sorgu). Var olmayan user_id'ler sonuçta yer
+    almaz; Telegram hesabı olmayan kullanıcılarda telegram_user_id None'dır.
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    if not unique_ids:
+        return {}
+
+    if settings.USER_HYDRATION_CACHE_TTL_SECONDS > 0:
+        displays, missing = user_display_cache.get_many(unique_ids)
+    else:
+        displays, missing = {}, unique_ids
+
+    if missing:
+        result = await session.execute(
+            select(
+                User.id,
+                User.username,
+                User.display_name,
+                TelegramAccount.telegram_user_id,
+                TelegramAccount.username,
+                TelegramAccount.first_name,
+            )
+            .outerjoin(TelegramAccount, TelegramAccount.user_id == User.id)
+            .where(User.id.in_(missing))
+        )
+        loaded = [
+            UserDisplay(
+                user_id=user_id,
+                telegram_user_id=telegram_user_id,
+                username=tg_username or username,
+                display_name=display_name or first_name,
+            )
+            for user_id, username, display_name, telegram_user_id, tg_username, first_name in result.all()
+        ]
+        if settings.USER_HYDRATION_CACHE_TTL_SECONDS > 0:
+            user_display_cache.put_many(loaded)
+        displays.update((display.user_id, display) for display in loaded)
+
+    return displays
+
+
+def invalidate_user_display(user_id: int | None = None) -> None:
+    """Bu process'teki görüntüleme cache'ini (tek kullanıcı ya da tümü) düşür."""
+    user_display_cache.invalidate(user_id)
+
+
+def get_user_display_cache_stats() -> dict:
+    """Hydration cache hit/miss sayaçları."""
+    return user_display_cache.stats()
@@ -2,13 +2,14 @@
 """
 NovaCore Telemetry Router - Growth & Education Event Tracking
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, func
 from datetime import datetime, timedelta
 from typing import List
 
 from app.core.db import get_session
+from app.core.rate_limit import RateLimit, rate_limit_user
 from app.core.security import get_current_user, get_admin_user
 from app.identity.models import User
 from app.telemetry.models import TelemetryEvent
@@ -20,6 +21,9 @@ from app.telemetry.schemas import (
 
 router = APIRouter(prefix="/api/v1/telemetry", tags=["telemetry"])
 
+# Kullanıcı başına günlük telemetry event limiti
+TELEMETRY_EVENTS_LIMIT = RateLimit("telemetry_events", limit=100, window_seconds=86400)
+
 
 @router.post(
     "/events",
@@ -27,6 +31,14 @@ router = APIRouter(prefix="/api/v1/telemetry", tags=["telemetry"])
     status_code=status.HTTP_201_CREATED,
     summary="Track Telemetry Event",
     description="Track a growth or education event (onboarding, academy, justice, etc.).",
+    dependencies=[
+        Depends(
+            rate_limit_user(
+                TELEMETRY_EVENTS_LIMIT,
+                detail="Rate limit exceeded: max 100 events per day",
+            )
+        )
+    ],
 )
 async def track_event(
     event_data: TelemetryEventCreate,
@@ -43,25 +55,9 @@ async def track_event(
     - recall_requested
     - appeal_submitted
     - justice_case_viewed (admin)
-    """
-    # Rate limiting: max 100 events per user per day
-    yesterday = datetime.utcnow() - timedelta(days=1)
-    count_query = select(func.count()).select_from(
-        select(TelemetryEvent.id)
-        .where(
-            TelemetryEvent.user_id == current_user.id,
-            TelemetryEvent.created_at >= yesterday,
-        )
-        .subquery()
-    )
-    event_count = (await session.execute(count_query)).scalar_one()
     
-    if event_count >= 100:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Rate limit exceeded: max 100 events per day",
-        )
-
+    Rate limit: max 100 events per user per day (TELEMETRY_EVENTS_LIMIT).
+    """
     # Create event
     event = TelemetryEvent(
         user_id=current_user.id,
@@ -0,0 +1,224 @@
+"""
+Treasury Flow Daily Rollup
+treasury_flows'u (day, app, kind) bazında özetleyen incremental rollup.
+
+route_revenue her flow'u session'a not eder; bekleyen satırlar commit'ten
+hemen önce tek bir upsert ile treasury_flow_daily'ye eklenir (ledger
+yazısıyla aynı transaction, rollback'te birlikte geri alınır).
+
+Okuma tarafı (flow_totals) kapanmış günleri rollup'tan, bugünü ve
+pencerenin yarım başlangıç gününü ham tablodan okur; böylece sonuç
+ham tablo üzerindeki aggregate ile birebir aynıdır.
+
+backfill_treasury_flow_daily() geçmişi ham tablodan yeniden hesaplar.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, and_, cast, delete, event, func, insert, literal, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.logging import get_logger
+from app.core.session_buffers import is_savepoint_commit, register_session_buffer
+from app.treasury.models import TreasuryFlow, TreasuryFlowDaily
+
+logger = get_logger("treasury_flow_daily")
+
+# TreasuryFlow ve TreasuryFlowDaily'de ortak olan tutar kolonları
+FLOW_METRICS = (
+    "gross_amount",
+    "tax_amount",
+    "net_to_performer",
+    "growth_amount",
+    "performer_pool_amount",
+    "dev_amount",
+    "burn_amount",
+)
+FLOW_DIMENSIONS = ("day", "app", "kind")
+
+_PENDING_KEY = "treasury_flow_daily_pending"
+
+
+def track_flow(session: AsyncSession, flow: TreasuryFlow) -> None:
+    """Commit'te rollup'a eklenecek bir flow'u not et."""
+    pending: dict[tuple[date, str, str], list] = session.info.setdefault(_PENDING_KEY, {})
+    key = (flow.ts.date(), flow.app, flow.kind)
+    sums = pending.setdefault(key, [Decimal("0")] * len(FLOW_METRICS) + [0])
+    for i, metric in enumerate(FLOW_METRICS):
+        sums[i] += getattr(flow, metric)
+    sums[-1] += 1
+
+
+def _upsert_daily(pending: dict[tuple[date, str, str], list]):
+    """Bekleyen tüm (day, app, kind) satırları için tek multi-row upsert."""
+    now = datetime.utcnow()
+    stmt = pg_insert(TreasuryFlowDaily).values(
+        [
+            {
+                "day": day,
+                "app": app,
+                "kind": kind,
+                **dict(zip(FLOW_METRICS, sums[:-1])),
+                "flow_count": sums[-1],
+                "updated_at": now,
+            }
+            # Sabit satır sırası: eşzamanlı commit'ler arasında deadlock olmaz
+            for (day, app, kind), sums in sorted(pending.items())
+        ]
+    )
+    daily = TreasuryFlowDaily.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=["day", "app", "kind"],
+        set_={
+            **{metric: daily.c[metric] + stmt.excluded[metric] for metric in FLOW_METRICS},
+            "flow_count": daily.c.flow_count + stmt.excluded.flow_count,
+            "updated_at": now,
+        },
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_pending_flows(session: Session) -> None:
+    """Bekleyen flow'ları commit'ten hemen önce rollup'a yaz."""
+    if is_savepoint_commit(session):
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        session.execute(_upsert_daily(pending))
+
+
+# Rollback olan transaction'ın / SAVEPOINT'in flow'ları atılır
+register_session_buffer(_PENDING_KEY, lambda pending: {key: list(sums) for key, sums in pending.items()})
+
+
+def _raw_dimension(name: str):
+    if name == "day":
+        return cast(TreasuryFlow.ts, Date)
+    return getattr(TreasuryFlow, name)
+
+
+async def flow_totals(
+    session: AsyncSession,
+    dimensions: tuple[str, ...] = (),
+    metrics: tuple[str, ...] = ("gross_amount",),
+    since: datetime | None = None,
+) -> dict[tuple, dict[str, Decimal]]:
+    """
+    treasury_flows toplamları, rollup + ham tablo birleşimi ile.
+
+    Args:
+        dimensions: Gruplama kolonları ("day", "app", "kind" alt kümesi)
+        metrics: Toplanacak tutar kolonları (FLOW_METRICS) veya "flow_count"
+        since: Pencere başlangıcı (None = tüm zamanlar)
+
+    Returns:
+        dimension değerleri tuple'ı → {metric: toplam}
+    """
+    today = datetime.utcnow().date()
+    today_start = datetime.combine(today, time.min)
+
+    # Rollup'tan okunabilecek ilk tam gün
+    if since is None:
+        first_full_day = None
+    elif since.time() == time.min:
+        first_full_day = since.date()
+    else:
+        first_full_day = since.date() + timedelta(days=1)
+
+    # 1) Kapanmış tam günler: rollup
+    daily_where = [TreasuryFlowDaily.day < today]
+    if first_full_day is not None:
+        daily_where.append(TreasuryFlowDaily.day >= first_full_day)
+    daily_dims = [getattr(TreasuryFlowDaily, d) for d in dimensions]
+    daily_query = select(
+        *daily_dims, *(func.sum(getattr(TreasuryFlowDaily, m)) for m in metrics)
+    ).where(*daily_where)
+    if daily_dims:
+        daily_query = daily_query.group_by(*daily_dims)
+
+    # 2) Bugün + pencerenin yarım başlangıç günü: ham tablo
+    raw_where = TreasuryFlow.ts >= today_start
+    if since is not None:
+        edge_end = datetime.combine(first_full_day, time.min)
+        raw_where = or_(raw_where, and_(TreasuryFlow.ts >= since, TreasuryFlow.ts < edge_end))
+    raw_dims = [_raw_dimension(d) for d in dimensions]
+    raw_query = select(
+        *raw_dims,
+        *(
+            func.count(TreasuryFlow.id) if m == "flow_count" else func.sum(getattr(TreasuryFlow, m))
+            for m in metrics
+        ),
+    ).where(raw_where)
+    if raw_dims:
+        raw_query = raw_query.group_by(*raw_dims)
+
+    totals: dict[tuple, dict[str, Decimal]] = {}
+    for query in (daily_query, raw_query):
+        for row in (await session.execute(query)).all():
+            key = tuple(row[: len(dimensions)])
+            bucket = totals.setdefault(key, {m: Decimal("0") for m in metrics})
+            for metric, value in zip(metrics, row[len(dimensions):]):
+                bucket[metric] += value or 0
+
+    # Boş pencerede de () anahtarı dönsün
+    if not dimensions:
+        totals.setdefault((), {m: Decimal("0") for m in metrics})
+    return totals
+
+
+async def backfill_treasury_flow_daily(
+    session: AsyncSession,
+    start: date | None = None,
+    end: date | None = None,
+) -> int:
+    """
+    [start, end) günlerinin rollup satırlarını ham tablodan yeniden hesapla.
+
+    İdempotent: aralıktaki mevcut satırlar silinip INSERT ... SELECT ile
+    yeniden yazılır. Canlı trafik altında sadece kapanmış günler (end <= bugün)
+    için çalıştırılmalı; bugün zaten ham tablodan okunur.
+
+    Returns:
+        Yazılan rollup satırı sayısı
+    """
+    day_expr = cast(TreasuryFlow.ts, Date)
+    raw_where = []
+    daily_where = []
+    if start is not None:
+        raw_where.append(TreasuryFlow.ts >= datetime.combine(start, time.min))
+        daily_where.append(TreasuryFlowDaily.day >= start)
+    if end is not None:
+        raw_where.append(TreasuryFlow.ts < datetime.combine(end, time.min))
+        daily_where.append(TreasuryFlowDaily.day < end)
+
+    await session.execute(delete(TreasuryFlowDaily).where(*daily_where))
+
+    aggregate = (
+        select(
+            day_expr,
+            TreasuryFlow.app,
+            TreasuryFlow.kind,
+            *(func.sum(getattr(TreasuryFlow, m)) for m in FLOW_METRICS),
+            func.count(TreasuryFlow.id),
+            cast(literal(datetime.utcnow()), DateTime),
+        )
+        .where(*raw_where)
+        .group_by(day_expr, TreasuryFlow.app, TreasuryFlow.kind)
+    )
+    result = await session.execute(
+        insert(TreasuryFlowDaily).from_select(
+            [*FLOW_DIMENSIONS, *FLOW_METRICS, "flow_count", "updated_at"],
+            aggregate,
+        )
+    )
+
+    logger.info(
+        "treasury_flow_daily_backfilled",
+        start=str(start) if start else None,
+        end=str(end) if end else None,
+        rows=result.rowcount,
+    )
+    return result.rowcount
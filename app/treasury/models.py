@@ -2,12 +2,12 @@
 NovaCore Treasury Models
 Devletin Ekonomik Dolaşım Sistemi - Modeller
 """
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import Column, Numeric, String, ForeignKey
+from sqlalchemy import Column, Numeric, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
@@ -93,6 +93,11 @@ class TreasuryFlow(SQLModel, table=True):
     Bu tablo → NovaCore'da Treasury heatmap / kaynak breakdown'ı besler.
     """
     __tablename__ = "treasury_flows"
+    __table_args__ = (
+        # Keyset pagination: (ts, id) < cursor, optionally per app
+        Index('ix_treasury_flows_ts_id', 'ts', 'id'),
+        Index('ix_treasury_flows_app_ts_id', 'app', 'ts', 'id'),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     ts: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -163,3 +168,53 @@ class TreasuryFlow(SQLModel, table=True):
             }
         }
 
+
+class TreasuryFlowDaily(SQLModel, table=True):
+    """
+    Günlük treasury akış özeti (incremental rollup).
+
+    (day, app, kind) başına treasury_flows toplamları. route_revenue
+    her flow'u aynı transaction'da buraya ekler; dashboard ve chart'lar
+    geçmiş günleri buradan, sadece bugünü ham tablodan okur.
+    """
+    __tablename__ = "treasury_flow_daily"
+    __table_args__ = (
+        UniqueConstraint('day', 'app', 'kind', name='uq_treasury_flow_daily'),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    day: date = Field(index=True)
+    app: str = Field(max_length=50)
+    kind: str = Field(max_length=50)
+
+    gross_amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    tax_amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    net_to_performer: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    growth_amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    performer_pool_amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    dev_amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    burn_amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+    flow_count: int = Field(default=0)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -2,11 +2,12 @@
 NovaCore Treasury Routes
 SiyahKare Nation Console için Treasury API endpoints
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_session
 from app.core.logging import get_logger
+from app.core.pagination import next_cursor
 from app.treasury.schemas import (
     RevenueChartData,
     SystemAccountOut,
@@ -49,19 +50,27 @@ async def get_treasury_summary(
 
 @router.get("/flows", response_model=list[TreasuryFlowOut])
 async def get_treasury_flows(
+    response: Response,
     range: str = Query(default="24h", description="24h, 7d, 30d, all"),
     app: str | None = Query(default=None, description="Filter by app"),
     kind: str | None = Query(default=None, description="Filter by kind"),
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=50, ge=1, le=100),
+    after: str | None = Query(default=None, description="Cursor from X-Next-Cursor (replaces page)"),
     service: TreasuryService = Depends(get_treasury_service),
 ):
     """
     Get treasury flows with filters.
     
-    Returns paginated list of treasury flows.
+    Returns paginated list of treasury flows. The cursor for the next
+    page is returned in the X-Next-Cursor header.
     """
-    flows, total = await service.get_flows(range, app, kind, page, per_page)
+    flows, _ = await service.get_flows(
+        range, app, kind, page, per_page, after=after, include_total=False
+    )
+    cursor = next_cursor(flows, per_page, ts_attr="ts")
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
     return flows
 
 
@@ -111,50 +120,7 @@ async def get_revenue_by_app_chart(
     
     Returns time series data for revenue breakdown by app.
     """
-    from datetime import timedelta, datetime
-    from decimal import Decimal
-    from sqlalchemy import func, cast, Date
-    from sqlmodel import select
-    from app.treasury.models import TreasuryFlow
-
-    # Range
-    if range == "7d":
-        since = datetime.utcnow() - timedelta(days=7)
-    else:  # 30d
-        since = datetime.utcnow() - timedelta(days=30)
-
-    # Query: group by date and app
-    query = (
-        select(
-            cast(TreasuryFlow.ts, Date).label("date"),
-            TreasuryFlow.app,
-            func.sum(TreasuryFlow.gross_amount).label("revenue"),
-        )
-        .where(TreasuryFlow.ts >= since)
-        .group_by(cast(TreasuryFlow.ts, Date), TreasuryFlow.app)
-        .order_by(cast(TreasuryFlow.ts, Date))
-    )
-
-    result = await service.session.execute(query)
-    rows = result.all()
-
-    # Organize data
-    dates = sorted(set(row[0] for row in rows))
-    apps = sorted(set(row[1] for row in rows))
-
-    revenue_by_app = {app: [Decimal("0")] * len(dates) for app in apps}
-    total_revenue = [Decimal("0")] * len(dates)
-
-    for date, app, revenue in rows:
-        date_idx = dates.index(date)
-        revenue_by_app[app][date_idx] = revenue
-        total_revenue[date_idx] += revenue
-
-    return RevenueChartData(
-        labels=[d.strftime("%Y-%m-%d") for d in dates],
-        revenue=total_revenue,
-        app_breakdown=revenue_by_app,
-    )
+    return await service.get_revenue_chart(range, "app")
 
 
 @router.get("/charts/revenue-by-kind", response_model=RevenueChartData)
@@ -167,48 +133,4 @@ async def get_revenue_by_kind_chart(
     
     Returns time series data for revenue breakdown by event kind.
     """
-    from datetime import timedelta, datetime
-    from decimal import Decimal
-    from sqlalchemy import func, cast, Date
-    from sqlmodel import select
-    from app.treasury.models import TreasuryFlow
-
-    # Range
-    if range == "7d":
-        since = datetime.utcnow() - timedelta(days=7)
-    else:  # 30d
-        since = datetime.utcnow() - timedelta(days=30)
-
-    # Query: group by date and kind
-    query = (
-        select(
-            cast(TreasuryFlow.ts, Date).label("date"),
-            TreasuryFlow.kind,
-            func.sum(TreasuryFlow.gross_amount).label("revenue"),
-        )
-        .where(TreasuryFlow.ts >= since)
-        .group_by(cast(TreasuryFlow.ts, Date), TreasuryFlow.kind)
-        .order_by(cast(TreasuryFlow.ts, Date))
-    )
-
-    result = await service.session.execute(query)
-    rows = result.all()
-
-    # Organize data
-    dates = sorted(set(row[0] for row in rows))
-    kinds = sorted(set(row[1] for row in rows))
-
-    revenue_by_kind = {kind: [Decimal("0")] * len(dates) for kind in kinds}
-    total_revenue = [Decimal("0")] * len(dates)
-
-    for date, kind, revenue in rows:
-        date_idx = dates.index(date)
-        revenue_by_kind[kind][date_idx] = revenue
-        total_revenue[date_idx] += revenue
-
-    return RevenueChartData(
-        labels=[d.strftime("%Y-%m-%d") for d in dates],
-        revenue=total_revenue,
-        app_breakdown=revenue_by_kind,
-    )
-
+    return await service.get_revenue_chart(range, "kind")
@@ -11,6 +11,8 @@ from sqlmodel import select
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.pagination import apply_keyset
+from app.treasury.daily_rollup import flow_totals, track_flow
 from app.treasury.models import SystemAccount, SystemAccountType, TreasuryFlow
 from app.treasury.rules import POOL_ACCOUNT_TYPE_MAP, resolve_config
 from app.treasury.schemas import (
@@ -22,10 +24,27 @@ from app.treasury.schemas import (
 )
 from app.wallet.models import Account, LedgerEntry, LedgerEntryType
 from app.wallet.service import WalletService
+from app.wallet.treasury_shards import get_treasury_shard_total
 from app.wallet.schemas import TransactionCreate
 
 logger = get_logger("treasury")
 
+# Revenue split pool'ları: account_type -> (label, description)
+POOL_ACCOUNT_LABELS = {
+    SystemAccountType.POOL_GROWTH: (
+        "Growth Fund",
+        "Marketing ve büyüme kampanyaları için fon",
+    ),
+    SystemAccountType.POOL_PERFORMER: (
+        "Performer Bonus Pool",
+        "Performer bonus dağıtımları için fon",
+    ),
+    SystemAccountType.POOL_DEV: (
+        "Dev Fund",
+        "Contributor ve developer ödemeleri için fon",
+    ),
+}
+
 
 class TreasuryService:
     """
@@ -76,6 +95,27 @@ class TreasuryService:
 
         return account
 
+    async def get_pool_accounts(
+        self, account_types: list[SystemAccountType]
+    ) -> dict[SystemAccountType, SystemAccount]:
+        """Load pool system accounts in one query, creating any that are missing."""
+        if not account_types:
+            return {}
+
+        result = await self.session.execute(
+            select(SystemAccount).where(SystemAccount.account_type.in_(account_types))
+        )
+        accounts = {account.account_type: account for account in result.scalars().all()}
+
+        for account_type in account_types:
+            if account_type not in accounts:
+                label, description = POOL_ACCOUNT_LABELS[account_type]
+                accounts[account_type] = await self.get_or_create_system_account(
+                    account_type, label, description
+                )
+
+        return accounts
+
     async def get_system_account_balance(
         self, account_type: SystemAccountType
     ) -> Decimal:
@@ -93,7 +133,16 @@ class TreasuryService:
         )
         wallet_account = wallet_account_result.scalar_one_or_none()
 
-        return wallet_account.balance if wallet_account else Decimal("0")
+        if not wallet_account:
+            return Decimal("0")
+
+        if wallet_account.user_id == settings.NCR_TREASURY_USER_ID:
+            # Pool'lar treasury'de tutulur: roll-up bekleyen shard credit'lerini de say
+            return wallet_account.balance + await get_treasury_shard_total(
+                self.session, wallet_account.token
+            )
+
+        return wallet_account.balance
 
     # ============ Revenue Routing ============
     async def route_revenue(self, request: RouteRevenueRequest) -> TreasuryFlowOut:
@@ -124,10 +173,13 @@ class TreasuryService:
         dev_amt = tax_amount * cfg.split["DEV_FUND"]
         burn_amt = tax_amount * cfg.split["BURN"]
 
+        # Tüm bacaklar tek journal'da: hesaplar bir kez kilitlenir, ledger tek INSERT
+        legs: list[TransactionCreate] = []
+
         # 1) User → Performer net transfer
         if request.performer_id:
             # User'dan çıkar
-            await self.wallet_service.create_transaction(
+            legs.append(
                 TransactionCreate(
                     user_id=request.user_id,
                     amount=request.gross_amount,
@@ -149,7 +201,7 @@ class TreasuryService:
             )
 
             # Performer'a ekle
-            await self.wallet_service.create_transaction(
+            legs.append(
                 TransactionCreate(
                     user_id=request.performer_id,
                     amount=net_to_performer,
@@ -168,59 +220,47 @@ class TreasuryService:
                 )
             )
 
-        # 2) Tax → pool'lara dağılır
-        # GROWTH
-        if growth_amt > 0:
-            growth_account = await self.get_or_create_system_account(
-                SystemAccountType.POOL_GROWTH,
-                "Growth Fund",
-                "Marketing ve büyüme kampanyaları için fon",
-            )
-            await self._credit_pool(
-                growth_account,
-                growth_amt,
-                request.app,
-                request.kind,
-                request.user_id,
-            )
+        # 2) Tax → pool'lara dağılır (GROWTH, PERFORMER_POOL, DEV_FUND)
+        pool_amounts = {
+            SystemAccountType.POOL_GROWTH: growth_amt,
+            SystemAccountType.POOL_PERFORMER: perfpool_amt,
+            SystemAccountType.POOL_DEV: dev_amt,
+        }
+        pool_accounts = await self.get_pool_accounts(
+            [pool_type for pool_type, amount in pool_amounts.items() if amount > 0]
+        )
+        for pool_type, amount in pool_amounts.items():
+            if amount > 0:
+                legs.append(
+                    self._pool_credit_leg(
+                        pool_accounts[pool_type],
+                        amount,
+                        request.app,
+                        request.kind,
+                        request.user_id,
+                    )
+                )
 
-        # PERFORMER_POOL
-        if perfpool_amt > 0:
-            perfpool_account = await self.get_or_create_system_account(
-                SystemAccountType.POOL_PERFORMER,
-                "Performer Bonus Pool",
-                "Performer bonus dağıtımları için fon",
-            )
-            await self._credit_pool(
-                perfpool_account,
-                perfpool_amt,
-                request.app,
-                request.kind,
-                request.user_id,
+        # 3) Burn
+        if burn_amt > 0:
+            legs.append(
+                self._burn_leg(
+                    burn_amt,
+                    request.app,
+                    request.kind,
+                    request.user_id,
+                )
             )
 
-        # DEV_FUND
-        if dev_amt > 0:
-            dev_account = await self.get_or_create_system_account(
-                SystemAccountType.POOL_DEV,
-                "Dev Fund",
-                "Contributor ve developer ödemeleri için fon",
-            )
-            await self._credit_pool(
-                dev_account,
-                dev_amt,
-                request.app,
-                request.kind,
-                request.user_id,
-            )
+        await self.wallet_service.post_journal(legs)
 
-        # 3) Burn
         if burn_amt > 0:
-            await self._burn_tokens(
-                burn_amt,
-                request.app,
-                request.kind,
-                request.user_id,
+            logger.info(
+                "tokens_burned",
+                amount=str(burn_amt),
+                app=request.app,
+                kind=request.kind,
+                user_id=request.user_id,
             )
 
         # 4) TreasuryFlow log'u oluştur
@@ -242,8 +282,8 @@ class TreasuryService:
             metadata=request.metadata,
         )
         self.session.add(flow)
+        track_flow(self.session, flow)
         await self.session.flush()
-        await self.session.refresh(flow)
 
         logger.info(
             "revenue_routed",
@@ -261,62 +301,50 @@ class TreasuryService:
 
         return TreasuryFlowOut.model_validate(flow)
 
-    async def _credit_pool(
+    def _pool_credit_leg(
         self,
         system_account: SystemAccount,
         amount: Decimal,
         app: str,
         kind: str,
         user_id: int,
-    ) -> None:
-        """Credit a pool account."""
+    ) -> TransactionCreate:
+        """Journal leg crediting a pool account."""
         if not system_account.wallet_account_id:
             raise ValueError(f"System account {system_account.id} has no wallet account")
 
         # Treasury user_id'ye ekle (pool'lar treasury'de tutulur)
-        await self.wallet_service.create_transaction(
-            TransactionCreate(
-                user_id=settings.NCR_TREASURY_USER_ID,
-                amount=amount,
-                token="NCR",
-                type=LedgerEntryType.EARN,
-                source_app=app.lower(),
-                related_user_id=user_id,
-                reference_id=system_account.id,
-                reference_type="POOL_CREDIT",
-                metadata={
-                    "pool_type": system_account.account_type.value,
-                    "kind": kind,
-                },
-            )
+        return TransactionCreate(
+            user_id=settings.NCR_TREASURY_USER_ID,
+            amount=amount,
+            token="NCR",
+            type=LedgerEntryType.EARN,
+            source_app=app.lower(),
+            related_user_id=user_id,
+            reference_id=system_account.id,
+            reference_type="POOL_CREDIT",
+            metadata={
+                "pool_type": system_account.account_type.value,
+                "kind": kind,
+            },
         )
 
-    async def _burn_tokens(
+    def _burn_leg(
         self, amount: Decimal, app: str, kind: str, user_id: int
-    ) -> None:
-        """Burn tokens (decrease total supply)."""
+    ) -> TransactionCreate:
+        """Journal leg burning tokens (decrease total supply)."""
         # User'dan çıkar (burn)
-        await self.wallet_service.create_transaction(
-            TransactionCreate(
-                user_id=user_id,
-                amount=amount,
-                token="NCR",
-                type=LedgerEntryType.BURN,
-                source_app=app.lower(),
-                reference_type="TREASURY_BURN",
-                metadata={
-                    "kind": kind,
-                    "burn_reason": "treasury_split",
-                },
-            )
-        )
-
-        logger.info(
-            "tokens_burned",
-            amount=str(amount),
-            app=app,
-            kind=kind,
+        return TransactionCreate(
             user_id=user_id,
+            amount=amount,
+            token="NCR",
+            type=LedgerEntryType.BURN,
+            source_app=app.lower(),
+            reference_type="TREASURY_BURN",
+            metadata={
+                "kind": kind,
+                "burn_reason": "treasury_split",
+            },
         )
 
     # ============ Treasury Summary ============
@@ -333,51 +361,29 @@ class TreasuryService:
 
         total_treasury = growth_balance + perfpool_balance + dev_balance
 
-        # Last 24h revenue
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        revenue_24h_result = await self.session.execute(
-            select(func.sum(TreasuryFlow.gross_amount)).where(
-                TreasuryFlow.ts >= yesterday
-            )
-        )
-        last_24h_revenue = revenue_24h_result.scalar() or Decimal("0")
-
-        # Last 7d revenue
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        revenue_7d_result = await self.session.execute(
-            select(func.sum(TreasuryFlow.gross_amount)).where(
-                TreasuryFlow.ts >= week_ago
-            )
-        )
-        last_7d_revenue = revenue_7d_result.scalar() or Decimal("0")
-
-        # Total burned
-        burn_total_result = await self.session.execute(
-            select(func.sum(TreasuryFlow.burn_amount))
+        # Flow aggregate'leri: kapanmış günler treasury_flow_daily'den,
+        # bugün ham tablodan (bkz. app.treasury.daily_rollup)
+        now = datetime.utcnow()
+        window_24h = await flow_totals(self.session, since=now - timedelta(days=1))
+        last_24h_revenue = window_24h[()]["gross_amount"]
+        window_7d = await flow_totals(self.session, since=now - timedelta(days=7))
+        last_7d_revenue = window_7d[()]["gross_amount"]
+
+        # Tüm zamanlar: app × kind tek sorguda, burn ve breakdown'lar buradan
+        all_time = await flow_totals(
+            self.session,
+            dimensions=("app", "kind"),
+            metrics=("gross_amount", "burn_amount"),
         )
-        total_burned = burn_total_result.scalar() or Decimal("0")
-
-        # Revenue by app
-        app_revenue_result = await self.session.execute(
-            select(
-                TreasuryFlow.app,
-                func.sum(TreasuryFlow.gross_amount).label("total"),
-            ).group_by(TreasuryFlow.app)
-        )
-        revenue_by_app = {
-            row[0]: row[1] for row in app_revenue_result.all() if row[1]
-        }
-
-        # Revenue by kind
-        kind_revenue_result = await self.session.execute(
-            select(
-                TreasuryFlow.kind,
-                func.sum(TreasuryFlow.gross_amount).label("total"),
-            ).group_by(TreasuryFlow.kind)
-        )
-        revenue_by_kind = {
-            row[0]: row[1] for row in kind_revenue_result.all() if row[1]
-        }
+        total_burned = Decimal("0")
+        revenue_by_app: dict[str, Decimal] = {}
+        revenue_by_kind: dict[str, Decimal] = {}
+        for (app, kind), sums in all_time.items():
+            total_burned += sums["burn_amount"]
+            revenue_by_app[app] = revenue_by_app.get(app, Decimal("0")) + sums["gross_amount"]
+            revenue_by_kind[kind] = revenue_by_kind.get(kind, Decimal("0")) + sums["gross_amount"]
+        revenue_by_app = {app: total for app, total in revenue_by_app.items() if total}
+        revenue_by_kind = {kind: total for kind, total in revenue_by_kind.items() if total}
 
         return TreasurySummary(
             total_treasury=total_treasury,
@@ -393,6 +399,36 @@ class TreasuryService:
             revenue_by_kind=revenue_by_kind,
         )
 
+    async def get_revenue_chart(self, range_str: str, dimension: str) -> RevenueChartData:
+        """
+        Daily revenue series broken down by app or kind.
+
+        Closed days come from treasury_flow_daily, today (and the partial
+        first day of the window) from treasury_flows.
+        """
+        days = 7 if range_str == "7d" else 30
+        since = datetime.utcnow() - timedelta(days=days)
+
+        totals = await flow_totals(self.session, dimensions=("day", dimension), since=since)
+
+        # Organize data
+        dates = sorted({day for day, _ in totals})
+        keys = sorted({key for _, key in totals})
+        date_index = {day: i for i, day in enumerate(dates)}
+
+        breakdown = {key: [Decimal("0")] * len(dates) for key in keys}
+        total_revenue = [Decimal("0")] * len(dates)
+        for (day, key), sums in totals.items():
+            revenue = sums["gross_amount"]
+            breakdown[key][date_index[day]] = revenue
+            total_revenue[date_index[day]] += revenue
+
+        return RevenueChartData(
+            labels=[d.strftime("%Y-%m-%d") for d in dates],
+            revenue=total_revenue,
+            app_breakdown=breakdown,
+        )
+
     # ============ Flow History ============
     async def get_flows(
         self,
@@ -401,8 +437,15 @@ class TreasuryService:
         kind: str | None = None,
         page: int = 1,
         per_page: int = 50,
-    ) -> tuple[list[TreasuryFlowOut], int]:
-        """Get treasury flows with filters."""
+        after: str | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[TreasuryFlowOut], int | None]:
+        """
+        Get treasury flows with filters.
+
+        `after` is a keyset cursor over (ts, id) (see app.core.pagination);
+        `include_total=False` skips the COUNT.
+        """
         query = select(TreasuryFlow)
 
         # Range filter
@@ -427,12 +470,13 @@ class TreasuryService:
             query = query.where(TreasuryFlow.kind == kind.upper())
 
         # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self.session.execute(count_query)).scalar() or 0
+        total = None
+        if include_total:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self.session.execute(count_query)).scalar() or 0
 
         # Fetch
-        query = query.order_by(TreasuryFlow.ts.desc())
-        query = query.offset((page - 1) * per_page).limit(per_page)
+        query = apply_keyset(query, TreasuryFlow.ts, TreasuryFlow.id, after, page, per_page)
 
         result = await self.session.execute(query)
         flows = [TreasuryFlowOut.model_validate(f) for f in result.scalars().all()]
@@ -5,7 +5,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 
-from sqlalchemy import Column, Numeric
+from sqlalchemy import Column, Index, Numeric, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
@@ -19,6 +19,10 @@ class Account(SQLModel, table=True):
     """
 
     __tablename__ = "accounts"
+    __table_args__ = (
+        # Guarded balance UPDATEs must match exactly one row per (user, token)
+        UniqueConstraint('user_id', 'token', name='uq_account_user_token'),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -32,6 +36,63 @@ class Account(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TreasuryShard(SQLModel, table=True):
+    """
+    Treasury hot-account shard.
+
+    Sharding açıkken treasury credit'leri tek Account satırı yerine
+    bu satırlara dağılır. Roll-up job'ı bakiyeleri periyodik olarak
+    canonical treasury Account'una taşır.
+    Gerçek treasury bakiyesi = canonical Account + SUM(shard balance).
+    """
+    __tablename__ = "treasury_shards"
+    __table_args__ = (
+        UniqueConstraint('token', 'shard_no', name='uq_treasury_shard'),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    token: str = Field(default="NCR", max_length=10)
+    shard_no: int = Field(default=0)
+    balance: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=18, scale=8), nullable=False, default=0),
+    )
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class TreasuryTotal(SQLModel, table=True):
+    """
+    Treasury özet sayaçları (incremental aggregate).
+
+    Ledger yazısı ile aynı transaction içinde güncellenir, böylece
+    treasury özeti ledger_entries / accounts taramadan okunur.
+
+    metric:
+    - rake / fee / burn → treasury'ye yansıyan original_type toplamları
+    - circulating       → treasury dışı hesap bakiyeleri toplamı
+    - holders           → bakiyesi > 0 olan hesap sayısı
+
+    Sıcak satır olmaması için her metric slot'lara bölünür;
+    gerçek değer = SUM(amount) GROUP BY metric.
+    """
+    __tablename__ = "treasury_totals"
+    __table_args__ = (
+        UniqueConstraint('token', 'metric', 'slot', name='uq_treasury_total_slot'),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    token: str = Field(default="NCR", max_length=10)
+    metric: str = Field(max_length=20)
+    slot: int = Field(default=0)
+    amount: Decimal = Field(
+        default=Decimal("0"),
+        sa_column=Column(Numeric(precision=24, scale=8), nullable=False, default=0),
+    )
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class DailyTreasuryStat(SQLModel, table=True):
     """
     Günlük Treasury istatistiği.
@@ -70,6 +131,9 @@ class NCRMarketState(SQLModel, table=True):
     ema_coverage: float = Field(default=1.0)  # 1.0 = %100 teminat
     ema_flow_index: float = Field(default=0.0)  # pozitif = sistemden fazla çıkış / baskı
     
+    # Her fiyat güncellemesinde artar (process cache'leri bununla revalidate eder)
+    version: int = Field(default=0)
+    
     # Basit telemetri
     last_updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -107,6 +171,10 @@ class LedgerEntry(SQLModel, table=True):
     """
 
     __tablename__ = "ledger_entries"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) < cursor
+        Index('ix_ledger_entries_user_created_id', 'user_id', 'created_at', 'id'),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
 
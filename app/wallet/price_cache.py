@@ -0,0 +1,140 @@
+"""
+NCR Price Cache - process-wide market price cache
+
+NCR fiyatı her pricing-aware path'te (revenue share, ekonomi özeti)
+okunur; değeri ise sadece update_ncr_price'ta (genelde günde bir cron)
+değişir.
+
+- TTL içinde: DB'ye hiç gidilmez
+- TTL dolunca: sadece ncr_market_state.version'ı okuyan ucuz
+  version-check; version aynıysa cache uzatılır, değiştiyse fiyat
+  yeniden yüklenir
+- update_ncr_price commit sonrası yeni fiyatı + version'ı bu process'in
+  cache'ine doğrudan yazar; diğer worker'lar (ve cron gibi ayrı
+  process'ler) değişikliği en geç bir TTL sonra version-check ile görür
+- Okunan satır update_ncr_price'ın yazdığı satırdır (en küçük id)
+- Market state satırı yoksa get_cached_ncr_price NCR_BASE_PRICE_TRY,
+  get_cached_market_price None döner; okuma yolu satır oluşturmaz /
+  commit etmez
+- warm_up_ncr_price_cache(): lifespan'de ilk request'ten önce yükler
+"""
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.wallet.models import NCRMarketState
+
+logger = get_logger("ncr_price_cache")
+
+# Market state satırı yokken kullanılan version anahtarı
+NO_MARKET_STATE_VERSION = -1
+
+
+class NCRPriceCache:
+    """Güncel NCR fiyatı + version stamp + hit/miss sayaçları."""
+
+    def __init__(self):
+        self._price: Optional[float] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.invalidations = 0
+
+    def invalidate(self) -> None:
+        """Cache'i düşür; sonraki okuma tam yükleme yapar."""
+        self._price = None
+        self._version = None
+        self.invalidations += 1
+
+    def set(self, price: Optional[float], version: int) -> None:
+        """Yazan taraf: yeni fiyatı doğrudan cache'e koy (None = market state yok)."""
+        self._price = price
+        self._version = version
+        self._checked_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """Sayaçlar ve cache'teki fiyat / version."""
+        return {
+            "price_try": self._price,
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "version_checks": self.version_checks,
+            "invalidations": self.invalidations,
+        }
+
+    async def get(self, session: AsyncSession) -> float:
+        """Cache'teki fiyat; market state yoksa NCR_BASE_PRICE_TRY."""
+        price = await self.get_market_price(session)
+        return settings.NCR_BASE_PRICE_TRY if price is None else price
+
+    async def get_market_price(self, session: AsyncSession) -> Optional[float]:
+        """Cache'teki market state fiyatı (satır yoksa None); boşsa veya version değiştiyse yükle."""
+        now = time.monotonic()
+
+        if self._version is not None:
+            if now - self._checked_at < settings.NCR_PRICE_CACHE_TTL_SECONDS:
+                self.hits += 1
+                return self._price
+
+            self.version_checks += 1
+            result = await session.execute(
+                select(NCRMarketState.version).order_by(NCRMarketState.id).limit(1)
+            )
+            version = result.scalar()
+            if (NO_MARKET_STATE_VERSION if version is None else version) == self._version:
+                self._checked_at = now
+                self.hits += 1
+                return self._price
+
+        self.misses += 1
+        result = await session.execute(
+            select(NCRMarketState.current_price_try, NCRMarketState.version)
+            .order_by(NCRMarketState.id)
+            .limit(1)
+        )
+        row = result.one_or_none()
+        if row is None:
+            self.set(None, NO_MARKET_STATE_VERSION)
+        else:
+            self.set(row.current_price_try, row.version)
+
+        logger.info("ncr_price_loaded", **self.stats())
+        return self._price
+
+
+ncr_price_cache = NCRPriceCache()
+
+
+async def get_cached_ncr_price(session: AsyncSession) -> float:
+    """Güncel NCR fiyatını cache üzerinden getir."""
+    return await ncr_price_cache.get(session)
+
+
+async def get_cached_market_price(session: AsyncSession) -> Optional[float]:
+    """Market state fiyatı cache üzerinden; satır yoksa None."""
+    return await ncr_price_cache.get_market_price(session)
+
+
+def invalidate_ncr_price_cache() -> None:
+    """Bu process'teki fiyat cache'ini düşür."""
+    ncr_price_cache.invalidate()
+
+
+def get_ncr_price_cache_stats() -> dict:
+    """Fiyat cache hit/miss sayaçları."""
+    return ncr_price_cache.stats()
+
+
+async def warm_up_ncr_price_cache() -> None:
+    """Fiyatı ilk request'ten önce yükle (lifespan)."""
+    from app.core.db import async_session_factory
+
+    async with async_session_factory() as session:
+        await ncr_price_cache.get(session)
@@ -1,6 +1,10 @@
 """
 NCR Pricing System
 Fiyat stabilizasyon algoritması - Coverage + Flow bazlı fiyat ayarlama
+
+Okuma tarafı (get_current_ncr_price) app.wallet.price_cache üzerinden
+gider; update_ncr_price her güncellemede version'ı artırır ve bu
+process'in cache'ini yeni fiyatla günceller.
 """
 from datetime import datetime
 from typing import Tuple
@@ -10,6 +14,14 @@ from sqlmodel import select
 
 from app.core.config import settings
 from app.wallet.models import NCRMarketState
+from app.wallet.price_cache import get_cached_ncr_price, ncr_price_cache
+
+# Bir günde izin verilen maksimum fiyat hareketi (±%15)
+MAX_DAILY_PRICE_CHANGE = 0.15
+
+# Market state'te saklanan EMA hassasiyeti
+EMA_COVERAGE_DIGITS = 4
+EMA_FLOW_DIGITS = 6
 
 
 async def _get_or_init_market_state(session: AsyncSession) -> NCRMarketState:
@@ -80,40 +92,33 @@ def compute_flow_index(
     return net_out / anchor
 
 
-async def update_ncr_price(
-    session: AsyncSession,
+def compute_price_step(
     *,
+    current_price: float,
+    ema_coverage: float,
+    ema_flow_index: float,
     treasury_reserves_fiat: float,
     ncr_outstanding: float,
     net_mint_24h: float,
     net_burn_24h: float,
     net_redemption_24h: float,
-) -> Tuple[float, dict]:
+) -> Tuple[float, float, float, dict]:
     """
-    NCR fiyatını Treasury ve akıma göre günceller.
-    
-    Bu fonksiyon günde 1 kere cron'la tetiklenebilir.
-    
-    Args:
-        session: Database session
-        treasury_reserves_fiat: Kasadaki fiat / stablecoin
-        ncr_outstanding: Tüm cüzdanlardaki toplam NCR (liability)
-        net_mint_24h: Son 24 saatte basılan NCR
-        net_burn_24h: Son 24 saatte yakılan NCR
-        net_redemption_24h: Son 24 saatte fiata çevrilen NCR
-    
+    Tek fiyat adımı (update_ncr_price'ın saf çekirdeği, DB yok).
+
+    Ekonomi simülasyonu da aynı adımı kullanır; knob'lar (NCR_K_*,
+    NCR_TARGET_COVERAGE, NCR_SMOOTHING_ALPHA, bantlar) çağrı anında
+    settings'ten okunur.
+
     Returns:
-        (new_price, metadata)
+        (new_price, ema_coverage, ema_flow_index, metadata)
+        new_price 4 haneye yuvarlanmıştır; EMA'lar yuvarlanmamıştır
     """
-    state = await _get_or_init_market_state(session)
-    
-    base_price = settings.NCR_BASE_PRICE_TRY
-    
     # 1) Coverage ve Flow hesapla
     raw_coverage = compute_coverage_ratio(
         treasury_reserves_fiat=treasury_reserves_fiat,
         ncr_outstanding=ncr_outstanding,
-        reference_price=state.current_price_try or base_price,
+        reference_price=current_price or settings.NCR_BASE_PRICE_TRY,
     )
     
     raw_flow = compute_flow_index(
@@ -124,8 +129,8 @@ async def update_ncr_price(
     
     # 2) EMA smoothing
     alpha = settings.NCR_SMOOTHING_ALPHA
-    ema_cov = _ema(state.ema_coverage, raw_coverage, alpha)
-    ema_flow = _ema(state.ema_flow_index, raw_flow, alpha)
+    ema_cov = _ema(ema_coverage, raw_coverage, alpha)
+    ema_flow = _ema(ema_flow_index, raw_flow, alpha)
     
     # 3) Coverage bazlı düzeltme
     target = settings.NCR_TARGET_COVERAGE
@@ -142,34 +147,22 @@ async def update_ncr_price(
     total_adjust = cov_adjust + flow_adjust
     
     # Hard clamp: bir günde belli bir %'den fazla oynama olmasın
-    max_daily_change = 0.15  # ±%15
-    if total_adjust > max_daily_change:
-        total_adjust = max_daily_change
-    elif total_adjust < -max_daily_change:
-        total_adjust = -max_daily_change
+    if total_adjust > MAX_DAILY_PRICE_CHANGE:
+        total_adjust = MAX_DAILY_PRICE_CHANGE
+    elif total_adjust < -MAX_DAILY_PRICE_CHANGE:
+        total_adjust = -MAX_DAILY_PRICE_CHANGE
     
     # 6) Yeni fiyat
-    proposed_price = state.current_price_try * (1 + total_adjust)
+    proposed_price = current_price * (1 + total_adjust)
     
     # Fiyat bantlarını uygula
     min_p = settings.NCR_MIN_PRICE_TRY
     max_p = settings.NCR_MAX_PRICE_TRY
-    new_price = max(min_p, min(max_p, proposed_price))
-    
-    # 7) State güncelle
-    state.last_price_try = state.current_price_try
-    state.current_price_try = round(new_price, 4)
-    state.ema_coverage = round(ema_cov, 4)
-    state.ema_flow_index = round(ema_flow, 6)
-    state.last_updated_at = datetime.utcnow()
-    
-    session.add(state)
-    await session.commit()
-    await session.refresh(state)
+    new_price = round(max(min_p, min(max_p, proposed_price)), 4)
     
     meta = {
-        "old_price": state.last_price_try,
-        "new_price": state.current_price_try,
+        "old_price": current_price,
+        "new_price": new_price,
         "raw_coverage": raw_coverage,
         "ema_coverage": ema_cov,
         "raw_flow": raw_flow,
@@ -179,11 +172,64 @@ async def update_ncr_price(
         "total_adjust": total_adjust,
     }
     
+    return new_price, ema_cov, ema_flow, meta
+
+
+async def update_ncr_price(
+    session: AsyncSession,
+    *,
+    treasury_reserves_fiat: float,
+    ncr_outstanding: float,
+    net_mint_24h: float,
+    net_burn_24h: float,
+    net_redemption_24h: float,
+) -> Tuple[float, dict]:
+    """
+    NCR fiyatını Treasury ve akıma göre günceller.
+    
+    Bu fonksiyon günde 1 kere cron'la tetiklenebilir.
+    
+    Args:
+        session: Database session
+        treasury_reserves_fiat: Kasadaki fiat / stablecoin
+        ncr_outstanding: Tüm cüzdanlardaki toplam NCR (liability)
+        net_mint_24h: Son 24 saatte basılan NCR
+        net_burn_24h: Son 24 saatte yakılan NCR
+        net_redemption_24h: Son 24 saatte fiata çevrilen NCR
+    
+    Returns:
+        (new_price, metadata)
+    """
+    state = await _get_or_init_market_state(session)
+    
+    new_price, ema_cov, ema_flow, meta = compute_price_step(
+        current_price=state.current_price_try,
+        ema_coverage=state.ema_coverage,
+        ema_flow_index=state.ema_flow_index,
+        treasury_reserves_fiat=treasury_reserves_fiat,
+        ncr_outstanding=ncr_outstanding,
+        net_mint_24h=net_mint_24h,
+        net_burn_24h=net_burn_24h,
+        net_redemption_24h=net_redemption_24h,
+    )
+    
+    # 7) State güncelle
+    state.last_price_try = state.current_price_try
+    state.current_price_try = new_price
+    state.ema_coverage = round(ema_cov, EMA_COVERAGE_DIGITS)
+    state.ema_flow_index = round(ema_flow, EMA_FLOW_DIGITS)
+    state.last_updated_at = datetime.utcnow()
+    state.version = (state.version or 0) + 1
+    
+    session.add(state)
+    await session.commit()
+    await session.refresh(state)
+    ncr_price_cache.set(state.current_price_try, state.version)
+    
     return state.current_price_try, meta
 
 
 async def get_current_ncr_price(session: AsyncSession) -> float:
-    """Mevcut NCR fiyatını getir."""
-    state = await _get_or_init_market_state(session)
-    return state.current_price_try
+    """Mevcut NCR fiyatını getir (process cache, version-check ile)."""
+    return await get_cached_ncr_price(session)
 
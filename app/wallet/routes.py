@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_session
+from app.core.pagination import next_cursor
 from app.core.security import get_admin_user, get_current_user
 from app.identity.models import User
 from app.wallet.models import LedgerEntryType
@@ -92,11 +93,13 @@ async def get_my_transactions(
     per_page: int = Query(20, ge=1, le=100),
     token: str | None = Query(None, description="Filter by token"),
     type: LedgerEntryType | None = Query(None, description="Filter by type"),
+    after: str | None = Query(None, description="Cursor from next_cursor (replaces page)"),
+    include_total: bool = Query(True, description="Compute total count"),
 ) -> TransactionListResponse:
     """Get current user's transaction history."""
     service = WalletService(session)
     entries, total = await service.get_transactions(
-        current_user.id, page, per_page, token, type
+        current_user.id, page, per_page, token, type, after=after, include_total=include_total
     )
 
     return TransactionListResponse(
@@ -104,6 +107,7 @@ async def get_my_transactions(
         total=total,
         page=page,
         per_page=per_page,
+        next_cursor=next_cursor(entries, per_page),
     )
 
 
@@ -79,9 +79,10 @@ class TransactionListResponse(BaseModel):
     """List of transactions."""
 
     transactions: list[TransactionResponse]
-    total: int
+    total: int | None = None
     page: int
     per_page: int
+    next_cursor: str | None = None
 
 
 # ============ Transfer Schema ============
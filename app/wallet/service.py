@@ -5,13 +5,16 @@ from datetime import datetime
 from decimal import Decimal
 
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import Insert, Integer, Numeric, Row, cast, column, func, insert, tuple_, update
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.wallet.models import Account, LedgerEntry, LedgerEntryType
+from app.core.pagination import apply_keyset
+from app.wallet.models import Account, LedgerEntry, LedgerEntryType, TreasuryShard
 from app.wallet.schemas import (
     BalanceResponse,
     TransactionCreate,
@@ -21,9 +24,43 @@ from app.wallet.schemas import (
     TreasuryBalance,
     TreasurySummary,
 )
+from app.wallet.treasury_shards import (
+    credit_treasury_shards,
+    ensure_treasury_shards,
+    get_treasury_shard_total,
+    pick_treasury_shard,
+    rollup_treasury_shards,
+    treasury_sharding_enabled,
+)
+from app.wallet.treasury_totals import (
+    METRIC_CIRCULATING,
+    METRIC_HOLDERS,
+    get_treasury_totals,
+    track_balance_change,
+    track_entry,
+)
 
 logger = get_logger("wallet")
 
+# Entry types that increase / decrease the account balance
+CREDIT_TYPES = frozenset(
+    {LedgerEntryType.EARN, LedgerEntryType.DEPOSIT, LedgerEntryType.REWARD}
+)
+DEBIT_TYPES = frozenset(
+    {
+        LedgerEntryType.SPEND,
+        LedgerEntryType.WITHDRAW,
+        LedgerEntryType.BURN,
+        LedgerEntryType.FEE,
+        LedgerEntryType.RAKE,
+        LedgerEntryType.TRANSFER,
+    }
+)
+# Debits that are mirrored as a treasury credit
+TREASURY_MIRROR_TYPES = frozenset(
+    {LedgerEntryType.RAKE, LedgerEntryType.FEE, LedgerEntryType.BURN}
+)
+
 
 class WalletService:
     """Wallet service for NCR ledger operations."""
@@ -34,8 +71,11 @@ class WalletService:
     # ============ Account Operations ============
     async def get_account(self, user_id: int, token: str = "NCR") -> Account | None:
         """Get user account for a specific token."""
+        # Balances are mutated with core UPDATEs, so always refresh the identity map
         result = await self.session.execute(
-            select(Account).where(Account.user_id == user_id, Account.token == token)
+            select(Account)
+            .where(Account.user_id == user_id, Account.token == token)
+            .execution_options(populate_existing=True)
         )
         return result.scalar_one_or_none()
 
@@ -44,10 +84,20 @@ class WalletService:
         account = await self.get_account(user_id, token)
 
         if not account:
-            account = Account(user_id=user_id, token=token, balance=Decimal("0"))
-            self.session.add(account)
-            await self.session.flush()
-            await self.session.refresh(account)
+            # ON CONFLICT: concurrent first-touch requests must not create duplicate rows
+            now = datetime.utcnow()
+            await self.session.execute(
+                pg_insert(Account)
+                .values(
+                    user_id=user_id,
+                    token=token,
+                    balance=Decimal("0"),
+                    created_at=now,
+                    updated_at=now,
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "token"])
+            )
+            account = await self.get_account(user_id, token)
 
             logger.info("account_created", user_id=user_id, token=token)
 
@@ -68,81 +118,241 @@ class WalletService:
         Create a ledger entry and update account balance.
         
         This is the core transaction method used by all apps.
+
+        The balance check, balance write and ledger insert run as a single
+        guarded statement (see _post_entry), so concurrent spends on the same
+        account serialize on the row lock instead of racing on a stale read.
         """
-        account = await self.get_or_create_account(tx.user_id, tx.token)
-
-        # Calculate new balance based on type
-        if tx.type in [LedgerEntryType.EARN, LedgerEntryType.DEPOSIT, LedgerEntryType.REWARD]:
-            # Increase balance
-            new_balance = account.balance + tx.amount
-        elif tx.type in [
-            LedgerEntryType.SPEND,
-            LedgerEntryType.WITHDRAW,
-            LedgerEntryType.BURN,
-            LedgerEntryType.FEE,
-            LedgerEntryType.RAKE,
-        ]:
-            # Decrease balance
-            if account.balance < tx.amount:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient balance. Current: {account.balance}, Required: {tx.amount}",
-                )
-            new_balance = account.balance - tx.amount
-        elif tx.type == LedgerEntryType.TRANSFER:
-            # Transfer out - decrease balance
-            if account.balance < tx.amount:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient balance for transfer. Current: {account.balance}",
-                )
-            new_balance = account.balance - tx.amount
+        if tx.type in CREDIT_TYPES:
+            delta = tx.amount
+        elif tx.type in DEBIT_TYPES:
+            delta = -tx.amount
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Unknown transaction type: {tx.type}",
             )
 
-        # Create ledger entry
-        entry = LedgerEntry(
+        now = datetime.utcnow()
+        entry_values = self._entry_values(tx, now)
+
+        is_treasury = tx.user_id == settings.NCR_TREASURY_USER_ID and tx.token == "NCR"
+        if is_treasury and treasury_sharding_enabled():
+            if delta > 0:
+                row = await self._credit_treasury_shard(entry_values, delta, tx.related_user_id)
+                return self._transaction_response(tx, row, now)
+            # Debits need the full treasury balance on the canonical row
+            await rollup_treasury_shards(self.session)
+
+        row = await self._post_entry(entry_values, delta)
+
+        if row is None:
+            current_balance = await self._get_current_balance(tx.user_id, tx.token)
+
+            if current_balance is None and delta > 0:
+                # First credit for this account: create it and retry once
+                await self.get_or_create_account(tx.user_id, tx.token)
+                row = await self._post_entry(entry_values, delta)
+            elif current_balance is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"No {tx.token} account for user {tx.user_id}",
+                )
+            else:
+                raise self._insufficient_balance(tx, current_balance)
+
+        logger.info(
+            "transaction_created",
+            entry_id=row.id,
+            user_id=tx.user_id,
+            type=tx.type.value,
+            amount=str(tx.amount),
+            source_app=tx.source_app,
+            balance_after=str(row.balance_after),
+        )
+
+        # Handle treasury operations for RAKE/FEE/BURN
+        if tx.type in TREASURY_MIRROR_TYPES:
+            await self._credit_treasury(
+                tx.amount, tx.type, tx.source_app, tx.metadata, shard_hint=tx.user_id
+            )  # Schema field name
+
+        return self._transaction_response(tx, row, now)
+
+    @staticmethod
+    def _transaction_response(
+        tx: TransactionCreate, row: Row, created_at: datetime
+    ) -> TransactionResponse:
+        """Build the response from the RETURNING row of a posted entry."""
+        return TransactionResponse(
+            id=row.id,
             user_id=tx.user_id,
             amount=tx.amount,
             token=tx.token,
             type=tx.type,
             source_app=tx.source_app,
-            related_user_id=tx.related_user_id,
-            performer_id=tx.performer_id,
-            agency_id=tx.agency_id,
-            reference_id=tx.reference_id,
-            reference_type=tx.reference_type,
-            meta=tx.metadata,  # Schema uses 'metadata', model uses 'meta'
-            balance_after=new_balance,
+            balance_after=row.balance_after,
+            created_at=created_at,
         )
-        self.session.add(entry)
 
-        # Update account balance
-        account.balance = new_balance
-        account.updated_at = datetime.utcnow()
-        self.session.add(account)
+    @staticmethod
+    def _entry_values(tx: TransactionCreate, now: datetime) -> dict:
+        """ledger_entries column values for a transaction (balance_after excluded)."""
+        return {
+            "user_id": tx.user_id,
+            "amount": tx.amount,
+            "token": tx.token,
+            "type": tx.type,
+            "source_app": tx.source_app,
+            "related_user_id": tx.related_user_id,
+            "performer_id": tx.performer_id,
+            "agency_id": tx.agency_id,
+            "reference_id": tx.reference_id,
+            "reference_type": tx.reference_type,
+            "metadata": tx.metadata,  # Schema uses 'metadata', DB column is 'metadata'
+            "created_at": now,
+        }
+
+    @staticmethod
+    def _treasury_entry_values(
+        amount: Decimal,
+        entry_type: LedgerEntryType,
+        source_app: str,
+        metadata: dict,
+        now: datetime,
+    ) -> dict:
+        """ledger_entries column values for the treasury side of a RAKE/FEE/BURN."""
+        return {
+            "user_id": settings.NCR_TREASURY_USER_ID,
+            "amount": amount,
+            "token": "NCR",
+            "type": LedgerEntryType.EARN,  # Treasury "earns" the rake/fee
+            "source_app": source_app,
+            "related_user_id": None,
+            "performer_id": None,
+            "agency_id": None,
+            "reference_id": None,
+            "reference_type": None,
+            "metadata": {
+                "original_type": entry_type.value,
+                **metadata,
+            },
+            "created_at": now,
+        }
+
+    @staticmethod
+    def _insufficient_balance(tx: TransactionCreate, current_balance: Decimal) -> HTTPException:
+        """Error for a debit the account cannot cover."""
+        if tx.type == LedgerEntryType.TRANSFER:
+            detail = f"Insufficient balance for transfer. Current: {current_balance}"
+        else:
+            detail = f"Insufficient balance. Current: {current_balance}, Required: {tx.amount}"
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
-        await self.session.flush()
-        await self.session.refresh(entry)
+    async def _post_entry(self, entry_values: dict, delta: Decimal) -> Row | None:
+        """
+        Apply a balance delta and write its ledger entry in one round-trip.
 
-        logger.info(
-            "transaction_created",
-            entry_id=entry.id,
-            user_id=tx.user_id,
-            type=tx.type.value,
-            amount=str(tx.amount),
-            source_app=tx.source_app,
-            balance_after=str(new_balance),
+        Rendered as:
+
+            WITH moved AS (
+                UPDATE accounts SET balance = balance + :delta
+                WHERE user_id = :user_id AND token = :token
+                  AND balance >= :amount          -- debits only
+                RETURNING balance
+            )
+            INSERT INTO ledger_entries (..., balance_after)
+            SELECT ..., moved.balance FROM moved
+            RETURNING id, balance_after
+
+        The UPDATE takes the row lock and re-checks the guard against the
+        latest committed balance, so no funds check can act on a stale read.
+        Returns None when no account row matched; the caller decides whether
+        that was a missing account or insufficient funds.
+        """
+        accounts = Account.__table__
+        ledger = LedgerEntry.__table__
+
+        conditions = [
+            accounts.c.user_id == entry_values["user_id"],
+            accounts.c.token == entry_values["token"],
+        ]
+        if delta < 0:
+            conditions.append(accounts.c.balance >= -delta)
+
+        moved = (
+            update(accounts)
+            .where(*conditions)
+            .values(balance=accounts.c.balance + delta, updated_at=entry_values["created_at"])
+            .returning(accounts.c.balance)
+            .cte("moved")
         )
 
-        # Handle treasury operations for RAKE/FEE/BURN
-        if tx.type in [LedgerEntryType.RAKE, LedgerEntryType.FEE, LedgerEntryType.BURN]:
-            await self._credit_treasury(tx.amount, tx.type, tx.source_app, tx.metadata)  # Schema field name
+        result = await self.session.execute(
+            self._insert_entry_from(moved, entry_values, moved.c.balance)
+        )
+        row = result.first()
+        if row is not None:
+            track_entry(self.session, entry_values, delta, row.balance_after)
+        return row
+
+    async def _post_shard_entry(
+        self, entry_values: dict, amount: Decimal, shard_no: int
+    ) -> Row | None:
+        """
+        Credit a treasury shard and write its ledger entry in one round-trip.
+
+        Same shape as _post_entry, but against treasury_shards. balance_after
+        is left NULL: a single shard's balance is not the treasury balance.
+        Returns None when the shard row does not exist yet.
+        """
+        shards = TreasuryShard.__table__
+        ledger = LedgerEntry.__table__
+
+        entry_values["metadata"] = {**entry_values["metadata"], "treasury_shard": shard_no}
+        moved = (
+            update(shards)
+            .where(shards.c.token == entry_values["token"], shards.c.shard_no == shard_no)
+            .values(balance=shards.c.balance + amount, updated_at=entry_values["created_at"])
+            .returning(shards.c.balance)
+            .cte("moved")
+        )
+
+        result = await self.session.execute(
+            self._insert_entry_from(
+                moved, entry_values, cast(None, ledger.c.balance_after.type)
+            )
+        )
+        row = result.first()
+        if row is not None:
+            track_entry(self.session, entry_values, amount, None)
+        return row
+
+    @staticmethod
+    def _insert_entry_from(moved, entry_values: dict, balance_after) -> Insert:
+        """INSERT INTO ledger_entries ... SELECT ... FROM moved RETURNING id, balance_after."""
+        ledger = LedgerEntry.__table__
+
+        # Explicit casts: INSERT ... SELECT cannot infer bind types from the target columns
+        columns = list(entry_values)
+        return (
+            insert(ledger)
+            .from_select(
+                [*columns, "balance_after"],
+                select(
+                    *[cast(entry_values[name], ledger.c[name].type) for name in columns],
+                    balance_after,
+                ).select_from(moved),
+            )
+            .returning(ledger.c.id, ledger.c.balance_after)
+        )
 
-        return TransactionResponse.model_validate(entry)
+    async def _get_current_balance(self, user_id: int, token: str) -> Decimal | None:
+        """Current balance, or None if the account row does not exist."""
+        result = await self.session.execute(
+            select(Account.balance).where(Account.user_id == user_id, Account.token == token)
+        )
+        return result.scalar_one_or_none()
 
     async def _credit_treasury(
         self,
@@ -150,39 +360,238 @@ class WalletService:
         entry_type: LedgerEntryType,
         source_app: str,
         metadata: dict,
+        shard_hint: int | None = None,
     ) -> None:
         """Credit treasury account with rake/fee/burn."""
-        treasury_account = await self.get_or_create_account(
-            settings.NCR_TREASURY_USER_ID, "NCR"
-        )
-
-        treasury_entry = LedgerEntry(
-            user_id=settings.NCR_TREASURY_USER_ID,
-            amount=amount,
-            token="NCR",
-            type=LedgerEntryType.EARN,  # Treasury "earns" the rake/fee
-            source_app=source_app,
-            meta={
-                "original_type": entry_type.value,
-                **metadata,
-            },
-            balance_after=treasury_account.balance + amount,
+        entry_values = self._treasury_entry_values(
+            amount, entry_type, source_app, metadata, datetime.utcnow()
         )
-        self.session.add(treasury_entry)
 
-        treasury_account.balance += amount
-        treasury_account.updated_at = datetime.utcnow()
-        self.session.add(treasury_account)
+        if treasury_sharding_enabled():
+            await self._credit_treasury_shard(entry_values, amount, shard_hint)
+            return
 
-        await self.session.flush()
+        row = await self._post_entry(entry_values, amount)
+        if row is None:
+            await self.get_or_create_account(settings.NCR_TREASURY_USER_ID, "NCR")
+            row = await self._post_entry(entry_values, amount)
 
         logger.info(
             "treasury_credited",
             amount=str(amount),
             type=entry_type.value,
             source_app=source_app,
-            new_balance=str(treasury_account.balance),
+            new_balance=str(row.balance_after),
+        )
+
+    async def _credit_treasury_shard(
+        self, entry_values: dict, amount: Decimal, shard_hint: int | None
+    ) -> Row:
+        """Credit one treasury shard instead of the canonical treasury row."""
+        shard_no = pick_treasury_shard(shard_hint)
+        row = await self._post_shard_entry(entry_values, amount, shard_no)
+        if row is None:
+            await ensure_treasury_shards(self.session, entry_values["token"])
+            row = await self._post_shard_entry(entry_values, amount, shard_no)
+
+        logger.info(
+            "treasury_shard_credited",
+            amount=str(amount),
+            shard_no=shard_no,
+            source_app=entry_values["source_app"],
+        )
+        return row
+
+    # ============ Journal Operations ============
+    async def post_journal(self, legs: list[TransactionCreate]) -> list[TransactionResponse]:
+        """
+        Post several ledger legs as one journal.
+
+        Costs three round-trips regardless of the number of legs:
+        1. SELECT ... FOR UPDATE on every touched account, ordered by account id,
+           so concurrent journals always acquire row locks in the same order.
+        2. One multi-row INSERT for all ledger entries.
+        3. One UPDATE ... FROM (VALUES ...) applying the net delta per account.
+
+        Legs are replayed in order against the locked balances, so funds checks
+        and balance_after match what sequential create_transaction calls would
+        produce. RAKE/FEE/BURN legs are mirrored to the treasury the same way;
+        with treasury sharding on, all treasury credits of the journal land on
+        one shard in a fourth statement instead of locking the canonical row.
+        Returns one response per input leg, in order.
+        """
+        if not legs:
+            return []
+
+        now = datetime.utcnow()
+
+        # (leg index or None for treasury mirrors, entry values, delta)
+        postings: list[tuple[int | None, dict, Decimal]] = []
+        for index, leg in enumerate(legs):
+            if leg.type in CREDIT_TYPES:
+                delta = leg.amount
+            elif leg.type in DEBIT_TYPES:
+                delta = -leg.amount
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown transaction type: {leg.type}",
+                )
+            postings.append((index, self._entry_values(leg, now), delta))
+
+            if leg.type in TREASURY_MIRROR_TYPES:
+                postings.append(
+                    (
+                        None,
+                        self._treasury_entry_values(
+                            leg.amount, leg.type, leg.source_app, leg.metadata, now
+                        ),
+                        leg.amount,
+                    )
+                )
+
+        # With sharding on, treasury credits go to one shard and never lock the canonical row
+        treasury_key = (settings.NCR_TREASURY_USER_ID, "NCR")
+        shard_no: int | None = None
+        if treasury_sharding_enabled():
+            if any(
+                (values["user_id"], values["token"]) == treasury_key and delta < 0
+                for _, values, delta in postings
+            ):
+                # Debits need the full treasury balance on the canonical row
+                await rollup_treasury_shards(self.session)
+            shard_no = pick_treasury_shard(legs[0].user_id)
+
+        def is_shard_credit(values: dict, delta: Decimal) -> bool:
+            return (
+                shard_no is not None
+                and delta > 0
+                and (values["user_id"], values["token"]) == treasury_key
+            )
+
+        keys = {
+            (values["user_id"], values["token"])
+            for _, values, delta in postings
+            if not is_shard_credit(values, delta)
+        }
+        locked = await self._lock_accounts(keys) if keys else {}
+
+        missing = keys - locked.keys()
+        if missing:
+            for index, values, delta in postings:
+                key = (values["user_id"], values["token"])
+                if key in missing and delta < 0:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"No {key[1]} account for user {key[0]}",
+                    )
+            await self.session.execute(
+                pg_insert(Account)
+                .values(
+                    [
+                        {
+                            "user_id": user_id,
+                            "token": token,
+                            "balance": Decimal("0"),
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for user_id, token in sorted(missing)
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "token"])
+            )
+            locked = await self._lock_accounts(keys)
+
+        # Replay legs against the locked balances
+        balances = {key: balance for key, (_, balance) in locked.items()}
+        shard_total = Decimal("0")
+        for index, values, delta in postings:
+            if is_shard_credit(values, delta):
+                values["metadata"] = {**values["metadata"], "treasury_shard": shard_no}
+                values["balance_after"] = None
+                shard_total += delta
+                track_entry(self.session, values, delta, None)
+                continue
+            key = (values["user_id"], values["token"])
+            if delta < 0 and balances[key] < -delta:
+                raise self._insufficient_balance(legs[index], balances[key])
+            balances[key] += delta
+            values["balance_after"] = balances[key]
+            track_entry(self.session, values, delta, balances[key])
+
+        ledger = LedgerEntry.__table__
+        result = await self.session.execute(
+            insert(ledger).returning(ledger.c.id, sort_by_parameter_order=True),
+            [values for _, values, _ in postings],
+        )
+        entry_ids = list(result.scalars().all())
+
+        net_deltas: dict[tuple[int, str], Decimal] = {}
+        for _, values, delta in postings:
+            if is_shard_credit(values, delta):
+                continue
+            key = (values["user_id"], values["token"])
+            net_deltas[key] = net_deltas.get(key, Decimal("0")) + delta
+
+        account_deltas = [
+            (locked[key][0], delta) for key, delta in net_deltas.items() if delta != 0
+        ]
+        if account_deltas:
+            accounts = Account.__table__
+            deltas = sa_values(
+                column("id", Integer),
+                column("delta", Numeric(precision=18, scale=8)),
+                name="deltas",
+            ).data(account_deltas)
+            await self.session.execute(
+                update(accounts)
+                .where(accounts.c.id == deltas.c.id)
+                .values(balance=accounts.c.balance + deltas.c.delta, updated_at=now)
+            )
+
+        if shard_total:
+            await credit_treasury_shards(self.session, {shard_no: shard_total})
+
+        logger.info(
+            "journal_posted",
+            legs=len(legs),
+            entries=len(postings),
+            accounts=len(keys),
+        )
+
+        responses: list[TransactionResponse] = []
+        for (index, values, _), entry_id in zip(postings, entry_ids):
+            if index is None:
+                continue
+            leg = legs[index]
+            responses.append(
+                TransactionResponse(
+                    id=entry_id,
+                    user_id=leg.user_id,
+                    amount=leg.amount,
+                    token=leg.token,
+                    type=leg.type,
+                    source_app=leg.source_app,
+                    balance_after=values["balance_after"],
+                    created_at=now,
+                )
+            )
+        return responses
+
+    async def _lock_accounts(
+        self, keys: set[tuple[int, str]]
+    ) -> dict[tuple[int, str], tuple[int, Decimal]]:
+        """Lock accounts in id order; returns (user_id, token) -> (account_id, balance)."""
+        result = await self.session.execute(
+            select(Account.id, Account.user_id, Account.token, Account.balance)
+            .where(tuple_(Account.user_id, Account.token).in_(list(keys)))
+            .order_by(Account.id)
+            .with_for_update()
         )
+        return {
+            (row.user_id, row.token): (row.id, row.balance) for row in result.all()
+        }
 
     # ============ Transfer Operations ============
     async def transfer(
@@ -237,6 +646,20 @@ class WalletService:
         self.session.add(to_entry)
 
         # Update balances
+        track_balance_change(
+            self.session,
+            from_user_id,
+            request.token,
+            from_account.balance,
+            from_account.balance - request.amount,
+        )
+        track_balance_change(
+            self.session,
+            request.to_user_id,
+            request.token,
+            to_account.balance,
+            to_account.balance + request.amount,
+        )
         from_account.balance -= request.amount
         from_account.updated_at = now
         to_account.balance += request.amount
@@ -273,8 +696,15 @@ class WalletService:
         per_page: int = 20,
         token: str | None = None,
         entry_type: LedgerEntryType | None = None,
-    ) -> tuple[list[LedgerEntry], int]:
-        """Get user's transaction history."""
+        after: str | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[LedgerEntry], int | None]:
+        """
+        Get user's transaction history.
+
+        `after` is a keyset cursor (see app.core.pagination) that replaces
+        `page` for deep history; `include_total=False` skips the COUNT.
+        """
         query = select(LedgerEntry).where(LedgerEntry.user_id == user_id)
 
         if token:
@@ -283,12 +713,15 @@ class WalletService:
             query = query.where(LedgerEntry.type == entry_type)
 
         # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self.session.execute(count_query)).scalar() or 0
+        total = None
+        if include_total:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self.session.execute(count_query)).scalar() or 0
 
         # Fetch
-        query = query.order_by(LedgerEntry.created_at.desc())
-        query = query.offset((page - 1) * per_page).limit(per_page)
+        query = apply_keyset(
+            query, LedgerEntry.created_at, LedgerEntry.id, after, page, per_page
+        )
 
         result = await self.session.execute(query)
         entries = list(result.scalars().all())
@@ -297,65 +730,32 @@ class WalletService:
 
     # ============ Treasury ============
     async def get_treasury_summary(self) -> TreasurySummary:
-        """Get treasury summary."""
+        """
+        Get treasury summary.
+
+        Reads the maintained treasury_totals counters instead of scanning
+        ledger_entries and accounts; see app.wallet.treasury_totals.
+        """
         treasury_account = await self.get_or_create_account(
             settings.NCR_TREASURY_USER_ID, "NCR"
         )
-
-        # Calculate totals from ledger
-        rake_result = await self.session.execute(
-            select(func.sum(LedgerEntry.amount)).where(
-                LedgerEntry.user_id == settings.NCR_TREASURY_USER_ID,
-                LedgerEntry.meta["original_type"].astext == "rake",  # DB column is 'metadata', Python field is 'meta'
-            )
-        )
-        total_rake = rake_result.scalar() or Decimal("0")
-
-        fee_result = await self.session.execute(
-            select(func.sum(LedgerEntry.amount)).where(
-                LedgerEntry.user_id == settings.NCR_TREASURY_USER_ID,
-                LedgerEntry.meta["original_type"].astext == "fee",  # DB column is 'metadata', Python field is 'meta'
-            )
-        )
-        total_fees = fee_result.scalar() or Decimal("0")
-
-        burn_result = await self.session.execute(
-            select(func.sum(LedgerEntry.amount)).where(
-                LedgerEntry.user_id == settings.NCR_TREASURY_USER_ID,
-                LedgerEntry.meta["original_type"].astext == "burn",  # DB column is 'metadata', Python field is 'meta'
-            )
-        )
-        total_burns = burn_result.scalar() or Decimal("0")
-
-        # Total NCR in circulation
-        circ_result = await self.session.execute(
-            select(func.sum(Account.balance)).where(
-                Account.token == "NCR",
-                Account.user_id != settings.NCR_TREASURY_USER_ID,
-            )
+        # Canonical row + credits not yet rolled up from the shards
+        treasury_balance = treasury_account.balance + await get_treasury_shard_total(
+            self.session
         )
-        total_circulation = circ_result.scalar() or Decimal("0")
 
-        # Users with balance
-        users_result = await self.session.execute(
-            select(func.count(Account.id)).where(
-                Account.token == "NCR",
-                Account.balance > 0,
-            )
-        )
-        users_with_balance = users_result.scalar() or 0
+        totals = await get_treasury_totals(self.session, "NCR")
 
         return TreasurySummary(
             balances=[
                 TreasuryBalance(
                     token="NCR",
-                    balance=treasury_account.balance,
-                    total_rake=total_rake,
-                    total_fees=total_fees,
-                    total_burns=total_burns,
+                    balance=treasury_balance,
+                    total_rake=totals.get("rake", Decimal("0")),
+                    total_fees=totals.get("fee", Decimal("0")),
+                    total_burns=totals.get("burn", Decimal("0")),
                 )
             ],
-            total_ncr_in_circulation=total_circulation,
-            total_users_with_balance=users_with_balance,
+            total_ncr_in_circulation=totals.get(METRIC_CIRCULATING, Decimal("0")),
+            total_users_with_balance=int(totals.get(METRIC_HOLDERS, Decimal("0"))),
         )
-
@@ -1,71 +1,200 @@
 """
 Treasury Cap System
 Günlük NCR dağıtım limitini kontrol eden ve yük oranına göre damping uygulayan sistem.
+
+Rezervasyon tek bir atomik statement'tır: bugünün DailyTreasuryStat satırı
+kilitlenir, damping tablosu SQL CASE olarak değerlendirilir ve issued_ncr
+aynı statement'ta artırılıp RETURNING ile döner. Eşzamanlı ödüller aynı
+issued_ncr'ı okuyup limiti aşamaz; her rezervasyon bir öncekinin
+sonucunu görür (seri uygulama ile birebir aynı sonuç).
+
+issued_ncr hiçbir zaman limit_ncr × TREASURY_HARD_CAP_RATIO'yu geçmez;
+kalan pay ödülden küçükse ödül kalan paya kırpılır.
 """
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Tuple
+from typing import Optional, Tuple
 
+from sqlalchemy import Float, Numeric, case, cast, func, literal, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.config import settings
 from app.wallet.models import DailyTreasuryStat
 
+# Damping tablosunun son eşiğinden sonra uygulanan çarpan
+OVERFLOW_MULTIPLIER = 0.05  # %5'lik can simidi
 
-async def _get_or_create_today_stat(session: AsyncSession) -> DailyTreasuryStat:
-    """Bugünün Treasury stat'ını getir veya oluştur."""
-    today = date.today()
-    
-    result = await session.execute(
-        select(DailyTreasuryStat).where(DailyTreasuryStat.day == today)
-    )
-    stat = result.scalar_one_or_none()
-    
-    if stat is None:
-        stat = DailyTreasuryStat(
-            day=today,
-            limit_ncr=settings.TREASURY_DAILY_NCR_LIMIT,
-            issued_ncr=0.0,
-        )
-        session.add(stat)
-        await session.commit()
-        await session.refresh(stat)
-    
-    return stat
+
+@dataclass(frozen=True)
+class TreasuryReservation:
+    """Atomik rezervasyonun RETURNING sonucu."""
+
+    granted_ncr: float
+    multiplier: float
+    load_ratio: float
+    issued_ncr: float  # Rezervasyon sonrası
+    limit_ncr: float
+    capped: bool  # Hard cap nedeniyle kırpıldı mı
 
 
 def _get_damping_multiplier(load_ratio: float) -> float:
     """
     Load ratio'ya göre damping multiplier döner.
-    
+
     Args:
         load_ratio: 0.0–∞ (issued / limit)
-    
+
     Returns:
         Multiplier (0.0–1.0)
     """
     # Threshold'lar küçükten büyüğe sırala
     thresholds = sorted(settings.TREASURY_DAMPING_TABLE.items(), key=lambda x: x[0])
-    
+
     for threshold, mult in thresholds:
         if load_ratio <= threshold:
             return mult
-    
+
     # Her şeyden sonra taşmışsa: minimum ödeme
-    return 0.05  # %5'lik can simidi
+    return OVERFLOW_MULTIPLIER
+
+
+def _damping_multiplier_sql(load_ratio):
+    """_get_damping_multiplier'ın SQL CASE karşılığı."""
+    thresholds = sorted(settings.TREASURY_DAMPING_TABLE.items(), key=lambda x: x[0])
+    return case(
+        *[(load_ratio <= threshold, literal(mult, Float)) for threshold, mult in thresholds],
+        else_=literal(OVERFLOW_MULTIPLIER, Float),
+    )
+
+
+def _reservation_statement(day: date, amount: float, now: datetime):
+    """
+    Kilitle → damping → hard cap → issued_ncr += granted, tek statement.
+
+    WITH cur AS (SELECT ... FOR UPDATE), ratio AS (...), calc AS (...)
+    UPDATE daily_treasury_stats SET issued_ncr = issued_ncr + calc.granted
+    FROM calc WHERE id = calc.id RETURNING ...
+    """
+    stats = DailyTreasuryStat.__table__
+    amount_sql = literal(amount, Float)
+
+    cur = (
+        select(stats.c.id, stats.c.issued_ncr, stats.c.limit_ncr)
+        .where(stats.c.day == day)
+        .with_for_update()
+        .cte("cur")
+    )
+
+    ratio = select(
+        cur.c.id,
+        cur.c.issued_ncr,
+        cur.c.limit_ncr,
+        case(
+            (cur.c.limit_ncr <= 0, literal(1.0, Float)),
+            else_=(cur.c.issued_ncr + amount_sql) / cur.c.limit_ncr,
+        ).label("load_ratio"),
+    ).cte("ratio")
+
+    multiplier = case(
+        (ratio.c.limit_ncr <= 0, literal(0.0, Float)),
+        else_=_damping_multiplier_sql(ratio.c.load_ratio),
+    )
+    # Hard cap'e kalan pay (kuruş altına yuvarlanır, negatif olamaz)
+    headroom = func.greatest(
+        func.floor(
+            cast(ratio.c.limit_ncr * settings.TREASURY_HARD_CAP_RATIO - ratio.c.issued_ncr, Numeric) * 100
+        ) / 100,
+        0,
+    )
+    calc = select(
+        ratio.c.id,
+        ratio.c.load_ratio,
+        multiplier.label("multiplier"),
+        func.round(cast(amount_sql * multiplier, Numeric), 2).label("damped"),
+        headroom.label("headroom"),
+    ).cte("calc")
+
+    clipped = func.least(calc.c.damped, calc.c.headroom)
+    granted = case((clipped < 0.01, literal(0, Numeric)), else_=clipped)
+    granted_ncr = cast(granted, Float)
+
+    return (
+        update(stats)
+        .where(stats.c.id == calc.c.id)
+        .values(issued_ncr=stats.c.issued_ncr + granted_ncr, updated_at=now)
+        .returning(
+            granted_ncr.label("granted_ncr"),
+            calc.c.multiplier,
+            calc.c.load_ratio,
+            (calc.c.headroom < calc.c.damped).label("capped"),
+            stats.c.issued_ncr,
+            stats.c.limit_ncr,
+        )
+    )
+
+
+async def _ensure_day_stat(session: AsyncSession, day: date) -> None:
+    """Günün satırını oluştur (varsa dokunma)."""
+    await session.execute(
+        pg_insert(DailyTreasuryStat)
+        .values(
+            day=day,
+            limit_ncr=settings.TREASURY_DAILY_NCR_LIMIT,
+            issued_ncr=0.0,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=["day"])
+    )
+
+
+async def reserve_treasury_budget(
+    session: AsyncSession,
+    amount: float,
+    day: Optional[date] = None,
+) -> TreasuryReservation:
+    """
+    Günlük bütçeden `amount` NCR için atomik rezervasyon.
+
+    Satır kilidi çağıranın transaction'ı commit edilene kadar tutulur;
+    rezervasyonu transaction'ın sonuna yakın yapın. Rollback olursa
+    rezervasyon da geri alınır.
+    """
+    day = day or date.today()
+    stmt = _reservation_statement(day, amount, datetime.utcnow())
+
+    row = (await session.execute(stmt)).one_or_none()
+    if row is None:
+        # Günün ilk ödülü: satırı oluştur, tekrar dene
+        await _ensure_day_stat(session, day)
+        row = (await session.execute(stmt)).one()
+
+    return TreasuryReservation(
+        granted_ncr=float(row.granted_ncr),
+        multiplier=float(row.multiplier),
+        load_ratio=float(row.load_ratio),
+        issued_ncr=row.issued_ncr,
+        limit_ncr=row.limit_ncr,
+        capped=bool(row.capped),
+    )
 
 
 async def apply_treasury_cap(
     session: AsyncSession,
     pre_treasury_ncr: float,
+    commit: bool = True,
 ) -> Tuple[float, dict]:
     """
     RewardEngine'den çıkan NCR'ı Treasury limitlerine göre keser.
-    
+
     Args:
         session: Database session
         pre_treasury_ncr: Treasury öncesi NCR miktarı
-    
+        commit: False ise rezervasyon çağıranın transaction'ıyla birlikte
+            commit edilir (satır kilidi o ana kadar tutulur)
+
     Returns:
         (adjusted_ncr, metadata)
     """
@@ -74,48 +203,30 @@ async def apply_treasury_cap(
             "treasury_applied": False,
             "reason": "non_positive_reward",
         }
-    
-    stat = await _get_or_create_today_stat(session)
-    
+
+    reservation = await reserve_treasury_budget(session, pre_treasury_ncr)
+    if commit:
+        await session.commit()
+
     # Eğer limit 0 veya negatifse tüm dağıtım kapalıdır (panic mode)
-    if stat.limit_ncr <= 0:
+    if reservation.limit_ncr <= 0:
         return 0.0, {
             "treasury_applied": True,
             "reason": "zero_daily_limit",
             "load_ratio": 1.0,
             "multiplier": 0.0,
         }
-    
-    # Projected load ratio
-    projected_issued = stat.issued_ncr + pre_treasury_ncr
-    load_ratio = projected_issued / stat.limit_ncr
-    
-    # Get damping multiplier
-    multiplier = _get_damping_multiplier(load_ratio)
-    
-    # Apply multiplier
-    adjusted_ncr = round(pre_treasury_ncr * multiplier, 2)
-    
-    # Eğer multiplier çok düşükse, "simge ödül" gibi davranabilirsin
-    if adjusted_ncr < 0.01:
-        adjusted_ncr = 0.0
-    
-    # DB update
-    stat.issued_ncr += adjusted_ncr
-    stat.updated_at = datetime.utcnow()
-    session.add(stat)
-    await session.commit()
-    await session.refresh(stat)
-    
+
     meta = {
         "treasury_applied": True,
-        "load_ratio": round(load_ratio, 4),
-        "multiplier": multiplier,
+        "load_ratio": round(reservation.load_ratio, 4),
+        "multiplier": reservation.multiplier,
         "pre_treasury_ncr": pre_treasury_ncr,
-        "final_ncr": adjusted_ncr,
-        "limit_ncr": stat.limit_ncr,
-        "issued_ncr": stat.issued_ncr,
+        "final_ncr": reservation.granted_ncr,
+        "limit_ncr": reservation.limit_ncr,
+        "issued_ncr": reservation.issued_ncr,
     }
-    
-    return adjusted_ncr, meta
+    if reservation.capped:
+        meta["hard_cap_reached"] = True
 
+    return reservation.granted_ncr, meta
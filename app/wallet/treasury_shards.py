@@ -0,0 +1,209 @@
+"""
+Treasury Shards
+Treasury hot-account'unu N alt hesaba bölen ve periyodik roll-up ile
+canonical bakiyeye birleştiren sistem.
+
+Her RAKE/FEE/BURN ve pool credit'i tek treasury Account satırını günceller;
+FlirtMarket, OnlyVips, PokerVerse ve Aurora'nın tüm ekonomik event'leri
+bu satırda sıraya girer. TREASURY_SHARD_COUNT > 1 iken credit'ler
+treasury_shards satırlarına dağılır, roll-up loop'u bunları canonical
+Account'a taşır. Okuma tarafı canonical + shard toplamını okur,
+böylece özet her an tam doğrudur.
+"""
+import asyncio
+import itertools
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import Integer, Numeric, column, func, update
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.wallet.models import Account, TreasuryShard
+from app.wallet.treasury_totals import track_balance_change
+
+logger = get_logger("treasury_shards")
+
+_round_robin = itertools.count()
+_rollup_task: asyncio.Task | None = None
+
+
+def treasury_sharding_enabled() -> bool:
+    """Sharding açık mı? (TREASURY_SHARD_COUNT > 1)"""
+    return settings.TREASURY_SHARD_COUNT > 1
+
+
+def pick_treasury_shard(hint: int | None = None) -> int:
+    """
+    Credit için shard seç.
+
+    hash: aynı hint (genelde ödeyen user_id) hep aynı shard'a düşer.
+    round_robin: process içinde sırayla dağıtır (hint yoksa da kullanılır).
+    """
+    shard_count = settings.TREASURY_SHARD_COUNT
+    if settings.TREASURY_SHARD_STRATEGY == "hash" and hint is not None:
+        return hint % shard_count
+    return next(_round_robin) % shard_count
+
+
+async def ensure_treasury_shards(session: AsyncSession, token: str = "NCR") -> None:
+    """Shard satırlarını oluştur (varsa dokunma)."""
+    now = datetime.utcnow()
+    await session.execute(
+        pg_insert(TreasuryShard)
+        .values(
+            [
+                {"token": token, "shard_no": shard_no, "balance": Decimal("0"), "updated_at": now}
+                for shard_no in range(settings.TREASURY_SHARD_COUNT)
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["token", "shard_no"])
+    )
+
+
+async def credit_treasury_shards(
+    session: AsyncSession,
+    shard_amounts: dict[int, Decimal],
+    token: str = "NCR",
+) -> None:
+    """Birden fazla shard'a tek UPDATE ile credit uygula."""
+    if not shard_amounts:
+        return
+
+    shards = TreasuryShard.__table__
+    amounts = sa_values(
+        column("shard_no", Integer),
+        column("amount", Numeric(precision=18, scale=8)),
+        name="amounts",
+    ).data(list(shard_amounts.items()))
+    stmt = (
+        update(shards)
+        .where(shards.c.token == token, shards.c.shard_no == amounts.c.shard_no)
+        .values(balance=shards.c.balance + amounts.c.amount, updated_at=datetime.utcnow())
+    )
+
+    result = await session.execute(stmt)
+    if result.rowcount < len(shard_amounts):
+        # İlk kullanım: shard satırları yok, oluşturup tekrar dene
+        await ensure_treasury_shards(session, token)
+        await session.execute(stmt)
+
+
+async def get_treasury_shard_total(session: AsyncSession, token: str = "NCR") -> Decimal:
+    """Henüz roll-up edilmemiş shard bakiyelerinin toplamı."""
+    result = await session.execute(
+        select(func.sum(TreasuryShard.balance)).where(TreasuryShard.token == token)
+    )
+    return result.scalar() or Decimal("0")
+
+
+async def rollup_treasury_shards(session: AsyncSession, token: str = "NCR") -> Decimal:
+    """
+    Shard bakiyelerini canonical treasury Account'una taşı.
+
+    Shard satırları FOR UPDATE ile kilitlenir, okunan tutar shard'lardan
+    düşülür ve tek upsert ile canonical bakiyeye eklenir. Aynı transaction
+    içinde olduğu için toplam treasury bakiyesi hiçbir an değişmez.
+
+    Returns:
+        Taşınan toplam tutar
+    """
+    result = await session.execute(
+        select(TreasuryShard.shard_no, TreasuryShard.balance)
+        .where(TreasuryShard.token == token, TreasuryShard.balance != 0)
+        .order_by(TreasuryShard.shard_no)
+        .with_for_update()
+    )
+    drained = [(row.shard_no, row.balance) for row in result.all()]
+    if not drained:
+        return Decimal("0")
+
+    total = sum((balance for _, balance in drained), Decimal("0"))
+    now = datetime.utcnow()
+
+    shards = TreasuryShard.__table__
+    amounts = sa_values(
+        column("shard_no", Integer),
+        column("amount", Numeric(precision=18, scale=8)),
+        name="amounts",
+    ).data(drained)
+    await session.execute(
+        update(shards)
+        .where(shards.c.token == token, shards.c.shard_no == amounts.c.shard_no)
+        .values(balance=shards.c.balance - amounts.c.amount, updated_at=now)
+    )
+
+    upsert = pg_insert(Account).values(
+        user_id=settings.NCR_TREASURY_USER_ID,
+        token=token,
+        balance=total,
+        created_at=now,
+        updated_at=now,
+    )
+    result = await session.execute(
+        upsert.on_conflict_do_update(
+            index_elements=["user_id", "token"],
+            set_={"balance": Account.balance + upsert.excluded.balance, "updated_at": now},
+        ).returning(Account.balance)
+    )
+    canonical_balance = result.scalar_one()
+    track_balance_change(
+        session,
+        settings.NCR_TREASURY_USER_ID,
+        token,
+        canonical_balance - total,
+        canonical_balance,
+    )
+
+    logger.info("treasury_shards_rolled_up", token=token, shards=len(drained), amount=str(total))
+    return total
+
+
+async def run_treasury_rollup_loop() -> None:
+    """Roll-up'ı TREASURY_ROLLUP_INTERVAL_SECONDS aralıkla çalıştır."""
+    from app.core.db import async_session_factory
+
+    while True:
+        await asyncio.sleep(settings.TREASURY_ROLLUP_INTERVAL_SECONDS)
+        try:
+            async with async_session_factory() as session:
+                await rollup_treasury_shards(session)
+                await session.commit()
+        except Exception as e:
+            logger.warning("treasury_rollup_failed", error=str(e))
+
+
+def start_treasury_rollup() -> None:
+    """Sharding açıksa roll-up loop'unu background task olarak başlat."""
+    global _rollup_task
+    if treasury_sharding_enabled() and _rollup_task is None:
+        _rollup_task = asyncio.create_task(run_treasury_rollup_loop())
+        logger.info(
+            "treasury_rollup_started",
+            shards=settings.TREASURY_SHARD_COUNT,
+            interval=settings.TREASURY_ROLLUP_INTERVAL_SECONDS,
+        )
+
+
+async def stop_treasury_rollup() -> None:
+    """Roll-up loop'unu durdur ve son bir roll-up yap."""
+    global _rollup_task
+    if _rollup_task is None:
+        return
+
+    _rollup_task.cancel()
+    try:
+        await _rollup_task
+    except asyncio.CancelledError:
+        pass
+    _rollup_task = None
+
+    from app.core.db import async_session_factory
+
+    async with async_session_factory() as session:
+        await rollup_treasury_shards(session)
+        await session.commit()
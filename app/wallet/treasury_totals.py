@@ -0,0 +1,201 @@
+"""
+Treasury Totals
+Treasury özetini (rake/fee/burn toplamları, dolaşımdaki NCR, holder sayısı)
+ledger_entries ve accounts taramadan okumak için incremental sayaçlar.
+
+Wallet her bakiye değişikliğinde delta'yı session'a not eder; delta'lar
+commit'ten hemen önce tek bir upsert ile treasury_totals'a yazılır.
+Yani sayaçlar ledger yazısıyla aynı transaction'da güncellenir, rollback
+olursa birlikte geri alınır. Upsert commit anında (tüm hesap kilitlerinden
+sonra) çalıştığı için hesap kilitleriyle deadlock oluşturmaz.
+
+reconcile_treasury_totals() tam yeniden hesaplama ile sayaçları doğrular.
+"""
+import random
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import event, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.session_buffers import is_savepoint_commit, register_session_buffer
+from app.wallet.models import Account, LedgerEntry, TreasuryTotal
+
+logger = get_logger("treasury_totals")
+
+# Treasury'ye yansıyan original_type'lar
+TRACKED_ORIGINAL_TYPES = ("rake", "fee", "burn")
+METRIC_CIRCULATING = "circulating"
+METRIC_HOLDERS = "holders"
+
+_PENDING_KEY = "treasury_totals_pending"
+
+
+def track_metric(session: AsyncSession, token: str, metric: str, amount: Decimal) -> None:
+    """Commit'te yazılacak bir sayaç delta'sı ekle."""
+    if not amount:
+        return
+    pending: dict[tuple[str, str], Decimal] = session.info.setdefault(_PENDING_KEY, {})
+    key = (token, metric)
+    pending[key] = pending.get(key, Decimal("0")) + amount
+
+
+def track_entry(
+    session: AsyncSession,
+    entry_values: dict,
+    delta: Decimal,
+    balance_after: Decimal | None,
+) -> None:
+    """
+    Bir ledger entry'nin sayaçlara etkisini not et.
+
+    Args:
+        entry_values: ledger_entries kolon değerleri (user_id, token, amount, metadata)
+        delta: Hesap bakiyesine uygulanan değişim
+        balance_after: Yeni bakiye (None = canonical hesap değişmedi, ör. treasury shard)
+    """
+    user_id = entry_values["user_id"]
+    token = entry_values["token"]
+    is_treasury = user_id == settings.NCR_TREASURY_USER_ID
+
+    original_type = (entry_values.get("metadata") or {}).get("original_type")
+    if is_treasury and original_type in TRACKED_ORIGINAL_TYPES:
+        track_metric(session, token, original_type, entry_values["amount"])
+
+    if balance_after is not None:
+        track_balance_change(session, user_id, token, balance_after - delta, balance_after)
+
+
+def track_balance_change(
+    session: AsyncSession,
+    user_id: int,
+    token: str,
+    balance_before: Decimal,
+    balance_after: Decimal,
+) -> None:
+    """Dolaşım ve holder sayacı için bakiye değişimini not et."""
+    if user_id != settings.NCR_TREASURY_USER_ID:
+        track_metric(session, token, METRIC_CIRCULATING, balance_after - balance_before)
+
+    if balance_before <= 0 < balance_after:
+        track_metric(session, token, METRIC_HOLDERS, Decimal("1"))
+    elif balance_after <= 0 < balance_before:
+        track_metric(session, token, METRIC_HOLDERS, Decimal("-1"))
+
+
+def _upsert_totals(pending: dict[tuple[str, str], Decimal], slot: int):
+    """Tüm bekleyen delta'lar için tek multi-row upsert (sabit satır sırası)."""
+    now = datetime.utcnow()
+    stmt = pg_insert(TreasuryTotal).values(
+        [
+            {"token": token, "metric": metric, "slot": slot, "amount": amount, "updated_at": now}
+            for (token, metric), amount in sorted(pending.items())
+            if amount
+        ]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["token", "metric", "slot"],
+        set_={"amount": TreasuryTotal.amount + stmt.excluded.amount, "updated_at": now},
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_pending_totals(session: Session) -> None:
+    """Bekleyen sayaç delta'larını commit'ten hemen önce yaz."""
+    if is_savepoint_commit(session):
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not any(pending.values()):
+        return
+    slot = random.randrange(max(settings.TREASURY_TOTALS_SLOTS, 1))
+    session.execute(_upsert_totals(pending, slot))
+
+
+# Rollback olan transaction'ın / SAVEPOINT'in delta'ları atılır
+register_session_buffer(_PENDING_KEY, dict)
+
+
+async def get_treasury_totals(session: AsyncSession, token: str = "NCR") -> dict[str, Decimal]:
+    """Tüm sayaçları tek sorguda oku (metric → değer)."""
+    result = await session.execute(
+        select(TreasuryTotal.metric, func.sum(TreasuryTotal.amount))
+        .where(TreasuryTotal.token == token)
+        .group_by(TreasuryTotal.metric)
+    )
+    return {metric: amount or Decimal("0") for metric, amount in result.all()}
+
+
+async def recompute_treasury_totals(session: AsyncSession, token: str = "NCR") -> dict[str, Decimal]:
+    """Sayaçları ledger_entries / accounts üzerinden baştan hesapla (yavaş, tam tarama)."""
+    totals: dict[str, Decimal] = {}
+
+    for original_type in TRACKED_ORIGINAL_TYPES:
+        result = await session.execute(
+            select(func.sum(LedgerEntry.amount)).where(
+                LedgerEntry.user_id == settings.NCR_TREASURY_USER_ID,
+                LedgerEntry.token == token,
+                LedgerEntry.meta["original_type"].astext == original_type,
+            )
+        )
+        totals[original_type] = result.scalar() or Decimal("0")
+
+    circ_result = await session.execute(
+        select(func.sum(Account.balance)).where(
+            Account.token == token,
+            Account.user_id != settings.NCR_TREASURY_USER_ID,
+        )
+    )
+    totals[METRIC_CIRCULATING] = circ_result.scalar() or Decimal("0")
+
+    holders_result = await session.execute(
+        select(func.count(Account.id)).where(Account.token == token, Account.balance > 0)
+    )
+    totals[METRIC_HOLDERS] = Decimal(holders_result.scalar() or 0)
+
+    return totals
+
+
+async def reconcile_treasury_totals(
+    session: AsyncSession,
+    token: str = "NCR",
+    fix: bool = False,
+) -> dict[str, tuple[Decimal, Decimal]]:
+    """
+    Sayaçları tam yeniden hesaplama ile karşılaştır.
+
+    Çağıran, session'ı REPEATABLE READ ile açmalı ki sayaçlar ve tarama
+    aynı snapshot'ı görsün. fix=True ise fark slot 0'a düzeltme delta'sı
+    olarak eklenir (ilk kurulumda backfill de budur).
+
+    Returns:
+        Uyuşmayan metric'ler: metric → (stored, recomputed)
+    """
+    stored = await get_treasury_totals(session, token)
+    recomputed = await recompute_treasury_totals(session, token)
+
+    drift = {
+        metric: (stored.get(metric, Decimal("0")), value)
+        for metric, value in recomputed.items()
+        if stored.get(metric, Decimal("0")) != value
+    }
+
+    if drift:
+        logger.warning(
+            "treasury_totals_drift",
+            token=token,
+            drift={metric: [str(s), str(r)] for metric, (s, r) in drift.items()},
+        )
+        if fix:
+            await session.execute(
+                _upsert_totals(
+                    {(token, metric): r - s for metric, (s, r) in drift.items()},
+                    slot=0,
+                )
+            )
+
+    return drift
@@ -71,6 +71,23 @@ class XpEvent(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class XpDelta(SQLModel, table=True):
+    """
+    Henüz UserLoyalty'ye işlenmemiş XP delta'sı (write-behind modu).
+
+    XP_FOLD_INTERVAL_SECONDS > 0 iken create_xp_event UserLoyalty'yi
+    güncellemez; delta buraya eklenir ve fold loop'u tarafından toplu
+    UPDATE ile işlenip silinir.
+    """
+
+    __tablename__ = "xp_deltas"
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+    amount: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class UserLoyalty(SQLModel, table=True):
     """
     User loyalty profile - cached/computed.
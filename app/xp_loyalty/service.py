@@ -1,5 +1,10 @@
 """
 NovaCore XP & Loyalty Service
+
+XP_FOLD_INTERVAL_SECONDS > 0 iken (write-behind) create_xp_event
+UserLoyalty'ye dokunmaz: delta xp_deltas'a eklenir, fold loop'u
+(app.xp_loyalty.write_behind) onları toplu UPDATE ile işler. Profil
+okumaları bekleyen delta'ları üstüne uygular.
 """
 from datetime import datetime
 
@@ -12,6 +17,7 @@ from app.xp_loyalty.models import (
     LoyaltyTier,
     TIER_THRESHOLDS,
     UserLoyalty,
+    XpDelta,
     XpEvent,
     get_level_xp_requirement,
 )
@@ -24,10 +30,97 @@ from app.xp_loyalty.schemas import (
     XpEventCreate,
     XpEventResponse,
 )
+from app.xp_loyalty.write_behind import (
+    get_loyalty_with_pending,
+    note_xp_appended,
+    xp_write_behind_enabled,
+)
 
 logger = get_logger("xp_loyalty")
 
 
+def _calculate_level(xp: int) -> int:
+    """Calculate level from XP."""
+    # Simple linear: 100 XP per level
+    level = (xp // 100) + 1
+    return max(1, level)
+
+
+def _calculate_tier(xp: int) -> LoyaltyTier:
+    """Calculate tier from XP."""
+    for tier in reversed(list(LoyaltyTier)):
+        if xp >= TIER_THRESHOLDS[tier]:
+            return tier
+    return LoyaltyTier.BRONZE
+
+
+def _calculate_vip_priority(tier: LoyaltyTier, level: int) -> int:
+    """Calculate VIP priority (0-100)."""
+    tier_base = {
+        LoyaltyTier.BRONZE: 0,
+        LoyaltyTier.SILVER: 25,
+        LoyaltyTier.GOLD: 50,
+        LoyaltyTier.DIAMOND: 75,
+    }
+
+    # Base from tier + level bonus (max +25)
+    priority = tier_base[tier] + min(25, level)
+    return min(100, priority)
+
+
+def _calculate_ai_bonus(tier: LoyaltyTier) -> float:
+    """Calculate AI credits bonus multiplier."""
+    bonuses = {
+        LoyaltyTier.BRONZE: 0.0,
+        LoyaltyTier.SILVER: 0.1,  # +10%
+        LoyaltyTier.GOLD: 0.25,  # +25%
+        LoyaltyTier.DIAMOND: 0.5,  # +50%
+    }
+    return bonuses[tier]
+
+
+def apply_xp_delta(loyalty: UserLoyalty, amount: int, now: datetime) -> None:
+    """
+    Apply one XP delta to a loyalty row in place.
+
+    Shared by the immediate path, the write-behind fold and merged reads,
+    so all three compute level / tier / benefits the same way.
+    """
+    loyalty.xp_total = max(0, loyalty.xp_total + amount)  # Don't go below 0
+    loyalty.level = _calculate_level(loyalty.xp_total)
+    loyalty.tier = _calculate_tier(loyalty.xp_total)
+    loyalty.vip_priority = _calculate_vip_priority(loyalty.tier, loyalty.level)
+    loyalty.ai_credits_bonus = _calculate_ai_bonus(loyalty.tier)
+    loyalty.total_events += 1
+    loyalty.updated_at = now
+    loyalty.last_activity_date = now
+
+
+def log_level_change(
+    user_id: int,
+    old_level: int,
+    new_level: int,
+    old_tier: LoyaltyTier,
+    new_tier: LoyaltyTier,
+) -> None:
+    """Emit level_up / tier_up for a level or tier transition."""
+    if old_level != new_level:
+        logger.info(
+            "level_up",
+            user_id=user_id,
+            old_level=old_level,
+            new_level=new_level,
+        )
+
+    if old_tier != new_tier:
+        logger.info(
+            "tier_up",
+            user_id=user_id,
+            old_tier=old_tier.value,
+            new_tier=new_tier.value,
+        )
+
+
 class XpLoyaltyService:
     """XP & Loyalty service."""
 
@@ -56,9 +149,30 @@ class XpLoyaltyService:
 
         return loyalty
 
+    async def _with_pending_xp(self, user_id: int, *amounts: int, create: bool = True) -> UserLoyalty:
+        """
+        Loyalty row with not-yet-folded XP deltas (and `amounts`) applied.
+
+        Returns a transient copy when anything is applied; the persistent
+        row is never modified here, the fold owns those writes.
+        """
+        loyalty, pending = await get_loyalty_with_pending(self.session, user_id)
+        if loyalty is None:
+            loyalty = await self.get_or_create_loyalty(user_id) if create else UserLoyalty(user_id=user_id)
+        if not pending and not amounts:
+            return loyalty
+
+        merged = UserLoyalty(**loyalty.model_dump())
+        for amount, created_at in pending:
+            apply_xp_delta(merged, amount, created_at)
+        now = datetime.utcnow()
+        for amount in amounts:
+            apply_xp_delta(merged, amount, now)
+        return merged
+
     async def get_loyalty_profile(self, user_id: int) -> LoyaltyProfileResponse:
         """Get full loyalty profile with computed fields."""
-        loyalty = await self.get_or_create_loyalty(user_id)
+        loyalty = await self._with_pending_xp(user_id)
 
         # Calculate XP to next level
         current_level_xp = get_level_xp_requirement(loyalty.level)
@@ -90,7 +204,7 @@ class XpLoyaltyService:
 
     async def get_loyalty_brief(self, user_id: int) -> LoyaltyProfileBrief:
         """Get brief loyalty profile for Aurora routing."""
-        loyalty = await self.get_or_create_loyalty(user_id)
+        loyalty = await self._with_pending_xp(user_id)
 
         return LoyaltyProfileBrief(
             user_id=loyalty.user_id,
@@ -112,67 +226,58 @@ class XpLoyaltyService:
     # ============ XP Events ============
     async def create_xp_event(self, event: XpEventCreate) -> XpEventResponse:
         """Create XP event and update loyalty profile."""
-        loyalty = await self.get_or_create_loyalty(event.user_id)
+        if xp_write_behind_enabled():
+            return await self._append_xp_event(event)
 
-        # Update XP
-        old_xp = loyalty.xp_total
-        loyalty.xp_total = max(0, loyalty.xp_total + event.amount)  # Don't go below 0
-
-        # Update level
+        loyalty = await self.get_or_create_loyalty(event.user_id)
         old_level = loyalty.level
-        loyalty.level = self._calculate_level(loyalty.xp_total)
-
-        # Update tier
         old_tier = loyalty.tier
-        loyalty.tier = self._calculate_tier(loyalty.xp_total)
+        apply_xp_delta(loyalty, event.amount, datetime.utcnow())
+        self.session.add(loyalty)
 
-        # Update VIP priority based on tier
-        loyalty.vip_priority = self._calculate_vip_priority(loyalty.tier, loyalty.level)
+        xp_event = self._build_xp_event(event, loyalty)
+        self.session.add(xp_event)
 
-        # Update AI credits bonus based on tier
-        loyalty.ai_credits_bonus = self._calculate_ai_bonus(loyalty.tier)
+        # Leaderboard snapshot (commit'te yazılır)
+        from app.telegram_gateway.leaderboard import track_xp
+        track_xp(self.session, event.user_id, event.amount)
 
-        # Update stats
-        loyalty.total_events += 1
-        loyalty.updated_at = datetime.utcnow()
-        loyalty.last_activity_date = datetime.utcnow()
+        await self.session.flush()
+        await self.session.refresh(xp_event)
 
-        self.session.add(loyalty)
+        log_level_change(event.user_id, old_level, loyalty.level, old_tier, loyalty.tier)
 
-        # Create event log
-        xp_event = XpEvent(
+        logger.info(
+            "xp_event_created",
+            event_id=xp_event.id,
             user_id=event.user_id,
             amount=event.amount,
             event_type=event.event_type,
-            source_app=event.source_app,
-            reference_id=event.reference_id,
-            reference_type=event.reference_type,
-            meta=event.metadata,  # Schema uses 'metadata', model uses 'meta'
-            xp_total_after=loyalty.xp_total,
-            level_after=loyalty.level,
-            tier_after=loyalty.tier.value,
+            xp_total=loyalty.xp_total,
         )
-        self.session.add(xp_event)
 
-        await self.session.flush()
-        await self.session.refresh(xp_event)
+        return XpEventResponse.model_validate(xp_event)
 
-        # Log level/tier changes
-        if old_level != loyalty.level:
-            logger.info(
-                "level_up",
-                user_id=event.user_id,
-                old_level=old_level,
-                new_level=loyalty.level,
-            )
+    async def _append_xp_event(self, event: XpEventCreate) -> XpEventResponse:
+        """
+        Write-behind path: log the XP event and its delta, leave UserLoyalty alone.
 
-        if old_tier != loyalty.tier:
-            logger.info(
-                "tier_up",
-                user_id=event.user_id,
-                old_tier=old_tier.value,
-                new_tier=loyalty.tier.value,
-            )
+        No lock is taken on user_loyalty, so concurrent XP for a hot user
+        does not serialize here. The *_after snapshot fields are computed
+        from the row plus pending deltas; level_up / tier_up are logged by
+        the fold that actually writes the new level.
+        """
+        merged = await self._with_pending_xp(event.user_id, event.amount, create=False)
+
+        self.session.add(XpDelta(user_id=event.user_id, amount=event.amount))
+        xp_event = self._build_xp_event(event, merged)
+        self.session.add(xp_event)
+
+        from app.telegram_gateway.leaderboard import track_xp
+        track_xp(self.session, event.user_id, event.amount)
+
+        await self.session.flush()
+        note_xp_appended()
 
         logger.info(
             "xp_event_created",
@@ -180,46 +285,26 @@ class XpLoyaltyService:
             user_id=event.user_id,
             amount=event.amount,
             event_type=event.event_type,
-            xp_total=loyalty.xp_total,
+            xp_total=merged.xp_total,
+            pending=True,
         )
 
         return XpEventResponse.model_validate(xp_event)
 
-    def _calculate_level(self, xp: int) -> int:
-        """Calculate level from XP."""
-        # Simple linear: 100 XP per level
-        level = (xp // 100) + 1
-        return max(1, level)
-
-    def _calculate_tier(self, xp: int) -> LoyaltyTier:
-        """Calculate tier from XP."""
-        for tier in reversed(list(LoyaltyTier)):
-            if xp >= TIER_THRESHOLDS[tier]:
-                return tier
-        return LoyaltyTier.BRONZE
-
-    def _calculate_vip_priority(self, tier: LoyaltyTier, level: int) -> int:
-        """Calculate VIP priority (0-100)."""
-        tier_base = {
-            LoyaltyTier.BRONZE: 0,
-            LoyaltyTier.SILVER: 25,
-            LoyaltyTier.GOLD: 50,
-            LoyaltyTier.DIAMOND: 75,
-        }
-
-        # Base from tier + level bonus (max +25)
-        priority = tier_base[tier] + min(25, level)
-        return min(100, priority)
-
-    def _calculate_ai_bonus(self, tier: LoyaltyTier) -> float:
-        """Calculate AI credits bonus multiplier."""
-        bonuses = {
-            LoyaltyTier.BRONZE: 0.0,
-            LoyaltyTier.SILVER: 0.1,  # +10%
-            LoyaltyTier.GOLD: 0.25,  # +25%
-            LoyaltyTier.DIAMOND: 0.5,  # +50%
-        }
-        return bonuses[tier]
+    def _build_xp_event(self, event: XpEventCreate, loyalty: UserLoyalty) -> XpEvent:
+        """XpEvent log row with the totals after this event."""
+        return XpEvent(
+            user_id=event.user_id,
+            amount=event.amount,
+            event_type=event.event_type,
+            source_app=event.source_app,
+            reference_id=event.reference_id,
+            reference_type=event.reference_type,
+            meta=event.metadata,  # Schema uses 'metadata', model uses 'meta'
+            xp_total_after=loyalty.xp_total,
+            level_after=loyalty.level,
+            tier_after=loyalty.tier.value,
+        )
 
     # ============ Leaderboard ============
     async def get_leaderboard(
@@ -0,0 +1,298 @@
+"""
+XP Write-Behind
+XP event'lerini UserLoyalty'ye toplu işleyen fold loop'u.
+
+Her flirt / onlyvips / poker / aurora / task event'i XP verir; anlık modda
+her biri user_loyalty satırını kilitleyip günceller, sıcak kullanıcının
+event'leri bu satırda sıraya girer. XP_FOLD_INTERVAL_SECONDS > 0 iken:
+
+- create_xp_event XpEvent log'unun yanına xp_deltas'a (user_id, amount)
+  ekler, user_loyalty'ye yazmaz (aynı transaction, rollback'te birlikte
+  geri alınır)
+- fold loop'u her aralıkta (veya bu process XP_FOLD_BATCH_SIZE delta
+  ekleyince) delta'ları kullanıcı bazında sırayla uygular ve tek
+  executemany UPDATE ile yazar; işlenen delta'lar aynı transaction'da
+  silinir
+- get_loyalty_profile / get_loyalty_brief bekleyen delta'ları okuma
+  anında uygular; kullanıcı son XP'sini hemen görür
+- level_up / tier_up log'ları fold commit'inden sonra, değişikliği yazan
+  fold tarafından bir kez atılır
+
+user_loyalty'yi doğrudan okuyan sorgular (leaderboard, admin özetleri)
+en fazla bir fold aralığı geriden gelir.
+"""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import bindparam, delete, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import timed
+from app.xp_loyalty.models import UserLoyalty, XpDelta
+
+logger = get_logger("xp_write_behind")
+
+# Fold'un yazdığı user_loyalty kolonları
+_FOLDED_COLUMNS = (
+    "xp_total",
+    "level",
+    "tier",
+    "vip_priority",
+    "ai_credits_bonus",
+    "total_events",
+    "updated_at",
+    "last_activity_date",
+)
+
+_fold_task: asyncio.Task | None = None
+_wake: asyncio.Event | None = None
+_stats = {
+    "folds": 0,
+    "users": 0,
+    "deltas": 0,
+    "level_changes": 0,
+    "failed": 0,
+    "appended_since_fold": 0,
+}
+
+
+def xp_write_behind_enabled() -> bool:
+    """Write-behind açık mı? (XP_FOLD_INTERVAL_SECONDS > 0)"""
+    return settings.XP_FOLD_INTERVAL_SECONDS > 0
+
+
+def note_xp_appended() -> None:
+    """Bir delta eklendi; eşik dolduysa fold'u erken uyandır."""
+    _stats["appended_since_fold"] += 1
+    if _wake is not None and _stats["appended_since_fold"] >= settings.XP_FOLD_BATCH_SIZE:
+        _wake.set()
+
+
+async def get_loyalty_with_pending(
+    session: AsyncSession,
+    user_id: int,
+) -> tuple[UserLoyalty | None, list[tuple[int, datetime]]]:
+    """
+    user_loyalty satırı + henüz fold edilmemiş delta'ları (amount, created_at).
+
+    Satır ve delta'lar tek statement'ta okunur: arada commit olan bir fold
+    delta'yı hem satıra hem bekleyenlere (veya hiçbirine) saydırmaz.
+    """
+    if not xp_write_behind_enabled():
+        result = await session.execute(select(UserLoyalty).where(UserLoyalty.user_id == user_id))
+        return result.scalar_one_or_none(), []
+
+    result = await session.execute(
+        select(UserLoyalty, XpDelta.amount, XpDelta.created_at)
+        .outerjoin(XpDelta, XpDelta.user_id == UserLoyalty.user_id)
+        .where(UserLoyalty.user_id == user_id)
+        .order_by(XpDelta.id)
+    )
+    rows = result.all()
+    if rows:
+        return rows[0][0], [(amount, created_at) for _, amount, created_at in rows if amount is not None]
+
+    # Henüz satırı olmayan (ilk XP'si fold bekleyen) kullanıcı
+    result = await session.execute(
+        select(XpDelta.amount, XpDelta.created_at)
+        .where(XpDelta.user_id == user_id)
+        .order_by(XpDelta.id)
+    )
+    return None, [(row.amount, row.created_at) for row in result.all()]
+
+
+def apply_pending_deltas(
+    rows: dict[int, UserLoyalty],
+    deltas: list[tuple[int, int, int, datetime]],
+) -> tuple[set[int], list[tuple]]:
+    """
+    (id, user_id, amount, created_at) delta'larını id sırasıyla satırlara uygula.
+
+    Returns:
+        (delta'sı işlenen user_id'ler,
+         [(user_id, old_level, new_level, old_tier, new_tier)] — kullanıcı başına en fazla bir)
+    """
+    from app.xp_loyalty.service import apply_xp_delta
+
+    before = {user_id: (row.level, row.tier) for user_id, row in rows.items()}
+    folded: set[int] = set()
+    for _, user_id, amount, created_at in sorted(deltas):
+        apply_xp_delta(rows[user_id], amount, created_at)
+        folded.add(user_id)
+
+    changes = []
+    for user_id in sorted(folded):
+        old_level, old_tier = before[user_id]
+        row = rows[user_id]
+        if (old_level, old_tier) != (row.level, row.tier):
+            changes.append((user_id, old_level, row.level, old_tier, row.tier))
+    return folded, changes
+
+
+async def fold_xp_deltas(session: AsyncSession, limit: int | None = None) -> dict:
+    """
+    En fazla `limit` kullanıcının bekleyen delta'larını UserLoyalty'ye işle.
+
+    Bekleyen delta'sı olan kullanıcıların user_loyalty satırları en eski
+    delta'sı önce gelecek şekilde FOR UPDATE SKIP LOCKED ile alınır:
+    eşzamanlı fold'lar birbirinin kullanıcılarını atlayıp sıradakileri
+    alır, uzun süredir bekleyen kullanıcı öne geçer. Delta'lar DELETE ...
+    RETURNING ile çekilir ve id sırasıyla uygulanır. Commit çağırana
+    aittir; level / tier değişiklikleri commit'ten sonra log_level_change
+    ile bildirilsin diye döndürülür.
+
+    Returns:
+        {"users", "deltas", "changes": [(user_id, old_level, new_level, old_tier, new_tier)]}
+    """
+    from app.telegram_gateway.leaderboard import track_xp
+
+    limit = limit or settings.XP_FOLD_BATCH_SIZE
+    has_pending = select(XpDelta.id).where(XpDelta.user_id == UserLoyalty.user_id).exists()
+
+    # İlk XP'si fold'da yazılan kullanıcıların satırı
+    has_row = select(UserLoyalty.user_id).where(UserLoyalty.user_id == XpDelta.user_id).exists()
+    result = await session.execute(
+        select(XpDelta.user_id).distinct().where(~has_row).limit(limit)
+    )
+    newcomers = list(result.scalars().all())
+    if newcomers:
+        now = datetime.utcnow()
+        await session.execute(
+            pg_insert(UserLoyalty.__table__).on_conflict_do_nothing(index_elements=["user_id"]),
+            [UserLoyalty(user_id=user_id, created_at=now, updated_at=now).model_dump() for user_id in newcomers],
+        )
+
+    oldest_delta = (
+        select(func.min(XpDelta.id))
+        .where(XpDelta.user_id == UserLoyalty.user_id)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        select(UserLoyalty)
+        .where(has_pending)
+        .order_by(oldest_delta)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    locked = {row.user_id: UserLoyalty(**row.model_dump()) for row in result.scalars().all()}
+    if not locked:
+        return {"users": 0, "deltas": 0, "changes": []}
+
+    deltas = XpDelta.__table__
+    result = await session.execute(
+        delete(deltas)
+        .where(deltas.c.user_id.in_(list(locked)))
+        .returning(deltas.c.id, deltas.c.user_id, deltas.c.amount, deltas.c.created_at)
+    )
+    drained = result.all()
+
+    folded, changes = apply_pending_deltas(locked, drained)
+
+    if folded:
+        loyalty = UserLoyalty.__table__
+        await session.execute(
+            update(loyalty)
+            .where(loyalty.c.user_id == bindparam("b_user_id"))
+            .values({column: bindparam(f"b_{column}") for column in _FOLDED_COLUMNS}),
+            [
+                {
+                    "b_user_id": user_id,
+                    **{f"b_{column}": getattr(locked[user_id], column) for column in _FOLDED_COLUMNS},
+                }
+                for user_id in sorted(folded)
+            ],
+        )
+        for user_id in folded:
+            # all_time score + level / tier görüntüleme alanları tazelensin
+            track_xp(session, user_id, 0)
+
+    return {"users": len(folded), "deltas": len(drained), "changes": changes}
+
+
+async def run_xp_fold_once(session_factory=None, limit: int | None = None) -> dict:
+    """Tek fold turu: fold + commit, sonra level / tier bildirimleri."""
+    from app.xp_loyalty.service import log_level_change
+
+    if session_factory is None:
+        from app.core.db import async_session_factory as session_factory
+
+    _stats["appended_since_fold"] = 0
+    with timed("xp_write_behind.fold"):
+        async with session_factory() as session:
+            result = await fold_xp_deltas(session, limit)
+            await session.commit()
+
+    # Commit olduysa: bu değişiklikleri yazan tek fold bu
+    for change in result["changes"]:
+        log_level_change(*change)
+
+    _stats["folds"] += 1
+    _stats["users"] += result["users"]
+    _stats["deltas"] += result["deltas"]
+    _stats["level_changes"] += len(result["changes"])
+    return result
+
+
+async def drain_xp_deltas(session_factory=None) -> int:
+    """Bekleyen delta'lar bitene (veya hepsi başka fold'da kilitli olana) kadar fold et."""
+    limit = settings.XP_FOLD_BATCH_SIZE
+    drained = 0
+    while True:
+        result = await run_xp_fold_once(session_factory, limit)
+        drained += result["deltas"]
+        if result["users"] < limit:
+            return drained
+
+
+async def run_xp_fold_loop() -> None:
+    """Fold'u XP_FOLD_INTERVAL_SECONDS aralıkla (veya eşik dolunca) çalıştır."""
+    while True:
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=settings.XP_FOLD_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+        try:
+            await drain_xp_deltas()
+        except Exception as e:
+            _stats["failed"] += 1
+            logger.warning("xp_fold_failed", error=str(e))
+
+
+def start_xp_fold() -> None:
+    """Write-behind açıksa fold loop'unu background task olarak başlat."""
+    global _fold_task, _wake
+    if xp_write_behind_enabled() and _fold_task is None:
+        _wake = asyncio.Event()
+        _fold_task = asyncio.create_task(run_xp_fold_loop())
+        logger.info(
+            "xp_fold_started",
+            interval=settings.XP_FOLD_INTERVAL_SECONDS,
+            batch_size=settings.XP_FOLD_BATCH_SIZE,
+        )
+
+
+async def stop_xp_fold() -> None:
+    """Fold loop'unu durdur ve bekleyen delta'ları son kez fold et."""
+    global _fold_task, _wake
+    if _fold_task is None:
+        return
+
+    _fold_task.cancel()
+    try:
+        await _fold_task
+    except asyncio.CancelledError:
+        pass
+    _fold_task = None
+    _wake = None
+
+    await drain_xp_deltas()
+
+
+def get_xp_fold_stats() -> dict:
+    """Bu process'teki fold sayaçları."""
+    return {"enabled": xp_write_behind_enabled(), "running": _fold_task is not None, **_stats}
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Treasury Flow Daily Backfill
+
+treasury_flow_daily rollup'ını treasury_flows ham tablosundan
+(day, app, kind) bazında yeniden hesaplar.
+
+- Varsayılan aralık: tüm geçmiş, bugün hariç (bugün zaten ham tablodan okunur)
+- İdempotent: aralıktaki rollup satırları silinip yeniden yazılır
+- Rollup'ın açıldığı gün yarım kalır; ertesi gün bir kez daha çalıştırın
+  (ya da --start ile sadece o günü verin)
+
+Kullanım:
+    python scripts/backfill_treasury_flow_daily.py
+    python scripts/backfill_treasury_flow_daily.py --start 2025-11-01 --end 2025-12-01
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.treasury.daily_rollup import backfill_treasury_flow_daily
+
+
+async def backfill(start: date | None, end: date) -> None:
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"🔷 Treasury flow daily backfill: {start or 'beginning'} → {end} (exclusive)")
+
+    async with async_session() as session:
+        rows = await backfill_treasury_flow_daily(session, start=start, end=end)
+        await session.commit()
+
+    await engine.dispose()
+    print(f"✅ {rows} rollup rows written")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild treasury_flow_daily from treasury_flows"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First day (YYYY-MM-DD)")
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=None,
+        help="Day after the last day (YYYY-MM-DD, default: today)",
+    )
+    args = parser.parse_args()
+
+    end = args.end or datetime.utcnow().date()
+    asyncio.run(backfill(args.start, end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+CP Decay Sweep Benchmark
+
+justice_cp_state'e sentetik CP satırları (varsayılan: 1M) ekler ve
+bulk decay sweeper'ın (app.justice.decay.sweep_cp_decay) throughput'unu
+ölçer. Karşılaştırma için eski lazy yolun (satır başına SELECT + UPDATE +
+commit) bir örneklem üzerindeki hızı da raporlanır.
+
+- Satırlar generate_series ile tek INSERT ... SELECT'te üretilir
+- last_updated_at 0-30 gün geriye dağılır, cp_value 0-100
+- Sweep sonrası doğrulama: decay'i biten satır kalmadı, regime'ler tutarlı
+
+Kullanım:
+    python scripts/bench_cp_decay_sweep.py
+    python scripts/bench_cp_decay_sweep.py --rows 200000 --chunk 5000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from app.core.config import settings
+from app.justice.decay import project_decay, sweep_cp_decay
+from app.justice.models import UserCpState
+from app.justice.policy import regime_for_cp
+from app.justice.policy_service import PolicyService
+
+BENCH_PREFIX = "bench-cp-"
+
+
+async def seed_rows(session: AsyncSession, rows: int) -> None:
+    await session.execute(
+        text("DELETE FROM justice_cp_state WHERE user_id LIKE :prefix"),
+        {"prefix": f"{BENCH_PREFIX}%"},
+    )
+    await session.execute(
+        text(
+            """
+            INSERT INTO justice_cp_state (user_id, cp_value, regime, last_updated_at)
+            SELECT :prefix || lpad(g::text, 8, '0'),
+                   (g * 37) % 101,
+                   'NORMAL',
+                   (now() AT TIME ZONE 'utc') - ((g % 30) || ' days')::interval
+                                              - ((g % 86400) || ' seconds')::interval
+            FROM generate_series(1, :rows) AS g
+            """
+        ),
+        {"prefix": BENCH_PREFIX, "rows": rows},
+    )
+    await session.commit()
+    await session.execute(text("ANALYZE justice_cp_state"))
+    await session.commit()
+
+
+async def legacy_sample(session_factory, sample: int) -> float:
+    """Eski lazy yol: satır başına oku, decay uygula, commit (rows/s)."""
+    async with session_factory() as session:
+        policy = await PolicyService(session).get_active_policy()
+        result = await session.execute(
+            select(UserCpState.user_id)
+            .where(UserCpState.user_id.like(f"{BENCH_PREFIX}%"))
+            .order_by(UserCpState.user_id.desc())
+            .limit(sample)
+        )
+        user_ids = list(result.scalars().all())
+
+    started = time.perf_counter()
+    for user_id in user_ids:
+        async with session_factory() as session:
+            state = (
+                await session.execute(select(UserCpState).where(UserCpState.user_id == user_id))
+            ).scalar_one()
+            cp_value, regime = project_decay(state, policy)
+            if cp_value != state.cp_value or regime != state.regime:
+                state.cp_value = cp_value
+                state.regime = regime
+                state.last_updated_at = datetime.utcnow()
+                session.add(state)
+                await session.commit()
+    return len(user_ids) / (time.perf_counter() - started)
+
+
+async def verify(session: AsyncSession) -> list[str]:
+    violations: list[str] = []
+    policy = await PolicyService(session).get_active_policy()
+    result = await session.execute(
+        select(UserCpState).where(UserCpState.user_id.like(f"{BENCH_PREFIX}%")).limit(10_000)
+    )
+    now = datetime.utcnow()
+    for state in result.scalars().all():
+        cp_value, regime = project_decay(state, policy, now)
+        if state.cp_value > 0 and cp_value != state.cp_value:
+            violations.append(f"{state.user_id}: pending decay {state.cp_value} -> {cp_value}")
+        if state.regime != regime_for_cp(state.cp_value, policy):
+            violations.append(f"{state.user_id}: regime {state.regime} != {regime}")
+    return violations
+
+
+async def run_benchmark(rows: int, chunk: int, sample: int, reseed: bool):
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        if reseed:
+            print(f"🌱 Seeding {rows:,} CP rows...")
+            async with session_factory() as session:
+                await seed_rows(session, rows)
+
+        print("🔷 CP decay sweep benchmark")
+        print(f"   rows={rows:,} chunk={chunk:,}")
+        print()
+
+        if sample:
+            legacy_rate = await legacy_sample(session_factory, sample)
+            print(f"📋 Legacy per-row decay (sample={sample:,}): {legacy_rate:,.0f} rows/s")
+            print(f"   → {rows / legacy_rate:,.1f}s projected for {rows:,} rows")
+            print()
+
+        async with session_factory() as session:
+            stats = await sweep_cp_decay(session, chunk_size=chunk)
+        rate = stats["scanned"] / stats["seconds"] if stats["seconds"] else 0.0
+        print("📋 Bulk sweep")
+        print(f"   Scanned:    {stats['scanned']:,} rows in {stats['chunks']} chunks")
+        print(f"   Updated:    {stats['updated']:,} rows")
+        print(f"   Throughput: {rate:,.0f} rows/s over {stats['seconds']:.2f}s")
+        print()
+
+        async with session_factory() as session:
+            stats = await sweep_cp_decay(session, chunk_size=chunk)
+        print(f"📋 Second sweep (idempotent): updated={stats['updated']:,} in {stats['seconds']:.2f}s")
+
+        async with session_factory() as session:
+            violations = await verify(session)
+        if violations:
+            for violation in violations[:10]:
+                print(f"   ❌ {violation}")
+        else:
+            print("   ✅ No pending decay, regimes consistent with policy")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk CP decay sweep benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic CP rows (default: 1000000)")
+    parser.add_argument("--chunk", type=int, default=10_000, help="user_id range chunk size (default: 10000)")
+    parser.add_argument(
+        "--legacy-sample",
+        type=int,
+        default=2_000,
+        help="Rows to decay with the legacy per-row path for comparison (0 = skip)",
+    )
+    parser.add_argument("--no-seed", action="store_true", help="Reuse previously seeded rows")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.rows, args.chunk, args.legacy_sample, not args.no_seed))
+
+
+if __name__ == "__main__":
+    main()
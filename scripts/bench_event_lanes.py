@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Event Lanes Benchmark
+
+Aynı PokerVerse BUY_IN akışını --concurrency kadar eşzamanlı "istek" ile
+iki yolla işler ve karşılaştırır:
+- direct: istek başına session + EventService + commit (lane'ler öncesi
+  POST /api/v1/events/poker). Sıcak kullanıcının istekleri aynı Account /
+  processed_events / citizen_scores satırlarında Postgres'te birbirini bekler
+- lanes: app.events.lanes ile; aynı kullanıcıya gelen istekler process
+  içinde sıraya girer, birikenler tek transaction'da işlenir
+
+Her koşuda:
+- Geçici kullanıcılar + NCR hesapları açılır, event'ler aralarında Zipf
+  benzeri dağılır (birkaç kullanıcı isteklerin çoğunu alır)
+- event/s throughput, istek başına p50 / p99 latency
+- lanes modunda: batch sayısı, coalesced item'lar, en sıcak key'lerin
+  peak kuyruk derinliği
+- Doğruluk: her kullanıcının son bakiyesi = başlangıç - başarılı buy-in
+  toplamı, ledger satırı sayısı = başarılı istek sayısı; iki yolun
+  kullanıcı başına başarılı istek sayıları aynı olmalı
+
+Sonunda geçici kullanıcılar ve kayıtları silinir.
+
+Kullanım:
+    python scripts/bench_event_lanes.py
+    python scripts/bench_event_lanes.py --events 20000 --users 500 --concurrency 200
+"""
+import argparse
+import asyncio
+import functools
+import random
+import sys
+import time
+from collections import Counter
+from decimal import Decimal
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+import app.main  # noqa: F401  (tüm modelleri metadata'ya kaydeder)
+from app.core.config import settings
+from app.core.lanes import KeyedLanes
+from app.events.lanes import event_lane_key, run_event_batch
+from app.events.schemas import PokerEvent, PokerEventType
+from app.events.service import EventService
+from app.identity.models import User
+from app.wallet.models import Account, LedgerEntry
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_stream(n: int, n_users: int, seed: int) -> list[int]:
+    """Event başına kullanıcı sırası; kullanıcılar Zipf(1.1) ağırlıklı."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** 1.1) for rank in range(1, n_users + 1)]
+    return rng.choices(range(n_users), weights=weights, k=n)
+
+
+async def create_users(session_factory, n_users: int, initial: Decimal, label: str) -> list[int]:
+    async with session_factory() as session:
+        base = random.randint(10**12, 10**13)
+        users = [
+            User(telegram_id=base + i, username=f"bench_lanes_{label}_{i}")
+            for i in range(n_users)
+        ]
+        session.add_all(users)
+        await session.flush()
+        session.add_all(Account(user_id=user.id, token="NCR", balance=initial) for user in users)
+        await session.commit()
+        return [user.id for user in users]
+
+
+async def run_mode(session_factory, mode: str, stream: list[int], n_users: int, concurrency: int,
+                   amount: Decimal, initial: Decimal) -> tuple[float, list[float], list[int], Counter, dict]:
+    user_ids = await create_users(session_factory, n_users, initial, mode)
+    events = [
+        PokerEvent(
+            event_id=f"bench-{mode}-{i}",
+            event_type=PokerEventType.BUY_IN,
+            user_id=user_ids[actor],
+            amount=amount,
+            table_id="bench",
+        )
+        for i, actor in enumerate(stream)
+    ]
+
+    lanes = KeyedLanes(f"bench_{mode}", max_batch=settings.EVENT_LANE_MAX_BATCH, enabled=True)
+    runner = functools.partial(run_event_batch, session_factory=session_factory)
+
+    async def direct(event: PokerEvent) -> None:
+        async with session_factory() as session:
+            try:
+                await EventService(session).handle_poker_event(event)
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+
+    async def laned(event: PokerEvent) -> None:
+        await lanes.submit(event_lane_key(event), ("poker", event), runner)
+
+    handle = direct if mode == "direct" else laned
+    latencies: list[float] = []
+    succeeded: Counter = Counter()
+    failures: Counter = Counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    for event in events:
+        queue.put_nowait(event)
+
+    async def client() -> None:
+        while not queue.empty():
+            event = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                await handle(event)
+                succeeded[event.user_id] += 1
+            except HTTPException as e:
+                failures[e.status_code] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_started
+
+    return wall, latencies, user_ids, succeeded, {**lanes.stats(), "rejected": dict(failures)}
+
+
+async def check_invariants(session_factory, user_ids: list[int], succeeded: Counter,
+                           amount: Decimal, initial: Decimal) -> list[str]:
+    violations: list[str] = []
+    async with session_factory() as session:
+        balances = dict(
+            (await session.execute(
+                select(Account.user_id, Account.balance)
+                .where(Account.user_id.in_(user_ids), Account.token == "NCR")
+            )).all()
+        )
+        entries = dict(
+            (await session.execute(
+                select(LedgerEntry.user_id, func.count(LedgerEntry.id))
+                .where(LedgerEntry.user_id.in_(user_ids))
+                .group_by(LedgerEntry.user_id)
+            )).all()
+        )
+    for user_id in user_ids:
+        expected = initial - amount * succeeded[user_id]
+        if balances[user_id] != expected:
+            violations.append(f"user {user_id}: balance {balances[user_id]} != expected {expected}")
+        if entries.get(user_id, 0) != succeeded[user_id]:
+            violations.append(
+                f"user {user_id}: {entries.get(user_id, 0)} ledger entries != {succeeded[user_id]} successes"
+            )
+    return violations
+
+
+async def cleanup(session_factory, user_ids: list[int]) -> None:
+    """user_id kolonu olan tüm tablolardan bench kullanıcılarının satırlarını sil."""
+    async with session_factory() as session:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            if "user_id" in table.c and table.name != "users":
+                await session.execute(delete(table).where(table.c.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def run_benchmark(n_events: int, n_users: int, concurrency: int, amount: Decimal,
+                        initial: Decimal, seed: int):
+    engine = create_async_engine(
+        settings.DATABASE_URL, echo=False, pool_size=min(concurrency, 50), max_overflow=0
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    stream = make_stream(n_events, n_users, seed)
+    hottest = Counter(stream).most_common(1)[0][1]
+
+    print("🔷 Event lanes benchmark (PokerVerse BUY_IN, Zipf users)")
+    print(f"   events={n_events} users={n_users} concurrency={concurrency} "
+          f"hottest_user_events={hottest} seed={seed}")
+    print()
+
+    throughput = {}
+    outcomes = {}
+    failed = False
+    try:
+        for mode in ("direct", "lanes"):
+            wall, latencies, user_ids, succeeded, stats = await run_mode(
+                session_factory, mode, stream, n_users, concurrency, amount, initial
+            )
+            try:
+                violations = await check_invariants(session_factory, user_ids, succeeded, amount, initial)
+            finally:
+                await cleanup(session_factory, user_ids)
+            position = {user_id: i for i, user_id in enumerate(user_ids)}
+            outcomes[mode] = sorted((position[u], n) for u, n in succeeded.items())
+
+            throughput[mode] = n_events / wall
+            print(f"📋 mode={mode}")
+            print(f"   Throughput: {throughput[mode]:,.0f} events/s over {wall:.2f}s")
+            print(f"   Latency:    p50={percentile(latencies, 50):.2f}ms "
+                  f"p99={percentile(latencies, 99):.2f}ms per request")
+            if stats["rejected"]:
+                print(f"   Rejected:   {stats['rejected']}")
+            if mode == "lanes":
+                print(f"   Batches:    {stats['batches']} "
+                      f"(coalesced={stats['coalesced']}, contended={stats['contended']})")
+                hot = ", ".join(f"{h['key']}={h['peak_depth']}" for h in stats["hot_keys"][:5])
+                print(f"   Hot keys:   {hot}")
+            if violations:
+                failed = True
+                print(f"   ❌ {len(violations)} invariant violation(s), e.g. {violations[0]}")
+            print()
+    finally:
+        await engine.dispose()
+
+    print(f"   speedup: {throughput['lanes'] / throughput['direct']:.1f}x")
+    if outcomes["direct"] != outcomes["lanes"]:
+        print("   ❌ Per-user successful buy-ins differ between modes")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("   ✅ Balances, ledger and per-user outcomes consistent")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Direct vs keyed-lane event processing benchmark")
+    parser.add_argument("--events", type=int, default=5_000, help="Number of events (default: 5000)")
+    parser.add_argument("--users", type=int, default=200, help="Number of users (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent requests (default: 100)")
+    parser.add_argument("--amount", type=str, default="1", help="Buy-in amount (default: 1)")
+    parser.add_argument(
+        "--initial",
+        type=str,
+        default="1000000",
+        help="Initial NCR balance per user (default: 1000000)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default: 42)")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(
+            args.events,
+            args.users,
+            args.concurrency,
+            Decimal(args.amount),
+            Decimal(args.initial),
+            args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+History Pagination Benchmark
+
+Tek kullanıcı için büyük bir ledger geçmişi üretir ve
+WalletService.get_transactions'ı OFFSET vs keyset cursor ile karşılaştırır.
+
+Her mod için:
+- Sayfa 1 ve derin sayfa (varsayılan: 10.000) latency'si (p50 / p99)
+- COUNT dahil / hariç
+
+Keyset cursor derin sayfa için, ilgili sayfanın son satırından
+üretilir (istemcinin next_cursor ile yürüdüğü duruma eşdeğer).
+
+Kullanım:
+    python scripts/bench_history_pagination.py
+    python scripts/bench_history_pagination.py --rows 500000 --deep-page 20000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.identity.models import User
+from app.wallet.models import LedgerEntry, LedgerEntryType
+from app.wallet.service import WalletService
+
+BENCH_SOURCE = "bench_pagination"
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def seed_history(session: AsyncSession, user_id: int, rows: int, batch: int = 10_000) -> None:
+    """Kullanıcı için `rows` adet ledger entry üret (1 sn arayla)."""
+    await session.execute(
+        delete(LedgerEntry).where(
+            LedgerEntry.user_id == user_id, LedgerEntry.source_app == BENCH_SOURCE
+        )
+    )
+    started = datetime.utcnow() - timedelta(seconds=rows)
+    ledger = LedgerEntry.__table__
+    for offset in range(0, rows, batch):
+        await session.execute(
+            insert(ledger),
+            [
+                {
+                    "user_id": user_id,
+                    "amount": Decimal("1"),
+                    "token": "NCR",
+                    "type": LedgerEntryType.EARN,
+                    "source_app": BENCH_SOURCE,
+                    "metadata": {},
+                    "balance_after": Decimal(i + 1),
+                    "created_at": started + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + batch, rows))
+            ],
+        )
+    await session.commit()
+
+
+async def cursor_for_page(session: AsyncSession, user_id: int, page: int, per_page: int) -> str | None:
+    """`page` sayfasına gelmek için istemcinin elinde olacak cursor."""
+    if page == 1:
+        return None
+    result = await session.execute(
+        select(LedgerEntry.created_at, LedgerEntry.id)
+        .where(LedgerEntry.user_id == user_id)
+        .order_by(LedgerEntry.created_at.desc(), LedgerEntry.id.desc())
+        .offset((page - 1) * per_page - 1)
+        .limit(1)
+    )
+    row = result.one()
+    return encode_cursor(row.created_at, row.id)
+
+
+async def measure(session_factory, user_id: int, page: int, per_page: int,
+                  keyset: bool, include_total: bool, repeats: int) -> list[float]:
+    async with session_factory() as session:
+        after = await cursor_for_page(session, user_id, page, per_page) if keyset else None
+
+    latencies: list[float] = []
+    for _ in range(repeats):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            entries, _ = await WalletService(session).get_transactions(
+                user_id,
+                page=1 if keyset else page,
+                per_page=per_page,
+                after=after,
+                include_total=include_total,
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert len(entries) == per_page
+    return latencies
+
+
+async def run_benchmark(rows: int, deep_page: int, per_page: int, repeats: int, reseed: bool):
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    if deep_page * per_page > rows:
+        raise SystemExit(f"--rows must be >= deep_page * per_page ({deep_page * per_page})")
+
+    async with session_factory() as session:
+        user = (await session.execute(select(User).order_by(User.id).limit(1))).scalar_one_or_none()
+        if user is None:
+            raise SystemExit("No users found; create a user first (e.g. scripts/seed_aurora_demo.py)")
+        user_id = user.id
+
+        if reseed:
+            print(f"🌱 Seeding {rows:,} ledger entries for user {user_id}...")
+            await seed_history(session, user_id, rows)
+
+    print("🔷 History pagination benchmark")
+    print(f"   user={user_id} rows={rows:,} per_page={per_page} repeats={repeats}")
+    print()
+
+    try:
+        for include_total in (True, False):
+            print(f"📋 include_total={include_total}")
+            for keyset in (False, True):
+                label = "keyset" if keyset else "offset"
+                for page in (1, deep_page):
+                    latencies = await measure(
+                        session_factory, user_id, page, per_page, keyset, include_total, repeats
+                    )
+                    print(f"   {label:<7} page={page:<6} "
+                          f"p50={percentile(latencies, 50):8.2f}ms "
+                          f"p99={percentile(latencies, 99):8.2f}ms "
+                          f"mean={statistics.fmean(latencies):8.2f}ms")
+            print()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OFFSET vs keyset history pagination benchmark")
+    parser.add_argument("--rows", type=int, default=250_000, help="Ledger rows to seed (default: 250000)")
+    parser.add_argument("--deep-page", type=int, default=10_000, help="Deep page number (default: 10000)")
+    parser.add_argument("--per-page", type=int, default=20, help="Page size (default: 20)")
+    parser.add_argument("--repeats", type=int, default=50, help="Requests per measurement (default: 50)")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse previously seeded rows")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(args.rows, args.deep_page, args.per_page, args.repeats, not args.no_seed)
+    )
+
+
+if __name__ == "__main__":
+    main()
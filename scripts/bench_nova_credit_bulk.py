@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+NovaCredit Bulk Ingestion Benchmark
+
+Aynı behavior event akışını iki yolla işler ve karşılaştırır:
+- sequential: event başına process_event + commit (partner app'in event
+  başına bir istek atması gibi)
+- bulk: --batch-size'lık gruplar halinde process_events_bulk + commit
+  (POST /api/v1/credit/events:batch gibi)
+
+Her koşuda:
+- Geçici kullanıcılar açılır, event'ler aralarında Zipf benzeri dağılır
+  (birkaç kullanıcı event'lerin çoğunu alır → aynı actor'da fold)
+- event/s throughput, commit başına p50 / p99 latency
+- Doğruluk: iki yolun son citizen_scores durumu ve score_changes
+  (delta, old_score, new_score) dizisi birebir aynı olmalı
+
+Sonunda geçici kullanıcılar ve kayıtları silinir.
+
+Kullanım:
+    python scripts/bench_nova_credit_bulk.py
+    python scripts/bench_nova_credit_bulk.py --events 20000 --users 500 --batch-size 1000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from app.core.config import settings
+from app.identity.models import User
+from app.nova_credit.models import CitizenScore, ScoreChange
+from app.nova_credit.rules import EVENT_TYPE_MAPPINGS
+from app.nova_credit.schemas import BehaviorEvent
+from app.nova_credit.service import _FOLDED_COLUMNS, NovaCreditService
+
+# Karşılaştırmada zaman damgaları hariç tutulur (iki koşu farklı anda çalışır)
+STATE_COLUMNS = tuple(c for c in _FOLDED_COLUMNS if not c.endswith("_at"))
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_events(n: int, n_users: int, seed: int) -> list[tuple[int, str]]:
+    """(kullanıcı sırası, event_type) listesi; kullanıcılar Zipf(1.1) ağırlıklı."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** 1.1) for rank in range(1, n_users + 1)]
+    actors = rng.choices(range(n_users), weights=weights, k=n)
+    event_types = list(EVENT_TYPE_MAPPINGS)
+    return [(actor, rng.choice(event_types)) for actor in actors]
+
+
+def to_behavior_event(user_id: int, event_type: str, i: int) -> BehaviorEvent:
+    category, base_delta = EVENT_TYPE_MAPPINGS[event_type]
+    return BehaviorEvent(
+        event_id=f"bench-{i}",
+        actor_id=user_id,
+        event_type=event_type,
+        category=category,
+        base_delta=base_delta,
+        source_app="system",
+        reason="bench",
+    )
+
+
+async def create_users(session_factory, n_users: int, label: str) -> list[int]:
+    async with session_factory() as session:
+        base = random.randint(10**12, 10**13)
+        users = [
+            User(telegram_id=base + i, username=f"bench_credit_{label}_{i}")
+            for i in range(n_users)
+        ]
+        session.add_all(users)
+        await session.commit()
+        return [user.id for user in users]
+
+
+async def run_mode(session_factory, mode: str, stream: list[tuple[int, str]], n_users: int,
+                   batch_size: int) -> tuple[float, list[float], list[int]]:
+    user_ids = await create_users(session_factory, n_users, mode)
+    events = [to_behavior_event(user_ids[actor], event_type, i) for i, (actor, event_type) in enumerate(stream)]
+
+    latencies: list[float] = []
+    wall_started = time.perf_counter()
+    if mode == "sequential":
+        for event in events:
+            started = time.perf_counter()
+            async with session_factory() as session:
+                await NovaCreditService(session).process_event(event)
+                await session.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+    else:
+        for offset in range(0, len(events), batch_size):
+            started = time.perf_counter()
+            async with session_factory() as session:
+                await NovaCreditService(session).process_events_bulk(events[offset:offset + batch_size])
+                await session.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+    wall = time.perf_counter() - wall_started
+
+    return wall, latencies, user_ids
+
+
+async def load_outcome(session_factory, user_ids: list[int]) -> tuple[list, list]:
+    """Kullanıcı sırasıyla son skor durumu + event sırasıyla score change'ler."""
+    position = {user_id: i for i, user_id in enumerate(user_ids)}
+    async with session_factory() as session:
+        scores = (
+            await session.execute(select(CitizenScore).where(CitizenScore.user_id.in_(user_ids)))
+        ).scalars().all()
+        changes = (
+            await session.execute(
+                select(ScoreChange).where(ScoreChange.user_id.in_(user_ids)).order_by(ScoreChange.id)
+            )
+        ).scalars().all()
+
+    state = sorted(
+        (position[s.user_id], *(getattr(s, c) for c in STATE_COLUMNS)) for s in scores
+    )
+    log = [
+        (position[c.user_id], c.event_id, c.delta, c.old_score, c.new_score, c.weight_applied)
+        for c in changes
+    ]
+    return state, log
+
+
+async def cleanup(session_factory, user_ids: list[int]) -> None:
+    async with session_factory() as session:
+        await session.execute(delete(ScoreChange).where(ScoreChange.user_id.in_(user_ids)))
+        await session.execute(delete(CitizenScore).where(CitizenScore.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def run_benchmark(n_events: int, n_users: int, batch_size: int, seed: int):
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    stream = make_events(n_events, n_users, seed)
+
+    print("🔷 NovaCredit bulk ingestion benchmark")
+    print(f"   events={n_events} users={n_users} batch_size={batch_size} seed={seed}")
+    print()
+
+    throughput = {}
+    outcomes = {}
+    try:
+        for mode in ("sequential", "bulk"):
+            wall, latencies, user_ids = await run_mode(session_factory, mode, stream, n_users, batch_size)
+            try:
+                outcomes[mode] = await load_outcome(session_factory, user_ids)
+            finally:
+                await cleanup(session_factory, user_ids)
+
+            throughput[mode] = n_events / wall
+            print(f"📋 mode={mode}")
+            print(f"   Commits:    {len(latencies)}")
+            print(f"   Throughput: {throughput[mode]:,.0f} events/s over {wall:.2f}s")
+            print(f"   Latency:    p50={percentile(latencies, 50):.2f}ms "
+                  f"p99={percentile(latencies, 99):.2f}ms per commit")
+            print()
+    finally:
+        await engine.dispose()
+
+    print(f"   speedup: {throughput['bulk'] / throughput['sequential']:.1f}x")
+    if outcomes["sequential"] == outcomes["bulk"]:
+        print("   ✅ Final scores and score change log identical")
+    else:
+        print("   ❌ Bulk outcome differs from sequential processing")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NovaCredit sequential vs bulk ingestion benchmark")
+    parser.add_argument("--events", type=int, default=5_000, help="Number of events (default: 5000)")
+    parser.add_argument("--users", type=int, default=200, help="Number of citizens (default: 200)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Events per bulk call (default: 500)")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default: 42)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.events, args.users, args.batch_size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
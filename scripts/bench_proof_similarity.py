@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Proof Index Benchmark
+
+app.abuse.similarity.ProofSimilarityIndex'e sentetik metin proof'ları
+(varsayılan: 1M) ekler ve lookup latency / recall / false positive
+oranını ölçer. DB gerekmez; index tamamen process içidir.
+
+- Proof'lar 50k sahte kelimelik bir sözlükten üretilir, bir kısmı ortak
+  şablon cümlelerle başlar (gerçek "görevi yaptım" kalıplarını taklit eder)
+- Sorguların yarısı index'teki bir proof'un hafif düzenlenmiş hali
+  (1-2 kelime değişimi / ekleme / silme, büyük harf, noktalama), diğer
+  yarısı index'te olmayan yeni proof'lar
+- Recall: gerçek shingle Jaccard'ı eşiğin üzerinde olan düzenlemelerden
+  orijinaline eşleşenlerin oranı
+- Raporlanan: imza + ekleme throughput'u, lookup p50 / p95 / p99,
+  recall, false positive oranı, index belleği
+
+Kullanım:
+    python scripts/bench_proof_similarity.py
+    python scripts/bench_proof_similarity.py --proofs 200000 --queries 5000
+"""
+import argparse
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.abuse.config import NEAR_DUPLICATE_SIMILARITY_THRESHOLD
+from app.abuse.similarity import (
+    SHINGLE_BYTES,
+    ProofSimilarityIndex,
+    normalize_proof_text,
+    proof_signature,
+)
+
+SYLLABLES = [
+    "ka", "le", "mi", "ro", "tu", "na", "si", "be", "de", "ya", "gö", "rev",
+    "lar", "ım", "çı", "şe", "ğa", "ol", "up", "ve", "ar", "kur", "tan", "sev",
+]
+TEMPLATES = [
+    "görevi tamamladım kanal linki aşağıda",
+    "bugünkü paylaşımımı yaptım arkadaşlarımı davet ettim",
+    "quest için yazdığım metin şöyle",
+]
+DOC_SEED_BASE = 1_000_003
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_vocabulary(size: int) -> list[str]:
+    rnd = random.Random(42)
+    return ["".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))) for _ in range(size)]
+
+
+def make_proof(vocab: list[str], doc_id: int) -> str:
+    """doc_id'den deterministik proof (1M metni bellekte tutmamak için)."""
+    rnd = random.Random(DOC_SEED_BASE + doc_id)
+    words = [rnd.choice(vocab) for _ in range(rnd.randint(12, 40))]
+    if doc_id % 3 == 0:
+        words = TEMPLATES[doc_id % len(TEMPLATES)].split() + words
+    return " ".join(words)
+
+
+def light_edit(vocab: list[str], text: str, rnd: random.Random) -> str:
+    """1-2 kelimelik düzenleme + yüzeysel değişiklikler."""
+    words = text.split()
+    for _ in range(rnd.randint(1, 2)):
+        i = rnd.randrange(len(words))
+        op = rnd.random()
+        if op < 0.4:
+            words[i] = rnd.choice(vocab)
+        elif op < 0.7:
+            words.insert(i, rnd.choice(vocab))
+        elif op < 0.85 and len(words) > 3:
+            del words[i]
+        else:
+            words[i] = words[i].upper() + "!"
+    return " ".join(words)
+
+
+def true_jaccard(a: str, b: str) -> float:
+    """Shingle kümeleri üzerinden gerçek Jaccard (imzanın tahmin ettiği değer)."""
+    da, db = normalize_proof_text(a).encode(), normalize_proof_text(b).encode()
+    sa = {da[i:i + SHINGLE_BYTES] for i in range(len(da) - SHINGLE_BYTES + 1)}
+    sb = {db[i:i + SHINGLE_BYTES] for i in range(len(db) - SHINGLE_BYTES + 1)}
+    return len(sa & sb) / len(sa | sb) if sa | sb else 0.0
+
+
+def run_benchmark(proofs: int, queries: int, threshold: float) -> None:
+    vocab = build_vocabulary(50_000)
+    index = ProofSimilarityIndex(proofs)
+    now = datetime.utcnow()
+    since = now - timedelta(days=30)
+
+    print("🔷 Near-duplicate proof index benchmark")
+    print(f"   proofs={proofs:,} queries={queries:,} threshold={threshold}")
+    print()
+
+    sign_seconds = add_seconds = 0.0
+    skipped = 0
+    for doc_id in range(proofs):
+        text = make_proof(vocab, doc_id)
+        t0 = time.perf_counter()
+        signature = proof_signature(text)
+        t1 = time.perf_counter()
+        sign_seconds += t1 - t0
+        if signature is None:
+            skipped += 1
+            continue
+        index.add(signature, user_id=doc_id % 50_000, source="bench", ref_id=doc_id, created_at=now)
+        add_seconds += time.perf_counter() - t1
+        if doc_id and doc_id % 100_000 == 0:
+            print(f"   ... {doc_id:,} indexed")
+
+    added = proofs - skipped
+    print(f"📥 Indexed {added:,} proofs ({skipped:,} too short)")
+    print(f"   Signature: {sign_seconds / proofs * 1e6:.1f} µs/proof")
+    print(f"   Insert:    {add_seconds / max(added, 1) * 1e6:.1f} µs/proof")
+    print(f"   Index memory: {index.memory_bytes() / 1024 / 1024:.1f} MiB "
+          f"(process max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB)")
+    print()
+
+    rnd = random.Random(7)
+    near_latencies: list[float] = []
+    fresh_latencies: list[float] = []
+    eligible = found = found_any = false_positives = 0
+    near_queries = queries // 2
+
+    for _ in range(near_queries):
+        doc_id = rnd.randrange(proofs)
+        original = make_proof(vocab, doc_id)
+        edited = light_edit(vocab, original, rnd)
+        signature = proof_signature(edited)
+        if signature is None:
+            continue
+        t0 = time.perf_counter()
+        match = index.query(signature, threshold, since=since)
+        near_latencies.append((time.perf_counter() - t0) * 1000)
+
+        if match is not None:
+            found_any += 1
+        if true_jaccard(original, edited) >= threshold:
+            eligible += 1
+            if match is not None and match.ref_id == doc_id:
+                found += 1
+
+    for q in range(queries - near_queries):
+        signature = proof_signature(make_proof(vocab, proofs + q))
+        if signature is None:
+            continue
+        t0 = time.perf_counter()
+        match = index.query(signature, threshold, since=since)
+        fresh_latencies.append((time.perf_counter() - t0) * 1000)
+        if match is not None:
+            false_positives += 1
+
+    stats = index.stats()
+    print("🔎 Lookups")
+    print(f"   Near-dup p50/p95/p99: {percentile(near_latencies, 50):.3f} / "
+          f"{percentile(near_latencies, 95):.3f} / {percentile(near_latencies, 99):.3f} ms")
+    print(f"   Fresh    p50/p95/p99: {percentile(fresh_latencies, 50):.3f} / "
+          f"{percentile(fresh_latencies, 95):.3f} / {percentile(fresh_latencies, 99):.3f} ms")
+    print(f"   Candidates verified/lookup: {stats['candidates'] / max(stats['lookups'], 1):.1f}")
+    print()
+    print("🎯 Quality")
+    print(f"   Recall (true Jaccard ≥ {threshold}): {found / max(eligible, 1):.1%} ({found:,}/{eligible:,})")
+    print(f"   Any near-dup flagged: {found_any / max(len(near_latencies), 1):.1%}")
+    print(f"   False positives (fresh proofs): {false_positives / max(len(fresh_latencies), 1):.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate proof index benchmark")
+    parser.add_argument("--proofs", type=int, default=1_000_000, help="Indexed proofs (default: 1000000)")
+    parser.add_argument("--queries", type=int, default=10_000, help="Lookups, half near-dup (default: 10000)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=NEAR_DUPLICATE_SIMILARITY_THRESHOLD,
+        help=f"Similarity threshold (default: {NEAR_DUPLICATE_SIMILARITY_THRESHOLD})",
+    )
+    args = parser.parse_args()
+
+    run_benchmark(args.proofs, args.queries, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
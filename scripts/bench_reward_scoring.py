@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Reward Scoring Benchmark - skaler vs batch
+
+RewardEngine.compute_reward_multiplier ve
+DynamicRewardManager.compute_macro_multiplier'ı (context başına bir
+çağrı) batch karşılıklarıyla (kolon array'leri) karşılaştırır. DB
+gerekmez; numpy gerekir.
+
+Her boyut için (varsayılan: 1, 1k, 1M kullanıcı):
+- Skaler: hazır UserEconomyContext / MacroContext listesi üzerinde döngü
+- Batch: hazır kolon array'leri üzerinde tek çağrı
+- Birkaç tekrarın p50 / p99 süresi, kullanıcı/s ve hızlanma
+- Doğruluk: batch sonucu skaler sonuçla bit-identical olmalı
+
+Tek kullanıcıda numpy çağrı overhead'i baskındır (skaler daha hızlı);
+tekil istek path'leri skaler kalır, batch toplu hesaplar içindir.
+
+Kullanım:
+    python scripts/bench_reward_scoring.py
+    python scripts/bench_reward_scoring.py --sizes 1,1000,100000 --repeats 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.economy.batch import NUMPY_AVAILABLE, np
+from app.economy.constitution import EconomyMode, UserEconomyContext
+from app.economy.drm import DynamicRewardManager, MacroContext
+from app.economy.reward_engine import CITIZEN_LEVEL_CODES, RewardEngine, encode_citizen_levels
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_users(n: int, rng) -> dict:
+    return {
+        "streak_days": rng.integers(0, 45, n),
+        "siyah_score_avg": np.clip(rng.normal(70, 15, n), 0, 100),
+        "risk_score": np.clip(rng.normal(1.5, 1.5, n), 0, 10),
+        "citizen_level": [CITIZEN_LEVEL_CODES[i] for i in rng.integers(0, len(CITIZEN_LEVEL_CODES), n)],
+    }
+
+
+def make_macro(n: int, rng) -> dict:
+    return {
+        "daily_emission_used": rng.uniform(0, 20_000, n),
+        "daily_emission_cap": np.full(n, 10_000.0),
+        "weekly_emission_used": rng.uniform(0, 140_000, n),
+        "weekly_emission_cap": np.full(n, 70_000.0),
+        "burn_rate_7d": rng.uniform(0, 0.6, n),
+        "treasury_health": rng.uniform(0, 1, n),
+    }
+
+
+def measure(fn, repeats: int) -> tuple[list[float], object]:
+    """fn'i `repeats` kez çalıştır; (süreler ms, son sonuç)."""
+    timings = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, result
+
+
+def report(label: str, n: int, scalar_ms: list[float], batch_ms: list[float], identical: bool) -> None:
+    scalar_p50 = percentile(scalar_ms, 50)
+    batch_p50 = percentile(batch_ms, 50)
+    print(f"📋 {label} n={n:,}")
+    print(f"   scalar: p50={scalar_p50:.3f}ms p99={percentile(scalar_ms, 99):.3f}ms "
+          f"({n / (scalar_p50 / 1000):,.0f} users/s)" if scalar_p50 else "   scalar: <timer resolution")
+    print(f"   batch:  p50={batch_p50:.3f}ms p99={percentile(batch_ms, 99):.3f}ms "
+          f"({n / (batch_p50 / 1000):,.0f} users/s)" if batch_p50 else "   batch:  <timer resolution")
+    if batch_p50:
+        print(f"   speedup: {scalar_p50 / batch_p50:.1f}x")
+    print("   ✅ bit-identical" if identical else "   ❌ batch result differs from scalar path")
+    print()
+
+
+def run_size(n: int, repeats: int, mode: EconomyMode, rng) -> bool:
+    # Büyük boyutlarda skaler döngü saniyeler sürer; tekrar sayısını kıs
+    scalar_repeats = repeats if n <= 100_000 else 1
+    engine = RewardEngine(mode)
+
+    users = make_users(n, rng)
+    contexts = [
+        UserEconomyContext(
+            user_id=str(i),
+            streak_days=int(users["streak_days"][i]),
+            siyah_score_avg=float(users["siyah_score_avg"][i]),
+            risk_score=float(users["risk_score"][i]),
+            citizen_level=users["citizen_level"][i],
+        )
+        for i in range(n)
+    ]
+    codes = encode_citizen_levels(users["citizen_level"])
+
+    scalar_ms, scalar = measure(
+        lambda: [engine.compute_reward_multiplier(ctx) for ctx in contexts], scalar_repeats
+    )
+    batch_ms, batch = measure(
+        lambda: engine.compute_reward_multiplier_batch(
+            users["streak_days"], users["siyah_score_avg"], users["risk_score"], codes
+        ),
+        repeats,
+    )
+    user_ok = batch.tolist() == scalar
+    report("RewardEngine.compute_reward_multiplier", n, scalar_ms, batch_ms, user_ok)
+
+    macro = make_macro(n, rng)
+    macro_contexts = [
+        MacroContext(mode=mode, **{k: float(v[i]) for k, v in macro.items()}) for i in range(n)
+    ]
+    scalar_ms, scalar = measure(
+        lambda: [DynamicRewardManager.compute_macro_multiplier(ctx) for ctx in macro_contexts],
+        scalar_repeats,
+    )
+    batch_ms, batch = measure(
+        lambda: DynamicRewardManager.compute_macro_multiplier_batch(mode, **macro), repeats
+    )
+    macro_ok = batch.tolist() == scalar
+    report("DynamicRewardManager.compute_macro_multiplier", n, scalar_ms, batch_ms, macro_ok)
+
+    return user_ok and macro_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs batch reward scoring benchmark")
+    parser.add_argument("--sizes", type=str, default="1,1000,1000000",
+                        help="Comma-separated user counts (default: 1,1000,1000000)")
+    parser.add_argument("--repeats", type=int, default=20, help="Repeats per measurement (default: 20)")
+    parser.add_argument("--mode", type=str, default=EconomyMode.NORMAL.value,
+                        choices=[m.value for m in EconomyMode], help="Economy mode (default: normal)")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default: 42)")
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ numpy package not installed. Install with: pip install numpy")
+        sys.exit(1)
+
+    rng = np.random.default_rng(args.seed)
+    mode = EconomyMode(args.mode)
+
+    print("🔷 Reward scoring benchmark (scalar vs batch)")
+    print(f"   sizes={args.sizes} repeats={args.repeats} mode={mode.value}")
+    print()
+
+    ok = all(run_size(int(n), args.repeats, mode, rng) for n in args.sizes.split(","))
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
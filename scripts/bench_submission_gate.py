@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Task Submission Gate Benchmark
+
+AbuseGuard.check_task_submission_allowed'ın eski (sıralı, 6 sorguya kadar)
+ve yeni (tek gate sorgusu + task cache + rate limiter) hallerini karşılaştırır.
+
+- Sentetik kullanıcılar + bench task'ları; kullanıcıların bir kısmında
+  rewarded / pending submission'lar (bir kısmı son 1 saat içinde)
+- Her iki yol aynı (user, task, external_id) dizisiyle çalıştırılır
+- Raporlanan: submit başına sorgu sayısı, latency (p50 / p95 / p99),
+  throughput ve iki yolun kararlarının birebir aynı olup olmadığı
+
+Kullanım:
+    python scripts/bench_submission_gate.py
+    python scripts/bench_submission_gate.py --submits 10000 --users 2000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import and_, delete, event, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.rate_limit import MemoryRateLimiter, set_rate_limiter
+from app.identity.models import User
+from app.telegram_gateway.abuse_guard import AbuseGuard
+from app.telegram_gateway.task_cache import invalidate_task_cache
+from app.telegram_gateway.task_models import SubmissionStatus, Task, TaskSubmission
+
+BENCH_TASK_PREFIX = "bench_gate_"
+BENCH_TELEGRAM_ID_BASE = 880_000_000
+BENCH_TASKS = 5
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def legacy_check(
+    session: AsyncSession,
+    user_id: int,
+    task_id: str,
+    external_id: Optional[str] = None,
+) -> tuple[bool, Optional[str]]:
+    """Eski check_task_submission_allowed (karşılaştırma için birebir kopya)."""
+    if external_id:
+        existing = await session.execute(
+            select(TaskSubmission).where(TaskSubmission.external_id == external_id)
+        )
+        if existing.scalar_one_or_none():
+            return False, "Bu submission zaten işlendi (idempotency)"
+
+    existing = await session.execute(
+        select(TaskSubmission).where(
+            and_(TaskSubmission.user_id == user_id, TaskSubmission.task_id == task_id)
+        )
+    )
+    submission = existing.scalar_one_or_none()
+
+    if submission:
+        if submission.status == "rewarded":
+            return False, "Bu görev zaten tamamlandı ve ödül verildi"
+        if submission.status == "pending":
+            task_result = await session.execute(select(Task).where(Task.id == task_id))
+            task = task_result.scalar_one_or_none()
+            if task and task.cooldown_seconds > 0:
+                elapsed = (datetime.utcnow() - submission.submitted_at).total_seconds()
+                if elapsed < task.cooldown_seconds:
+                    remaining = int(task.cooldown_seconds - elapsed)
+                    return False, f"Cooldown aktif. {remaining} saniye sonra tekrar deneyebilirsin."
+
+    task_result = await session.execute(select(Task).where(Task.id == task_id))
+    task = task_result.scalar_one_or_none()
+
+    if task and task.max_completions_per_user > 0:
+        completed_count = await session.execute(
+            select(func.count(TaskSubmission.id)).where(
+                and_(
+                    TaskSubmission.user_id == user_id,
+                    TaskSubmission.task_id == task_id,
+                    TaskSubmission.status == "rewarded",
+                )
+            )
+        )
+        if completed_count.scalar_one() >= task.max_completions_per_user:
+            return False, f"Bu görev maksimum {task.max_completions_per_user} kez tamamlanabilir"
+
+    one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+    recent_count = await session.execute(
+        select(func.count(TaskSubmission.id)).where(
+            and_(TaskSubmission.user_id == user_id, TaskSubmission.submitted_at >= one_hour_ago)
+        )
+    )
+    if recent_count.scalar_one() >= 20:
+        return False, "Rate limit: Saatte maksimum 20 görev tamamlayabilirsin"
+
+    return True, None
+
+
+async def cleanup(session: AsyncSession) -> None:
+    bench_users = select(User.id).where(User.telegram_id >= BENCH_TELEGRAM_ID_BASE)
+    await session.execute(
+        delete(TaskSubmission).where(TaskSubmission.user_id.in_(bench_users))
+    )
+    await session.execute(delete(Task).where(Task.id.like(f"{BENCH_TASK_PREFIX}%")))
+    await session.execute(delete(User).where(User.telegram_id >= BENCH_TELEGRAM_ID_BASE))
+    await session.commit()
+
+
+async def seed(session: AsyncSession, users: int) -> tuple[list[int], list[str]]:
+    """Bench kullanıcıları, task'ları ve karışık submission geçmişi."""
+    await cleanup(session)
+
+    task_ids = [f"{BENCH_TASK_PREFIX}{i}" for i in range(BENCH_TASKS)]
+    await session.execute(
+        insert(Task.__table__),
+        [
+            {
+                "id": task_id,
+                "title": f"Bench task {i}",
+                "description": "",
+                "category": "bench",
+                "reward_xp": 10,
+                "reward_ncr": "1",
+                "cooldown_seconds": 600 if i % 2 else 0,
+                "max_completions_per_user": 1,
+                "metadata": {},
+            }
+            for i, task_id in enumerate(task_ids)
+        ],
+    )
+    result = await session.execute(
+        insert(User.__table__).returning(User.__table__.c.id),
+        [
+            {"telegram_id": BENCH_TELEGRAM_ID_BASE + i, "username": f"bench_gate_{i}"}
+            for i in range(users)
+        ],
+    )
+    user_ids = [row[0] for row in result.all()]
+
+    now = datetime.utcnow()
+    submissions = []
+    for n, user_id in enumerate(user_ids):
+        # 1/3 rewarded, 1/3 pending (cooldown dolmamış), 1/3 temiz;
+        # her 10 kullanıcıdan birinin submission'ları son 1 saat içinde
+        for t, task_id in enumerate(task_ids):
+            kind = (n + t) % 3
+            if kind == 2:
+                continue
+            submissions.append(
+                {
+                    "user_id": user_id,
+                    "task_id": task_id,
+                    "status": SubmissionStatus.REWARDED if kind == 0 else SubmissionStatus.PENDING,
+                    "external_id": f"{BENCH_TASK_PREFIX}{user_id}_{t}",
+                    "proof_metadata": {},
+                    "submitted_at": now - timedelta(minutes=1 if n % 10 == 0 else 90),
+                    "created_at": now,
+                }
+            )
+    await session.execute(insert(TaskSubmission.__table__), submissions)
+    await session.commit()
+    return user_ids, task_ids
+
+
+def workload(user_ids: list[int], task_ids: list[str], submits: int) -> list[tuple]:
+    """(user_id, task_id, external_id) dizisi; %10'u tekrar eden external_id."""
+    calls = []
+    for i in range(submits):
+        user_id = user_ids[i % len(user_ids)]
+        t = (i // len(user_ids)) % len(task_ids)
+        if i % 10 == 0:
+            external_id = f"{BENCH_TASK_PREFIX}{user_id}_{t}"
+        else:
+            external_id = f"{BENCH_TASK_PREFIX}new_{i}"
+        calls.append((user_id, task_ids[t], external_id))
+    return calls
+
+
+async def run_path(session_factory, engine, calls, check) -> tuple[dict, list]:
+    queries = 0
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        nonlocal queries
+        queries += 1
+
+    latencies: list[float] = []
+    decisions = []
+    event.listen(engine.sync_engine, "before_cursor_execute", _on_execute)
+    started = time.perf_counter()
+    try:
+        for user_id, task_id, external_id in calls:
+            async with session_factory() as session:
+                t0 = time.perf_counter()
+                decisions.append(await check(session, user_id, task_id, external_id))
+                latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _on_execute)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "queries_per_submit": queries / len(calls),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "throughput": len(calls) / elapsed,
+    }, decisions
+
+
+async def gate_check(session, user_id, task_id, external_id):
+    return await AbuseGuard(session).check_task_submission_allowed(user_id, task_id, external_id)
+
+
+def print_stats(label: str, stats: dict) -> None:
+    print(f"📋 {label}")
+    print(f"   Queries/submit: {stats['queries_per_submit']:.2f}")
+    print(f"   Latency p50/p95/p99: {stats['p50']:.2f} / {stats['p95']:.2f} / {stats['p99']:.2f} ms")
+    print(f"   Throughput: {stats['throughput']:,.0f} checks/s")
+    print()
+
+
+async def run_benchmark(submits: int, users: int):
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        print(f"🌱 Seeding {users:,} users × {BENCH_TASKS} tasks...")
+        async with session_factory() as session:
+            user_ids, task_ids = await seed(session, users)
+        calls = workload(user_ids, task_ids, submits)
+
+        print("🔷 Task submission gate benchmark")
+        print(f"   submits={submits:,} users={users:,}")
+        print()
+
+        legacy_stats, legacy_decisions = await run_path(session_factory, engine, calls, legacy_check)
+        print_stats("Legacy (sequential queries)", legacy_stats)
+
+        invalidate_task_cache()
+        set_rate_limiter(MemoryRateLimiter())
+        gate_stats, gate_decisions = await run_path(session_factory, engine, calls, gate_check)
+        print_stats("Gate (single query + task cache + rate limiter)", gate_stats)
+
+        mismatches = [
+            (call, old, new)
+            for call, old, new in zip(calls, legacy_decisions, gate_decisions)
+            if old[0] != new[0] or (old[1] or "").split(".")[0] != (new[1] or "").split(".")[0]
+        ]
+        if mismatches:
+            for call, old, new in mismatches[:10]:
+                print(f"   ❌ {call}: legacy={old} gate={new}")
+        else:
+            print("   ✅ Decisions identical for all submits")
+
+        speedup = gate_stats["throughput"] / legacy_stats["throughput"] if legacy_stats["throughput"] else 0
+        print(f"   Speedup: {speedup:.2f}x")
+
+        async with session_factory() as session:
+            await cleanup(session)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task submission gate benchmark")
+    parser.add_argument("--submits", type=int, default=10_000, help="Gate checks per path (default: 10000)")
+    parser.add_argument("--users", type=int, default=1_000, help="Synthetic users (default: 1000)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.submits, args.users))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Treasury Cap Reservation Benchmark
+
+Günlük treasury bütçesine eşzamanlı ödül rezervasyonu yağdırır ve eski
+read-modify-write akışını atomik rezervasyonla karşılaştırır.
+
+Her koşuda:
+- N task × M rezervasyon, her biri kendi transaction'ında
+- Küçük bir günlük limit (talep limitin birkaç katı) → damping ve hard
+  cap devreye girer
+- p50 / p99 latency, rezervasyon/s
+- Doğruluk: issued_ncr == verilenlerin toplamı, issued_ncr <= hard cap,
+  seri uygulamayla aynı sonuç
+
+Gerçek günün sayacına dokunmaz; koşular uzak gelecekteki bir gün
+satırında yapılır ve sonunda silinir.
+
+Kullanım:
+    python scripts/bench_treasury_cap.py
+    python scripts/bench_treasury_cap.py --tasks 200 --reservations 50 --hold-ms 2
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from app.core.config import settings
+from app.wallet.models import DailyTreasuryStat
+from app.wallet.treasury_cap import _get_damping_multiplier, reserve_treasury_budget
+
+BENCH_DAY = date(2099, 1, 1)
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def serial_issued(limit_ncr: float, amount: float, count: int) -> float:
+    """Rezervasyonlar tek tek uygulansaydı varılacak issued_ncr."""
+    issued = 0.0
+    hard_cap = limit_ncr * settings.TREASURY_HARD_CAP_RATIO
+    for _ in range(count):
+        damped = round(amount * _get_damping_multiplier((issued + amount) / limit_ncr), 2)
+        granted = min(damped, max(int((hard_cap - issued) * 100) / 100, 0.0))
+        issued += granted if granted >= 0.01 else 0.0
+    return issued
+
+
+async def legacy_reserve(session: AsyncSession, amount: float, day: date) -> float:
+    """Eski akış: oku → Python'da damping → issued_ncr'ı geri yaz."""
+    stat = (
+        await session.execute(select(DailyTreasuryStat).where(DailyTreasuryStat.day == day))
+    ).scalar_one()
+    granted = round(amount * _get_damping_multiplier((stat.issued_ncr + amount) / stat.limit_ncr), 2)
+    if granted < 0.01:
+        granted = 0.0
+    stat.issued_ncr += granted
+    stat.updated_at = datetime.utcnow()
+    session.add(stat)
+    return granted
+
+
+async def atomic_reserve(session: AsyncSession, amount: float, day: date) -> float:
+    return (await reserve_treasury_budget(session, amount, day=day)).granted_ncr
+
+
+async def run_once(session_factory, mode: str, day: date, tasks: int, reservations: int,
+                   amount: float, limit_ncr: float, hold_ms: float):
+    reserve = atomic_reserve if mode == "atomic" else legacy_reserve
+
+    async with session_factory() as session:
+        await session.execute(delete(DailyTreasuryStat).where(DailyTreasuryStat.day == day))
+        session.add(DailyTreasuryStat(day=day, limit_ncr=limit_ncr, issued_ncr=0.0))
+        await session.commit()
+
+    latencies: list[float] = []
+    granted_total = 0.0
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal granted_total, errors
+        for _ in range(reservations):
+            started = time.perf_counter()
+            async with session_factory() as session:
+                try:
+                    granted = await reserve(session, amount, day)
+                    if hold_ms:
+                        # Rezervasyon ile commit arasındaki ödül işini taklit et
+                        await asyncio.sleep(hold_ms / 1000)
+                    await session.commit()
+                    granted_total += granted
+                except Exception:
+                    await session.rollback()
+                    errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    wall = time.perf_counter() - wall_started
+
+    async with session_factory() as session:
+        stat = (
+            await session.execute(select(DailyTreasuryStat).where(DailyTreasuryStat.day == day))
+        ).scalar_one()
+        issued = stat.issued_ncr
+        await session.execute(delete(DailyTreasuryStat).where(DailyTreasuryStat.day == day))
+        await session.commit()
+
+    total = tasks * reservations
+    hard_cap = limit_ncr * settings.TREASURY_HARD_CAP_RATIO
+    expected = serial_issued(limit_ncr, amount, total - errors)
+
+    print(f"📋 mode={mode}")
+    print(f"   Requests:   {total} (errors={errors})")
+    print(f"   Throughput: {total / wall:,.0f} reservations/s over {wall:.2f}s")
+    print(f"   Latency:    p50={percentile(latencies, 50):.2f}ms "
+          f"p99={percentile(latencies, 99):.2f}ms "
+          f"mean={statistics.fmean(latencies):.2f}ms")
+    print(f"   Issued:     {issued:,.2f} / limit {limit_ncr:,.2f} "
+          f"(hard cap {hard_cap:,.2f}, serial {expected:,.2f})")
+
+    violations = []
+    if abs(issued - granted_total) > 0.005:
+        violations.append(f"issued {issued:.2f} != granted total {granted_total:.2f}")
+    if issued > hard_cap + 1e-6:
+        violations.append(f"hard cap exceeded by {issued - hard_cap:,.2f}")
+    if abs(issued - expected) > 0.005 * total:
+        violations.append(f"issued differs from serial replay by {issued - expected:,.2f}")
+    for violation in violations:
+        print(f"   ❌ {violation}")
+    if not violations:
+        print("   ✅ Cap respected, matches serial replay")
+    print()
+
+    return total / wall
+
+
+async def run_benchmark(modes: list[str], tasks: int, reservations: int, amount: float,
+                        demand_ratio: float, hold_ms: float):
+    engine = create_async_engine(
+        settings.DATABASE_URL, echo=False, pool_size=min(tasks, 50), max_overflow=0
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    limit_ncr = tasks * reservations * amount / demand_ratio
+
+    print("🔷 Treasury cap reservation benchmark")
+    print(f"   tasks={tasks} reservations/task={reservations} amount={amount} "
+          f"limit={limit_ncr:,.2f} hold={hold_ms}ms")
+    print()
+
+    results = {}
+    try:
+        for offset, mode in enumerate(modes):
+            results[mode] = await run_once(
+                session_factory, mode, BENCH_DAY + timedelta(days=offset),
+                tasks, reservations, amount, limit_ncr, hold_ms,
+            )
+    finally:
+        await engine.dispose()
+
+    baseline = results[modes[0]]
+    for mode, throughput in results.items():
+        print(f"   {mode:<7} {throughput:>10,.0f} reservations/s  ({throughput / baseline:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treasury cap reservation benchmark")
+    parser.add_argument("--modes", type=str, default="legacy,atomic",
+                        help="Comma-separated modes to compare (default: legacy,atomic)")
+    parser.add_argument("--tasks", type=int, default=100, help="Concurrent asyncio tasks (default: 100)")
+    parser.add_argument("--reservations", type=int, default=20, help="Reservations per task (default: 20)")
+    parser.add_argument("--amount", type=float, default=5.0, help="NCR per reservation (default: 5)")
+    parser.add_argument("--demand-ratio", type=float, default=2.0,
+                        help="Total demand / daily limit (default: 2.0)")
+    parser.add_argument("--hold-ms", type=float, default=0.0,
+                        help="Simulated work between reservation and commit (default: 0)")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",")
+    asyncio.run(run_benchmark(modes, args.tasks, args.reservations, args.amount,
+                              args.demand_ratio, args.hold_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Treasury Shard Contention Benchmark
+
+Treasury'ye eşzamanlı credit yağdırır ve shard sayısına göre
+throughput / latency karşılaştırır (varsayılan: 1 vs 16 shard).
+
+Her koşuda:
+- N task × M credit (create_transaction EARN → treasury)
+- p50 / p99 latency, tx/s
+- Doğruluk: canonical + shard toplamı == başlangıç + credit toplamı
+- Roll-up sonrası: tüm shard'lar 0, canonical == beklenen
+
+Kullanım:
+    python scripts/bench_treasury_shards.py
+    python scripts/bench_treasury_shards.py --shard-counts 1,4,16 --tasks 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.wallet.models import LedgerEntryType
+from app.wallet.schemas import TransactionCreate
+from app.wallet.service import WalletService
+from app.wallet.treasury_shards import get_treasury_shard_total, rollup_treasury_shards
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def treasury_total(session: AsyncSession) -> tuple[Decimal, Decimal]:
+    """(canonical balance, shard total)"""
+    account = await WalletService(session).get_or_create_account(
+        settings.NCR_TREASURY_USER_ID, "NCR"
+    )
+    return account.balance, await get_treasury_shard_total(session)
+
+
+async def run_once(session_factory, shard_count: int, tasks: int, credits: int, amount: Decimal):
+    settings.TREASURY_SHARD_COUNT = shard_count
+
+    async with session_factory() as session:
+        # Önceki koşudan kalan shard bakiyelerini temizle
+        await rollup_treasury_shards(session)
+        canonical_before, _ = await treasury_total(session)
+        await session.commit()
+
+    latencies: list[float] = []
+    succeeded = 0
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal succeeded, errors
+        for _ in range(credits):
+            started = time.perf_counter()
+            async with session_factory() as session:
+                try:
+                    await WalletService(session).create_transaction(
+                        TransactionCreate(
+                            user_id=settings.NCR_TREASURY_USER_ID,
+                            amount=amount,
+                            type=LedgerEntryType.EARN,
+                            source_app="admin",
+                            related_user_id=random.randint(1, 1_000_000),
+                            metadata={"bench": "treasury_shards"},
+                        )
+                    )
+                    await session.commit()
+                    succeeded += 1
+                except Exception:
+                    await session.rollback()
+                    errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    wall = time.perf_counter() - wall_started
+
+    violations: list[str] = []
+    expected = canonical_before + amount * succeeded
+    async with session_factory() as session:
+        canonical, shard_total = await treasury_total(session)
+        if canonical + shard_total != expected:
+            violations.append(f"canonical+shards {canonical + shard_total} != expected {expected}")
+
+        await rollup_treasury_shards(session)
+        await session.commit()
+
+        canonical, shard_total = await treasury_total(session)
+        if shard_total != 0:
+            violations.append(f"shards not drained after roll-up: {shard_total}")
+        if canonical != expected:
+            violations.append(f"canonical after roll-up {canonical} != expected {expected}")
+
+    total = succeeded + errors
+    print(f"📋 shards={shard_count}")
+    print(f"   Requests:   {total} (ok={succeeded}, errors={errors})")
+    print(f"   Throughput: {total / wall:,.0f} tx/s over {wall:.2f}s")
+    print(f"   Latency:    p50={percentile(latencies, 50):.2f}ms "
+          f"p99={percentile(latencies, 99):.2f}ms "
+          f"mean={statistics.fmean(latencies):.2f}ms")
+    if violations:
+        for violation in violations:
+            print(f"   ❌ {violation}")
+    else:
+        print("   ✅ Treasury totals exact (before and after roll-up)")
+    print()
+
+    return total / wall
+
+
+async def run_benchmark(shard_counts: list[int], tasks: int, credits: int, amount: Decimal):
+    engine = create_async_engine(
+        settings.DATABASE_URL, echo=False, pool_size=min(tasks, 50), max_overflow=0
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print("🔷 Treasury shard contention benchmark")
+    print(f"   tasks={tasks} credits/task={credits} amount={amount}")
+    print()
+
+    original_count = settings.TREASURY_SHARD_COUNT
+    results = {}
+    try:
+        for shard_count in shard_counts:
+            results[shard_count] = await run_once(
+                session_factory, shard_count, tasks, credits, amount
+            )
+    finally:
+        settings.TREASURY_SHARD_COUNT = original_count
+        await engine.dispose()
+
+    baseline = results[shard_counts[0]]
+    for shard_count, throughput in results.items():
+        print(f"   shards={shard_count:<3} {throughput:>10,.0f} tx/s  ({throughput / baseline:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treasury shard contention benchmark")
+    parser.add_argument(
+        "--shard-counts",
+        type=str,
+        default="1,16",
+        help="Comma-separated shard counts to compare (default: 1,16)",
+    )
+    parser.add_argument("--tasks", type=int, default=100, help="Concurrent asyncio tasks (default: 100)")
+    parser.add_argument("--credits", type=int, default=20, help="Credits per task (default: 20)")
+    parser.add_argument("--amount", type=str, default="1", help="Credit amount (default: 1)")
+    args = parser.parse_args()
+
+    shard_counts = [int(n) for n in args.shard_counts.split(",")]
+    asyncio.run(run_benchmark(shard_counts, args.tasks, args.credits, Decimal(args.amount)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Wallet Hot-Account Concurrency Benchmark
+
+Tek bir hesaba (hot account) çok sayıda asyncio task'tan eşzamanlı SPEND atar:
+- p50 / p99 latency
+- throughput (tx/s)
+- invariant ihlalleri:
+  * final balance != initial - sum(başarılı spend)
+  * negatif bakiye
+  * ledger entry sayısı != başarılı spend sayısı
+  * tekrar eden balance_after (iki tx aynı bakiyeyi okumuş = lost update)
+
+--legacy ile eski read-check-write akışını (SELECT → Python check → UPDATE)
+emüle ederek aynı iş yükünde ihlalleri karşılaştırabilirsin.
+
+Kullanım:
+    python scripts/bench_wallet_hot_account.py --tasks 100 --spends 20
+    python scripts/bench_wallet_hot_account.py --tasks 100 --spends 20 --legacy
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from app.core.config import settings
+from app.identity.models import User
+from app.wallet.models import Account, LedgerEntry, LedgerEntryType
+from app.wallet.schemas import TransactionCreate
+from app.wallet.service import WalletService
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile (ms)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def legacy_spend(session: AsyncSession, user_id: int, amount: Decimal) -> None:
+    """Eski akış: plain SELECT, Python'da kontrol, sonra yaz."""
+    result = await session.execute(
+        select(Account).where(Account.user_id == user_id, Account.token == "NCR")
+    )
+    account = result.scalar_one()
+    if account.balance < amount:
+        raise HTTPException(status_code=400, detail="Insufficient balance")
+    new_balance = account.balance - amount
+    session.add(
+        LedgerEntry(
+            user_id=user_id,
+            amount=amount,
+            token="NCR",
+            type=LedgerEntryType.SPEND,
+            source_app="flirt",
+            meta={"bench": True},
+            balance_after=new_balance,
+        )
+    )
+    account.balance = new_balance
+    account.updated_at = datetime.utcnow()
+    session.add(account)
+    await session.flush()
+
+
+async def run_benchmark(tasks: int, spends: int, amount: Decimal, initial: Decimal, legacy: bool):
+    engine = create_async_engine(
+        settings.DATABASE_URL, echo=False, pool_size=min(tasks, 50), max_overflow=0
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    # Setup: hot user + account
+    async with session_factory() as session:
+        user = User(
+            telegram_id=random.randint(10**12, 10**13),
+            username="bench_hot_account",
+        )
+        session.add(user)
+        await session.flush()
+        session.add(Account(user_id=user.id, token="NCR", balance=initial))
+        await session.commit()
+        user_id = user.id
+
+    latencies: list[float] = []
+    succeeded = 0
+    rejected = 0
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal succeeded, rejected, errors
+        for _ in range(spends):
+            started = time.perf_counter()
+            async with session_factory() as session:
+                try:
+                    if legacy:
+                        await legacy_spend(session, user_id, amount)
+                    else:
+                        await WalletService(session).create_transaction(
+                            TransactionCreate(
+                                user_id=user_id,
+                                amount=amount,
+                                type=LedgerEntryType.SPEND,
+                                source_app="flirt",
+                                metadata={"bench": True},
+                            )
+                        )
+                    await session.commit()
+                    succeeded += 1
+                except HTTPException:
+                    await session.rollback()
+                    rejected += 1
+                except Exception:
+                    await session.rollback()
+                    errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    print(f"🔷 Hot-account benchmark ({'legacy read-check-write' if legacy else 'guarded UPDATE'})")
+    print(f"   tasks={tasks} spends/task={spends} amount={amount} initial={initial}")
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    wall = time.perf_counter() - wall_started
+
+    # Invariant checks
+    violations: list[str] = []
+    async with session_factory() as session:
+        final_balance = (
+            await session.execute(
+                select(Account.balance).where(Account.user_id == user_id, Account.token == "NCR")
+            )
+        ).scalar_one()
+        entry_count = (
+            await session.execute(
+                select(func.count(LedgerEntry.id)).where(LedgerEntry.user_id == user_id)
+            )
+        ).scalar_one()
+        duplicate_balances = (
+            await session.execute(
+                select(func.count())
+                .select_from(
+                    select(LedgerEntry.balance_after)
+                    .where(LedgerEntry.user_id == user_id)
+                    .group_by(LedgerEntry.balance_after)
+                    .having(func.count() > 1)
+                    .subquery()
+                )
+            )
+        ).scalar_one()
+
+        expected_balance = initial - amount * succeeded
+        if final_balance != expected_balance:
+            violations.append(f"final balance {final_balance} != expected {expected_balance}")
+        if final_balance < 0:
+            violations.append(f"negative balance {final_balance}")
+        if entry_count != succeeded:
+            violations.append(f"ledger entries {entry_count} != successful spends {succeeded}")
+        if duplicate_balances:
+            violations.append(f"{duplicate_balances} duplicated balance_after values (lost updates)")
+
+        # Cleanup
+        await session.execute(delete(LedgerEntry).where(LedgerEntry.user_id == user_id))
+        await session.execute(delete(Account).where(Account.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+    await engine.dispose()
+
+    total = succeeded + rejected + errors
+    print()
+    print(f"   Requests:   {total} (ok={succeeded}, insufficient={rejected}, errors={errors})")
+    print(f"   Throughput: {total / wall:,.0f} tx/s over {wall:.2f}s")
+    print(f"   Latency:    p50={percentile(latencies, 50):.2f}ms "
+          f"p99={percentile(latencies, 99):.2f}ms "
+          f"mean={statistics.fmean(latencies):.2f}ms")
+    print()
+    if violations:
+        print(f"❌ {len(violations)} invariant violation(s):")
+        for violation in violations:
+            print(f"   - {violation}")
+    else:
+        print("✅ No invariant violations")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wallet hot-account concurrency benchmark")
+    parser.add_argument("--tasks", type=int, default=100, help="Concurrent asyncio tasks (default: 100)")
+    parser.add_argument("--spends", type=int, default=20, help="Spends per task (default: 20)")
+    parser.add_argument("--amount", type=str, default="1", help="Spend amount (default: 1)")
+    parser.add_argument(
+        "--initial",
+        type=str,
+        default="1500",
+        help="Initial balance; below tasks*spends*amount exercises the funds guard (default: 1500)",
+    )
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Use the old read-check-write flow for comparison",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(
+            args.tasks,
+            args.spends,
+            Decimal(args.amount),
+            Decimal(args.initial),
+            args.legacy,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Leaderboard Snapshot Rebuild
+
+leaderboard_snapshot'ın güncel daily / weekly / all_time bucket'larını
+kaynak tablolardan (user_loyalty, xp_events, task_rewards,
+referral_rewards) yeniden kurar ve rank'leri yeniden hesaplar.
+
+- Migration sonrası bir kez çalıştırın (tablo boş başlar)
+- İdempotent: güncel bucket satırları silinip yeniden yazılır
+
+Kullanım:
+    python scripts/rebuild_leaderboard_snapshot.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.telegram_gateway.leaderboard import rebuild_leaderboard_snapshot
+
+
+async def rebuild() -> None:
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print("🔷 Rebuilding leaderboard snapshot...")
+
+    async with async_session() as session:
+        counts = await rebuild_leaderboard_snapshot(session)
+
+    await engine.dispose()
+    for period, rows in counts.items():
+        print(f"   {period:<9} {rows:>8} rows")
+    print("✅ Leaderboard snapshot rebuilt")
+
+
+def main():
+    asyncio.run(rebuild())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Treasury Totals Reconciliation
+
+treasury_totals sayaçlarını (rake/fee/burn, dolaşım, holder sayısı)
+ledger_entries + accounts üzerinden tam yeniden hesaplama ile karşılaştırır.
+
+- Sayaçlar ve tarama aynı REPEATABLE READ snapshot'ında okunur
+- --fix: farkı düzeltme delta'sı olarak yazar (ilk kurulumda backfill)
+- Fark varsa exit code 1 (cron / alerting için)
+
+Kullanım:
+    python scripts/reconcile_treasury_totals.py
+    python scripts/reconcile_treasury_totals.py --fix
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.wallet.treasury_totals import reconcile_treasury_totals
+
+
+async def reconcile(token: str, fix: bool) -> int:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        isolation_level="REPEATABLE READ",
+    )
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"🔷 Treasury totals reconciliation (token={token}, fix={fix})")
+
+    async with async_session() as session:
+        drift = await reconcile_treasury_totals(session, token=token, fix=fix)
+        await session.commit()
+
+    await engine.dispose()
+
+    if not drift:
+        print("✅ Counters match full recompute")
+        return 0
+
+    for metric, (stored, recomputed) in drift.items():
+        print(f"   ❌ {metric}: stored={stored} recomputed={recomputed} diff={recomputed - stored}")
+    if fix:
+        print("🔧 Correction deltas written")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reconcile treasury_totals counters against a full recompute"
+    )
+    parser.add_argument("--token", type=str, default="NCR", help="Token symbol (default: NCR)")
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Write correction deltas (also used for the initial backfill)",
+    )
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(reconcile(args.token, args.fix)))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,40 @@
 Aurora Policy Simulation Script
 Simulates user behavior and CP/regime evolution over time.
 
+CP weights come from app.justice.policy.cp_weight_for_violation and
+regimes from regime_for_cp (the same code JusticeService uses); the
+population is simulated with the vectorized engine in
+app.economy.simulation (numpy required). --sweep runs a grid over policy
+fields, e.g. --sweep "threshold_lockdown=[70,80,90]".
+
 Usage:
     python scripts/simulate_aurora_policies.py --users 1000 --days 90 --decay 1
+    python scripts/simulate_aurora_policies.py --users 1000000 --days 365 --timeseries cp.parquet
+    python scripts/simulate_aurora_policies.py --sweep "decay_per_day=[1,2]" --sweep "threshold_lockdown=[70,90]"
 """
 
 import argparse
 import json
-import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-from collections import defaultdict
+import os
 import sys
+import time
 from pathlib import Path
+from typing import Dict
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.justice.policy import regime_for_cp
+from app.economy.simulation import (
+    NUMPY_AVAILABLE,
+    JusticeScenario,
+    default_policy,
+    parse_sweep_spec,
+    run_sweep,
+    simulate_justice,
+    write_results,
+)
+
+REGIME_ORDER = ["NORMAL", "SOFT_FLAG", "PROBATION", "RESTRICTED", "LOCKDOWN"]
 
 
 class PolicySimulator:
@@ -27,7 +44,7 @@ class PolicySimulator:
     
     def __init__(
         self,
-        decay_per_day: float = 1.0,
+        decay_per_day: int = 1,
         violation_probability: float = 0.05,
         violation_severity_dist: Dict[int, float] = None,
         # DAO-controlled parameters
@@ -39,6 +56,7 @@ class PolicySimulator:
         threshold_probation: int = 40,
         threshold_restricted: int = 60,
         threshold_lockdown: int = 80,
+        seed: int = 42,
     ):
         self.decay_per_day = decay_per_day
         self.violation_probability = violation_probability
@@ -49,134 +67,29 @@ class PolicySimulator:
             4: 0.15, # 15% severity 4
             5: 0.05, # 5% severity 5
         }
-        
-        # CP weights by category (DAO-controlled)
-        self.cp_base = {
-            "EKO": base_eko,
-            "COM": base_com,
-            "SYS": base_sys,
-            "TRUST": base_trust,
-        }
-        self.severity_multiplier = {
-            1: 0.5,
-            2: 1.0,
-            3: 1.5,
-            4: 2.0,
-            5: 3.0,
-        }
-        
-        # Regime thresholds (DAO-controlled)
-        self.threshold_soft_flag = threshold_soft_flag
-        self.threshold_probation = threshold_probation
-        self.threshold_restricted = threshold_restricted
-        self.threshold_lockdown = threshold_lockdown
-    
-    def calculate_cp_delta(self, category: str, severity: int, code: str) -> int:
-        """Calculate CP delta for a violation."""
-        base = self.cp_base.get(category, 10)
-        multiplier = self.severity_multiplier.get(severity, 1.0)
-        cp = int(base * multiplier)
-        
-        # Special cases
-        if code == "SYS_EXPLOIT":
-            cp = max(cp, 60)
-        if code == "TRUST_MULTIPLE_ACCOUNTS":
-            cp = max(cp, 80)
-        
-        return cp
-    
-    def apply_decay(self, cp: float, days: float) -> float:
-        """Apply decay to CP over time."""
-        decay_amount = days * self.decay_per_day
-        return max(0.0, cp - decay_amount)
-    
-    def _regime_for_cp(self, cp: int) -> str:
-        """Calculate regime based on CP using DAO-controlled thresholds."""
-        if cp >= self.threshold_lockdown:
-            return "LOCKDOWN"
-        if cp >= self.threshold_restricted:
-            return "RESTRICTED"
-        if cp >= self.threshold_probation:
-            return "PROBATION"
-        if cp >= self.threshold_soft_flag:
-            return "SOFT_FLAG"
-        return "NORMAL"
-    
-    def generate_violation(self) -> Tuple[str, int, str]:
-        """Generate a random violation."""
-        category = random.choice(["EKO", "COM", "SYS", "TRUST"])
-        severity = random.choices(
-            list(self.violation_severity_dist.keys()),
-            weights=list(self.violation_severity_dist.values()),
-        )[0]
-        
-        codes = {
-            "EKO": ["EKO_NO_SHOW", "EKO_FRAUD", "EKO_CHARGEBACK"],
-            "COM": ["COM_TOXIC", "COM_HARASSMENT", "COM_SPAM"],
-            "SYS": ["SYS_EXPLOIT", "SYS_ABUSE", "SYS_BOT"],
-            "TRUST": ["TRUST_MULTIPLE_ACCOUNTS", "TRUST_FAKE_ID", "TRUST_SCAM"],
-        }
-        code = random.choice(codes[category])
-        
-        return category, severity, code
+        self.seed = seed
+        self.policy = default_policy(
+            decay_per_day=decay_per_day,
+            base_eko=base_eko,
+            base_com=base_com,
+            base_sys=base_sys,
+            base_trust=base_trust,
+            threshold_soft_flag=threshold_soft_flag,
+            threshold_probation=threshold_probation,
+            threshold_restricted=threshold_restricted,
+            threshold_lockdown=threshold_lockdown,
+        )
     
-    def simulate_user(
-        self,
-        user_id: str,
-        days: int,
-        violation_probability: float = None,
-    ) -> Dict:
-        """Simulate a single user's journey."""
-        if violation_probability is None:
-            violation_probability = self.violation_probability
-        
-        cp = 0.0
-        regime_history = []
-        violations = []
-        current_date = datetime.utcnow() - timedelta(days=days)
-        
-        for day in range(days):
-            # Apply decay
-            cp = self.apply_decay(cp, 1.0)
-            
-            # Check for violation
-            if random.random() < violation_probability:
-                category, severity, code = self.generate_violation()
-                cp_delta = self.calculate_cp_delta(category, severity, code)
-                cp += cp_delta
-                
-                violations.append({
-                    "day": day,
-                    "category": category,
-                    "severity": severity,
-                    "code": code,
-                    "cp_delta": cp_delta,
-                    "cp_after": cp,
-                })
-            
-            # Record regime (using DAO-controlled thresholds)
-            regime = self._regime_for_cp(int(cp))
-            regime_history.append({
-                "day": day,
-                "cp": int(cp),
-                "regime": regime,
-            })
-        
-        # Final state
-        final_regime = self._regime_for_cp(int(cp))
-        
-        return {
-            "user_id": user_id,
-            "initial_cp": 0,
-            "final_cp": int(cp),
-            "final_regime": final_regime,
-            "total_violations": len(violations),
-            "violations": violations,
-            "regime_history": regime_history,
-            "days_in_lockdown": sum(1 for r in regime_history if r["regime"] == "LOCKDOWN"),
-            "days_in_restricted": sum(1 for r in regime_history if r["regime"] == "RESTRICTED"),
-            "days_in_probation": sum(1 for r in regime_history if r["regime"] == "PROBATION"),
-        }
+    def scenario(self, num_users: int, days: int, violation_probability: float = None) -> JusticeScenario:
+        return JusticeScenario(
+            n_users=num_users,
+            n_days=days,
+            seed=self.seed,
+            violation_probability=(
+                self.violation_probability if violation_probability is None else violation_probability
+            ),
+            severity_weights=tuple(self.violation_severity_dist[s] for s in range(1, 6)),
+        )
     
     def simulate_population(
         self,
@@ -186,65 +99,33 @@ class PolicySimulator:
     ) -> Dict:
         """Simulate a population of users."""
         print(f"Simulating {num_users} users over {days} days...")
+        scenario = self.scenario(num_users, days, violation_probability)
         
-        users = []
-        for i in range(num_users):
-            if (i + 1) % 100 == 0:
-                print(f"  Progress: {i + 1}/{num_users} users...")
-            
-            user_data = self.simulate_user(
-                f"SIM-{i:04d}",
-                days,
-                violation_probability,
-            )
-            users.append(user_data)
-        
-        # Aggregate statistics
-        final_regimes = defaultdict(int)
-        final_cp_values = []
-        total_violations = 0
-        lockdown_users = 0
-        restricted_users = 0
-        probation_users = 0
-        
-        for user in users:
-            final_regimes[user["final_regime"]] += 1
-            final_cp_values.append(user["final_cp"])
-            total_violations += user["total_violations"]
-            
-            if user["final_regime"] == "LOCKDOWN":
-                lockdown_users += 1
-            elif user["final_regime"] == "RESTRICTED":
-                restricted_users += 1
-            elif user["final_regime"] == "PROBATION":
-                probation_users += 1
-        
-        avg_cp = sum(final_cp_values) / len(final_cp_values) if final_cp_values else 0
-        max_cp = max(final_cp_values) if final_cp_values else 0
+        started = time.perf_counter()
+        result = simulate_justice(scenario, self.policy)
+        print(f"  Done in {time.perf_counter() - started:.1f}s")
         
         return {
             "simulation_params": {
                 "num_users": num_users,
                 "days": days,
+                "seed": self.seed,
                 "decay_per_day": self.decay_per_day,
-                "violation_probability": violation_probability or self.violation_probability,
-            },
-            "summary": {
-                "total_users": num_users,
-                "average_cp": round(avg_cp, 2),
-                "max_cp": max_cp,
-                "total_violations": total_violations,
-                "average_violations_per_user": round(total_violations / num_users, 2),
-                "regime_distribution": dict(final_regimes),
-                "lockdown_users": lockdown_users,
-                "lockdown_percentage": round(lockdown_users / num_users * 100, 2),
-                "restricted_users": restricted_users,
-                "restricted_percentage": round(restricted_users / num_users * 100, 2),
-                "probation_users": probation_users,
-                "probation_percentage": round(probation_users / num_users * 100, 2),
+                "violation_probability": scenario.violation_probability,
             },
-            "users": users[:10],  # Sample of first 10 users
+            "summary": result.summary,
+            "days": result.rows,
         }
+    
+    def sweep(self, num_users: int, days: int, grid: Dict[str, list], violation_probability: float = None):
+        """Run the simulation over the cartesian product of `grid`."""
+        print(f"Sweeping {num_users} users over {days} days: {', '.join(grid)}")
+        return run_sweep(
+            simulate_justice,
+            self.scenario(num_users, days, violation_probability),
+            grid,
+            policy=self.policy,
+        )
 
 
 def main():
@@ -265,8 +146,8 @@ def main():
     )
     parser.add_argument(
         "--decay",
-        type=float,
-        default=1.0,
+        type=int,
+        default=1,
         help="CP decay per day (default: 1.0)",
     )
     parser.add_argument(
@@ -361,9 +242,31 @@ def main():
         action="store_true",
         help="Print detailed summary to console (in addition to JSON)",
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="RNG seed (default: 42)",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        help='Policy parameter grid, e.g. "threshold_lockdown=[70,80,90]" (repeatable)',
+    )
+    parser.add_argument(
+        "--timeseries",
+        type=str,
+        default=None,
+        help="Write per-day regime counts to .parquet or .csv",
+    )
     
     args = parser.parse_args()
     
+    if not NUMPY_AVAILABLE:
+        print("❌ numpy package not installed. Install with: pip install numpy")
+        sys.exit(1)
+    
     # Load from on-chain DAO if requested
     if args.use_dao:
         try:
@@ -505,33 +408,66 @@ def main():
             threshold_lockdown=args.threshold_lockdown,
         )
     
-    result = simulator.simulate_population(
-        num_users=args.users,
-        days=args.days,
-        violation_probability=args.violation_prob,
-    )
+    simulator.seed = args.seed
     
-    if args.summary_only:
+    if args.sweep:
+        grid = parse_sweep_spec(args.sweep)
+        rows, summaries = simulator.sweep(args.users, args.days, grid, args.violation_prob)
         output = {
-            "simulation_params": result["simulation_params"],
-            "summary": result["summary"],
+            "simulation_params": {
+                "num_users": args.users,
+                "days": args.days,
+                "seed": args.seed,
+                "violation_probability": args.violation_prob,
+                "sweep": grid,
+            },
+            "sweeps": summaries,
         }
+        print_sweep_summary(summaries, list(grid))
     else:
-        output = result
+        result = simulator.simulate_population(
+            num_users=args.users,
+            days=args.days,
+            violation_probability=args.violation_prob,
+        )
+        rows = result["days"]
+        
+        if args.summary_only:
+            output = {
+                "simulation_params": result["simulation_params"],
+                "summary": result["summary"],
+            }
+        else:
+            output = result
+        
+        # Print summary
+        if args.summary or not args.summary_only:
+            print_detailed_summary(result, args)
     
     # Write JSON output
     with open(args.output, "w") as f:
         json.dump(output, f, indent=2, default=str)
     
-    # Print summary
-    if args.summary or not args.summary_only:
-        print_detailed_summary(result, args)
-    
     print(f"\n✅ Results saved to: {args.output}")
+    if args.timeseries:
+        print(f"✅ Per-day rows saved to: {write_results(rows, args.timeseries)}")
     if args.summary:
         print("=" * 60)
 
 
+def print_sweep_summary(summaries: list, names: list) -> None:
+    """Print one line per sweep point."""
+    print("\n" + "=" * 60)
+    print("AURORA POLICY SWEEP SUMMARY")
+    print("=" * 60)
+    for s in summaries:
+        params = ", ".join(f"{name}={s[name]}" for name in names)
+        print(f"\n#{s['sweep_id']:<3} {params}")
+        print(f"     avg CP {s['average_cp']:.2f} | LOCKDOWN {s['lockdown_percentage']:5.2f}% | "
+              f"RESTRICTED {s['restricted_percentage']:5.2f}% | PROBATION {s['probation_percentage']:5.2f}%")
+    print("=" * 60)
+
+
 def print_detailed_summary(result: Dict, args) -> None:
     """Print detailed summary to console."""
     print("\n" + "=" * 60)
@@ -548,8 +484,7 @@ def print_detailed_summary(result: Dict, args) -> None:
     print(f"  Violation probability: {params['violation_probability'] * 100:.1f}%")
     
     print(f"\nFinal Regime Distribution:")
-    regime_order = ["NORMAL", "SOFT_FLAG", "PROBATION", "RESTRICTED", "LOCKDOWN"]
-    for regime in regime_order:
+    for regime in REGIME_ORDER:
         count = summary["regime_distribution"].get(regime, 0)
         percentage = count / params['num_users'] * 100
         bar = "█" * int(percentage / 2)  # Visual bar
@@ -558,37 +493,27 @@ def print_detailed_summary(result: Dict, args) -> None:
     print(f"\nCP Statistics:")
     print(f"  Average CP: {summary['average_cp']:.2f}")
     print(f"  Max CP: {summary['max_cp']}")
-    
-    # Calculate median CP if we have user data
-    if "users" in result and len(result["users"]) > 0:
-        cp_values = [u["final_cp"] for u in result["users"]]
-        cp_values.sort()
-        median_cp = cp_values[len(cp_values) // 2]
-        print(f"  Median CP: {median_cp:.1f}")
+    print(f"  Median CP: {summary['median_cp']:.1f}")
     
     print(f"\nViolation Statistics:")
     print(f"  Total Violations: {summary['total_violations']}")
     print(f"  Avg Violations/User: {summary['average_violations_per_user']:.2f}")
     
-    # Violation category breakdown (if available)
-    if "users" in result and len(result["users"]) > 0:
-        category_counts = defaultdict(int)
-        for user in result["users"]:
-            for v in user.get("violations", []):
-                category_counts[v["category"]] += 1
-        
-        total_violations = sum(category_counts.values())
-        if total_violations > 0:
-            print(f"\n  Top Violation Categories:")
-            for category in ["EKO", "COM", "SYS", "TRUST"]:
-                count = category_counts.get(category, 0)
-                percentage = (count / total_violations) * 100
-                print(f"    {category}: {count:4d} ({percentage:5.1f}%)")
+    # Violation category breakdown
+    category_counts = summary.get("category_distribution", {})
+    total_violations = sum(category_counts.values())
+    if total_violations > 0:
+        print(f"\n  Top Violation Categories:")
+        for category in ["EKO", "COM", "SYS", "TRUST"]:
+            count = category_counts.get(category, 0)
+            percentage = (count / total_violations) * 100
+            print(f"    {category}: {count:4d} ({percentage:5.1f}%)")
     
     print(f"\nCritical Regimes:")
     print(f"  LOCKDOWN:   {summary['lockdown_users']:4d} users ({summary['lockdown_percentage']:5.2f}%)")
     print(f"  RESTRICTED: {summary['restricted_users']:4d} users ({summary['restricted_percentage']:5.2f}%)")
     print(f"  PROBATION:  {summary['probation_users']:4d} users ({summary['probation_percentage']:5.2f}%)")
+    print(f"  Avg days in LOCKDOWN: {summary['avg_days_in_lockdown']:.1f}")
     
     # Policy assessment
     print(f"\nPolicy Assessment:")
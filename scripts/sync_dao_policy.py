@@ -170,6 +170,7 @@ async def sync_from_chain(
         
         print(f"✅ Policy version '{new_policy.version}' saved and activated")
         print(f"   Synced at: {new_policy.synced_at}")
+        print(f"   Running workers pick it up within {settings.JUSTICE_POLICY_CACHE_TTL_SECONDS}s (policy cache version check)")
     
     await engine.dispose()
 
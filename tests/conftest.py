@@ -2,12 +2,15 @@
 NovaCore Test Configuration
 """
 import asyncio
+import os
 from collections.abc import AsyncGenerator
+from contextlib import contextmanager
 from decimal import Decimal
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
@@ -19,6 +22,10 @@ from app.main import app
 # Test database URL (in-memory SQLite for tests)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+# Postgres'e özgü SQL (ON CONFLICT, SKIP LOCKED, LATERAL, RETURNING) testleri için
+# boş bir test veritabanı; ayarlı değilse bu testler skip edilir.
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -48,6 +55,125 @@ async def test_engine():
     await engine.dispose()
 
 
+@pytest_asyncio.fixture(scope="function")
+async def pg_engine():
+    """Postgres test engine; şema her test için sıfırdan kurulur."""
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL not set")
+
+    engine = create_async_engine(TEST_POSTGRES_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def pg_session_factory(pg_engine):
+    """Postgres test engine'ine bağlı session factory."""
+    return sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pg_session(pg_session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """Postgres test session'ı (test_session'ın Postgres karşılığı)."""
+    async with pg_session_factory() as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pg_client(pg_session) -> AsyncGenerator[AsyncClient, None]:
+    """Postgres session'ı kullanan test client."""
+
+    async def override_get_session():
+        yield pg_session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as ac:
+        yield ac
+
+    app.dependency_overrides.clear()
+
+
+class QueryCounter:
+    """Bir blok içinde veritabanına giden SQL statement'ları."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_at_most(self, expected: int) -> None:
+        """N+1 regresyonlarında çalışan sorguları listeleyerek fail et."""
+        assert self.count <= expected, (
+            f"Expected at most {expected} queries, got {self.count}:\n"
+            + "\n".join(self.statements)
+        )
+
+
+@pytest.fixture
+def count_queries(pg_engine):
+    """
+    Query-count harness (Postgres test engine'i üzerinde).
+
+        with count_queries() as queries:
+            await client.get(...)
+        queries.assert_at_most(4)
+    """
+
+    @contextmanager
+    def _count():
+        counter = QueryCounter()
+
+        def _on_execute(conn, cursor, statement, parameters, context, executemany):
+            counter.statements.append(statement)
+
+        event.listen(pg_engine.sync_engine, "before_cursor_execute", _on_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(pg_engine.sync_engine, "before_cursor_execute", _on_execute)
+
+    return _count
+
+
+@pytest.fixture
+def count_commits(pg_engine):
+    """
+    Postgres test engine'ine giden COMMIT'ler (before_cursor_execute görmez).
+
+        with count_commits() as commits:
+            await pipeline.run(...)
+        assert len(commits) == 1
+    """
+
+    @contextmanager
+    def _count():
+        commits: list[None] = []
+
+        def _on_commit(conn):
+            commits.append(None)
+
+        event.listen(pg_engine.sync_engine, "commit", _on_commit)
+        try:
+            yield commits
+        finally:
+            event.remove(pg_engine.sync_engine, "commit", _on_commit)
+
+    return _count
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
     """Create test database session."""
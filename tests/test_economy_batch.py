@@ -0,0 +1,71 @@
+"""
+RewardEngine / DRM Batch Scoring Tests
+Batch path skaler path ile bit-identical olmalı.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.economy.batch import round_like_python
+from app.economy.constitution import EconomyMode, UserEconomyContext
+from app.economy.drm import DynamicRewardManager, MacroContext
+from app.economy.reward_engine import CITIZEN_LEVEL_CODES, RewardEngine, encode_citizen_levels
+
+
+def test_round_like_python_matches_builtin_round():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.uniform(0, 50, 20_000),
+        np.arange(0, 5_000) / 100 + 0.005,  # x.xx5 sınırları
+        np.array([2.675, 0.125, 0.375, 1.005]),
+    ])
+    expected = np.array([round(float(v), 2) for v in values])
+    assert np.array_equal(round_like_python(values, 2), expected)
+
+
+@pytest.mark.parametrize("mode", list(EconomyMode))
+def test_reward_multiplier_batch_matches_scalar(mode):
+    rng = np.random.default_rng(1)
+    n = 2_000
+    streak = rng.integers(-2, 40, n)
+    siyah = rng.uniform(-10, 110, n)
+    risk = rng.uniform(0, 12, n)
+    levels = [CITIZEN_LEVEL_CODES[i] if i < len(CITIZEN_LEVEL_CODES) else "unknown"
+              for i in rng.integers(0, len(CITIZEN_LEVEL_CODES) + 1, n)]
+
+    engine = RewardEngine(mode)
+    batch = engine.compute_reward_multiplier_batch(streak, siyah, risk, encode_citizen_levels(levels))
+    scalar = [
+        engine.compute_reward_multiplier(UserEconomyContext(
+            user_id="batch",
+            streak_days=int(streak[i]),
+            siyah_score_avg=float(siyah[i]),
+            risk_score=float(risk[i]),
+            citizen_level=levels[i],
+        ))
+        for i in range(n)
+    ]
+    assert batch.tolist() == scalar
+
+
+@pytest.mark.parametrize("mode", list(EconomyMode))
+def test_macro_multiplier_batch_matches_scalar(mode):
+    rng = np.random.default_rng(2)
+    n = 2_000
+    columns = {
+        "daily_emission_used": rng.uniform(0, 20_000, n),
+        "daily_emission_cap": rng.choice([0.0, 5_000.0, 10_000.0], n),
+        "weekly_emission_used": rng.uniform(0, 140_000, n),
+        "weekly_emission_cap": rng.choice([0.0, 70_000.0], n),
+        "burn_rate_7d": rng.uniform(0, 0.6, n),
+        "treasury_health": rng.uniform(0, 1, n),
+    }
+
+    batch = DynamicRewardManager.compute_macro_multiplier_batch(mode, **columns)
+    scalar = [
+        DynamicRewardManager.compute_macro_multiplier(
+            MacroContext(mode=mode, **{k: float(v[i]) for k, v in columns.items()})
+        )
+        for i in range(n)
+    ]
+    assert batch.tolist() == scalar
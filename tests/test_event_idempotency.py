@@ -0,0 +1,120 @@
+"""
+Event Idempotency Tests
+processed_events üzerinden (source_app, event_id) başına tek işleme
+(Postgres gerekir: ON CONFLICT DO NOTHING RETURNING).
+"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.events.models import ProcessedEvent
+from app.events.schemas import PokerEvent, PokerEventType
+from app.events.service import EventService
+from app.identity.models import User
+from app.nova_credit.models import ScoreChange
+from app.wallet.models import Account, LedgerEntry
+
+
+@pytest.fixture
+async def player(pg_session_factory) -> int:
+    """100 NCR bakiyeli kullanıcı."""
+    async with pg_session_factory() as session:
+        user = User(username="poker_player")
+        session.add(user)
+        await session.flush()
+        session.add(Account(user_id=user.id, token="NCR", balance=Decimal("100")))
+        await session.commit()
+        return user.id
+
+
+def buy_in(user_id: int, event_id: str = "table-7-buyin-1", amount: str = "10") -> PokerEvent:
+    return PokerEvent(
+        event_id=event_id,
+        event_type=PokerEventType.BUY_IN,
+        user_id=user_id,
+        amount=Decimal(amount),
+        table_id="table-7",
+    )
+
+
+async def handle(session_factory, event: PokerEvent):
+    async with session_factory() as session:
+        result = await EventService(session).handle_poker_event(event)
+        await session.commit()
+        return result
+
+
+async def effects(session_factory, user_id: int) -> dict:
+    """Kullanıcıya uygulanmış wallet / NovaCredit etkileri ve claim satırları."""
+    async with session_factory() as session:
+        async def count(model, *where):
+            return (await session.execute(select(func.count()).select_from(model).where(*where))).scalar_one()
+
+        balance = (await session.execute(
+            select(Account.balance).where(Account.user_id == user_id, Account.token == "NCR")
+        )).scalar_one()
+        return {
+            "balance": balance,
+            "ledger": await count(LedgerEntry, LedgerEntry.user_id == user_id),
+            "score_changes": await count(ScoreChange, ScoreChange.user_id == user_id),
+            "processed": await count(ProcessedEvent, ProcessedEvent.user_id == user_id),
+        }
+
+
+async def test_duplicate_event_id_replays_stored_result(pg_session_factory, player):
+    first = await handle(pg_session_factory, buy_in(player))
+    after_first = await effects(pg_session_factory, player)
+    assert not first.duplicate and first.event_id == "table-7-buyin-1"
+    assert after_first["balance"] == Decimal("90") and after_first["ledger"] == 1
+
+    # Retry (farklı amount ile bile) etkileri ikinci kez uygulamaz
+    retry = await handle(pg_session_factory, buy_in(player, amount="25"))
+    assert retry.duplicate
+    assert retry.model_dump(exclude={"duplicate"}) == first.model_dump(exclude={"duplicate"})
+    assert await effects(pg_session_factory, player) == after_first
+
+
+async def test_event_id_reused_for_different_event_is_rejected(pg_session_factory, player):
+    await handle(pg_session_factory, buy_in(player))
+    before = await effects(pg_session_factory, player)
+
+    async with pg_session_factory() as session:
+        other_user = User(username="someone_else")
+        session.add(other_user)
+        await session.commit()
+
+    reused = [
+        buy_in(player).model_copy(update={"event_type": PokerEventType.CASH_OUT}),
+        buy_in(other_user.id),
+    ]
+    for event in reused:
+        with pytest.raises(HTTPException) as exc_info:
+            await handle(pg_session_factory, event)
+        assert exc_info.value.status_code == 409
+
+    assert await effects(pg_session_factory, player) == before
+
+
+async def test_concurrent_duplicate_waits_for_first_delivery(pg_session_factory, player):
+    event = buy_in(player)
+
+    async with pg_session_factory() as first_session:
+        first = await EventService(first_session).handle_poker_event(event)
+
+        # İkinci teslimat unique index'te birinci commit edene kadar bekler
+        second_task = asyncio.create_task(handle(pg_session_factory, event))
+        await asyncio.sleep(0.3)
+        assert not second_task.done()
+
+        await first_session.commit()
+
+    second = await asyncio.wait_for(second_task, timeout=10)
+    assert second.duplicate and not first.duplicate
+    assert second.new_ncr_balance == first.new_ncr_balance == Decimal("90")
+
+    after = await effects(pg_session_factory, player)
+    assert (after["balance"], after["ledger"], after["processed"]) == (Decimal("90"), 1, 1)
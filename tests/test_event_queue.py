@@ -0,0 +1,118 @@
+"""
+Event Queue Tests
+Queue + worker pool, SQLite stand-in üzerinde (Postgres gerekmez).
+"""
+import asyncio
+import random
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from app.events.models import EventDeadLetter, EventQueueItem
+from app.events.queue import enqueue_event, get_queue_depth, parse_queued_event
+from app.events.schemas import FlirtEvent, FlirtEventType
+from app.events.worker import EventQueueWorkerPool
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[EventQueueItem.__table__, EventDeadLetter.__table__],
+        )
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def enqueue(session_factory, events: list[tuple[int, str]]) -> None:
+    async with session_factory() as session:
+        for user_id, event_id in events:
+            await enqueue_event(session, "flirt", FlirtEvent(
+                event_id=event_id,
+                event_type=FlirtEventType.TIP_SENT,
+                user_id=user_id,
+                amount=Decimal("5"),
+            ))
+        await session.commit()
+
+
+async def drain(pool: EventQueueWorkerPool, session_factory, timeout: float = 10.0) -> None:
+    pool.start()
+    try:
+        async with asyncio.timeout(timeout):
+            while True:
+                async with session_factory() as session:
+                    depth = await get_queue_depth(session)
+                if depth["pending"] == depth["processing"] == 0:
+                    return
+                await asyncio.sleep(0.01)
+    finally:
+        await pool.stop()
+
+
+async def test_workers_preserve_per_user_order(session_factory):
+    rng = random.Random(3)
+    events = [(rng.randint(1, 6), f"e{i}") for i in range(120)]
+    await enqueue(session_factory, events)
+
+    handled: list[tuple[int, str]] = []
+    in_flight: set[int] = set()
+
+    async def processor(session, item):
+        # Aynı kullanıcının iki event'i asla eşzamanlı işlenmemeli
+        assert item.user_id not in in_flight
+        in_flight.add(item.user_id)
+        await asyncio.sleep(rng.random() / 1000)
+        in_flight.discard(item.user_id)
+        event = parse_queued_event(item)
+        handled.append((event.user_id, event.event_id))
+
+    pool = EventQueueWorkerPool(session_factory, workers=4, batch_size=5, processor=processor,
+                                poll_interval=0.005)
+    await drain(pool, session_factory)
+
+    assert sorted(handled, key=lambda e: int(e[1][1:])) == events
+    for user_id in {u for u, _ in events}:
+        assert [e for e in handled if e[0] == user_id] == [e for e in events if e[0] == user_id]
+    assert pool.stats()["processed"] == len(events)
+
+
+async def test_retry_and_dead_letter(session_factory):
+    await enqueue(session_factory, [(1, "flaky"), (1, "after-flaky"), (2, "rejected"),
+                                    (2, "after-rejected"), (3, "broken")])
+    attempts: dict[str, int] = {}
+    handled: list[str] = []
+
+    async def processor(session, item):
+        attempts[item.event_id] = attempts.get(item.event_id, 0) + 1
+        if item.event_id == "flaky" and attempts["flaky"] < 3:
+            raise ConnectionError("partner timeout")
+        if item.event_id == "rejected":
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+        if item.event_id == "broken":
+            raise RuntimeError("boom")
+        handled.append(item.event_id)
+
+    pool = EventQueueWorkerPool(session_factory, workers=2, batch_size=10, processor=processor,
+                                poll_interval=0.005, max_attempts=4, retry_base_seconds=0)
+    await drain(pool, session_factory)
+
+    # Retry edilen head, aynı kullanıcının sonraki event'ini bekletir
+    assert handled.index("flaky") < handled.index("after-flaky")
+    assert attempts == {"flaky": 3, "after-flaky": 1, "rejected": 1, "after-rejected": 1, "broken": 4}
+
+    async with session_factory() as session:
+        dead = (await session.execute(select(EventDeadLetter).order_by(EventDeadLetter.id))).scalars().all()
+        depth = await get_queue_depth(session)
+    assert [(d.event_id, d.attempts) for d in dead] == [("rejected", 1), ("broken", 4)]
+    assert "Insufficient balance" in dead[0].last_error
+    assert depth == {"pending": 0, "processing": 0, "dead_letters": 2, "oldest_age_seconds": 0.0}
+
+    stats = pool.stats()
+    assert (stats["processed"], stats["retried"], stats["dead_lettered"]) == (3, 5, 2)
@@ -0,0 +1,126 @@
+"""
+Keyed Lanes Tests
+"""
+import asyncio
+import random
+
+import pytest
+
+from app.core.lanes import KeyedLanes
+
+
+async def test_same_key_serialized_and_coalesced_other_keys_parallel():
+    lanes = KeyedLanes("test", max_batch=4, enabled=True)
+    rng = random.Random(7)
+    batches: list[tuple[int, list[int]]] = []
+    in_flight: set[int] = set()
+    max_parallel = 0
+
+    async def runner(key, items):
+        nonlocal max_parallel
+        # Aynı key'in iki batch'i asla eşzamanlı çalışmamalı
+        assert key not in in_flight
+        in_flight.add(key)
+        max_parallel = max(max_parallel, len(in_flight))
+        await asyncio.sleep(rng.random() / 500)
+        in_flight.discard(key)
+        batches.append((key, list(items)))
+        return [item * 10 for item in items]
+
+    work = [(rng.choice([1, 1, 1, 2, 3]), i) for i in range(60)]
+    results = await asyncio.gather(*(lanes.submit(key, item, runner) for key, item in work))
+
+    assert results == [item * 10 for _, item in work]
+    for key in {k for k, _ in work}:
+        processed = [i for k, items in batches if k == key for i in items]
+        assert processed == [i for k, i in work if k == key]
+    assert all(len(items) <= 4 for _, items in batches)
+    assert max_parallel > 1
+
+    stats = lanes.stats()
+    assert stats["submitted"] == 60
+    assert stats["batches"] == len(batches) < 60
+    assert stats["coalesced"] == 60 - len(batches)
+    # Lane'ler boşalınca silinir; en sıcak key peak tablosunun başında
+    assert stats["active_lanes"] == 0 and lanes._lanes == {}
+    assert stats["hot_keys"][0]["key"] == "1"
+
+
+async def test_item_errors_reach_only_their_caller():
+    lanes = KeyedLanes("test", enabled=True)
+    gate = asyncio.Event()
+
+    async def runner(key, items):
+        await gate.wait()
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    tasks = [asyncio.create_task(lanes.submit("k", item, runner)) for item in ("a", "bad", "c")]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert results[0] == "a" and results[2] == "c"
+    assert isinstance(results[1], ValueError)
+
+
+async def test_runner_failure_and_cancelled_leader():
+    lanes = KeyedLanes("test", enabled=True)
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def blocking_runner(key, items):
+        await release.wait()
+        return items
+
+    async def slow_runner(key, items):
+        started.set()
+        await asyncio.sleep(10)
+        return items
+
+    blocker = asyncio.create_task(lanes.submit("k", 0, blocking_runner))
+    await asyncio.sleep(0)
+    leader = asyncio.create_task(lanes.submit("k", 1, slow_runner))
+    follower = asyncio.create_task(lanes.submit("k", 2, slow_runner))
+    await asyncio.sleep(0)
+    release.set()
+    assert await blocker == 0
+    await started.wait()
+    leader.cancel()
+
+    # Follower liderin batch'indeydi: iptali değil RuntimeError görür
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    with pytest.raises(RuntimeError):
+        await follower
+
+    async def failing_runner(key, items):
+        raise ConnectionError("db down")
+
+    with pytest.raises(ConnectionError):
+        await lanes.submit("k", 3, failing_runner)
+    assert lanes._lanes == {}
+
+
+async def test_hold_and_disabled_passthrough():
+    lanes = KeyedLanes("test", enabled=True)
+    order: list[str] = []
+
+    async def worker(name):
+        async with lanes.hold("u1"):
+            order.append(f"{name}+")
+            await asyncio.sleep(0.001)
+            order.append(f"{name}-")
+
+    await asyncio.gather(worker("a"), worker("b"))
+    assert order == ["a+", "a-", "b+", "b-"]
+    assert lanes.stats()["contended"] == 1 and lanes._lanes == {}
+
+    disabled = KeyedLanes("off", enabled=False)
+    calls: list[list] = []
+
+    async def runner(key, items):
+        calls.append(items)
+        return items
+
+    assert await asyncio.gather(*(disabled.submit("k", i, runner) for i in range(3))) == [0, 1, 2]
+    assert calls == [[0], [1], [2]]
@@ -0,0 +1,35 @@
+"""
+Stage Timing Metrics Tests
+"""
+import pytest
+
+from app.core.metrics import get_timing_stats, observe, reset_timing_stats, timed
+
+
+def test_timings_aggregate_per_stage():
+    reset_timing_stats()
+    for ms in (1, 2, 3, 100):
+        observe("telegram_submit.wallet_credit", ms / 1000)
+    observe("quest_complete.commit", 0.005)
+
+    stats = get_timing_stats("telegram_submit.")
+
+    assert list(stats) == ["telegram_submit.wallet_credit"]
+    wallet = stats["telegram_submit.wallet_credit"]
+    assert wallet["count"] == 4
+    assert wallet["p50_ms"] == 2.0
+    assert wallet["max_ms"] == 100.0
+    assert wallet["mean_ms"] == 26.5
+
+
+def test_timed_records_failures():
+    reset_timing_stats()
+    with pytest.raises(RuntimeError):
+        with timed("telegram_submit.commit"):
+            raise RuntimeError("boom")
+    with timed("telegram_submit.commit"):
+        pass
+
+    stats = get_timing_stats()["telegram_submit.commit"]
+    assert stats["count"] == 2
+    assert stats["errors"] == 1
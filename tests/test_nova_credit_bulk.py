@@ -0,0 +1,166 @@
+"""
+NovaCredit Bulk Ingestion Tests
+process_events_bulk, event'lerin process_event ile tek tek işlenmesiyle
+aynı CitizenScore / ScoreChange satırlarını yazmalı (Postgres gerekir).
+"""
+import random
+
+from sqlmodel import select
+
+from app.identity.models import User
+from app.nova_credit.models import CitizenScore, CreditTier, ScoreChange
+from app.nova_credit.rules import CREDIT_DEFAULT, EVENT_TYPE_MAPPINGS
+from app.nova_credit.schemas import BehaviorEvent
+from app.nova_credit.service import NovaCreditService
+
+# Zaman damgaları iki yolda farklı; geri kalan her kolon aynı olmalı
+SCORE_COLUMNS = (
+    "nova_credit",
+    "tier",
+    "risk_score",
+    "reputation_score",
+    "total_positive_events",
+    "total_negative_events",
+    "total_events",
+    "positive_streak",
+    "negative_streak",
+    "volatility",
+)
+CHANGE_COLUMNS = (
+    "event_type",
+    "delta",
+    "old_score",
+    "new_score",
+    "category",
+    "reason",
+    "source_app",
+    "weight_applied",
+    "base_delta",
+    "context",
+)
+
+
+def new_score(user_id: int, **overrides) -> CitizenScore:
+    fields = {
+        "user_id": user_id,
+        "nova_credit": CREDIT_DEFAULT,
+        "tier": CreditTier.SOLID,
+        "risk_score": 0.0,
+        "reputation_score": 0.5,
+        "total_positive_events": 0,
+        "total_negative_events": 0,
+        "total_events": 0,
+        "positive_streak": 0,
+        "negative_streak": 0,
+    }
+    fields.update(overrides)
+    return CitizenScore(**fields)
+
+
+def make_events(n: int, actors: list[int], seed: int, prefix: str) -> list[BehaviorEvent]:
+    rng = random.Random(seed)
+    event_types = list(EVENT_TYPE_MAPPINGS)
+    events = []
+    for i in range(n):
+        event_type = rng.choice(event_types)
+        category, base_delta = EVENT_TYPE_MAPPINGS[event_type]
+        events.append(BehaviorEvent(
+            event_id=f"{prefix}-{i}",
+            actor_id=rng.choice(actors),
+            event_type=event_type,
+            category=category,
+            base_delta=base_delta,
+            source_app="system",
+            context={"i": i},
+        ))
+    return events
+
+
+async def seed_citizens(session_factory, label: str) -> list[int]:
+    """12 kullanıcı; ilk 8'inin skor satırı var (streak eşikleri, clamp sınırları), son 4'ü yeni."""
+    async with session_factory() as session:
+        users = [User(username=f"credit_{label}_{i}") for i in range(12)]
+        session.add_all(users)
+        await session.flush()
+        user_ids = [user.id for user in users]
+
+        initial = [
+            new_score(user_ids[0], nova_credit=995, positive_streak=6),
+            new_score(user_ids[1], nova_credit=3, tier=CreditTier.GHOST, negative_streak=4),
+        ]
+        for i in range(2, 8):
+            credit = random.Random(i).randint(0, 1000)
+            initial.append(new_score(user_ids[i], nova_credit=credit))
+        session.add_all(initial)
+        await session.commit()
+        return user_ids
+
+
+async def persisted(session_factory, user_ids: list[int]) -> tuple[list[dict], list[list[tuple]]]:
+    """Kullanıcı sırasıyla skor satırları ve (id sıralı) ScoreChange'leri."""
+    async with session_factory() as session:
+        scores = {
+            score.user_id: score
+            for score in (await session.execute(
+                select(CitizenScore).where(CitizenScore.user_id.in_(user_ids))
+            )).scalars()
+        }
+        changes = (await session.execute(
+            select(ScoreChange).where(ScoreChange.user_id.in_(user_ids)).order_by(ScoreChange.id)
+        )).scalars().all()
+
+    score_rows = [{name: getattr(scores[u], name) for name in SCORE_COLUMNS} for u in user_ids]
+    change_rows = [
+        [
+            (change.event_id.split("-", 1)[1], *(getattr(change, name) for name in CHANGE_COLUMNS))
+            for change in changes
+            if change.user_id == user_id
+        ]
+        for user_id in user_ids
+    ]
+    return score_rows, change_rows
+
+
+async def test_bulk_ingestion_matches_process_event(pg_session_factory):
+    sequential_users = await seed_citizens(pg_session_factory, "seq")
+    bulk_users = await seed_citizens(pg_session_factory, "bulk")
+    actors = list(range(12))
+    sequential_events = [
+        event.model_copy(update={"actor_id": sequential_users[event.actor_id]})
+        for event in make_events(1_500, actors, seed=7, prefix="seq")
+    ]
+    bulk_events = [
+        event.model_copy(update={"actor_id": bulk_users[event.actor_id]})
+        for event in make_events(1_500, actors, seed=7, prefix="bulk")
+    ]
+
+    sequential_results = []
+    async with pg_session_factory() as session:
+        service = NovaCreditService(session)
+        for event in sequential_events:
+            sequential_results.append(await service.process_event(event))
+            await session.commit()
+
+    bulk_results = []
+    for start in range(0, len(bulk_events), 250):
+        async with pg_session_factory() as session:
+            bulk_results.extend(
+                await NovaCreditService(session).process_events_bulk(bulk_events[start:start + 250])
+            )
+            await session.commit()
+
+    def comparable(result):
+        return result.model_dump(exclude={"user_id"})
+
+    assert [comparable(r) for r in bulk_results] == [comparable(r) for r in sequential_results]
+
+    expected_scores, expected_changes = await persisted(pg_session_factory, sequential_users)
+    scores, changes = await persisted(pg_session_factory, bulk_users)
+    assert scores == expected_scores
+    assert changes == expected_changes
+
+    # Streak, clamp ve tier geçişleri gerçekten denendi; yeni kullanıcılara satır açıldı
+    assert all(0 <= row["nova_credit"] <= 1000 for row in scores)
+    assert any(r.tier_changed for r in bulk_results)
+    assert sum(len(rows) for rows in changes) == len(bulk_events)
+    assert all(changes[i] for i in range(8, 12))
@@ -0,0 +1,107 @@
+"""
+Keyset Pagination Tests
+app.core.pagination cursor'ları ve (created_at, id) tie-break'i, SQLite üzerinde.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, select
+
+from app.core.pagination import apply_keyset, decode_cursor, encode_cursor, next_cursor
+
+metadata = MetaData()
+history = Table(
+    "history",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime, nullable=False),
+)
+flows = Table(
+    "flows",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("ts", DateTime, nullable=False),
+)
+
+T0 = datetime(2025, 12, 3, 12, 0, 0, 123456)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(T0, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (T0, "42")
+    assert decode_cursor(encode_cursor(T0, "a|b")) == (T0, "a|b")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor(T0, 1)[:-3] + "!!"])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_non_integer_id_rejected_for_integer_column():
+    with pytest.raises(HTTPException) as exc_info:
+        apply_keyset(select(history), history.c.created_at, history.c.id, encode_cursor(T0, "x"), 1, 10)
+    assert exc_info.value.status_code == 400
+
+
+def walk(conn, table, ts_column, per_page: int) -> list:
+    """Cursor'ları takip ederek tüm satırları sayfa sayfa oku."""
+    ts_attr = ts_column.name
+    seen, after = [], None
+    while True:
+        query = apply_keyset(select(table), ts_column, table.c.id, after, page=1, per_page=per_page)
+        rows = conn.execute(query).all()
+        seen.extend(row.id for row in rows)
+        after = next_cursor(rows, per_page, ts_attr=ts_attr)
+        if after is None:
+            return seen
+
+
+@pytest.mark.parametrize("per_page", [1, 2, 3, 7])
+def test_keyset_breaks_created_at_ties_by_id(per_page):
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    # 3 satır aynı created_at'te, sayfa sınırları bu grubun ortasına denk gelir
+    rows = [
+        (1, T0), (2, T0 + timedelta(seconds=1)), (3, T0), (4, T0), (5, T0 + timedelta(seconds=1)),
+        (6, T0 - timedelta(seconds=1)),
+    ]
+    with engine.begin() as conn:
+        conn.execute(history.insert(), [{"id": i, "created_at": ts} for i, ts in rows])
+        seen = walk(conn, history, history.c.created_at, per_page)
+
+    assert seen == [5, 2, 4, 3, 1, 6]
+
+
+def test_keyset_with_string_ids():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(flows.insert(), [{"id": i, "ts": T0} for i in ("a", "c", "b")])
+        seen = walk(conn, flows, flows.c.ts, per_page=2)
+
+    assert seen == ["c", "b", "a"]
+
+
+def test_offset_fallback_without_cursor():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(history.insert(), [{"id": i, "created_at": T0} for i in range(1, 6)])
+        page_2 = conn.execute(
+            apply_keyset(select(history), history.c.created_at, history.c.id, None, page=2, per_page=2)
+        ).all()
+
+    assert [row.id for row in page_2] == [3, 2]
+
+
+def test_next_cursor_stops_on_short_page():
+    class Item:
+        def __init__(self, row_id):
+            self.id, self.created_at = row_id, T0
+
+    assert next_cursor([Item(1)], per_page=2) is None
+    assert decode_cursor(next_cursor([Item(3), Item(2)], per_page=2)) == (T0, "2")
@@ -0,0 +1,141 @@
+"""
+NCR Price Cache Tests
+"""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.agency.services.revenue_share_service import DEFAULT_NCR_PRICE_TRY, RevenueShareService
+from app.core.config import settings
+from app.wallet import price_cache
+from app.wallet.models import NCRMarketState
+from app.wallet.price_cache import NCRPriceCache
+
+
+@pytest.fixture
+async def market_db(tmp_path):
+    """Sadece ncr_market_state'li SQLite; (session_factory, çalışan SQL listesi)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'price.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[NCRMarketState.__table__])
+
+    statements: list[str] = []
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _on_execute)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), statements
+    await engine.dispose()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """price_cache'in gördüğü monotonic saat."""
+    now = [1_000.0]
+    monkeypatch.setattr(price_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+async def write_state(session_factory, row_id: int, price: float, version: int) -> None:
+    """Başka bir process'in update_ncr_price'ı gibi satırı doğrudan yaz."""
+    async with session_factory() as session:
+        await session.execute(
+            text(
+                "INSERT INTO ncr_market_state (id, current_price_try, last_price_try, ema_coverage, "
+                "ema_flow_index, version, last_updated_at) "
+                "VALUES (:id, :price, :price, 1.0, 0.0, :version, '2025-12-03 12:00:00') "
+                "ON CONFLICT (id) DO UPDATE SET current_price_try = :price, version = :version"
+            ),
+            {"id": row_id, "price": price, "version": version},
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_pushed_price_served_without_db():
+    cache = NCRPriceCache()
+    cache.set(1.25, version=3)
+
+    # TTL içinde session'a hiç dokunulmaz
+    assert await cache.get(session=None) == 1.25
+    cache.set(1.31, version=4)
+    assert await cache.get(session=None) == 1.31
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["version"]) == (2, 0, 4)
+
+
+async def test_ttl_expiry_revalidates_and_reloads_on_version_bump(market_db, clock):
+    session_factory, statements = market_db
+    await write_state(session_factory, 1, 1.40, version=7)
+    cache = NCRPriceCache()
+
+    async with session_factory() as session:
+        assert await cache.get(session) == 1.40
+        statements.clear()
+
+        # TTL içinde: sorgu yok
+        clock[0] += settings.NCR_PRICE_CACHE_TTL_SECONDS - 1
+        assert await cache.get(session) == 1.40
+        assert statements == []
+
+    # TTL doldu, version aynı: sadece version-check, fiyat yeniden yüklenmez
+    clock[0] += 2
+    async with session_factory() as session:
+        assert await cache.get(session) == 1.40
+    assert len(statements) == 1 and "current_price_try" not in statements[0]
+
+    # Başka process version'ı artırdı: TTL içinde eski fiyat, sonra reload
+    await write_state(session_factory, 1, 1.55, version=8)
+    statements.clear()
+    async with session_factory() as session:
+        assert await cache.get(session) == 1.40
+        clock[0] += settings.NCR_PRICE_CACHE_TTL_SECONDS
+        assert await cache.get(session) == 1.55
+    assert len(statements) == 2
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["version_checks"], stats["version"]) == (2, 2, 8)
+
+
+async def test_cold_start_without_market_state_does_not_write(market_db, clock):
+    session_factory, statements = market_db
+    cache = NCRPriceCache()
+
+    async with session_factory() as session:
+        assert await cache.get(session) == settings.NCR_BASE_PRICE_TRY
+        assert await cache.get_market_price(session) is None
+        assert not session.new and not session.dirty
+
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+    async with session_factory() as session:
+        count = await session.execute(text("SELECT count(*) FROM ncr_market_state"))
+        assert count.scalar_one() == 0
+
+    # İlk satır yazılınca version -1 → 0 değişimi reload tetikler
+    await write_state(session_factory, 1, 1.10, version=0)
+    clock[0] += settings.NCR_PRICE_CACHE_TTL_SECONDS
+    async with session_factory() as session:
+        assert await cache.get(session) == 1.10
+
+
+async def test_revenue_share_price_fallback_and_row(market_db, monkeypatch):
+    session_factory, _ = market_db
+    monkeypatch.setattr(price_cache, "ncr_price_cache", NCRPriceCache())
+    monkeypatch.setattr(settings, "NCR_BASE_PRICE_TRY", 2.5)
+
+    async with session_factory() as session:
+        # Satır yok: NCR_BASE_PRICE_TRY değil, servisin kendi varsayılanı
+        assert await RevenueShareService(session).get_ncr_price_try() == DEFAULT_NCR_PRICE_TRY
+
+    # update_ncr_price'ın yazdığı satır (en küçük id) okunur
+    await write_state(session_factory, 1, 1.75, version=1)
+    await write_state(session_factory, 2, 9.99, version=1)
+    price_cache.invalidate_ncr_price_cache()
+    async with session_factory() as session:
+        assert await RevenueShareService(session).get_ncr_price_try() == Decimal("1.75")
@@ -0,0 +1,150 @@
+"""
+Proof Fingerprint Tests
+proof_fingerprints üzerinden exact duplicate-proof tespiti ve retention
+sweeper'ı (Postgres gerekir: ON CONFLICT, DELETE ... IN (SELECT ... LIMIT)).
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+from sqlmodel import select
+
+from app.abuse.config import DUPLICATE_PROOF_WINDOW_DAYS
+from app.abuse.models import AbuseEvent, AbuseEventType, ProofFingerprint, ProofSignature
+from app.abuse.retention import sweep_proof_fingerprints
+from app.abuse.service import AbuseGuard
+from app.identity.models import User
+
+PROOF_HASH = "a" * 64
+
+
+async def seed_users(session_factory, count: int) -> list[int]:
+    async with session_factory() as session:
+        users = [User(username=f"farmer_{n}") for n in range(count)]
+        session.add_all(users)
+        await session.commit()
+        return [user.id for user in users]
+
+
+async def add_fingerprint(session_factory, user_id: int, days_ago: float, proof_hash: str = PROOF_HASH) -> None:
+    """Fingerprint'i `days_ago` gün önce kullanılmış gibi yaz."""
+    async with session_factory() as session:
+        await session.execute(
+            text(
+                "INSERT INTO proof_fingerprints (proof_hash, user_id, created_at) "
+                "VALUES (:proof_hash, :user_id, :created_at)"
+            ),
+            {
+                "proof_hash": proof_hash,
+                "user_id": user_id,
+                "created_at": datetime.utcnow() - timedelta(days=days_ago),
+            },
+        )
+        await session.commit()
+
+
+async def check(session_factory, user_id: int) -> tuple[bool, dict | None]:
+    """check_duplicate_proof sonucu + kaydedilen DUPLICATE_PROOF event'inin meta'sı."""
+    async with session_factory() as session:
+        duplicate = await AbuseGuard(session).check_duplicate_proof(user_id, "daily_share", PROOF_HASH)
+        event = (await session.execute(
+            select(AbuseEvent)
+            .where(AbuseEvent.user_id == user_id, AbuseEvent.event_type == AbuseEventType.DUPLICATE_PROOF)
+            .order_by(AbuseEvent.id.desc())
+            .limit(1)
+        )).scalar_one_or_none()
+        return duplicate, event.meta if event else None
+
+
+async def test_same_user_match_wins_over_older_cross_user_match(pg_session_factory):
+    first, second, third = await seed_users(pg_session_factory, 3)
+    await add_fingerprint(pg_session_factory, second, days_ago=5)
+    await add_fingerprint(pg_session_factory, first, days_ago=2)
+    await add_fingerprint(pg_session_factory, third, days_ago=1)
+
+    # Kendi kaydı varsa başka hesapların daha eski kayıtlarına rağmen o döner
+    assert await check(pg_session_factory, first) == (True, {
+        "task_id": "daily_share",
+        "previous_submission_id": None,
+        "proof_hash": PROOF_HASH,
+        "scope": "same_user",
+    })
+
+
+async def test_cross_user_match_returns_oldest_other_account(pg_session_factory):
+    first, second, third, newcomer = await seed_users(pg_session_factory, 4)
+    await add_fingerprint(pg_session_factory, first, days_ago=1)
+    await add_fingerprint(pg_session_factory, second, days_ago=5)
+    await add_fingerprint(pg_session_factory, third, days_ago=3)
+
+    duplicate, meta = await check(pg_session_factory, newcomer)
+    assert duplicate
+    assert (meta["scope"], meta["previous_user_id"]) == ("cross_user", second)
+
+
+async def test_window_cutoff(pg_session_factory):
+    owner, other = await seed_users(pg_session_factory, 2)
+    await add_fingerprint(pg_session_factory, owner, days_ago=DUPLICATE_PROOF_WINDOW_DAYS + 1)
+    assert await check(pg_session_factory, other) == (False, None)
+
+    await add_fingerprint(pg_session_factory, owner, days_ago=DUPLICATE_PROOF_WINDOW_DAYS - 1, proof_hash="b" * 64)
+    async with pg_session_factory() as session:
+        assert await AbuseGuard(session).check_duplicate_proof(other, "daily_share", "b" * 64)
+
+
+async def test_record_keeps_first_use(pg_session_factory):
+    (user_id,) = await seed_users(pg_session_factory, 1)
+    await add_fingerprint(pg_session_factory, user_id, days_ago=10)
+
+    async with pg_session_factory() as session:
+        guard = AbuseGuard(session)
+        await guard.record_proof_fingerprint(user_id, None, PROOF_HASH)
+        await guard.record_proof_fingerprint(user_id, None, None)  # proof yok: no-op
+        await session.commit()
+
+        rows = (await session.execute(
+            select(ProofFingerprint).where(ProofFingerprint.user_id == user_id)
+        )).scalars().all()
+
+    # ON CONFLICT DO NOTHING: ilk kullanımın zamanı korunur
+    assert len(rows) == 1
+    assert datetime.utcnow() - rows[0].created_at > timedelta(days=9)
+
+
+async def test_sweeper_deletes_expired_rows_in_chunks(pg_session_factory):
+    (user_id,) = await seed_users(pg_session_factory, 1)
+    expired = DUPLICATE_PROOF_WINDOW_DAYS + 1
+    for n in range(7):
+        await add_fingerprint(pg_session_factory, user_id, days_ago=expired, proof_hash=f"{n:064d}")
+    for n in range(2):
+        await add_fingerprint(pg_session_factory, user_id, days_ago=1, proof_hash=f"fresh{n:059d}")
+    async with pg_session_factory() as session:
+        for days_ago in (expired, expired, expired, 1):
+            await session.execute(
+                text(
+                    "INSERT INTO proof_signatures (user_id, source, signature, created_at) "
+                    "VALUES (:user_id, 'quest', :signature, :created_at)"
+                ),
+                {
+                    "user_id": user_id,
+                    "signature": bytes(64),
+                    "created_at": datetime.utcnow() - timedelta(days=days_ago),
+                },
+            )
+        await session.commit()
+
+    async with pg_session_factory() as session:
+        result = await sweep_proof_fingerprints(session, chunk_size=3)
+
+    # fingerprints: 3 + 3 + 1; signatures: 3 + 0 (tam chunk sonrası boş chunk ile biter)
+    assert (result["fingerprints"], result["signatures"], result["chunks"]) == (7, 3, 5)
+
+    async with pg_session_factory() as session:
+        remaining = [
+            (await session.execute(select(func.count()).select_from(model))).scalar_one()
+            for model in (ProofFingerprint, ProofSignature)
+        ]
+        assert remaining == [2, 1]
+
+        # Silinecek satır kalmadı: tablo başına tek boş chunk
+        again = await sweep_proof_fingerprints(session, chunk_size=3)
+    assert (again["fingerprints"], again["signatures"], again["chunks"]) == (0, 0, 2)
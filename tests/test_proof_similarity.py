@@ -0,0 +1,64 @@
+"""
+Near-duplicate Proof Index Tests
+"""
+from datetime import datetime, timedelta
+
+from app.abuse.similarity import (
+    ProofSimilarityIndex,
+    proof_signature,
+    signature_from_bytes,
+    signature_similarity,
+    signature_to_bytes,
+)
+
+PROOF = (
+    "Bugün NasipQuest kanalında görevi paylaştım, üç arkadaşımı davet ettim "
+    "ve topluluk sohbetine katılıp yeni gelenlere rehberlik yaptım."
+)
+EDITED = (
+    "bugün nasipquest kanalında görevi paylaştım!! dört arkadaşımı davet ettim "
+    "ve topluluk sohbetine katılıp yeni gelenlere rehberlik yaptım"
+)
+OTHER = (
+    "Akşam yürüyüşünde çektiğim fotoğrafları mahalle grubuyla paylaştım, "
+    "parktaki çöpleri toplamak için gönüllü listesi oluşturduk."
+)
+
+
+def test_signature_tracks_text_similarity():
+    original, edited, other = proof_signature(PROOF), proof_signature(EDITED), proof_signature(OTHER)
+
+    assert signature_similarity(original, original) == 1.0
+    assert signature_similarity(original, edited) >= 0.75
+    assert signature_similarity(original, other) < 0.3
+    assert proof_signature("tamam, yaptım") is None
+    assert signature_from_bytes(signature_to_bytes(original)) == original
+
+
+def test_index_finds_near_duplicate_across_users():
+    index = ProofSimilarityIndex(capacity=16)
+    now = datetime.utcnow()
+    index.add(proof_signature(PROOF), user_id=1, source="quest", ref_id=10, created_at=now)
+    index.add(proof_signature(OTHER), user_id=2, source="quest", ref_id=11, created_at=now)
+
+    match = index.query(proof_signature(EDITED), 0.75, since=now - timedelta(days=30))
+
+    assert match is not None
+    assert (match.user_id, match.source, match.ref_id) == (1, "quest", 10)
+    assert match.similarity >= 0.75
+    # Resubmitting to the same record is not a duplicate
+    assert index.query(proof_signature(EDITED), 0.75, exclude=(1, "quest", 10)) is None
+    # Entries outside the window are ignored
+    assert index.query(proof_signature(EDITED), 0.75, since=now + timedelta(seconds=1)) is None
+
+
+def test_index_evicts_oldest_when_full():
+    index = ProofSimilarityIndex(capacity=4)
+    now = datetime.utcnow()
+    index.add(proof_signature(PROOF), user_id=1, source="quest", ref_id=1, created_at=now)
+    for i in range(4):
+        text = f"{OTHER} ek not numarası {i} ile farklı bir kapanış cümlesi {i * 7919}"
+        index.add(proof_signature(text), user_id=2, source="quest", ref_id=100 + i, created_at=now)
+
+    assert len(index) == 4
+    assert index.query(proof_signature(EDITED), 0.75) is None
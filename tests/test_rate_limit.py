@@ -0,0 +1,133 @@
+"""
+NovaCore Rate Limiter Tests
+"""
+import pytest
+
+from app.core import rate_limit as rl
+from app.core.rate_limit import MemoryRateLimiter, RateLimit, RedisRateLimiter
+
+LIMIT = RateLimit("test_limit", limit=3, window_seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_memory_acquire_enforces_limit():
+    limiter = MemoryRateLimiter()
+
+    results = [await limiter.acquire("user-1", LIMIT) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert 0 < results[3].retry_after <= LIMIT.window_seconds
+    # Other keys are independent
+    assert (await limiter.acquire("user-2", LIMIT)).allowed
+
+
+@pytest.mark.asyncio
+async def test_memory_window_slides(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rl.time, "monotonic", lambda: now[0])
+    limiter = MemoryRateLimiter()
+
+    for _ in range(3):
+        assert (await limiter.acquire("user-1", LIMIT)).allowed
+    assert not (await limiter.acquire("user-1", LIMIT)).allowed
+
+    now[0] += LIMIT.window_seconds + 1
+    assert (await limiter.acquire("user-1", LIMIT)).allowed
+
+    # Idle keys are swept
+    now[0] += 10 * LIMIT.window_seconds
+    await limiter.acquire("user-2", LIMIT)
+    assert limiter.stats()["keys"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_record_saturates_at_limit():
+    limiter = MemoryRateLimiter()
+
+    counts = [await limiter.record("user-1", LIMIT) for _ in range(5)]
+
+    assert counts == [1, 2, 3, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_redis_acquire_enforces_limit():
+    fakeredis = pytest.importorskip("fakeredis")
+    limiter = RedisRateLimiter(client=fakeredis.FakeAsyncRedis())
+
+    results = [await limiter.acquire("user-1", LIMIT) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[3].retry_after > 0
+    assert (await limiter.record("user-2", LIMIT)) == 1
+
+    await limiter.reset("user-1", LIMIT)
+    assert (await limiter.acquire("user-1", LIMIT)).allowed
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_refund_releases_slot():
+    limiter = MemoryRateLimiter()
+
+    results = [await limiter.acquire("user-1", LIMIT) for _ in range(3)]
+    assert not (await limiter.acquire("user-1", LIMIT)).allowed
+
+    await limiter.refund("user-1", LIMIT, results[1])
+    assert (await limiter.acquire("user-1", LIMIT)).allowed
+    assert not (await limiter.acquire("user-1", LIMIT)).allowed
+
+
+@pytest.mark.asyncio
+async def test_redis_refund_releases_slot():
+    fakeredis = pytest.importorskip("fakeredis")
+    limiter = RedisRateLimiter(client=fakeredis.FakeAsyncRedis())
+
+    results = [await limiter.acquire("user-1", LIMIT) for _ in range(3)]
+    await limiter.refund("user-1", LIMIT, results[0])
+    assert (await limiter.acquire("user-1", LIMIT)).allowed
+    assert not (await limiter.acquire("user-1", LIMIT)).allowed
+    await limiter.close()
+
+
+def test_backend_defaults_to_redis_outside_dev(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", None)
+    for env, backend in (("dev", "memory"), ("staging", "redis"), ("prod", "redis")):
+        monkeypatch.setattr(settings, "ENV", env)
+        assert settings.rate_limit_backend == backend
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "memory")
+    assert settings.rate_limit_backend == "memory"
+
+
+@pytest.mark.asyncio
+async def test_dependency_counts_only_successful_requests():
+    from fastapi import Depends, FastAPI, HTTPException
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.security import get_current_user
+    from app.identity.models import User
+
+    app = FastAPI()
+    app.dependency_overrides[get_current_user] = lambda: User(id=7, username="limited")
+
+    @app.post("/events", dependencies=[Depends(rl.rate_limit_user(LIMIT))])
+    async def track(fail: bool = False):
+        if fail:
+            raise HTTPException(status_code=400, detail="bad event")
+        return {"ok": True}
+
+    limiter = MemoryRateLimiter()
+    rl.set_rate_limiter(limiter)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            # Başarısız istekler limiti tüketmez
+            for _ in range(5):
+                assert (await client.post("/events", params={"fail": True})).status_code == 400
+            statuses = [(await client.post("/events")).status_code for _ in range(4)]
+    finally:
+        rl.set_rate_limiter(None)
+
+    assert statuses == [200, 200, 200, 429]
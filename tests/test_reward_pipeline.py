@@ -0,0 +1,121 @@
+"""
+Task Reward Pipeline Tests
+TaskRewardPipeline'ın submission + abuse + XP + treasury + ledger + TaskReward
+yazılarını tek commit'te yapması (Postgres gerekir: treasury / ledger CTE'leri).
+"""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.abuse.models import AbuseEvent, AbuseEventType
+from app.abuse.service import AbuseGuard
+from app.identity.models import User
+from app.telegram_gateway.reward_pipeline import TaskRewardPipeline
+from app.telegram_gateway.task_models import SubmissionStatus, Task, TaskReward, TaskSubmission
+from app.wallet.models import Account, DailyTreasuryStat, LedgerEntry
+from app.xp_loyalty.models import UserLoyalty
+
+
+@pytest.fixture
+async def user_id(pg_session_factory) -> int:
+    """Görev + 40 NCR bakiyeli kullanıcı."""
+    async with pg_session_factory() as session:
+        session.add(Task(id="daily_share", title="Daily share", category="daily",
+                         reward_xp=50, reward_ncr="10"))
+        user = User(username="farmer")
+        session.add(user)
+        await session.flush()
+        session.add(Account(user_id=user.id, token="NCR", balance=Decimal("40")))
+        await session.commit()
+        return user.id
+
+
+@pytest.fixture
+def no_curate(monkeypatch):
+    """Curator commit sonrası best-effort çalışır; pipeline commit'ine dahil değil."""
+
+    async def _curate(self, ctx):
+        return None
+
+    monkeypatch.setattr(TaskRewardPipeline, "_curate", _curate)
+
+
+async def submit(session, user_id: int) -> tuple[TaskRewardPipeline, TaskSubmission]:
+    """Router'daki gibi: submission flush + abuse yazısı, commit yok."""
+    guard = AbuseGuard(session, unit_of_work=True)
+    submission = TaskSubmission(user_id=user_id, task_id="daily_share", status=SubmissionStatus.APPROVED)
+    session.add(submission)
+    await session.flush()
+    await guard.register_event(user_id, AbuseEventType.TOO_FAST_COMPLETION)
+    return TaskRewardPipeline(session, guard), submission
+
+
+async def count_rows(session, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def test_pipeline_commits_once_and_returns_returning_values(
+    pg_session_factory, user_id, no_curate, count_commits, count_queries
+):
+    async with pg_session_factory() as session:
+        with count_commits() as commits, count_queries() as queries:
+            pipeline, submission = await submit(session, user_id)
+            task = await session.get(Task, "daily_share")
+            result = await pipeline.run(user_id, task, submission)
+
+    assert len(commits) == 1
+    assert result.total_ncr > 0
+
+    # Bakiye ve XP toplamı yazılardan gelir; ledger INSERT'ünden sonra yeniden okuma yok
+    ledger_at = next(i for i, sql in enumerate(queries.statements) if "INSERT INTO ledger_entries" in sql)
+    rereads = [
+        sql for sql in queries.statements[ledger_at + 1:]
+        if sql.lstrip().upper().startswith("SELECT") and ("accounts" in sql or "user_loyalty" in sql)
+    ]
+    assert rereads == []
+
+    async with pg_session_factory() as session:
+        account = (await session.execute(select(Account).where(Account.user_id == user_id))).scalar_one()
+        loyalty = (await session.execute(
+            select(UserLoyalty).where(UserLoyalty.user_id == user_id)
+        )).scalar_one()
+        entry = (await session.execute(select(LedgerEntry).where(LedgerEntry.user_id == user_id))).scalar_one()
+        reward = (await session.execute(select(TaskReward))).scalar_one()
+        stored = await session.get(TaskSubmission, submission.id)
+
+    assert result.new_balance == account.balance == entry.balance_after == Decimal("40") + result.total_ncr
+    assert result.new_xp_total == loyalty.xp_total == result.total_xp
+    assert (reward.wallet_tx_id, reward.xp_amount) == (entry.id, result.total_xp)
+    assert stored.status == SubmissionStatus.REWARDED
+
+
+@pytest.mark.parametrize("stage", ["treasury_cap", "wallet_credit", "reward_record"])
+async def test_failing_stage_rolls_back_everything(pg_session_factory, user_id, no_curate, monkeypatch, stage):
+    original = getattr(TaskRewardPipeline, f"_stage_{stage}")
+
+    async def failing(self, ctx):
+        # Adımın yazıları session'a girdikten sonra hata
+        await original(self, ctx)
+        raise RuntimeError(f"{stage} failed")
+
+    monkeypatch.setattr(TaskRewardPipeline, f"_stage_{stage}", failing)
+
+    async with pg_session_factory() as session:
+        pipeline, submission = await submit(session, user_id)
+        task = await session.get(Task, "daily_share")
+        with pytest.raises(RuntimeError):
+            await pipeline.run(user_id, task, submission)
+
+    async with pg_session_factory() as session:
+        counts = {
+            model.__name__: await count_rows(session, model)
+            for model in (TaskSubmission, LedgerEntry, TaskReward, AbuseEvent, UserLoyalty)
+        }
+        account = (await session.execute(select(Account).where(Account.user_id == user_id))).scalar_one()
+        issued = (await session.execute(select(func.coalesce(func.sum(DailyTreasuryStat.issued_ncr), 0)))).scalar_one()
+
+    assert counts == dict.fromkeys(counts, 0)
+    assert account.balance == Decimal("40")
+    assert issued == 0
@@ -0,0 +1,146 @@
+"""
+Risk Score Tests
+AbuseGuard RiskScore delta'larının commit'te tek atomik UPDATE ile yazılması
+(Postgres gerekir: ON CONFLICT, LEAST/GREATEST, UPDATE ... RETURNING).
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, text
+from sqlmodel import select
+
+from app.abuse.config import MAX_RISK_SCORE, MIN_RISK_SCORE
+from app.abuse.models import AbuseEvent, AbuseEventType, UserRiskProfile
+from app.abuse.service import AbuseGuard
+from app.identity.models import User
+
+
+@pytest.fixture
+async def user_id(pg_session_factory) -> int:
+    async with pg_session_factory() as session:
+        user = User(username="farmer")
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def stored_score(session_factory, user_id: int) -> float | None:
+    """Ayrı bir session'dan DB'deki commit'lenmiş skor."""
+    async with session_factory() as session:
+        return (await session.execute(
+            select(UserRiskProfile.risk_score).where(UserRiskProfile.user_id == user_id)
+        )).scalar_one_or_none()
+
+
+async def test_deltas_are_clamped_in_order(pg_session_factory, user_id):
+    async with pg_session_factory() as session:
+        guard = AbuseGuard(session, unit_of_work=True)
+        for delta in (6.0, 7.0, -12.0, 3.0):
+            profile = await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=delta)
+        await session.commit()
+
+    # 6 → 10 (clamp) → 0 (clamp) → 3; toplamı clamp'lemek 4 verirdi
+    assert profile.risk_score == 3.0
+    assert await stored_score(pg_session_factory, user_id) == 3.0
+
+
+@pytest.mark.parametrize("delta, expected", [(25.0, MAX_RISK_SCORE), (-25.0, MIN_RISK_SCORE)])
+async def test_single_delta_is_clamped(pg_session_factory, user_id, delta, expected):
+    async with pg_session_factory() as session:
+        await AbuseGuard(session).register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=delta)
+
+    assert await stored_score(pg_session_factory, user_id) == expected
+
+
+async def test_deltas_are_buffered_until_commit(pg_session_factory, user_id):
+    async with pg_session_factory() as session:
+        guard = AbuseGuard(session, unit_of_work=True)
+        await guard.get_or_create_profile(user_id)
+        await session.commit()
+
+        profile = await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=2.5)
+        await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=1.5)
+
+        # Profil tahmini skoru gösterir ama dirty değildir; DB commit'e kadar değişmez
+        assert profile.risk_score == 4.0
+        assert profile not in session.dirty
+        assert await stored_score(pg_session_factory, user_id) == 0.0
+
+        await session.commit()
+
+    assert await stored_score(pg_session_factory, user_id) == 4.0
+
+
+async def test_returning_value_is_written_back_to_profile(pg_session_factory, user_id):
+    async with pg_session_factory() as session:
+        guard = AbuseGuard(session, unit_of_work=True)
+        profile = await guard.get_or_create_profile(user_id)
+        await session.commit()
+
+        # Başka bir worker aynı anda skoru 4'e çeker; bu session onu görmez
+        async with pg_session_factory() as other:
+            await other.execute(
+                text("UPDATE abuse_user_risk_profiles SET risk_score = 4 WHERE user_id = :user_id"),
+                {"user_id": user_id},
+            )
+            await other.commit()
+
+        await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=1.0)
+        assert profile.risk_score == 1.0
+        await session.commit()
+
+        # Commit'te UPDATE ... RETURNING'in değeri profile yazılır
+        assert profile.risk_score == 5.0
+        assert profile not in session.dirty
+
+
+async def test_one_commit_per_submission(pg_session_factory, user_id, count_commits):
+    async with pg_session_factory() as session:
+        guard = AbuseGuard(session, unit_of_work=True)
+        with count_commits() as commits:
+            # Birden çok heuristic'e takılan tek submission
+            await guard.register_event(user_id, AbuseEventType.TOO_FAST_COMPLETION)
+            await guard.register_event(user_id, AbuseEventType.DUPLICATE_PROOF)
+            await guard.register_event(user_id, AbuseEventType.AUTO_REJECT)
+            assert commits == []
+            await session.commit()
+
+    assert len(commits) == 1
+    async with pg_session_factory() as session:
+        events = (await session.execute(
+            select(func.count()).select_from(AbuseEvent).where(AbuseEvent.user_id == user_id)
+        )).scalar_one()
+    assert events == 3
+
+
+async def test_savepoint_rollback_drops_only_its_delta(pg_session_factory, user_id):
+    async with pg_session_factory() as session:
+        guard = AbuseGuard(session, unit_of_work=True)
+        await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=1.0)
+        with pytest.raises(RuntimeError):
+            async with session.begin_nested():
+                await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=5.0)
+                raise RuntimeError
+        profile = await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=2.0)
+        await session.commit()
+
+    assert profile.risk_score == 3.0
+    assert await stored_score(pg_session_factory, user_id) == 3.0
+
+
+async def test_concurrent_sessions_do_not_lose_updates(pg_session_factory, user_id):
+    async with pg_session_factory() as session:
+        await AbuseGuard(session).get_or_create_profile(user_id)
+
+    async def worker() -> None:
+        async with pg_session_factory() as session:
+            guard = AbuseGuard(session)
+            profile = await guard.get_or_create_profile(user_id)
+            for _ in range(5):
+                await guard.register_event(user_id, AbuseEventType.MANUAL_FLAG, override_delta=0.5)
+                await asyncio.sleep(0)
+            assert profile.risk_score <= 5.0
+
+    # İki session aynı profili 0'dan okur; read-modify-write olsaydı 2.5 kalırdı
+    await asyncio.gather(worker(), worker())
+    assert await stored_score(pg_session_factory, user_id) == 5.0
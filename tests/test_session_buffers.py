@@ -0,0 +1,208 @@
+"""
+Session Buffer Tests
+SAVEPOINT rollback'inde session.info buffer'larının geri alınması;
+micro-batch / lane batch'inde başarısız event'in sayaç delta'ları commit'e
+sızmaz (batch testleri Postgres gerekir: treasury_totals / leaderboard upsert).
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel, select
+
+from app.abuse import similarity
+from app.abuse.models import ProofSignature
+from app.abuse.similarity import proof_signature, signature_to_bytes, track_proof_signature
+from app.core import session_buffers
+from app.core.config import settings
+from app.core.session_buffers import is_savepoint_commit, register_session_buffer
+from app.events.lanes import run_event_batch
+from app.events.queue import enqueue_event
+from app.events.schemas import PokerEvent, PokerEventType
+from app.events.service import EventService
+from app.events.worker import EventQueueWorkerPool, process_queued_event
+from app.identity.models import User
+from app.telegram_gateway.leaderboard import ALL_TIME, get_user_snapshot
+from app.wallet.models import Account
+from app.wallet.treasury_totals import get_treasury_totals, reconcile_treasury_totals
+from app.xp_loyalty.models import UserLoyalty
+
+_TEST_KEY = "test_session_buffer"
+
+
+def track(session: Session, amount: int) -> None:
+    session.info.setdefault(_TEST_KEY, []).append(amount)
+
+
+@pytest.fixture
+def buffered_session(monkeypatch):
+    """Test buffer'ı kayıtlı SQLite session; commit'te yazılan buffer'lar listesi."""
+    monkeypatch.setattr(session_buffers, "_buffers", dict(session_buffers._buffers))
+    register_session_buffer(_TEST_KEY, list)
+    flushed: list[list[int]] = []
+
+    def _flush(session):
+        if not is_savepoint_commit(session):
+            flushed.append(session.info.pop(_TEST_KEY, []))
+
+    event.listen(Session, "before_commit", _flush)
+    session = Session(create_engine("sqlite://"))
+    session.connection()
+    yield session, flushed
+    session.close()
+    event.remove(Session, "before_commit", _flush)
+
+
+def test_savepoint_rollback_restores_buffer(buffered_session):
+    session, flushed = buffered_session
+    track(session, 1)
+
+    with session.begin_nested():
+        track(session, 2)
+    with pytest.raises(ValueError):
+        with session.begin_nested():
+            track(session, 3)
+            with session.begin_nested():
+                track(session, 4)
+            raise ValueError
+    with session.begin_nested():
+        track(session, 5)
+
+    # SAVEPOINT release'leri buffer'ı yazmaz; dış commit hepsini bir kez yazar
+    assert flushed == []
+    session.commit()
+    assert flushed == [[1, 2, 5]]
+
+
+def test_outer_rollback_discards_buffer(buffered_session):
+    session, flushed = buffered_session
+    track(session, 1)
+    session.begin_nested()
+    track(session, 2)
+
+    session.rollback()
+    assert _TEST_KEY not in session.info
+    session.commit()
+    assert flushed == [[]]
+
+
+def test_signatures_from_rolled_back_savepoint_are_not_indexed(monkeypatch):
+    monkeypatch.setattr(settings, "PROOF_SIMILARITY_INDEX_CAPACITY", 16)
+    similarity.reset_proof_similarity_index()
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[ProofSignature.__table__])
+
+    def track_signature(session: Session, ref_id: int, text: str) -> None:
+        signature = proof_signature(text)
+        row = ProofSignature(
+            user_id=7,
+            source="quest",
+            ref_id=ref_id,
+            signature=signature_to_bytes(signature),
+            created_at=datetime.now(timezone.utc),
+        )
+        track_proof_signature(session, row, signature)
+
+    with Session(engine) as session:
+        with pytest.raises(ValueError):
+            with session.begin_nested():
+                track_signature(session, 1, "Kanalda görevi paylaştım ve üç arkadaşımı davet ettim bugün.")
+                raise ValueError
+        with session.begin_nested():
+            track_signature(session, 2, "Parktaki çöpleri toplamak için gönüllü listesi oluşturduk akşam.")
+
+        # SAVEPOINT release'i index'e yazmaz; sadece dış commit
+        assert len(similarity.get_proof_similarity_index()) == 0
+        session.commit()
+
+    index = similarity.get_proof_similarity_index()
+    assert len(index) == 1
+    similarity.reset_proof_similarity_index()
+
+
+# ------ Event queue micro-batch / lane batch (Postgres) ------
+
+@pytest.fixture
+async def players(pg_session_factory) -> list[int]:
+    """Treasury kullanıcısı (id=1) + 100 NCR bakiyeli üç oyuncu."""
+    async with pg_session_factory() as session:
+        session.add(User(username="treasury"))
+        users = [User(username=f"player_{n}") for n in range(3)]
+        session.add_all(users)
+        await session.flush()
+        for user in users:
+            session.add(Account(user_id=user.id, token="NCR", balance=Decimal("100")))
+        await session.commit()
+        return [user.id for user in users]
+
+
+def poker_events(players: list[int]) -> list[PokerEvent]:
+    first, second, third = players
+    return [
+        PokerEvent(event_id="rake-1", event_type=PokerEventType.RAKE, user_id=first,
+                   amount=Decimal("5"), hand_id="h1", table_id="t1"),
+        PokerEvent(event_id="cash-2", event_type=PokerEventType.CASH_OUT, user_id=second,
+                   amount=Decimal("200"), table_id="t1"),
+        PokerEvent(event_id="cash-3", event_type=PokerEventType.CASH_OUT, user_id=third,
+                   amount=Decimal("300"), table_id="t1"),
+    ]
+
+
+async def assert_counters_match_ledger(session_factory, players: list[int], failed: int) -> None:
+    async with session_factory() as session:
+        assert await reconcile_treasury_totals(session) == {}
+        totals = await get_treasury_totals(session)
+        assert totals["rake"] == Decimal("5")
+
+        for user_id in players:
+            snapshot = await get_user_snapshot(session, user_id, ALL_TIME)
+            loyalty = (await session.execute(
+                select(UserLoyalty).where(UserLoyalty.user_id == user_id)
+            )).scalar_one_or_none()
+            assert (snapshot.score if snapshot else None) == (loyalty.xp_total if loyalty else None)
+            if user_id == failed:
+                assert loyalty is None
+
+
+async def test_failed_event_deltas_do_not_leak_into_worker_batch(pg_session_factory, players):
+    events = poker_events(players)
+    async with pg_session_factory() as session:
+        for poker_event in events:
+            await enqueue_event(session, "poker", poker_event)
+        await session.commit()
+
+    async def processor(session, item):
+        # Etkiler (ledger + buffer'lanan sayaç / leaderboard delta'ları) uygulandıktan sonra hata
+        result = await process_queued_event(session, item)
+        if item.event_id == "cash-2":
+            raise RuntimeError("downstream failure")
+        return result
+
+    pool = EventQueueWorkerPool(pg_session_factory, batch_size=10, processor=processor,
+                                retry_base_seconds=60)
+    assert await pool.run_once() == 3
+    assert (pool.processed, pool.retried, pool.failed_batches) == (2, 1, 0)
+
+    await assert_counters_match_ledger(pg_session_factory, players, failed=players[1])
+
+
+async def test_failed_event_deltas_do_not_leak_into_lane_commit(pg_session_factory, players, monkeypatch):
+    handle_poker_event = EventService.handle_poker_event
+
+    async def failing_after_effects(self, event):
+        result = await handle_poker_event(self, event)
+        if event.event_id == "cash-2":
+            raise RuntimeError("downstream failure")
+        return result
+
+    monkeypatch.setattr(EventService, "handle_poker_event", failing_after_effects)
+
+    events = poker_events(players)
+    results = await run_event_batch(
+        ("table", "t1"), [("poker", e) for e in events], session_factory=pg_session_factory
+    )
+    assert [type(r).__name__ for r in results] == ["EventResult", "RuntimeError", "EventResult"]
+
+    await assert_counters_match_ledger(pg_session_factory, players, failed=players[1])
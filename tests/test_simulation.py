@@ -0,0 +1,28 @@
+"""
+Vectorized Economy Simulation Tests
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.config import settings
+from app.economy.simulation import _reserve_one, apply_daily_treasury_cap
+
+
+def test_daily_treasury_cap_matches_serial_reservations():
+    rng = np.random.default_rng(2)
+    requested = np.round(rng.uniform(0.5, 30, 4_000), 2)
+    limit_ncr = 20_000.0  # talep limitin ~3 katı: tüm bandlar + hard cap
+
+    granted, issued = apply_daily_treasury_cap(requested, limit_ncr)
+
+    serial, serial_issued = [], 0.0
+    for amount in requested:
+        g = _reserve_one(float(amount), serial_issued, limit_ncr,
+                         limit_ncr * settings.TREASURY_HARD_CAP_RATIO)
+        serial.append(g)
+        serial_issued += g
+
+    assert granted.tolist() == serial
+    assert issued == pytest.approx(serial_issued)
+    assert issued <= limit_ncr * settings.TREASURY_HARD_CAP_RATIO
@@ -0,0 +1,138 @@
+"""
+Submission Gate Tests
+AbuseGuard'ın tek sorguluk submission gate'i (Postgres gerekir: LATERAL).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.core.rate_limit import MemoryRateLimiter, set_rate_limiter
+from app.identity.models import User
+from app.telegram_gateway.abuse_guard import SUBMISSION_RATE_LIMIT, AbuseGuard
+from app.telegram_gateway.task_cache import invalidate_task_cache
+from app.telegram_gateway.task_models import SubmissionStatus, Task, TaskSubmission
+
+
+async def seed(session_factory, statuses: list[tuple[SubmissionStatus, int]]) -> tuple[int, dict]:
+    """Kullanıcı + task + (status, kaç saniye önce) submission'ları; {status: submitted_at}."""
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        # max_completions_per_user > 1 olan task'larda çift başına birden fazla satır
+        await session.execute(
+            text("ALTER TABLE telegram_task_submissions DROP CONSTRAINT uq_user_task_submission")
+        )
+        user = User(telegram_id=42, username="gate")
+        session.add(user)
+        session.add(Task(
+            id="repeatable",
+            title="Repeatable",
+            category="daily",
+            cooldown_seconds=600,
+            max_completions_per_user=3,
+        ))
+        await session.flush()
+        submitted = {}
+        for status, seconds_ago in statuses:
+            submitted[status] = now - timedelta(seconds=seconds_ago)
+            session.add(TaskSubmission(
+                user_id=user.id,
+                task_id="repeatable",
+                status=status,
+                submitted_at=submitted[status],
+            ))
+        await session.commit()
+        return user.id, submitted
+
+
+@pytest.fixture
+def limiter():
+    """Her test için boş, process içi rate limiter."""
+    limiter = MemoryRateLimiter()
+    set_rate_limiter(limiter)
+    yield limiter
+    set_rate_limiter(None)
+
+
+async def gate_row(session_factory, user_id: int):
+    async with session_factory() as session:
+        result = await session.execute(AbuseGuard._submission_gate_query(user_id, "repeatable", None))
+        return result.one()
+
+
+async def test_gate_prefers_rewarded_row_over_newer_submissions(pg_session_factory, limiter):
+    invalidate_task_cache()
+    user_id, submitted = await seed(pg_session_factory, [
+        (SubmissionStatus.REWARDED, 3_000),
+        (SubmissionStatus.REJECTED, 2_000),
+        (SubmissionStatus.PENDING, 10),
+    ])
+
+    gate = await gate_row(pg_session_factory, user_id)
+    # status ve zaman damgası aynı satırdan
+    assert gate.existing_status == SubmissionStatus.REWARDED
+    assert gate.existing_submitted_at == submitted[SubmissionStatus.REWARDED]
+    assert gate.rewarded_count == 1
+
+    async with pg_session_factory() as session:
+        allowed, reason = await AbuseGuard(session).check_task_submission_allowed(user_id, "repeatable")
+    assert not allowed and "ödül verildi" in reason
+
+
+async def test_gate_uses_latest_submission_for_cooldown(pg_session_factory, limiter):
+    invalidate_task_cache()
+    user_id, submitted = await seed(pg_session_factory, [
+        (SubmissionStatus.REJECTED, 5_000),
+        (SubmissionStatus.PENDING, 30),
+    ])
+
+    gate = await gate_row(pg_session_factory, user_id)
+    assert gate.existing_status == SubmissionStatus.PENDING
+    assert gate.existing_submitted_at == submitted[SubmissionStatus.PENDING]
+    assert gate.rewarded_count == 0
+
+    async with pg_session_factory() as session:
+        allowed, reason = await AbuseGuard(session).check_task_submission_allowed(user_id, "repeatable")
+    assert not allowed and reason.startswith("Cooldown aktif")
+
+
+async def test_gate_without_submissions(pg_session_factory):
+    invalidate_task_cache()
+    user_id, _ = await seed(pg_session_factory, [])
+
+    gate = await gate_row(pg_session_factory, user_id)
+    assert gate.existing_status is None and gate.existing_submitted_at is None
+    assert gate.idempotent_hit is False and gate.rewarded_count == 0
+
+
+async def test_hourly_rate_limit_counts_only_allowed_submissions(pg_session_factory, limiter):
+    invalidate_task_cache()
+    user_id, _ = await seed(pg_session_factory, [])
+    cap = SUBMISSION_RATE_LIMIT.limit
+
+    async with pg_session_factory() as session:
+        guards = [AbuseGuard(session) for _ in range(cap)]
+        for guard in guards:
+            assert await guard.check_task_submission_allowed(user_id, "repeatable") == (True, None)
+
+        allowed, reason = await AbuseGuard(session).check_task_submission_allowed(user_id, "repeatable")
+        assert not allowed and reason.startswith("Rate limit")
+
+        # Yazılamayan submit slot'unu geri verir; reddedilen kontrol slot tüketmez
+        await guards[0].refund_submission_rate_limit()
+        await guards[0].refund_submission_rate_limit()
+        assert (await AbuseGuard(session).check_task_submission_allowed(user_id, "repeatable"))[0]
+        assert not (await AbuseGuard(session).check_task_submission_allowed(user_id, "repeatable"))[0]
+
+
+async def test_rate_limit_is_checked_after_db_gates(pg_session_factory, limiter):
+    invalidate_task_cache()
+    user_id, _ = await seed(pg_session_factory, [(SubmissionStatus.REWARDED, 3_000)])
+
+    async with pg_session_factory() as session:
+        for _ in range(SUBMISSION_RATE_LIMIT.limit + 5):
+            allowed, reason = await AbuseGuard(session).check_task_submission_allowed(user_id, "repeatable")
+            assert not allowed and "ödül verildi" in reason
+
+    # Reddedilen submit'ler saatlik limiti tüketmedi
+    assert (await limiter.acquire(str(user_id), SUBMISSION_RATE_LIMIT)).remaining == SUBMISSION_RATE_LIMIT.limit - 1
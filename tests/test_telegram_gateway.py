@@ -0,0 +1,92 @@
+"""
+NovaCore Telegram Gateway Tests
+(Postgres gerekir: şema SQLite'ın derleyemediği ARRAY kolonları içerir)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.telegram_gateway.user_hydration import hydrate_users, invalidate_user_display
+
+
+@pytest_asyncio.fixture
+async def test_event(pg_session):
+    """Create an active event."""
+    from app.telegram_gateway.event_models import Event, EventStatus, EventType
+
+    event = Event(
+        code="test_event",
+        name="Test Event",
+        event_type=EventType.QUEST_WAR,
+        status=EventStatus.ACTIVE,
+        starts_at=datetime.utcnow() - timedelta(days=1),
+        ends_at=datetime.utcnow() + timedelta(days=1),
+    )
+    pg_session.add(event)
+    await pg_session.commit()
+    await pg_session.refresh(event)
+    return event
+
+
+async def add_participants(session, event, start: int, count: int) -> list[int]:
+    """Create `count` users with Telegram accounts and event participations."""
+    from app.identity.models import User
+    from app.telegram_gateway.event_models import EventParticipation
+    from app.telegram_gateway.models import TelegramAccount
+
+    user_ids = []
+    for i in range(start, start + count):
+        user = User(telegram_id=500_000 + i, username=f"user{i}", display_name=f"User {i}")
+        session.add(user)
+        await session.flush()
+        session.add(TelegramAccount(user_id=user.id, telegram_user_id=700_000 + i, username=f"tg{i}"))
+        session.add(EventParticipation(event_id=event.id, user_id=user.id, total_xp_earned=i * 10))
+        user_ids.append(user.id)
+    await session.commit()
+    return user_ids
+
+
+@pytest.mark.asyncio
+async def test_event_leaderboard_query_count_is_constant(
+    pg_client: AsyncClient, pg_session, test_event, count_queries
+):
+    """Event leaderboard query count must not grow with the number of rows."""
+    await add_participants(pg_session, test_event, start=0, count=3)
+    invalidate_user_display()
+
+    with count_queries() as small:
+        response = await pg_client.get(f"/api/v1/telegram/events/{test_event.id}/leaderboard")
+    assert response.status_code == 200
+    assert len(response.json()["entries"]) == 3
+
+    await add_participants(pg_session, test_event, start=3, count=17)
+    invalidate_user_display()
+
+    with count_queries() as large:
+        response = await pg_client.get(f"/api/v1/telegram/events/{test_event.id}/leaderboard")
+    assert response.status_code == 200
+    entries = response.json()["entries"]
+    assert len(entries) == 20
+    assert entries[0]["username"] == "tg19"
+    assert entries[0]["display_name"] == "User 19"
+
+    large.assert_at_most(small.count)
+
+
+@pytest.mark.asyncio
+async def test_hydrate_users_single_query_and_cache(pg_session, test_event, count_queries):
+    """hydrate_users loads a list in one query and serves repeats from cache."""
+    user_ids = await add_participants(pg_session, test_event, start=0, count=10)
+    invalidate_user_display()
+
+    with count_queries() as queries:
+        displays = await hydrate_users(pg_session, user_ids)
+    queries.assert_at_most(1)
+    assert set(displays) == set(user_ids)
+    assert displays[user_ids[0]].telegram_user_id == 700_000
+
+    with count_queries() as queries:
+        await hydrate_users(pg_session, user_ids)
+    queries.assert_at_most(0)
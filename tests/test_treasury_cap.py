@@ -0,0 +1,70 @@
+"""
+Treasury Cap Tests
+Günlük bütçe rezervasyonunun tek statement'ta kilitlenip uygulanması
+(Postgres gerekir: SELECT ... FOR UPDATE, UPDATE ... FROM ... RETURNING).
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlmodel import select
+
+from app.core.config import settings
+from app.wallet.models import DailyTreasuryStat
+from app.wallet.treasury_cap import reserve_treasury_budget
+
+DAY = date(2099, 12, 31)
+
+
+async def add_day(session_factory, limit_ncr: float) -> None:
+    async with session_factory() as session:
+        session.add(DailyTreasuryStat(day=DAY, limit_ncr=limit_ncr, issued_ncr=0.0))
+        await session.commit()
+
+
+async def issued_ncr(session_factory) -> float:
+    async with session_factory() as session:
+        return (await session.execute(
+            select(DailyTreasuryStat.issued_ncr).where(DailyTreasuryStat.day == DAY)
+        )).scalar_one()
+
+
+async def test_concurrent_reservations_never_exceed_hard_cap(pg_session_factory):
+    """Toplam talep limitin 2 katı; her worker kendi session'ında rezervasyon + commit yapar."""
+    workers, per_worker, amount = 10, 20, 5.0
+    limit_ncr = workers * per_worker * amount / 2
+    hard_cap = limit_ncr * settings.TREASURY_HARD_CAP_RATIO
+    await add_day(pg_session_factory, limit_ncr)
+
+    granted: list[float] = []
+    issued_seen: list[float] = []
+
+    async def worker():
+        for _ in range(per_worker):
+            async with pg_session_factory() as session:
+                reservation = await reserve_treasury_budget(session, amount, day=DAY)
+                await session.commit()
+            granted.append(reservation.granted_ncr)
+            issued_seen.append(reservation.issued_ncr)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    issued = await issued_ncr(pg_session_factory)
+
+    assert issued <= hard_cap + 1e-6
+    assert max(issued_seen) <= hard_cap + 1e-6
+    # Kayıp güncelleme yok: sayaç verilenlerin toplamı
+    assert issued == pytest.approx(sum(granted), abs=0.005)
+    # Seri uygulama: her pozitif rezervasyon farklı bir issued_ncr görür
+    positive = [seen for seen, g in zip(issued_seen, granted) if g > 0]
+    assert len(set(positive)) == len(positive)
+
+
+async def test_rollback_releases_reservation(pg_session_factory):
+    await add_day(pg_session_factory, 1_000.0)
+
+    async with pg_session_factory() as session:
+        reservation = await reserve_treasury_budget(session, 50.0, day=DAY)
+        assert reservation.granted_ncr > 0
+        await session.rollback()
+
+    assert await issued_ncr(pg_session_factory) == 0.0
@@ -1,10 +1,19 @@
 """
 NovaCore Wallet Tests
 """
+import asyncio
 from decimal import Decimal
 
 import pytest
+import pytest_asyncio
+from fastapi import HTTPException
 from httpx import AsyncClient
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.wallet.models import Account, LedgerEntry, LedgerEntryType
+from app.wallet.schemas import TransactionCreate
+from app.wallet.service import WalletService
 
 
 @pytest.mark.asyncio
@@ -92,6 +101,97 @@ async def test_create_transaction_insufficient_balance(client: AsyncClient, test
     assert "Insufficient balance" in response.json()["detail"]
 
 
+@pytest_asyncio.fixture
+async def pg_user(pg_session):
+    """Create a test user on Postgres (after the treasury user, id=1)."""
+    from app.identity.models import User
+
+    pg_session.add(User(username="treasury"))
+    await pg_session.flush()
+    user = User(
+        telegram_id=123456789,
+        username="testuser",
+        display_name="Test User",
+    )
+    pg_session.add(user)
+    await pg_session.commit()
+    await pg_session.refresh(user)
+    return user
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_spend_without_account(pg_client: AsyncClient, pg_user):
+    """Test spend for a user that has no account row yet."""
+    response = await pg_client.post(
+        "/api/v1/wallet/tx",
+        json={
+            "user_id": pg_user.id,
+            "amount": "10",
+            "type": "spend",
+            "source_app": "flirt",
+        },
+    )
+
+    assert response.status_code == 400
+    assert "No NCR account" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_earn_creates_account(pg_client: AsyncClient, pg_user):
+    """Test first earn creates the account and credits it."""
+    response = await pg_client.post(
+        "/api/v1/wallet/tx",
+        json={
+            "user_id": pg_user.id,
+            "amount": "25",
+            "type": "earn",
+            "source_app": "flirt",
+        },
+    )
+
+    assert response.status_code == 200
+    assert Decimal(response.json()["balance_after"]) == Decimal("25")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_spends_never_overdraw(pg_session_factory, pg_user):
+    """Test concurrent spends on one account serialize on the guarded UPDATE."""
+    async with pg_session_factory() as session:
+        session.add(Account(user_id=pg_user.id, token="NCR", balance=Decimal("100")))
+        await session.commit()
+
+    async def spend() -> Decimal | None:
+        async with pg_session_factory() as session:
+            try:
+                tx = await WalletService(session).create_transaction(
+                    TransactionCreate(
+                        user_id=pg_user.id,
+                        amount=Decimal("15"),
+                        type=LedgerEntryType.SPEND,
+                        source_app="flirt",
+                    )
+                )
+            except HTTPException as e:
+                assert e.status_code == 400
+                return None
+            await session.commit()
+            return tx.balance_after
+
+    results = await asyncio.gather(*(spend() for _ in range(20)))
+    successes = sorted(r for r in results if r is not None)
+
+    # 100 / 15 → 6 spends; each balance_after is distinct and never negative
+    assert successes == [Decimal("100") - 15 * n for n in range(6, 0, -1)]
+
+    async with pg_session_factory() as session:
+        balance = (await WalletService(session).get_balance(pg_user.id)).balance
+        entries = (await session.execute(
+            select(func.count()).select_from(LedgerEntry).where(LedgerEntry.user_id == pg_user.id)
+        )).scalar_one()
+    assert balance == Decimal("10")
+    assert entries == len(successes)
+
+
 @pytest.mark.asyncio
 async def test_transfer(client: AsyncClient, test_user, test_user_token, test_account, test_session):
     """Test transfer between users."""
@@ -151,3 +251,111 @@ async def test_get_my_transactions(client: AsyncClient, test_user, test_user_tok
     assert data["total"] >= 1
     assert len(data["transactions"]) >= 1
 
+
+@pytest.mark.asyncio
+async def test_get_my_transactions_cursor(pg_client: AsyncClient, pg_session, pg_user):
+    """Test keyset pagination walks the full history without overlap."""
+    from app.core.security import create_access_token
+
+    pg_session.add(Account(user_id=pg_user.id, token="NCR", balance=Decimal("1000")))
+    await pg_session.commit()
+
+    for _ in range(5):
+        await pg_client.post(
+            "/api/v1/wallet/tx",
+            json={
+                "user_id": pg_user.id,
+                "amount": "10",
+                "type": "spend",
+                "source_app": "flirt",
+            },
+        )
+
+    headers = {"Authorization": f"Bearer {create_access_token(user_id=pg_user.id)}"}
+    seen: list[int] = []
+    params = {"per_page": 2, "include_total": False}
+    while True:
+        response = await pg_client.get("/api/v1/wallet/me/transactions", headers=headers, params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(tx["id"] for tx in data["transactions"])
+        if not data["next_cursor"]:
+            break
+        params["after"] = data["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == 5
+    assert seen == sorted(seen, reverse=True)
+
+    response = await pg_client.get(
+        "/api/v1/wallet/me/transactions", headers=headers, params={"after": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shard_count", [1, 4])
+async def test_post_journal(pg_session_factory, pg_user, monkeypatch, shard_count):
+    """Test multi-leg journal posting with treasury mirroring (canonical row and shards)."""
+    from app.core.config import settings
+    from app.identity.models import User
+    from app.wallet.treasury_shards import get_treasury_shard_total
+
+    monkeypatch.setattr(settings, "TREASURY_SHARD_COUNT", shard_count)
+    async with pg_session_factory() as session:
+        performer = User(username="performer")
+        session.add(performer)
+        await session.flush()
+        session.add(Account(user_id=pg_user.id, token="NCR", balance=Decimal("1000")))
+        session.add(Account(user_id=performer.id, token="NCR", balance=Decimal("0")))
+        await session.commit()
+
+    async with pg_session_factory() as session:
+        responses = await WalletService(session).post_journal(
+            [
+                TransactionCreate(
+                    user_id=pg_user.id, amount=Decimal("100"), type=LedgerEntryType.SPEND, source_app="flirt"
+                ),
+                TransactionCreate(
+                    user_id=performer.id, amount=Decimal("100"), type=LedgerEntryType.EARN, source_app="flirt"
+                ),
+                TransactionCreate(
+                    user_id=performer.id, amount=Decimal("10"), type=LedgerEntryType.FEE, source_app="flirt"
+                ),
+            ]
+        )
+        await session.commit()
+
+    # One response per leg, balance_after replayed in leg order
+    assert [r.balance_after for r in responses] == [Decimal("900"), Decimal("100"), Decimal("90")]
+    assert len({r.id for r in responses}) == 3
+
+    sharded = shard_count > 1
+    async with pg_session_factory() as session:
+        entries = list((await session.execute(select(LedgerEntry).order_by(LedgerEntry.id))).scalars())
+        service = WalletService(session)
+        user_balance = (await service.get_balance(pg_user.id)).balance
+        performer_balance = (await service.get_balance(performer.id)).balance
+        treasury_balance = (await service.get_balance(settings.NCR_TREASURY_USER_ID)).balance
+        shard_total = await get_treasury_shard_total(session)
+
+    # Three legs + the treasury mirror of the FEE leg
+    assert [(e.user_id, e.type, e.amount) for e in entries] == [
+        (pg_user.id, LedgerEntryType.SPEND, Decimal("100")),
+        (performer.id, LedgerEntryType.EARN, Decimal("100")),
+        (performer.id, LedgerEntryType.FEE, Decimal("10")),
+        (settings.NCR_TREASURY_USER_ID, LedgerEntryType.EARN, Decimal("10")),
+    ]
+    mirror = entries[-1]
+    assert mirror.meta["original_type"] == "fee"
+    assert [e.balance_after for e in entries] == [
+        Decimal("900"), Decimal("100"), Decimal("90"), None if sharded else Decimal("10")
+    ]
+
+    # Balanced: what left the user is on the performer, the treasury row or its shards
+    assert (user_balance, performer_balance) == (Decimal("900"), Decimal("90"))
+    if sharded:
+        assert mirror.meta["treasury_shard"] == pg_user.id % shard_count
+        assert (treasury_balance, shard_total) == (Decimal("0"), Decimal("10"))
+    else:
+        assert (treasury_balance, shard_total) == (Decimal("10"), Decimal("0"))
@@ -0,0 +1,136 @@
+"""
+XP Write-Behind Tests
+Fold'un kullanıcı başına uygulama mantığı (DB gerekmez) ve SQL fold'u
+(Postgres gerekir: ON CONFLICT, SKIP LOCKED, DELETE ... RETURNING).
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from app.core.config import settings
+from app.identity.models import User
+from app.xp_loyalty import service as loyalty_service
+from app.xp_loyalty.models import LoyaltyTier, UserLoyalty, XpDelta
+from app.xp_loyalty.schemas import XpEventCreate
+from app.xp_loyalty.service import XpLoyaltyService, apply_xp_delta
+from app.xp_loyalty.write_behind import apply_pending_deltas, run_xp_fold_once
+
+
+def make_rows() -> dict[int, UserLoyalty]:
+    return {
+        1: UserLoyalty(user_id=1, xp_total=950, level=10, tier=LoyaltyTier.BRONZE),
+        2: UserLoyalty(user_id=2, xp_total=30, level=1, tier=LoyaltyTier.BRONZE),
+        3: UserLoyalty(user_id=3, xp_total=4_990, level=50, tier=LoyaltyTier.SILVER, total_events=7),
+    }
+
+
+def test_fold_matches_immediate_updates():
+    rng = random.Random(11)
+    start = datetime(2025, 12, 3, 12, 0)
+    deltas = [
+        (i, rng.choice([1, 1, 2, 3]), rng.choice([5, 20, 80, 150, -60]), start + timedelta(seconds=i))
+        for i in range(1, 200)
+    ]
+
+    # Anlık mod: her event kendi sırasıyla satıra uygulanır
+    immediate = make_rows()
+    for _, user_id, amount, created_at in deltas:
+        apply_xp_delta(immediate[user_id], amount, created_at)
+
+    # Write-behind: delta'lar DELETE ... RETURNING sırasından bağımsız id sırasıyla
+    folded_rows = make_rows()
+    folded, _ = apply_pending_deltas(folded_rows, list(reversed(deltas)))
+
+    assert folded == {1, 2, 3}
+    for user_id in folded:
+        assert (
+            folded_rows[user_id].model_dump(exclude={"created_at"})
+            == immediate[user_id].model_dump(exclude={"created_at"})
+        )
+    # Negatif delta'lar sırayla 0'da kırpılır (toplamın tek seferde kırpılması değil)
+    assert all(row.xp_total >= 0 for row in folded_rows.values())
+
+
+def test_level_and_tier_changes_reported_once_per_user():
+    rows = make_rows()
+    now = datetime(2025, 12, 3, 12, 0)
+    deltas = [
+        (1, 1, 30, now),      # 980: level 10 → 10
+        (2, 1, 40, now),      # 1020: level 11, SILVER
+        (3, 1, 500, now),     # 1520: level 16
+        (4, 2, 10, now),      # 40: level 1 → 1
+        (5, 3, 5, now),       # 4995
+    ]
+    folded, changes = apply_pending_deltas(rows, deltas)
+
+    assert folded == {1, 2, 3}
+    assert changes == [(1, 10, 16, LoyaltyTier.BRONZE, LoyaltyTier.SILVER)]
+    assert rows[1].total_events == 3 and rows[1].vip_priority == 25 + 16
+    assert rows[3].total_events == 8 and rows[3].tier == LoyaltyTier.SILVER
+
+
+async def test_fold_writes_same_rows_as_immediate_mode(pg_session_factory, monkeypatch):
+    async with pg_session_factory() as session:
+        users = [User(username=f"xp_{i}") for i in range(4)]
+        session.add_all(users)
+        await session.flush()
+        immediate_ids = [users[0].id, users[1].id]
+        folded_ids = [users[2].id, users[3].id]
+        # İlk çift level 10 / BRONZE sınırında satırla başlar, ikincisinin satırı yok
+        for user_id in (immediate_ids[0], folded_ids[0]):
+            session.add(UserLoyalty(user_id=user_id, xp_total=950, level=10, tier=LoyaltyTier.BRONZE))
+        await session.commit()
+
+    amounts = [30, 40, -60, 500, 25, -5_000, 120]
+
+    async def add_xp(user_ids: list[int]) -> None:
+        for amount in amounts:
+            for user_id in user_ids:
+                async with pg_session_factory() as session:
+                    await XpLoyaltyService(session).create_xp_event(
+                        XpEventCreate(user_id=user_id, amount=amount, event_type="test", source_app="aurora")
+                    )
+                    await session.commit()
+
+    async def rows(user_ids: list[int]) -> list[dict]:
+        async with pg_session_factory() as session:
+            result = await session.execute(select(UserLoyalty).where(UserLoyalty.user_id.in_(user_ids)))
+            by_user = {row.user_id: row for row in result.scalars()}
+        return [
+            by_user[user_id].model_dump(exclude={"user_id", "created_at", "updated_at", "last_activity_date"})
+            for user_id in user_ids
+        ]
+
+    monkeypatch.setattr(settings, "XP_FOLD_INTERVAL_SECONDS", 0.0)
+    await add_xp(immediate_ids)
+    expected = await rows(immediate_ids)
+
+    monkeypatch.setattr(settings, "XP_FOLD_INTERVAL_SECONDS", 5.0)
+    await add_xp(folded_ids)
+
+    # Fold öncesi: profil bekleyen delta'ları gösterir, satır yazılmamış
+    async with pg_session_factory() as session:
+        service = XpLoyaltyService(session)
+        for user_id, row in zip(folded_ids, expected):
+            profile = await service.get_loyalty_profile(user_id)
+            assert (profile.xp_total, profile.level, profile.tier) == (row["xp_total"], row["level"], row["tier"])
+        stored = await session.get(UserLoyalty, folded_ids[0])
+        assert stored.xp_total == 950
+        await session.commit()
+
+    level_changes: list[tuple] = []
+    monkeypatch.setattr(loyalty_service, "log_level_change", lambda *change: level_changes.append(change))
+
+    first = await run_xp_fold_once(pg_session_factory)
+    assert first["users"] == 2 and first["deltas"] == 2 * len(amounts)
+    assert await rows(folded_ids) == expected
+    assert {change[0] for change in level_changes} == set(folded_ids)
+
+    # İkinci fold'da iş yok, level_up / tier_up tekrar atılmaz
+    reported = list(level_changes)
+    second = await run_xp_fold_once(pg_session_factory)
+    assert (second["users"], second["deltas"]) == (0, 0)
+    assert level_changes == reported
+    async with pg_session_factory() as session:
+        assert (await session.execute(select(XpDelta))).first() is None